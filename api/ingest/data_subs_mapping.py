@@ -1,9 +1,17 @@
 """Functions to adapt incoming iFDO payloads into the shape expected by our DB models and serializers."""
 
+import itertools
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any
 
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+# Format of EXIF datetimes, which pandas doesn't infer
+EXIF_DATETIME_FORMAT = "%Y:%m:%d %H:%M:%S%z"
+# Number of leading datetimes from which the format of all the datetimes parsed at once is inferred
+DATETIME_FORMAT_SAMPLE = 100
 
 
 class IFDOAdaptError(ValueError):
@@ -70,22 +78,51 @@ def _maybe_dict(v: Any) -> dict | None:
     raise IFDOAdaptError(f"Expected an object/dict, got {type(v).__name__}")
 
 
+def parse_datetimes(values: Sequence[str]) -> list[datetime | None]:
+    """Parse many datetime strings at once, as UTC datetimes.
+
+    Each pass parses all the strings the previous passes couldn't, in a single vectorized call:
+    - in the format of the first strings, inferred once;
+    - as EXIF datetimes;
+    - in any format pandas reads, inferred for each string (as parsing each string on its own does).
+
+    Args:
+        values (Sequence[str]): the datetime strings.
+
+    Returns:
+        list[datetime | None]: the parsed datetime of each string, None if it isn't a valid datetime.
+    """
+    inferred_format = next(filter(None, map(guess_datetime_format, values[:DATETIME_FORMAT_SAMPLE])), None)
+    parsed_values: list[datetime | None] = [None] * len(values)
+    pending = list(range(len(values)))
+    for datetime_format in (inferred_format, EXIF_DATETIME_FORMAT, "mixed"):
+        if datetime_format is None or not pending:
+            continue
+        parsed = pd.to_datetime(
+            pd.Series([values[index] for index in pending], dtype=object),
+            format=datetime_format,
+            utc=True,
+            errors="coerce",
+        )
+        is_valid = parsed.notna().to_numpy()
+        for index, value in zip(
+            itertools.compress(pending, is_valid), parsed[is_valid].dt.to_pydatetime(), strict=True
+        ):
+            parsed_values[index] = value
+        pending = list(itertools.compress(pending, ~is_valid))
+    return parsed_values
+
+
 def _maybe_datetime(v: Any) -> datetime | None:
     if _is_blank(v):
         return None
     if isinstance(v, datetime):
         return v
     if isinstance(v, str):
-        # try pandas
-        try:
-            return pd.to_datetime(v, utc=True).to_pydatetime()
-        except Exception:
-            pass
-        # try EXIF
-        try:
-            return datetime.strptime(v, "%Y:%m:%d %H:%M:%S%z")
-        except Exception:
-            raise IFDOAdaptError(f"Invalid datetime: {v!r}") from None
+        parsed = parse_datetimes([v])[0]
+        if parsed is None:
+            raise IFDOAdaptError(f"Invalid datetime: {v!r}")
+        return parsed
     raise IFDOAdaptError(f"Expected datetime-like value, got {type(v).__name__}")
 
 
@@ -240,6 +277,34 @@ def adapt_ifdo_image_set_to_serializer_payload(ifdo: dict[str, Any]) -> dict[str
     return {k: v for k, v in payload.items() if v is not None}
 
 
+def parse_item_datetimes(items: Sequence[Any]) -> list[Any]:
+    """Parse the image-datetime of many iFDO image items at once, ahead of adapting each item.
+
+    Parsing datetimes one at a time is slow, and dominates the time taken to adapt the items of large image sets.
+
+    Args:
+        items (Sequence[Any]): image-set-items of an iFDO payload.
+
+    Returns:
+        list[Any]: the items, with the valid datetime strings replaced by their datetime (in a copy of their item).
+        Invalid datetimes are left for `adapt_ifdo_item_to_image_serializer_payload` to report.
+    """
+    indices = [
+        index
+        for index, item in enumerate(items)
+        if isinstance(item, dict)
+        and isinstance(item.get("image-datetime"), str)
+        and not _is_blank(item["image-datetime"])
+    ]
+    items = list(items)
+    for index, parsed in zip(
+        indices, parse_datetimes([items[index]["image-datetime"] for index in indices]), strict=True
+    ):
+        if parsed is not None:
+            items[index] = {**items[index], "image-datetime": parsed}
+    return items
+
+
 def adapt_ifdo_item_to_image_serializer_payload(
     item: dict[str, Any],
     *,
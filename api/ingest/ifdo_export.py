@@ -0,0 +1,245 @@
+"""Export of image sets as iFDO documents, the inverse of the adapters of `data_subs_mapping`."""
+
+import itertools
+import json
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from api.models import Creator, Image, ImageSet
+from api.models.fields import NamedURI
+from api.models.image import ImageCreator
+from api.models.image_set import ImageSetCreator, ImageSetRelatedMaterial
+from api.utils.constants import IFDO_EXPORT_CHUNK_SIZE
+
+# iFDO fields of the model fields common to image sets and images
+COMMON_FIELDS = {
+    "handle": "image-handle",
+    "copyright": "image-copyright",
+    "date_time": "image-datetime",
+    "latitude": "image-latitude",
+    "longitude": "image-longitude",
+    "altitude_meters": "image-altitude-meters",
+    "coordinate_uncertainty_meters": "image-coordinate-uncertainty-meters",
+    "entropy": "image-entropy",
+    "particle_count": "image-particle-count",
+    "acquisition": "image-acquisition",
+    "quality": "image-quality",
+    "deployment": "image-deployment",
+    "navigation": "image-navigation",
+    "scale_reference": "image-scale-reference",
+    "illumination": "image-illumination",
+    "pixel_magnitude": "image-pixel-magnitude",
+    "marine_zone": "image-marine-zone",
+    "spectral_resolution": "image-spectral-resolution",
+    "capture_mode": "image-capture-mode",
+    "fauna_attraction": "image-fauna-attraction",
+    "area_square_meters": "image-area-square-meter",
+    "meters_above_ground": "image-meters-above-ground",
+    "acquisition_settings": "image-acquisition-settings",
+    "camera_yaw_degrees": "image-camera-yaw-degrees",
+    "camera_pitch_degrees": "image-camera-pitch-degrees",
+    "camera_roll_degrees": "image-camera-roll-degrees",
+    "overlap_fraction": "image-overlap-fraction",
+}
+
+# iFDO fields of the image-set-header, by ImageSet field
+IMAGE_SET_FIELDS = {
+    **COMMON_FIELDS,
+    "id": "image-set-uuid",
+    "name": "image-set-name",
+    "handle": "image-set-handle",
+    "date_time": "image-set-start-datetime",
+    "abstract": "image-abstract",
+    "target_environment": "image-target-environment",
+    "time_synchronisation": "image-time-synchronisation",
+    "item_identification_scheme": "image-item-identification-scheme",
+    "visual_constraints": "image-visual-constraints",
+    "spatial_constraints": "image-spatial-constraints",
+    "temporal_constraints": "image-temporal-constraints",
+    "local_path": "image-set-local-path",
+    "min_latitude_degrees": "image-set-min-latitude-degrees",
+    "max_latitude_degrees": "image-set-max-latitude-degrees",
+    "min_longitude_degrees": "image-set-min-longitude-degrees",
+    "max_longitude_degrees": "image-set-max-longitude-degrees",
+}
+
+# iFDO fields of the image-set-items, by Image field
+IMAGE_FIELDS = {
+    **COMMON_FIELDS,
+    "id": "image-uuid",
+    "filename": "image-filename",
+    "sha256_hash": "image-hash-sha256",
+    "average_color": "image-average-color",
+    "mpeg7_color_layout": "image-mpeg7-colorlayout",
+    "mpeg7_color_statistic": "image-mpeg7-colorstatistic",
+    "mpeg7_color_structure": "image-mpeg7-colorstructure",
+    "mpeg7_dominant_color": "image-mpeg7-dominantcolor",
+    "mpeg7_edge_histogram": "image-mpeg7-edgehistogram",
+    "mpeg7_homogeneous_texture": "image-mpeg7-homogeneoustexture",
+    "mpeg7_scalable_color": "image-mpeg7-scalablecolor",
+}
+
+# iFDO fields of the named-URI foreign keys, common to image sets and images. The camera objects (pose, viewport, ...)
+# are not exported, as the adapters don't map them either.
+NAMED_URI_FIELDS = {
+    "context": "image-context",
+    "project": "image-project",
+    "event": "image-event",
+    "platform": "image-platform",
+    "sensor": "image-sensor",
+    "pi": "image-pi",
+    "license": "image-license",
+}
+
+# iFDO fields of related materials, by RelatedMaterial field
+RELATED_MATERIAL_FIELDS = {"uri": "uri", "title": "title", "relation": "relation"}
+
+# Models of the objects referred to by images, by field
+RELATED_MODELS = {
+    **{field: Image._meta.get_field(field).related_model for field in NAMED_URI_FIELDS},
+    "creators": Creator,
+}
+
+
+def _ifdo_value(value: Any) -> Any:
+    """Convert a model field value to its iFDO (JSON) value, with datetimes in UTC as in iFDO files."""
+    if isinstance(value, datetime):
+        return value.astimezone(UTC).strftime("%Y-%m-%d %H:%M:%S.%f")
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _ifdo_fields(values: dict[str, Any], fields: dict[str, str]) -> dict[str, Any]:
+    """Map model field values to iFDO fields, leaving out the empty ones, which the adapters read as missing."""
+    return {
+        ifdo_field: _ifdo_value(values[field])
+        for field, ifdo_field in fields.items()
+        if values.get(field) is not None and values[field] != ""
+    }
+
+
+def named_uri_data(obj: NamedURI) -> dict[str, str]:
+    """Named-URI object (creator, platform, ...) as an iFDO object, read back by the adapters as the same object."""
+    return {"name": obj.name, "uri": obj.uri} if obj.uri else {"name": obj.name}
+
+
+def ifdo_image_set_header(image_set: ImageSet) -> dict[str, Any]:
+    """Build the image-set-header of an image set, adapted back to the image set by the iFDO ingest.
+
+    Args:
+        image_set (ImageSet): the image set.
+
+    Returns:
+        dict[str, Any]: the image-set-header.
+    """
+    header = _ifdo_fields(vars(image_set), IMAGE_SET_FIELDS)
+    for field, ifdo_field in NAMED_URI_FIELDS.items():
+        obj = getattr(image_set, field)
+        if obj is not None:
+            header[ifdo_field] = named_uri_data(obj)
+
+    creators = ImageSetCreator.objects.filter(image_set=image_set).select_related("creator").order_by("id")
+    if creators:
+        header["image-creators"] = [named_uri_data(link.creator) for link in creators]
+
+    materials = (
+        ImageSetRelatedMaterial.objects.filter(image_set=image_set).select_related("related_material").order_by("id")
+    )
+    if materials:
+        # The adapter requires a name, which related materials don't have: their title (or URI) stands for it
+        header["image-set-related-material"] = [
+            {
+                "name": link.related_material.title or link.related_material.uri,
+                **_ifdo_fields(vars(link.related_material), RELATED_MATERIAL_FIELDS),
+            }
+            for link in materials
+        ]
+    return header
+
+
+class _RelatedObjects:
+    """Named-URI objects and creators of the images of an export, fetched a chunk of images at a time.
+
+    Objects are fetched once per export, as the images of an image set mostly share the same few objects.
+    """
+
+    def __init__(self) -> None:
+        self.objects: dict[str, dict[UUID, dict[str, str]]] = {field: {} for field in RELATED_MODELS}
+
+    def _fetch(self, field: str, ids: set[UUID]) -> None:
+        """Fetch the objects of a field not fetched yet, by id."""
+        cache = self.objects[field]
+        missing = ids - cache.keys() - {None}
+        if missing:
+            objects = RELATED_MODELS[field].objects.in_bulk(missing)
+            cache.update((pk, named_uri_data(obj)) for pk, obj in objects.items())
+
+    def items(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Build the image-set-items of a chunk of image rows, as returned by `iter_ifdo_items`."""
+        for field in NAMED_URI_FIELDS:
+            self._fetch(field, {row[f"{field}_id"] for row in rows})
+
+        creator_ids: dict[UUID, list[UUID]] = {}
+        links = ImageCreator.objects.filter(image_id__in=[row["id"] for row in rows]).order_by("id")
+        for image_id, creator_id in links.values_list("image_id", "creator_id"):
+            creator_ids.setdefault(image_id, []).append(creator_id)
+        self._fetch("creators", set(itertools.chain.from_iterable(creator_ids.values())))
+
+        items = []
+        for row in rows:
+            item = _ifdo_fields(row, IMAGE_FIELDS)
+            for field, ifdo_field in NAMED_URI_FIELDS.items():
+                if row[f"{field}_id"] is not None:
+                    item[ifdo_field] = self.objects[field][row[f"{field}_id"]]
+            if row["id"] in creator_ids:
+                item["image-creators"] = [self.objects["creators"][pk] for pk in creator_ids[row["id"]]]
+            items.append(item)
+        return items
+
+
+def iter_ifdo_items(image_set: ImageSet, chunk_size: int = IFDO_EXPORT_CHUNK_SIZE) -> Iterator[list[dict[str, Any]]]:
+    """Build the image-set-items of an image set, a chunk at a time.
+
+    Images are read from a server-side cursor, by filename, and the objects they refer to are fetched once per chunk,
+    so memory use doesn't grow with the number of images.
+
+    Args:
+        image_set (ImageSet): the image set.
+        chunk_size (int): number of images per chunk.
+
+    Yields:
+        list[dict[str, Any]]: the image-set-items of a chunk of images.
+    """
+    rows = (
+        Image.objects.filter(image_set=image_set)
+        .order_by("filename")
+        .values(*IMAGE_FIELDS, *(f"{field}_id" for field in NAMED_URI_FIELDS))
+        .iterator(chunk_size=chunk_size)
+    )
+    related = _RelatedObjects()
+    for chunk in itertools.batched(rows, chunk_size):
+        yield related.items(list(chunk))
+
+
+def iter_ifdo_json(image_set: ImageSet, chunk_size: int = IFDO_EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """Serialize an image set as an iFDO JSON document, a chunk of images at a time.
+
+    The document is the inverse of the iFDO ingest: uploading it as an iFDO file (or ingesting it as "ifdo") creates
+    the same image set and images.
+
+    Args:
+        image_set (ImageSet): the image set.
+        chunk_size (int): number of images per chunk, see `iter_ifdo_items`.
+
+    Yields:
+        str: consecutive parts of the JSON document.
+    """
+    yield f'{{"image-set-header": {json.dumps(ifdo_image_set_header(image_set))}, "image-set-items": ['
+    separator = ""
+    for items in iter_ifdo_items(image_set, chunk_size):
+        yield separator + ", ".join(json.dumps(item) for item in items)
+        separator = ", "
+    yield "]}"
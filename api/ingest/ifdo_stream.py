@@ -0,0 +1,316 @@
+"""Streaming reader of large and compressed iFDO request bodies and files."""
+
+import gzip
+import zlib
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+import ijson
+import yaml
+import zstandard
+
+from api.ingest.data_subs_mapping import IFDOAdaptError
+from api.utils.constants import IFDO_COMPRESSIONS, IFDO_UPLOAD_FORMATS
+
+Events = Iterator[tuple[str, Any]]
+
+CONTAINER_STARTS = {"start_map", "start_array"}
+CONTAINER_ENDS = {"end_map", "end_array"}
+
+# Raised while reading truncated or corrupt compressed data
+DECOMPRESSION_ERRORS = (EOFError, gzip.BadGzipFile, zlib.error, zstandard.ZstdError)
+
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_TIMESTAMP_TAG = "tag:yaml.org,2002:timestamp"
+# Aliases may expand a YAML document to at most this many times its own number of events (and 1000 more), which
+# stops documents nesting aliases from expanding exponentially
+YAML_ALIAS_EXPANSION_RATIO = 10
+
+
+def ifdo_upload_format(filename: str) -> tuple[str, str | None] | None:
+    """Get the format and compression of an iFDO file from its file extensions, e.g. ("json", "gzip") for .json.gz.
+
+    Args:
+        filename (str): name of the uploaded file.
+
+    Returns:
+        tuple[str, str | None] | None: one of the `IFDO_UPLOAD_FORMATS` values and one of the `IFDO_COMPRESSIONS`
+        values (None if not compressed), or None if the format is not supported.
+    """
+    suffixes = [suffix.lower() for suffix in Path(filename).suffixes]
+    compression = IFDO_COMPRESSIONS.get(suffixes[-1]) if suffixes else None
+    if compression is not None:
+        suffixes.pop()
+    upload_format = IFDO_UPLOAD_FORMATS.get(suffixes[-1]) if suffixes else None
+    return None if upload_format is None else (upload_format, compression)
+
+
+def decompress_stream(stream: IO[bytes], compression: str | None) -> IO[bytes]:
+    """Wrap a stream of compressed data in a stream of the decompressed data, decompressed as it is read.
+
+    Args:
+        stream (IO[bytes]): the compressed data.
+        compression (str | None): one of the `IFDO_COMPRESSIONS` values, or None for uncompressed data.
+
+    Returns:
+        IO[bytes]: the decompressed data.
+    """
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+    return stream
+
+
+def _json_events(stream: IO[bytes]) -> Events:
+    """Parse events of a JSON document, with JSON syntax errors raised as IFDOAdaptError."""
+    try:
+        yield from ijson.basic_parse(stream, use_float=True)
+    except ijson.JSONError as exc:
+        raise IFDOAdaptError(f"Invalid JSON: {exc}") from None
+    except DECOMPRESSION_ERRORS as exc:
+        raise IFDOAdaptError(f"Invalid compressed data: {exc}") from None
+
+
+def _expand_yaml_aliases(events: Iterator[yaml.Event]) -> Iterator[yaml.Event]:
+    """Replace the aliases of a stream of YAML events by the events of the nodes they refer to.
+
+    Raises:
+        IFDOAdaptError: if an alias refers to an unknown anchor or to a node containing it, or aliases expand the
+            document too much.
+    """
+    anchors: dict[str, list[yaml.Event]] = {}
+    # Events of the anchored nodes being read, with their current depth
+    recordings: list[tuple[list[yaml.Event], list[int]]] = []
+    expanded = 0
+    for parsed, event in enumerate(events, start=1):
+        if isinstance(event, yaml.AliasEvent):
+            if event.anchor not in anchors:
+                raise IFDOAdaptError(f"Invalid YAML: found undefined alias {event.anchor!r}")
+            node_events = anchors[event.anchor]
+            if any(recorded is node_events for recorded, _ in recordings):
+                raise IFDOAdaptError(f"Invalid YAML: recursive alias {event.anchor!r}")
+            expanded += len(node_events)
+            if expanded > YAML_ALIAS_EXPANSION_RATIO * parsed + 1000:
+                raise IFDOAdaptError("Invalid YAML: aliases expand the document too much")
+        else:
+            node_events = [event]
+            if isinstance(event, yaml.NodeEvent) and event.anchor is not None:
+                anchors[event.anchor] = []
+                recordings.append((anchors[event.anchor], [0]))
+
+        for node_event in node_events:
+            for recorded, depth in recordings:
+                recorded.append(node_event)
+                depth[0] += isinstance(node_event, yaml.CollectionStartEvent)
+                depth[0] -= isinstance(node_event, yaml.CollectionEndEvent)
+            recordings = [recording for recording in recordings if recording[1][0] > 0]
+            yield node_event
+
+
+def _yaml_scalar(loader: yaml.BaseLoader, event: yaml.ScalarEvent) -> Any:
+    """Construct the value of a YAML scalar, as `yaml.safe_load` does but with timestamps kept as strings."""
+    tag = event.tag
+    if tag is None or tag == "!":
+        tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+    if tag == YAML_TIMESTAMP_TAG:
+        # iFDO datetimes are parsed from their string by the serializers, as for JSON
+        return event.value
+    constructor = loader.yaml_constructors.get(tag, loader.yaml_constructors[None])
+    return constructor(loader, yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style))
+
+
+def _yaml_node_events(loader: yaml.BaseLoader, events: Iterator[yaml.Event]) -> Events:
+    """Translate YAML events into the events of `ijson.basic_parse`."""
+    # For each open collection: None for sequences, and for mappings whether their next node is a key
+    collections: list[bool | None] = []
+    for event in _expand_yaml_aliases(events):
+        if isinstance(event, yaml.CollectionEndEvent):
+            collections.pop()
+            yield ("end_map" if isinstance(event, yaml.MappingEndEvent) else "end_array"), None
+        elif not isinstance(event, yaml.NodeEvent):
+            # Stream and document starts and ends
+            continue
+        elif collections and collections[-1]:
+            if not isinstance(event, yaml.ScalarEvent):
+                raise IFDOAdaptError("Invalid YAML: mapping keys must be scalars")
+            collections[-1] = False
+            yield "map_key", str(_yaml_scalar(loader, event))
+        else:
+            if collections and collections[-1] is False:
+                collections[-1] = True
+            if isinstance(event, yaml.MappingStartEvent):
+                collections.append(True)
+                yield "start_map", None
+            elif isinstance(event, yaml.SequenceStartEvent):
+                collections.append(None)
+                yield "start_array", None
+            else:
+                yield "scalar", _yaml_scalar(loader, event)
+
+
+def _yaml_events(stream: IO[bytes]) -> Events:
+    """Parse events of a YAML document, as `_json_events` does for JSON, for it to be read as a JSON document."""
+    loader = YAML_LOADER(stream)
+
+    def parse() -> Iterator[yaml.Event]:
+        while loader.check_event():
+            yield loader.get_event()
+
+    try:
+        yield from _yaml_node_events(loader, parse())
+    except yaml.YAMLError as exc:
+        raise IFDOAdaptError(f"Invalid YAML: {exc}") from None
+    except DECOMPRESSION_ERRORS as exc:
+        raise IFDOAdaptError(f"Invalid compressed data: {exc}") from None
+    finally:
+        loader.dispose()
+
+
+EVENT_PARSERS: dict[str, Callable[[IO[bytes]], Events]] = {
+    "json": _json_events,
+    "yaml": _yaml_events,
+}
+
+
+def _read_value(events: Events, event: str, value: Any) -> Any:
+    """Build the JSON value starting with the given event, consuming its events.
+
+    Args:
+        events (Events): parse events of the document.
+        event (str): the first event of the value.
+        value (Any): the value of the first event.
+
+    Returns:
+        Any: the value, as `json.loads` would give it (with floats for all non-integer numbers).
+    """
+    if event not in CONTAINER_STARTS:
+        return value
+    builder = ijson.ObjectBuilder()
+    builder.event(event, value)
+    depth = 1
+    for event, value in events:
+        builder.event(event, value)
+        if event in CONTAINER_STARTS:
+            depth += 1
+        elif event in CONTAINER_ENDS:
+            depth -= 1
+            if depth == 0:
+                break
+    return builder.value
+
+
+def _iter_items(events: Events) -> Iterator[Any]:
+    """Yield the items of the image-set-items array one at a time, then check the rest of the document."""
+    for event, value in events:
+        if event == "end_array":
+            break
+        yield _read_value(events, event, value)
+    yield from _read_rest(events, depth=0)
+
+
+def _read_rest(events: Events, depth: int) -> Iterator[Any]:
+    """Read the rest of the document after the image-set-items, for syntax errors to be reported, yielding nothing.
+
+    Args:
+        events (Events): parse events of the document.
+        depth (int): depth of the next event in the iFDO object, -1 once the iFDO object has ended.
+
+    Raises:
+        IFDOAdaptError: if the request body has fields after its iFDO object, which could only be read once its
+            items have been ingested.
+    """
+    late_fields = []
+    for event, value in events:
+        if event in CONTAINER_STARTS:
+            depth += 1
+        elif event in CONTAINER_ENDS:
+            depth -= 1
+        elif event == "map_key" and depth == -1:
+            late_fields.append(value)
+    if late_fields:
+        raise IFDOAdaptError(
+            f"Request body fields must come before ifdo in streamed payloads, found after it: {', '.join(late_fields)}"
+        )
+    yield from ()
+
+
+def _read_body_fields(events: Events) -> tuple[dict[str, Any], bool]:
+    """Read the fields of the request body up to its iFDO object.
+
+    Returns:
+        tuple[dict[str, Any], bool]: the fields before "ifdo", and whether an iFDO object was found.
+    """
+    body: dict[str, Any] = {}
+    for key_event, key in events:
+        if key_event == "end_map":
+            break
+        event, value = next(events)
+        if key == "ifdo":
+            return body, event == "start_map"
+        body[key] = _read_value(events, event, value)
+    return body, False
+
+
+def _read_ifdo_fields(events: Events) -> tuple[dict[str, Any], Iterator[Any]]:
+    """Read the fields of the iFDO object up to its image-set-items.
+
+    Returns:
+        tuple[dict[str, Any], Iterator[Any]]: the fields before "image-set-items", and an iterator over the items.
+    """
+    ifdo: dict[str, Any] = {}
+    for key_event, key in events:
+        if key_event == "end_map":
+            break
+        event, value = next(events)
+        if key != "image-set-items":
+            ifdo[key] = _read_value(events, event, value)
+        elif "image-set-header" not in ifdo:
+            raise IFDOAdaptError("ifdo.image-set-header must come before ifdo.image-set-items in streamed payloads")
+        elif event != "start_array":
+            raise IFDOAdaptError("ifdo.image-set-items must be a list")
+        else:
+            return ifdo, _iter_items(events)
+    return ifdo, _read_rest(events, depth=-1)
+
+
+def read_ifdo_stream(
+    stream: IO[bytes], upload_format: str = "json", compression: str | None = None, wrapped: bool = True
+) -> tuple[dict[str, Any], dict[str, Any] | None, Iterator[Any]]:
+    """Read a request body with an iFDO object under "ifdo", or an iFDO file, without loading its items into memory.
+
+    The body is parsed as a stream of JSON events: the fields of the body before "ifdo" and the fields of the iFDO
+    object before its image-set-items (its image-set-header) are read up front, and the image-set-items are built one
+    at a time as the returned iterator is consumed, so memory use doesn't grow with the number of items. This needs the
+    image-set-header to come before the image-set-items, as in iFDO files, and the fields of the body to come before
+    "ifdo". Compressed data is decompressed as it is read, and YAML documents are read as the equivalent JSON document.
+
+    Args:
+        stream (IO[bytes]): the request body or file.
+        upload_format (str): one of the `IFDO_UPLOAD_FORMATS` values.
+        compression (str | None): one of the `IFDO_COMPRESSIONS` values, or None for uncompressed data.
+        wrapped (bool): whether the iFDO object is under "ifdo" of a request body, rather than the whole document as
+            in iFDO files (and the documents of `iter_ifdo_json`), which have no other fields.
+
+    Raises:
+        IFDOAdaptError: if the body isn't valid JSON (or YAML), or its iFDO object can't be streamed. Errors in the
+            rest of the document, and body fields after "ifdo", are raised once the items have been consumed.
+
+    Returns:
+        tuple[dict[str, Any], dict[str, Any] | None, Iterator[Any]]: the fields of the body before "ifdo", the
+        fields of the iFDO object before its image-set-items (None if the body has no iFDO object), and an iterator
+        over the image-set-items.
+    """
+    events = EVENT_PARSERS[upload_format](decompress_stream(stream, compression))
+    if next(events, (None, None))[0] != "start_map":
+        raise IFDOAdaptError("Request body must be a JSON object" if wrapped else "iFDO file must be a JSON object")
+    if not wrapped:
+        ifdo, items = _read_ifdo_fields(events)
+        return {}, ifdo, items
+
+    body, has_ifdo = _read_body_fields(events)
+    if not has_ifdo:
+        return body, None, iter(())
+    ifdo, items = _read_ifdo_fields(events)
+    return body, ifdo, items
@@ -0,0 +1,541 @@
+"""Bulk ingest of the image items of large iFDO payloads."""
+
+import hashlib
+import json
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Sequence
+from functools import partial
+from itertools import batched, islice
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from api.ingest.data_subs_mapping import (
+    IFDOAdaptError,
+    adapt_ifdo_item_to_image_serializer_payload,
+    parse_item_datetimes,
+)
+from api.models import Image, ImageSet
+from api.models.image import ImageCreator
+from api.serializers.base import DeferredCreate
+from api.serializers.image import BulkIngestImageSerializer
+from api.utils.constants import IFDO_BULK_BATCH_SIZE, IFDO_COMMIT_CHUNK_SIZE
+from api.utils.parallel import imap_chunks
+
+# Fields that must be unique among all images, or among the images of an image set for filenames
+UNIQUE_IMAGE_FIELDS = ("id", "sha256_hash", "filename")
+
+# Fields written when the item of an image changed on re-ingest: images keep their id, creation time and image set,
+# and their geom is recomputed by the database
+UPSERT_IMAGE_FIELDS = [
+    field.name for field in Image._meta.concrete_fields if field.name not in {"id", "created_at", "image_set", "geom"}
+]
+
+# Foreign keys of images to their camera parameters, which are created for each image (see `_RelatedResolver`)
+CAMERA_PARAMETER_FIELDS = [
+    "camera_pose",
+    "camera_housing_viewport",
+    "flatport_parameter",
+    "domeport_parameter",
+    "photometric_calibration",
+    "camera_calibration_model",
+]
+
+# Stands for the images of earlier items of the payload when checking unique fields, which have no id yet
+_EARLIER_ITEM = object()
+
+
+def item_content_hash(payload: dict[str, Any]) -> str:
+    """Hash of an adapted iFDO image item, stored on its image to detect changed items when the payload is re-ingested.
+
+    The hash covers every value of the serializer payload, independently of the order of its keys, except its image
+    set, which every item of a payload shares.
+
+    Args:
+        payload (dict[str, Any]): the image serializer payload, adapted from the iFDO item.
+
+    Returns:
+        str: the hex SHA-256 of the payload.
+    """
+    content = {key: value for key, value in payload.items() if key != "image_set_id"}
+    encoded = json.dumps(content, sort_keys=True, default=str, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _adapt_items(items: Sequence[Any], image_set_id: UUID, start: int) -> tuple[list[int], list[dict], dict[str, Any]]:
+    """Adapt the iFDO image items into serializer payloads.
+
+    Args:
+        items (Sequence[Any]): image-set-items of the iFDO payload.
+        image_set_id (UUID): id of the image set created by the payload.
+        start (int): (1-based) index of the first item in the payload.
+
+    Returns:
+        tuple[list[int], list[dict], dict[str, Any]]: the (1-based) index and payload of each adapted item, and the
+        errors of the other items by index.
+    """
+    indices: list[int] = []
+    payloads: list[dict] = []
+    item_errors: dict[str, Any] = {}
+    for idx, item in enumerate(parse_item_datetimes(items), start=start):
+        if not isinstance(item, dict):
+            item_errors[str(idx)] = {"detail": "Item must be an object"}
+            continue
+        try:
+            payload = adapt_ifdo_item_to_image_serializer_payload(item, image_set_id=image_set_id)
+        except IFDOAdaptError as exc:
+            item_errors[str(idx)] = {"detail": str(exc)}
+            continue
+        # Every image goes to the new image set, which isn't looked up again for each item
+        payload.pop("image_set_id", None)
+        indices.append(idx)
+        payloads.append(payload)
+    return indices, payloads, item_errors
+
+
+def _unique_field_errors(indices: list[int], rows: list[dict], image_set: ImageSet) -> dict[str, Any]:
+    """Find the items whose id, hash or filename is already taken, by another image or by an earlier item.
+
+    Items updating an existing image (with its id) don't conflict with the values that image already has.
+
+    Args:
+        indices (list[int]): index of each item in the payload.
+        rows (list[dict]): validated data of each item.
+        image_set (ImageSet): the image set of the payload, in which filenames must be unique.
+
+    Returns:
+        dict[str, Any]: errors by item index.
+    """
+    item_errors: dict[str, Any] = {}
+    for field in UNIQUE_IMAGE_FIELDS:
+        queryset = Image.objects.filter(image_set=image_set) if field == "filename" else Image.objects.all()
+        values = [row.get(field) for row in rows]
+        # Id of the image (or earlier item) taking each value
+        taken = dict(
+            queryset.filter(**{f"{field}__in": {value for value in values if value is not None}}).values_list(
+                field, "pk"
+            )
+        )
+        for idx, row, value in zip(indices, rows, values, strict=True):
+            if value is None:
+                continue
+            if value in taken and taken[value] != row.get("id"):
+                item_errors.setdefault(str(idx), {"detail": f"An image with {field} {value} already exists."})
+            taken[value] = _EARLIER_ITEM
+    return item_errors
+
+
+class _RelatedResolver:
+    """Save the related objects of validated image items, sharing the ones with the same payload.
+
+    Objects identified by key fields (named URIs such as projects, platforms or creators) are validated and got or
+    created once per distinct payload, through the identity map of the request. Objects without key fields (camera
+    parameters) are created for each image, as the per-item path does, with one bulk insert per model.
+    """
+
+    def __init__(self, context: dict[str, Any]) -> None:
+        self.context = context
+        self.shared: dict[tuple, models.Model] = {}
+        self.unkeyed: defaultdict[type[models.Model], list[models.Model]] = defaultdict(list)
+
+    def resolve(self, deferred: DeferredCreate) -> models.Model:
+        """Get the instance of a deferred related object."""
+        if not deferred.serializer_class.key_fields:
+            instance = deferred.serializer_class.Meta.model(**deferred.validated_data)
+            self.unkeyed[type(instance)].append(instance)
+            return instance
+
+        key = (deferred.serializer_class, tuple(sorted(deferred.validated_data.items())))
+        if key not in self.shared:
+            self.shared[key] = deferred.save(context=self.context)
+        return self.shared[key]
+
+    def save_unkeyed(self) -> None:
+        """Insert the related objects created for each image."""
+        for model, instances in self.unkeyed.items():
+            model.objects.bulk_create(instances)
+
+
+def _build_images(
+    rows: list[dict], image_set: ImageSet, resolver: _RelatedResolver
+) -> tuple[list[Image], list[ImageCreator]]:
+    """Build the unsaved images of the validated items, and their creator links.
+
+    Args:
+        rows (list[dict]): validated data of each item.
+        image_set (ImageSet): the image set created by the payload.
+        resolver (_RelatedResolver): resolver of the related objects of the items.
+
+    Returns:
+        tuple[list[Image], list[ImageCreator]]: the images and their links to their creators.
+    """
+    images: list[Image] = []
+    image_creators: list[ImageCreator] = []
+    for row in rows:
+        creators = row.pop("creators", [])
+        creators_deferred = row.pop("_creators_deferred", None)
+        if creators_deferred is not None:
+            creators = [resolver.resolve(creator) for creator in creators_deferred]
+        for field, value in row.items():
+            if isinstance(value, DeferredCreate):
+                row[field] = resolver.resolve(value)
+
+        image = Image(**row, image_set=image_set)
+        images.append(image)
+        image_creators.extend(ImageCreator(image=image, creator=creator) for creator in dict.fromkeys(creators))
+    return images, image_creators
+
+
+def _validate_image_batch(
+    image_set_id: UUID, start: int, items: Sequence[Any]
+) -> tuple[list[int], list[dict], dict[str, Any]]:
+    """Adapt and validate a batch of image items, the CPU-bound stage of the ingest.
+
+    Validation doesn't query the database: the items only hold nested objects, resolved when their images are created,
+    and the image set is given by id. So batches can be validated by worker processes, which have no database access
+    (see `imap_chunks`), while the image set is still being created.
+
+    Args:
+        image_set_id (UUID): id of the image set created by the payload.
+        start (int): (1-based) index of the first item of the batch in the payload.
+        items (Sequence[Any]): the image items of the batch.
+
+    Returns:
+        tuple[list[int], list[dict], dict[str, Any]]: the index and validated data of each item (empty if any item is
+        invalid), and the errors of the invalid items by index.
+    """
+    indices, payloads, item_errors = _adapt_items(items, image_set_id, start)
+    return _validate_payloads(indices, payloads, item_errors)
+
+
+def _validate_payloads(
+    indices: list[int], payloads: list[dict], item_errors: dict[str, Any]
+) -> tuple[list[int], list[dict], dict[str, Any]]:
+    """Validate adapted image items together, adding the content hash of their payload to their validated data.
+
+    Args:
+        indices (list[int]): (1-based) index of each item in the payload.
+        payloads (list[dict]): serializer payload of each item.
+        item_errors (dict[str, Any]): errors of the items of the batch that couldn't be adapted, by index.
+
+    Returns:
+        tuple[list[int], list[dict], dict[str, Any]]: as `_validate_image_batch`.
+    """
+    content_hashes = [item_content_hash(payload) for payload in payloads]
+    serializer = BulkIngestImageSerializer(data=payloads, many=True)
+    if not serializer.is_valid():
+        for idx, errors in zip(indices, serializer.errors, strict=True):
+            if errors:
+                item_errors[str(idx)] = errors
+    if item_errors:
+        return indices, [], dict(sorted(item_errors.items(), key=lambda error: int(error[0])))
+    rows = [
+        dict(row, content_hash=content_hash)
+        for row, content_hash in zip(serializer.validated_data, content_hashes, strict=True)
+    ]
+    return indices, rows, {}
+
+
+def _create_image_batch(
+    image_set: ImageSet, indices: list[int], rows: list[dict], context: dict[str, Any], insert: bool = True
+) -> tuple[int, dict[str, Any]]:
+    """Check the unique fields of a batch of validated image items, and insert their images if they are all unique.
+
+    Args:
+        image_set (ImageSet): the image set created by the payload.
+        indices (list[int]): index of each item in the payload.
+        rows (list[dict]): validated data of each item.
+        context (dict[str, Any]): serializer context shared by the request, with its identity map.
+        insert (bool): whether to insert the images of valid items, or only validate them.
+
+    Returns:
+        tuple[int, dict[str, Any]]: the number of created images, and the errors of the invalid items by index.
+    """
+    item_errors = _unique_field_errors(indices, rows, image_set)
+    if item_errors or not insert:
+        return 0, item_errors
+
+    resolver = _RelatedResolver(context)
+    images, image_creators = _build_images(rows, image_set, resolver)
+    resolver.save_unkeyed()
+    Image.objects.bulk_create(images)
+    ImageCreator.objects.bulk_create(image_creators)
+    return len(images), {}
+
+
+def bulk_create_images(
+    image_set: ImageSet,
+    items: Iterable[Any],
+    context: dict[str, Any],
+    batch_size: int | None = None,
+    start: int = 1,
+) -> tuple[int, dict[str, Any]]:
+    """Create the images of the items of an iFDO payload with bulk queries.
+
+    Items are processed in batches, so only a few batches are held in memory when they are streamed. The items of a
+    batch are adapted and validated together, by `IFDO_UPLOAD_WORKERS` worker processes for payloads of several batches
+    (see `_validate_image_batch`). Each validated batch then has its unique fields checked with one query per field
+    (against the images of earlier batches too), the related objects shared by several items (e.g. the project or the
+    creators of a dive) resolved once, and its images and their links to their creators inserted with `bulk_create`,
+    in order and in the caller's transaction.
+
+    Once an item is invalid, the following batches are only validated, to report their errors too: the caller must
+    then roll back the images of the earlier batches.
+
+    Args:
+        image_set (ImageSet): the image set created by the payload.
+        items (Iterable[Any]): image-set-items of the iFDO payload.
+        context (dict[str, Any]): serializer context shared by the request, with its identity map.
+        batch_size (int | None): number of items per batch, `IFDO_BULK_BATCH_SIZE` by default.
+        start (int): (1-based) index of the first item in the payload.
+
+    Returns:
+        tuple[int, dict[str, Any]]: the number of created images, and the errors of the invalid items by (1-based)
+        index.
+    """
+    batch_size = batch_size or IFDO_BULK_BATCH_SIZE
+    batches = ((start + number * batch_size, batch) for number, batch in enumerate(batched(items, batch_size)))
+    validated_batches = imap_chunks(partial(_validate_image_batch, image_set.id), batches, settings.IFDO_UPLOAD_WORKERS)
+
+    created = 0
+    item_errors: dict[str, Any] = {}
+    for indices, rows, validation_errors in validated_batches:
+        if validation_errors:
+            item_errors |= validation_errors
+            continue
+        batch_created, batch_errors = _create_image_batch(image_set, indices, rows, context, insert=not item_errors)
+        created += batch_created
+        item_errors |= batch_errors
+    return created, item_errors
+
+
+def _camera_parameter_ids(image_ids: Sequence[UUID]) -> dict[str, set[Any]]:
+    """Ids of the camera parameters of some images, by image field."""
+    parameter_ids: dict[str, set[Any]] = {field: set() for field in CAMERA_PARAMETER_FIELDS}
+    for values in Image.objects.filter(pk__in=image_ids).values_list(*CAMERA_PARAMETER_FIELDS).iterator():
+        for field, value in zip(CAMERA_PARAMETER_FIELDS, values, strict=True):
+            if value is not None:
+                parameter_ids[field].add(value)
+    return parameter_ids
+
+
+def _delete_orphaned_camera_parameters(parameter_ids: dict[str, set[Any]]) -> None:
+    """Delete the given camera parameters no image or image set refers to anymore."""
+    for field, ids in parameter_ids.items():
+        if ids:
+            model = Image._meta.get_field(field).related_model
+            model.objects.filter(pk__in=ids, images__isnull=True, image_sets__isnull=True).delete()
+
+
+class _ImageSetUpsert:
+    """Changes between the images of an existing image set and the items of a payload re-ingesting it.
+
+    Images are matched to items by filename. The filename, id and content hash of the images are read up front (not
+    the images themselves), and the items are then read a batch at a time: the items whose content hash matches their
+    image are left alone, and only the new and changed ones are validated and kept until all items have been read.
+    """
+
+    def __init__(self, image_set: ImageSet) -> None:
+        self.image_set = image_set
+        images = Image.objects.filter(image_set=image_set).values_list("filename", "pk", "content_hash")
+        self.existing: dict[str, tuple[UUID, str | None]] = {
+            filename: (pk, content_hash) for filename, pk, content_hash in images.iterator()
+        }
+        self.filenames: set[str] = set()
+        self.counts = {"created": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+
+    def changed_items(self, start: int, items: Sequence[Any]) -> tuple[list[int], list[dict], dict[str, Any]]:
+        """Adapt a batch of items, and validate the ones that are new or changed.
+
+        Args:
+            start (int): (1-based) index of the first item of the batch in the payload.
+            items (Sequence[Any]): the image items of the batch.
+
+        Returns:
+            tuple[list[int], list[dict], dict[str, Any]]: as `_validate_image_batch`, for the new and changed items.
+        """
+        indices, payloads, item_errors = _adapt_items(items, self.image_set.id, start)
+        changed_indices: list[int] = []
+        changed_payloads: list[dict] = []
+        for idx, payload in zip(indices, payloads, strict=True):
+            filename = payload.get("filename")
+            if filename in self.filenames:
+                item_errors[str(idx)] = {"detail": f"An image with filename {filename} already exists."}
+                continue
+            self.filenames.add(filename)
+            if filename in self.existing and self.existing[filename][1] == item_content_hash(payload):
+                self.counts["unchanged"] += 1
+                continue
+            changed_indices.append(idx)
+            changed_payloads.append(payload)
+        return _validate_payloads(changed_indices, changed_payloads, item_errors)
+
+    def delete_missing(self, batch_size: int) -> None:
+        """Delete the images whose filename no longer is in the payload, and their camera parameters, by batch."""
+        missing = [pk for filename, (pk, _) in self.existing.items() if filename not in self.filenames]
+        for pks in batched(missing, batch_size):
+            parameter_ids = _camera_parameter_ids(pks)
+            Image.objects.filter(pk__in=pks).delete()
+            _delete_orphaned_camera_parameters(parameter_ids)
+        self.counts["deleted"] = len(missing)
+
+    def save(self, indices: list[int], rows: list[dict], context: dict[str, Any], write: bool = True) -> dict[str, Any]:
+        """Check the unique fields of a batch of new and changed items, and insert or update their images.
+
+        Changed images are updated in place, keeping their id (and the annotations of the image), with their creators
+        replaced by the ones of the item. Their camera parameters are created anew, as for new images, and the ones
+        they replace are deleted. An item whose image-uuid isn't the id of the image of its filename conflicts
+        with that image.
+
+        Args:
+            indices (list[int]): index of each item in the payload.
+            rows (list[dict]): validated data of each item.
+            context (dict[str, Any]): serializer context shared by the request, with its identity map.
+            write (bool): whether to write the images of valid items, or only check them.
+
+        Returns:
+            dict[str, Any]: the errors of the invalid items by index.
+        """
+        uuid_errors: dict[str, Any] = {}
+        for idx, row in zip(indices, rows, strict=True):
+            if row["filename"] not in self.existing:
+                continue
+            pk = self.existing[row["filename"]][0]
+            if row.setdefault("id", pk) != pk:
+                uuid_errors[str(idx)] = {
+                    "detail": f"An image with filename {row['filename']} already exists with image-uuid {pk}."
+                }
+        item_errors = _unique_field_errors(indices, rows, self.image_set) | uuid_errors
+        if item_errors or not write:
+            return item_errors
+
+        resolver = _RelatedResolver(context)
+        images, image_creators = _build_images(rows, self.image_set, resolver)
+        resolver.save_unkeyed()
+        created = [image for image in images if image.filename not in self.existing]
+        updated = [image for image in images if image.filename in self.existing]
+        now = timezone.now()
+        for image in updated:
+            image.updated_at = now
+        Image.objects.bulk_create(created)
+        replaced_parameter_ids = _camera_parameter_ids([image.pk for image in updated])
+        Image.objects.bulk_update(updated, UPSERT_IMAGE_FIELDS)
+        _delete_orphaned_camera_parameters(replaced_parameter_ids)
+        ImageCreator.objects.filter(image__in=updated).delete()
+        ImageCreator.objects.bulk_create(image_creators)
+        self.counts["created"] += len(created)
+        self.counts["updated"] += len(updated)
+        return {}
+
+
+def upsert_images(
+    image_set: ImageSet, items: Iterable[Any], context: dict[str, Any], batch_size: int | None = None
+) -> tuple[dict[str, int], dict[str, Any]]:
+    """Re-ingest the items of an iFDO payload into an existing image set, writing only what changed.
+
+    Each item is matched to the image of the same filename, and compared with it by content hash (see
+    `item_content_hash`): unchanged items are skipped without being validated, changed items update their image, new
+    items are inserted as by `bulk_create_images`, and the images whose filename is no longer in the payload are
+    deleted. Re-syncing a large image set thus costs a read of its filenames and hashes plus the changes.
+
+    The new and changed items are held in memory until all items have been read, as the missing images can only be
+    deleted then, and deleted first, so their filenames and hashes can be reused. Nothing is written if any item is
+    invalid; once one is, later batches are only checked, to report their errors too, and the caller must then roll
+    back the writes of the earlier ones.
+
+    Args:
+        image_set (ImageSet): the existing image set, updated from the header of the payload.
+        items (Iterable[Any]): image-set-items of the iFDO payload.
+        context (dict[str, Any]): serializer context shared by the request, with its identity map.
+        batch_size (int | None): number of items per batch, `IFDO_BULK_BATCH_SIZE` by default.
+
+    Returns:
+        tuple[dict[str, int], dict[str, Any]]: the number of created, updated, unchanged and deleted images, and the
+        errors of the invalid items by (1-based) index.
+    """
+    batch_size = batch_size or IFDO_BULK_BATCH_SIZE
+    upsert = _ImageSetUpsert(image_set)
+    changed_batches: list[tuple[list[int], list[dict]]] = []
+    item_errors: dict[str, Any] = {}
+    for number, batch in enumerate(batched(items, batch_size)):
+        indices, rows, validation_errors = upsert.changed_items(1 + number * batch_size, batch)
+        item_errors |= validation_errors
+        if not item_errors and rows:
+            changed_batches.append((indices, rows))
+    if item_errors:
+        return upsert.counts, item_errors
+
+    upsert.delete_missing(batch_size)
+    for indices, rows in changed_batches:
+        item_errors |= upsert.save(indices, rows, context, write=not item_errors)
+    return upsert.counts, item_errors
+
+
+class IngestCheckpoint:
+    """Progress of a chunked ingest, from which an interrupted ingest resumes.
+
+    `state` holds the id of the image set ("image_set_id") and the number of items committed so far
+    ("committed_items"), and is empty for a new ingest. `save` persists it, and is called in the transaction of each
+    chunk, so the progress is committed together with the images of the chunk.
+    """
+
+    def __init__(self, state: dict[str, Any], save: Callable[[], None]) -> None:
+        self.state = state
+        self.save = save
+
+    @property
+    def image_set_id(self) -> str | None:
+        """Id of the image set of the ingest, once it has been committed."""
+        return self.state.get("image_set_id")
+
+    @property
+    def committed_items(self) -> int:
+        """Number of items whose images have been committed."""
+        return self.state.get("committed_items", 0)
+
+    def commit(self, **changes: Any) -> None:
+        """Update and save the progress."""
+        self.state.update(changes)
+        self.save()
+
+
+def bulk_create_images_in_chunks(
+    image_set: ImageSet,
+    items: Iterable[Any],
+    context: dict[str, Any],
+    checkpoint: IngestCheckpoint,
+    chunk_size: int = IFDO_COMMIT_CHUNK_SIZE,
+) -> tuple[int, dict[str, Any]]:
+    """Create the images of the items of an iFDO payload with bulk queries, committing them a chunk at a time.
+
+    Each chunk of items is created by `bulk_create_images` in its own transaction, which also saves the checkpoint, so
+    locks and pending row versions don't build up over the whole payload. The items committed by an earlier run, by
+    the checkpoint, are skipped. The ingest stops at the first chunk with invalid items, which is rolled back: the
+    earlier chunks stay committed, for the ingest to resume from them.
+
+    Args:
+        image_set (ImageSet): the image set created by the payload.
+        items (Iterable[Any]): image-set-items of the iFDO payload.
+        context (dict[str, Any]): serializer context shared by the request, with its identity map.
+        checkpoint (IngestCheckpoint): progress of the ingest, updated as chunks are committed.
+        chunk_size (int): number of items per transaction.
+
+    Returns:
+        tuple[int, dict[str, Any]]: the number of images created by this run, and the errors of the invalid items of
+        the failed chunk by (1-based) index.
+    """
+    created = 0
+    committed = checkpoint.committed_items
+    for chunk in batched(islice(items, committed, None), chunk_size):
+        with transaction.atomic():
+            chunk_created, item_errors = bulk_create_images(image_set, chunk, context, start=committed + 1)
+            if item_errors:
+                transaction.set_rollback(True)
+                return created, item_errors
+            committed += len(chunk)
+            checkpoint.commit(committed_items=committed)
+        created += chunk_created
+    return created, {}
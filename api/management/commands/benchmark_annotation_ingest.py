@@ -0,0 +1,150 @@
+"""Management command to benchmark the per-row, bulk and COPY annotation ingest paths."""
+
+import time
+import uuid
+from argparse import ArgumentParser
+from collections.abc import Callable
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import override_settings
+
+from api.models import AnnotationSet, Image, ImageSet, Label
+from api.utils.annotations_ingest import (
+    bulk_insert_annotations_data,
+    copy_insert_annotations_data,
+    insert_annotations_data,
+)
+
+
+class _Rollback(Exception):
+    """Raised to roll back the data created by a benchmark run."""
+
+
+class Command(BaseCommand):
+    """Django management command to benchmark annotation ingest.
+
+    Every run creates its own image set, images, annotation set and labels, times the ingest of synthetic annotation
+    rows, and rolls everything back, so it leaves the database unchanged. Runs can be repeated with different numbers
+    of worker processes, to measure how the validation of large uploads scales with cores.
+    """
+
+    help = (
+        "Time the per-row, bulk and COPY annotation ingest paths on synthetic annotation data (rolled back "
+        "afterwards)."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add command-line arguments for the benchmark size and mode.
+
+        Args:
+            parser: The argument parser to which we can add custom arguments.
+        """
+        parser.add_argument("--rows", type=int, default=100_000, help="Number of annotation rows to ingest")
+        parser.add_argument("--images", type=int, default=1_000, help="Number of images the rows refer to")
+        parser.add_argument("--labels", type=int, default=50, help="Number of labels the rows refer to")
+        parser.add_argument("--annotators", type=int, default=10, help="Number of annotators the rows refer to")
+        parser.add_argument(
+            "--mode",
+            choices=["bulk", "copy", "per-row", "both", "all"],
+            default="bulk",
+            help=(
+                "Ingest path(s) to time: both is bulk and per-row (which takes a long time on large uploads), all "
+                "adds copy"
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            nargs="+",
+            help=(
+                "Numbers of worker processes to time each ingest path with, e.g. 1 2 4 to measure how validation "
+                "scales with cores (defaults to ANNOTATION_UPLOAD_WORKERS)"
+            ),
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Run the benchmark based on provided options.
+
+        Args:
+            *args: Positional arguments (not used here).
+            **options: Command-line options for the benchmark.
+        """
+        modes = {
+            "bulk": bulk_insert_annotations_data,
+            "copy": copy_insert_annotations_data,
+            "per-row": insert_annotations_data,
+        }
+        if options["mode"] == "both":
+            del modes["copy"]
+        elif options["mode"] != "all":
+            modes = {options["mode"]: modes[options["mode"]]}
+
+        for mode, insert_annotations in modes.items():
+            for workers in options["workers"] or [settings.ANNOTATION_UPLOAD_WORKERS]:
+                with override_settings(ANNOTATION_UPLOAD_WORKERS=workers):
+                    seconds, queries = self._run(insert_annotations, options)
+                rate = options["rows"] / seconds if seconds else 0
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{mode} ({workers} workers): {options['rows']} rows in {seconds:.2f}s ({rate:.0f} rows/s, "
+                        f"{queries} queries)"
+                    )
+                )
+
+    def _run(self, insert_annotations: Callable[[list[dict], uuid.UUID], dict], options: dict) -> tuple[float, int]:
+        """Create the fixtures, time one ingest, and roll everything back.
+
+        Args:
+            insert_annotations: The ingest function to time.
+            options: Command-line options for the benchmark.
+
+        Returns:
+            The elapsed time in seconds and the number of queries run by the ingest.
+        """
+        queries = 0
+
+        def count_queries(execute: Callable, sql: str, params: object, many: bool, context: dict) -> object:
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        try:
+            with transaction.atomic():
+                image_set = ImageSet.objects.create(name="Benchmark image set")
+                images = Image.objects.bulk_create(
+                    [Image(filename=f"benchmark_{i}.jpg", image_set=image_set) for i in range(options["images"])]
+                )
+                annotation_set = AnnotationSet.objects.create(name="Benchmark annotation set")
+                annotation_set.image_sets.set([image_set])
+                labels = Label.objects.bulk_create(
+                    [
+                        Label(name=f"label_{i}", parent_label_name="benchmark", annotation_set=annotation_set)
+                        for i in range(options["labels"])
+                    ]
+                )
+                rows = [
+                    {
+                        "image_id": str(images[i % len(images)].id) if i % 2 else "",
+                        "image_filename": images[i % len(images)].filename,
+                        "annotation_platform": "benchmark",
+                        "shape": "rectangle",
+                        "coordinates": [[i, i, i + 10, i, i + 10, i + 10, i, i + 10]],
+                        "dimension_pixels": None,
+                        "label_name": labels[i % len(labels)].name,
+                        "annotator_name": f"benchmark annotator {i % options['annotators']}",
+                        "creation_datetime": "15062023 09:30:00",
+                    }
+                    for i in range(options["rows"])
+                ]
+
+                with connection.execute_wrapper(count_queries):
+                    start = time.perf_counter()
+                    insert_annotations(rows, annotation_set.id)
+                    elapsed = time.perf_counter() - start
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        return elapsed, queries
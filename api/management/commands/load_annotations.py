@@ -0,0 +1,119 @@
+"""Management command to load an annotations file into the database."""
+
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from api.utils.annotations_ingest import ingest_annotation_data
+from api.utils.annotations_parser import (
+    annotation_upload_format,
+    iter_annotation_records,
+    iter_sheet_rows,
+    open_annotation_workbook,
+    parse_annotation_data,
+    parse_annotation_records,
+    parse_annotation_set_metadata,
+    parse_label_set,
+)
+from api.utils.constants import (
+    ANNOTATION_DATA_SHEET,
+    ANNOTATION_INGEST_BACKENDS,
+    ANNOTATION_SET_SHEET,
+    ANNOTATION_UPLOAD_FORMATS,
+    ANNOTATION_UPLOAD_MODES,
+    LABEL_SET_SHEET,
+)
+
+
+class Command(BaseCommand):
+    """Django management command to load an annotations template (.xlsx), CSV, JSON Lines or Parquet file.
+
+    Does the same as the upload endpoint, but from a file on disk and with the PostgreSQL COPY backend by default, so
+    very large (e.g. machine-generated) annotation sets can be loaded without going through an HTTP request.
+    """
+
+    help = "Load an annotations template (.xlsx), CSV, JSON Lines or Parquet file into the database."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add command-line arguments for the file, ingest backend, upload mode and coordinate validation.
+
+        Args:
+            parser: The argument parser to which we can add custom arguments.
+        """
+        parser.add_argument("file", help="Path to the annotations .xlsx, .csv, .ndjson/.jsonl or .parquet file")
+        parser.add_argument(
+            "--backend",
+            choices=ANNOTATION_INGEST_BACKENDS,
+            default="copy",
+            help="How to insert the annotation data (defaults to PostgreSQL COPY)",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=ANNOTATION_UPLOAD_MODES,
+            default="create",
+            help="Create a new annotation set, or append the new rows to the set of the file's annotation-set-uuid",
+        )
+        parser.add_argument(
+            "--validate-coordinates",
+            action="store_true",
+            help="Reject the file if any annotation coordinates do not follow the rules of their shape",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Parse and ingest the annotations template file.
+
+        Args:
+            *args: Positional arguments (not used here).
+            **options: Command-line options for the load.
+
+        Raises:
+            CommandError: If the file is not in a supported format, or cannot be read, parsed or ingested.
+        """
+        upload_format = annotation_upload_format(options["file"])
+        if upload_format is None:
+            raise CommandError(f"File is not a {', '.join(ANNOTATION_UPLOAD_FORMATS)} file.")
+
+        if upload_format == "xlsx":
+            try:
+                workbook = open_annotation_workbook(options["file"])
+            except Exception as e:
+                raise CommandError(f"Failed to read Excel file: {e}") from e
+
+            try:
+                annotation_set = parse_annotation_set_metadata(iter_sheet_rows(workbook, ANNOTATION_SET_SHEET))
+                label_data = parse_label_set(iter_sheet_rows(workbook, LABEL_SET_SHEET))
+                annotation_data = parse_annotation_data(iter_sheet_rows(workbook, ANNOTATION_DATA_SHEET))
+            except ValueError as e:
+                raise CommandError(f"Error parsing annotations template: {e}") from e
+            finally:
+                workbook.close()
+        else:
+            try:
+                with open(options["file"], "rb") as file:
+                    records = iter_annotation_records(file, upload_format)
+                    annotation_set, label_data, annotation_data = parse_annotation_records(records)
+            except OSError as e:
+                raise CommandError(f"Failed to read file: {e}") from e
+            except ValueError as e:
+                raise CommandError(f"Error parsing annotations file: {e}") from e
+
+        try:
+            data = ingest_annotation_data(
+                annotation_set,
+                label_data,
+                annotation_data,
+                backend=options["backend"],
+                validate_coordinates=options["validate_coordinates"],
+                with_data=False,
+                mode=options["mode"],
+            )
+        except (ValueError, ValidationError) as e:
+            raise CommandError(f"Error ingesting annotations data: {e}") from e
+
+        self.stdout.write(self.style.SUCCESS("Annotations loaded!"))
+        self.stdout.write(f"Annotation set: {data['annotation_set']['id']}")
+        self.stdout.write(f"Labels: {len(data['label_set'])}")
+        self.stdout.write(f"Annotations created: {data['annotation_data']['created']}")
+        if "skipped" in data["annotation_data"]:
+            self.stdout.write(f"Annotations already in the set: {data['annotation_data']['skipped']}")
@@ -0,0 +1,62 @@
+"""Management command to refresh the local taxon name index from the cached WoRMS service."""
+
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+
+from api.models.taxon_name import TaxonName
+from api.services.taxon_name_index import held_aphia_ids, refresh_taxon_names
+
+
+class Command(BaseCommand):
+    """Django management command to refresh the local taxon name index.
+
+    Intended to be run periodically (e.g. from a cron job), so that name searches keep working when WoRMS is
+    unreachable.
+    """
+
+    help = (
+        "Harvest scientific and vernacular names for every AphiaID referenced by a label from the cached WoRMS "
+        "service into the local taxon name index."
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add command-line arguments for the refresh options.
+
+        Args:
+            parser: The argument parser to which we can add custom arguments.
+        """
+        parser.add_argument(
+            "--aphia-ids",
+            type=int,
+            nargs="+",
+            default=None,
+            help="Only refresh the given AphiaIDs (defaults to every AphiaID referenced by a label)",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only harvest AphiaIDs that have no names in the index yet",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Refresh the taxon name index based on provided options.
+
+        Args:
+            *args: Positional arguments (not used here).
+            **options: Command-line options for the refresh.
+        """
+        aphia_ids = options["aphia_ids"] or held_aphia_ids()
+        if options["missing_only"]:
+            indexed = set(TaxonName.objects.values_list("aphia_id", flat=True).distinct())
+            aphia_ids = [aphia_id for aphia_id in aphia_ids if aphia_id not in indexed]
+
+        summary = refresh_taxon_names(aphia_ids)
+
+        self.stdout.write(self.style.SUCCESS("Taxon name index refreshed!"))
+        self.stdout.write(f"Taxa refreshed: {summary['taxa']}")
+        self.stdout.write(f"Names indexed: {summary['names']}")
+        if summary["failed"]:
+            self.stdout.write(
+                self.style.WARNING(f"WARNING: {summary['failed']} taxa could not be fetched from the WoRMS cache.")
+            )
@@ -0,0 +1,73 @@
+"""Management command to process the annotations and iFDO uploads queued as upload jobs."""
+
+import time
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.models.base import UploadJobStatusEnum
+from api.services.upload_jobs import claim_next_job, run_job
+from api.utils.constants import UPLOAD_WORKER_POLL_INTERVAL
+
+
+class Command(BaseCommand):
+    """Django management command to run the upload worker.
+
+    Polls the upload jobs table and processes queued jobs one at a time, oldest first. Several workers can run side
+    by side, as each job is claimed with a row lock.
+    """
+
+    help = "Process uploads queued for the background worker."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add command-line arguments for the worker options.
+
+        Args:
+            parser: The argument parser to which we can add custom arguments.
+        """
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling for new jobs",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=None,
+            help="Exit after processing this many jobs",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=UPLOAD_WORKER_POLL_INTERVAL,
+            help="Seconds to wait before polling again when the queue is empty",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Run the worker loop based on provided options.
+
+        Args:
+            *args: Positional arguments (not used here).
+            **options: Command-line options for the worker.
+        """
+        processed = 0
+        while options["max_jobs"] is None or processed < options["max_jobs"]:
+            # The worker is long-running, so drop connections that have gone stale between jobs
+            close_old_connections()
+            job = claim_next_job()
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            self.stdout.write(f"Processing {job.kind} upload job {job.id}")
+            job = run_job(job)
+            processed += 1
+            if job.status == UploadJobStatusEnum.succeeded.value:
+                self.stdout.write(self.style.SUCCESS(f"Job {job.id} succeeded"))
+            else:
+                self.stdout.write(self.style.ERROR(f"Job {job.id} failed: {job.errors}"))
+
+        self.stdout.write(f"Upload jobs processed: {processed}")
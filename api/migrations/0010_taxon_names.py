@@ -0,0 +1,40 @@
+# Generated by Django 4.2.3 on 2026-10-19 01:02
+"""
+This migration adds the taxon_names table, a local index of scientific and vernacular names per AphiaID,
+with a trigram index on the upper-cased name so name searches can be resolved without calling WoRMS.
+"""
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.functions.text
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_alter_context_name_alter_context_uri_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaxonName',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('aphia_id', models.PositiveIntegerField(db_index=True, help_text='The AphiaID of the taxon this name belongs to')),
+                ('name', models.CharField(help_text='Scientific or vernacular name of the taxon', max_length=255)),
+                ('is_vernacular', models.BooleanField(default=False, help_text='Indicates whether the name is a vernacular (common) name rather than the scientific name')),
+                ('language_code', models.CharField(blank=True, help_text='Language code of a vernacular name, as provided by WoRMS', max_length=16, null=True)),
+            ],
+            options={
+                'db_table': 'taxon_names',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='taxon_names_name_trgm_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taxonname',
+            constraint=models.UniqueConstraint(fields=('aphia_id', 'name'), name='uq_taxon_name_aphia_id_name'),
+        ),
+    ]
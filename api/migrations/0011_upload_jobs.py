@@ -0,0 +1,45 @@
+# Generated by Django 4.2.3 on 2026-10-19 01:23
+"""
+This migration adds the upload_jobs table, the queue of annotations and iFDO uploads processed by the
+run_upload_worker management command, with their progress, timing per phase, result and errors.
+"""
+
+import django.core.serializers.json
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_taxon_names'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(choices=[('annotations', 'annotations'), ('ifdo', 'ifdo')], help_text='Kind of upload: an annotations template file or an iFDO payload', max_length=32)),
+                ('status', models.CharField(choices=[('queued', 'queued'), ('running', 'running'), ('succeeded', 'succeeded'), ('failed', 'failed')], default='queued', help_text='Processing state of the job', max_length=16)),
+                ('filename', models.CharField(blank=True, help_text='Name of the uploaded file, if any', max_length=255, null=True)),
+                ('file', models.BinaryField(blank=True, help_text='Content of the uploaded file, cleared once the job has succeeded', null=True)),
+                ('payload', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Uploaded JSON payload, cleared once the job has succeeded', null=True)),
+                ('options', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Ingest options given with the upload')),
+                ('phase', models.CharField(blank=True, help_text='Phase the job is currently in, or the last phase it ran', max_length=32, null=True)),
+                ('phases', models.JSONField(blank=True, default=dict, help_text='Start time, end time and duration in seconds of every phase the job has run')),
+                ('total_rows', models.PositiveIntegerField(blank=True, help_text='Number of rows (annotations or images) in the upload, once parsed', null=True)),
+                ('processed_rows', models.PositiveIntegerField(default=0, help_text='Number of rows ingested so far')),
+                ('result', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Summary of the ingested data, once the job has succeeded', null=True)),
+                ('errors', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Errors that made the job fail', null=True)),
+                ('started_at', models.DateTimeField(blank=True, help_text='When a worker started processing the job', null=True)),
+                ('finished_at', models.DateTimeField(blank=True, help_text='When the job succeeded or failed', null=True)),
+            ],
+            options={
+                'db_table': 'upload_jobs',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='upload_jobs_status_created_idx')],
+            },
+        ),
+    ]
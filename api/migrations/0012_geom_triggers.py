@@ -0,0 +1,98 @@
+"""
+This migration moves the computation of the geom of images and image sets, and of the limits of image sets, into the
+database: triggers set them from the latitude and longitude (and the bounding box of image sets) on every insert and
+update, so rows written by bulk_create, QuerySet.update or COPY get them too. Existing rows are then backfilled in
+batches of primary keys, each batch committed on its own so large tables aren't locked for the whole migration.
+"""
+
+from django.db import migrations
+
+# Number of rows backfilled per transaction
+BACKFILL_BATCH_SIZE = 10000
+
+
+def geom_sql(row: str = "") -> str:
+    """SQL expression of the geom of a row of images or image_sets, with its columns prefixed by `row`."""
+    return (
+        f"CASE WHEN {row}latitude IS NOT NULL AND {row}longitude IS NOT NULL "
+        f"THEN ST_SetSRID(ST_MakePoint({row}longitude, {row}latitude), 4326) END"
+    )
+
+
+def limits_sql(row: str = "") -> str:
+    """SQL expression of the limits of a row of image_sets, the polygon of its bounding box if it is complete."""
+    bounds = [f"{row}min_longitude_degrees", f"{row}min_latitude_degrees"]
+    bounds += [f"{row}max_longitude_degrees", f"{row}max_latitude_degrees"]
+    return (
+        f"CASE WHEN {' AND '.join(f'{bound} IS NOT NULL' for bound in bounds)} "
+        f"THEN ST_MakeEnvelope({', '.join(bounds)}, 4326) END"
+    )
+
+
+CREATE_TRIGGERS = f"""
+CREATE FUNCTION images_set_geom() RETURNS trigger AS $$
+BEGIN
+    NEW.geom := {geom_sql("NEW.")};
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER images_geom_trigger
+    BEFORE INSERT OR UPDATE ON images
+    FOR EACH ROW EXECUTE FUNCTION images_set_geom();
+
+CREATE FUNCTION image_sets_set_geom_limits() RETURNS trigger AS $$
+BEGIN
+    NEW.geom := {geom_sql("NEW.")};
+    NEW.limits := {limits_sql("NEW.")};
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER image_sets_geom_limits_trigger
+    BEFORE INSERT OR UPDATE ON image_sets
+    FOR EACH ROW EXECUTE FUNCTION image_sets_set_geom_limits();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER image_sets_geom_limits_trigger ON image_sets;
+DROP FUNCTION image_sets_set_geom_limits();
+DROP TRIGGER images_geom_trigger ON images;
+DROP FUNCTION images_set_geom();
+"""
+
+# Columns computed by the triggers, by table
+COMPUTED_COLUMNS = {
+    "images": {"geom": geom_sql()},
+    "image_sets": {"geom": geom_sql(), "limits": limits_sql()},
+}
+
+
+def backfill(apps, schema_editor) -> None:  # noqa: ANN001
+    """Recompute the geom and limits of the existing rows, a batch of primary keys at a time."""
+    with schema_editor.connection.cursor() as cursor:
+        for table, columns in COMPUTED_COLUMNS.items():
+            assignments = ", ".join(f"{column} = {sql}" for column, sql in columns.items())
+            stale = " OR ".join(f"{column} IS DISTINCT FROM {sql}" for column, sql in columns.items())
+            cursor.execute(f"SELECT id FROM {table} ORDER BY id LIMIT %s", [BACKFILL_BATCH_SIZE])
+            ids = [row[0] for row in cursor.fetchall()]
+            while ids:
+                cursor.execute(f"UPDATE {table} SET {assignments} WHERE id = ANY(%s) AND ({stale})", [ids])
+                cursor.execute(
+                    f"SELECT id FROM {table} WHERE id > %s ORDER BY id LIMIT %s", [ids[-1], BACKFILL_BATCH_SIZE]
+                )
+                ids = [row[0] for row in cursor.fetchall()]
+
+
+class Migration(migrations.Migration):
+    # Each backfill batch is committed on its own
+    atomic = False
+
+    dependencies = [
+        ("api", "0011_upload_jobs"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGERS, reverse_sql=DROP_TRIGGERS),
+        migrations.RunPython(backfill, reverse_code=migrations.RunPython.noop),
+    ]
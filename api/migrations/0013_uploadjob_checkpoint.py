@@ -0,0 +1,23 @@
+# Generated by Django 4.2.3 on 2026-10-19 03:10
+"""
+This migration adds the checkpoint of chunked iFDO ingests to upload jobs: the image set and the number of image items
+committed so far, from which a failed job is resumed.
+"""
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_geom_triggers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadjob',
+            name='checkpoint',
+            field=models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Image set and number of committed items of a chunked iFDO ingest, from which it resumes', null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.3 on 2026-10-19 09:42
+"""
+This migration adds the content hash of images: the SHA-256 of the adapted iFDO item each image was ingested from,
+compared on re-ingest to only update the images whose item changed.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_uploadjob_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 of the adapted iFDO item the image was ingested from, to detect changed items on re-ingest', max_length=64, null=True),
+        ),
+    ]
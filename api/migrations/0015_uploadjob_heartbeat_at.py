@@ -0,0 +1,22 @@
+# Generated by Django 4.2.3 on 2026-10-19 11:05
+"""
+This migration adds the heartbeat of upload jobs: the worker running a job refreshes it periodically, so jobs left
+running by a crashed worker are detected and failed.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_image_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='When the worker processing the job last reported it was still running', null=True),
+        ),
+    ]
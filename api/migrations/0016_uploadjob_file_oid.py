@@ -0,0 +1,22 @@
+# Generated by Django 4.2.3 on 2026-10-19 11:40
+"""
+This migration adds the large object of upload jobs: streamed iFDO uploads are spooled into a PostgreSQL large object
+instead of the file column, so they are not read into memory nor bound by the size limit of bytea values.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_uploadjob_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadjob',
+            name='file_oid',
+            field=models.PositiveBigIntegerField(blank=True, help_text='OID of the large object holding a streamed iFDO upload, removed once the job has succeeded', null=True),
+        ),
+    ]
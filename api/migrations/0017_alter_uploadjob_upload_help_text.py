@@ -0,0 +1,33 @@
+# Generated by Django 4.2.3 on 2026-10-19 14:20
+"""
+This migration updates the help text of the upload kept on upload jobs, which is now also cleared once a job has failed
+and cannot be resumed.
+"""
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_uploadjob_file_oid'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='uploadjob',
+            name='file',
+            field=models.BinaryField(blank=True, help_text='Content of the uploaded file, cleared once the job has finished unless it can be resumed', null=True),
+        ),
+        migrations.AlterField(
+            model_name='uploadjob',
+            name='file_oid',
+            field=models.PositiveBigIntegerField(blank=True, help_text='OID of the large object holding a streamed iFDO upload, removed as the file is cleared', null=True),
+        ),
+        migrations.AlterField(
+            model_name='uploadjob',
+            name='payload',
+            field=models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Uploaded JSON payload, cleared once the job has finished unless it can be resumed', null=True),
+        ),
+    ]
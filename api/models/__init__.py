@@ -22,6 +22,8 @@ from .fields import (
 from .image import Image
 from .image_set import ImageSet
 from .label import Label
+from .taxon_name import TaxonName
+from .upload_job import UploadJob
 
 __all__ = [
     "ImageSet",
@@ -33,6 +35,8 @@ __all__ = [
     "Annotation",
     "AnnotationLabel",
     "Label",
+    "TaxonName",
+    "UploadJob",
     "Creator",
     "Context",
     "Project",
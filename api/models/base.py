@@ -179,3 +179,19 @@ class QualityEnum(CaseInsensitiveEnum):
     raw = "raw"
     processed = "processed"
     product = "product"
+
+
+class UploadJobKindEnum(CaseInsensitiveEnum):
+    """Enumeration for the kinds of upload processed by the background worker."""
+
+    annotations = "annotations"
+    ifdo = "ifdo"
+
+
+class UploadJobStatusEnum(CaseInsensitiveEnum):
+    """Enumeration for the states of a background upload job."""
+
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
@@ -94,6 +94,7 @@ class CommonFieldsImagesImageSets(models.Model):
         help_text="UTC time of image acquisition (or start time of a video)",
     )
 
+    # Set from the latitude and longitude by a database trigger on insert and update (migration 0012)
     geom = models.PointField(
         srid=4326,
         null=True,
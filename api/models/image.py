@@ -1,7 +1,6 @@
 """Models for images."""
 
 from django.contrib.gis.db import models
-from django.contrib.gis.geos import Point
 
 from .base import DefaultColumns
 from .common_fields import CommonFieldsAll, CommonFieldsImagesImageSets
@@ -43,6 +42,12 @@ class Image(DefaultColumns, CommonFieldsAll, CommonFieldsImagesImageSets):
         blank=False,
         help_text=("A unique name for the image filename."),
     )
+    content_hash = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        help_text="SHA-256 of the adapted iFDO item the image was ingested from, to detect changed items on re-ingest",
+    )
 
     context = models.ForeignKey(
         "Context",
@@ -192,10 +197,5 @@ class Image(DefaultColumns, CommonFieldsAll, CommonFieldsImagesImageSets):
             models.Index(fields=["marine_zone"], name="images_marine_zone_idx"),
         ]
 
-    def save(self, *args, **kwargs) -> None:  # noqa: D102
-        if self.latitude is not None and self.longitude is not None:
-            self.geom = Point(self.longitude, self.latitude, srid=4326)
-        super().save(*args, **kwargs)
-
     def __str__(self) -> str:
         return self.filename
@@ -1,7 +1,6 @@
 """Docstring for api.models.image_set."""
 
 from django.contrib.gis.db import models
-from django.contrib.gis.geos import Point, Polygon
 from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db.models import CheckConstraint, F, Q
@@ -236,6 +235,7 @@ class ImageSet(CommonFieldsAll, CommonFieldsImagesImageSets, DefaultColumns):
         help_text="The upper bounding box longitude...",
     )
 
+    # Set from the bounding box by a database trigger on insert and update, with the geom (migration 0012)
     limits = models.PolygonField(
         srid=4326,
         null=True,
@@ -274,29 +274,5 @@ class ImageSet(CommonFieldsAll, CommonFieldsImagesImageSets, DefaultColumns):
             ),
         ]
 
-    def save(self, *args, **kwargs) -> None:
-        """Save method to update geom and limits fields."""
-        if self.latitude is not None and self.longitude is not None:
-            self.geom = Point(self.longitude, self.latitude, srid=4326)
-
-        if (
-            self.min_latitude_degrees is not None
-            and self.max_latitude_degrees is not None
-            and self.min_longitude_degrees is not None
-            and self.max_longitude_degrees is not None
-        ):
-            # Polygon.from_bbox expects (xmin, ymin, xmax, ymax)
-            self.limits = Polygon.from_bbox(
-                (
-                    self.min_longitude_degrees,
-                    self.min_latitude_degrees,
-                    self.max_longitude_degrees,
-                    self.max_latitude_degrees,
-                )
-            )
-            self.limits.srid = 4326
-
-        super().save(*args, **kwargs)
-
     def __str__(self) -> str:
         return self.name
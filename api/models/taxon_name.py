@@ -0,0 +1,55 @@
+"""Model for the local index of taxon names used to resolve name searches to AphiaIDs."""
+
+from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
+
+from api.models.base import DefaultColumns
+
+
+class TaxonName(DefaultColumns):
+    """A scientific or vernacular name of a WoRMS taxon referenced by at least one label.
+
+    Rows are harvested from the cached WoRMS service by the `refresh_taxon_names` management command, so that
+    `name_part` searches can be resolved to AphiaIDs inside the database, without calling WoRMS.
+    """
+
+    aphia_id = models.PositiveIntegerField(
+        db_index=True,
+        help_text="The AphiaID of the taxon this name belongs to",
+    )
+
+    name = models.CharField(
+        max_length=255,
+        help_text="Scientific or vernacular name of the taxon",
+    )
+
+    is_vernacular = models.BooleanField(
+        default=False,
+        help_text="Indicates whether the name is a vernacular (common) name rather than the scientific name",
+    )
+
+    language_code = models.CharField(
+        max_length=16,
+        null=True,
+        blank=True,
+        help_text="Language code of a vernacular name, as provided by WoRMS",
+    )
+
+    class Meta:
+        """Meta class for TaxonName."""
+
+        db_table = "taxon_names"
+        constraints = [
+            models.UniqueConstraint(fields=["aphia_id", "name"], name="uq_taxon_name_aphia_id_name"),
+        ]
+        indexes = [
+            # icontains lookups compile to UPPER(name) LIKE UPPER(%s), so the trigram index is built on UPPER(name).
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="taxon_names_name_trgm_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.aphia_id})"
@@ -0,0 +1,135 @@
+"""Model for uploads queued for processing by the background worker."""
+
+from django.contrib.gis.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+
+from api.models.base import DefaultColumns, UploadJobKindEnum, UploadJobStatusEnum, enum_choices
+
+
+class UploadJob(DefaultColumns):
+    """An annotations or iFDO upload accepted by the API and processed by the `run_upload_worker` command.
+
+    The uploaded file or payload is stored on the job until it has been ingested, so large uploads are not bound by
+    the HTTP request timeout. The worker records the current phase, the timing of every phase, row counts, and the
+    result or errors of the ingest, which clients poll through the jobs endpoint.
+    """
+
+    kind = models.CharField(
+        max_length=32,
+        choices=enum_choices(UploadJobKindEnum),
+        help_text="Kind of upload: an annotations template file or an iFDO payload",
+    )
+
+    status = models.CharField(
+        max_length=16,
+        choices=enum_choices(UploadJobStatusEnum),
+        default=UploadJobStatusEnum.queued.value,
+        help_text="Processing state of the job",
+    )
+
+    filename = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text="Name of the uploaded file, if any",
+    )
+
+    file = models.BinaryField(
+        null=True,
+        blank=True,
+        help_text="Content of the uploaded file, cleared once the job has finished unless it can be resumed",
+    )
+
+    file_oid = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        help_text="OID of the large object holding a streamed iFDO upload, removed as the file is cleared",
+    )
+
+    payload = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        null=True,
+        blank=True,
+        help_text="Uploaded JSON payload, cleared once the job has finished unless it can be resumed",
+    )
+
+    options = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        default=dict,
+        blank=True,
+        help_text="Ingest options given with the upload",
+    )
+
+    phase = models.CharField(
+        max_length=32,
+        null=True,
+        blank=True,
+        help_text="Phase the job is currently in, or the last phase it ran",
+    )
+
+    phases = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Start time, end time and duration in seconds of every phase the job has run",
+    )
+
+    total_rows = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Number of rows (annotations or images) in the upload, once parsed",
+    )
+
+    processed_rows = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of rows ingested so far",
+    )
+
+    checkpoint = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        null=True,
+        blank=True,
+        help_text="Image set and number of committed items of a chunked iFDO ingest, from which it resumes",
+    )
+
+    result = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        null=True,
+        blank=True,
+        help_text="Summary of the ingested data, once the job has succeeded",
+    )
+
+    errors = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        null=True,
+        blank=True,
+        help_text="Errors that made the job fail",
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a worker started processing the job",
+    )
+
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the worker processing the job last reported it was still running",
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the job succeeded or failed",
+    )
+
+    class Meta:
+        """Meta class for UploadJob."""
+
+        db_table = "upload_jobs"
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="upload_jobs_status_created_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} upload {self.id} ({self.status})"
@@ -22,6 +22,7 @@ from .fields import (
 from .image import ImageSerializer
 from .image_set import ImageSetSerializer
 from .label import LabelSerializer
+from .upload_job import UploadJobSerializer
 
 __all__ = [
     "ImageSetSerializer",
@@ -47,4 +48,5 @@ __all__ = [
     "RelatedMaterialSerializer",
     "SensorSerializer",
     "FileUploadSerializer",
+    "UploadJobSerializer",
 ]
@@ -16,6 +16,12 @@ from api.serializers.base import (
     ReadOnlyFieldsMixin,
     StrictPrimaryKeyRelatedField,
 )
+from api.utils.constants import (
+    ANNOTATION_INGEST_BACKENDS,
+    ANNOTATION_SUMMARY_RESPONSE_THRESHOLD,
+    ANNOTATION_UPLOAD_MODES,
+    ANNOTATION_UPLOAD_RESPONSES,
+)
 
 FK_PAIRS = [
     ("annotator", "annotator_id"),
@@ -72,6 +78,23 @@ class AnnotationSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
+class BulkAnnotationSerializer(AnnotationSerializer):
+    """Serializer validating one row of a bulk annotations upload.
+
+    The image, annotation set, label and annotator of the rows are resolved up front with set-based queries, so only
+    the annotation fields and the label creation date-time are validated here.
+    """
+
+    image_id = None
+    annotation_set_id = None
+    creation_datetime = serializers.DateTimeField(write_only=True)
+
+    class Meta(AnnotationSerializer.Meta):
+        """Meta class for BulkAnnotationSerializer."""
+
+        fields = ["annotation_platform", "shape", "coordinates", "dimension_pixels", "creation_datetime"]
+
+
 class AnnotationLabelSerializer(ReadOnlyFieldsMixin, BaseSerializer):
     """Serializer for AnnotationLabel model."""
 
@@ -180,6 +203,58 @@ class AnnotationLabelSerializer(ReadOnlyFieldsMixin, BaseSerializer):
 
 
 class FileUploadSerializer(serializers.Serializer):
-    """Serializer for file upload, for uploading annotations data using XLSX file."""
+    """Serializer for file upload, for uploading annotations data using XLSX, CSV, JSON Lines or Parquet file."""
+
+    file = serializers.FileField(
+        help_text="Select the .xlsx template file, or a .csv, .ndjson/.jsonl or .parquet file with the same sections"
+    )
+    backend = serializers.ChoiceField(
+        choices=ANNOTATION_INGEST_BACKENDS,
+        required=False,
+        help_text='How to insert the annotation data: "rows", "bulk" or "copy" (PostgreSQL COPY, for very large '
+        "annotation sets). Chosen from the number of rows if not given.",
+    )
+    mode = serializers.ChoiceField(
+        choices=ANNOTATION_UPLOAD_MODES,
+        required=False,
+        default="create",
+        help_text='"create" to ingest the upload as a new annotation set, or "append" to only add the labels and '
+        "annotation rows not already in the existing annotation set given by its annotation-set-uuid",
+    )
+    background = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Queue the upload for the background worker and return a job to poll, instead of ingesting it "
+        "within the request",
+    )
+    validate_coordinates = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Reject the upload, listing the rows at fault, if any annotation coordinates do not follow the rules "
+        "of their shape (number of values, closed polygons, finite and non-negative pixel coordinates)",
+    )
+    dry_run = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Only check the upload, without writing anything, and return a report of all its errors",
+    )
+    response = serializers.ChoiceField(
+        choices=ANNOTATION_UPLOAD_RESPONSES,
+        required=False,
+        help_text='"full" to return every created annotation, or "summary" to only return counts, the annotation set '
+        "id and timings, the created annotations being listed by the annotation set annotations endpoint. Defaults "
+        f"to a summary for uploads of at least {ANNOTATION_SUMMARY_RESPONSE_THRESHOLD} rows.",
+    )
+
+    def validate(self, attrs: dict) -> dict:
+        """Reject dry runs queued for the background worker, as they are reported within the request.
 
-    file = serializers.FileField(help_text="Select the .xlsx template file")
+        Args:
+            attrs (dict): The attributes to validate.
+
+        Returns:
+            dict: The validated attributes.
+        """
+        if attrs["dry_run"] and attrs["background"]:
+            raise serializers.ValidationError({"dry_run": "A dry run cannot be queued in the background."})
+        return attrs
@@ -3,12 +3,16 @@
 from typing import TypeVar
 
 from attr import dataclass
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
+from django.db.models import UniqueConstraint
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
 M = TypeVar("M")  # model type variable
 
+# Key of the serializer context holding the instances resolved by NestedGetOrCreateMixin during a request
+IDENTITY_MAP_CONTEXT_KEY = "identity_map"
+
 
 class BaseSerializer(serializers.ModelSerializer):
     """Base serializer with common validation logic for all serializers."""
@@ -82,7 +86,13 @@ class BaseSerializer(serializers.ModelSerializer):
 
 
 class NestedGetOrCreateMixin:
-    """Mixin for nested serializers to get-or-create related instances based on a unique key field (e.g., name)."""
+    """Mixin for nested serializers to get-or-create related instances based on a unique key field (e.g., name).
+
+    When the serializer context has an identity map (a dict under `IDENTITY_MAP_CONTEXT_KEY`), instances are kept
+    in it by model and key fields, so objects repeated across a request (e.g. the platform or creators of every item of
+    an iFDO payload) are resolved only once. The context is shared by nested serializers, so a single map can be given
+    to the top-level serializers of a request.
+    """
 
     key_fields = ["name", "uri"]  # Fields that can be used to identify an existing instance for get-or-create logic.
     exclude_compare_fields = {"id", "created_at", "updated_at"}
@@ -96,10 +106,36 @@ class NestedGetOrCreateMixin:
         return fields
 
     def create(self, validated_data: dict) -> M:
+        """Create a new instance, or return the existing one with the same key fields if its other fields match.
+
+        Args:
+            validated_data (dict): The validated data from the serializer.
+
+        Returns:
+            The created or existing instance.
+        """
+        Model = self.Meta.model
+        identity_map = self.context.get(IDENTITY_MAP_CONTEXT_KEY) if self.key_fields else None
+        key_value = {field: validated_data.get(field, "") for field in self.key_fields or []}
+        if identity_map is None:
+            return self._create_or_get_existing(validated_data, key_value)
+
+        key = (Model, *key_value.values())
+        if key in identity_map:
+            instance = identity_map[key]
+            self._check_matches(instance, validated_data, key_value)
+            return instance
+
+        instance = self._insert_or_get_existing(validated_data, key_value)
+        identity_map[key] = instance
+        return instance
+
+    def _create_or_get_existing(self, validated_data: dict, key_value: dict) -> M:
         """Try to create a new instance. If it violates unique constraint, fetch existing and compare fields.
 
         Args:
             validated_data (dict): The validated data from the serializer.
+            key_value (dict): The key fields of the instance.
 
         Returns:
             The created or existing instance.
@@ -113,22 +149,101 @@ class NestedGetOrCreateMixin:
         except IntegrityError as err:
             if not self.key_fields:
                 raise serializers.ValidationError("An object with these details already exists.") from err
-            key_value = {field: validated_data.get(field, "") for field in self.key_fields}
             existing = Model.objects.filter(**key_value).first()
 
             if existing is None:
                 raise
 
-            for field, incoming in validated_data.items():
-                if field in self.exclude_compare_fields:
-                    continue
-                if getattr(existing, field) != incoming:
-                    raise serializers.ValidationError(
-                        {field: f"{Model.__name__} with {key_value!r} already exists but differs."}
-                    ) from err
-
+            self._check_matches(existing, validated_data, key_value)
             return existing
 
+    def _insert_or_get_existing(self, validated_data: dict, key_value: dict) -> M:
+        """Insert a new instance, or return the existing one with the same key fields, for the ingest identity map.
+
+        The insert is a single `INSERT ... ON CONFLICT (<key fields>) DO NOTHING RETURNING` statement, so a conflict on
+        the key fields doesn't need a savepoint to recover from. Conflicts on any other constraint still raise. Models
+        without a unique constraint on exactly the key fields are got or created as without an identity map.
+
+        Args:
+            validated_data (dict): The validated data from the serializer.
+            key_value (dict): The key fields of the instance.
+
+        Raises:
+            serializers.ValidationError: If the instance conflicts with an existing one that differs.
+
+        Returns:
+            The created or existing instance.
+        """
+        Model = self.Meta.model
+        if not _has_unique_constraint(Model, self.key_fields):
+            return self._create_or_get_existing(validated_data, key_value)
+
+        instance = Model(**validated_data)
+        if _insert_ignoring_conflicts(instance, self.key_fields):
+            return instance
+
+        existing = Model.objects.get(**key_value)
+        self._check_matches(existing, validated_data, key_value)
+        return existing
+
+    def _check_matches(self, existing: M, validated_data: dict, key_value: dict) -> None:
+        """Check that an existing instance has the values of the validated data.
+
+        Args:
+            existing: The existing instance with the same key fields.
+            validated_data (dict): The validated data from the serializer.
+            key_value (dict): The key fields of the instance.
+
+        Raises:
+            serializers.ValidationError: If any field of the existing instance differs.
+        """
+        for field, incoming in validated_data.items():
+            if field in self.exclude_compare_fields:
+                continue
+            if getattr(existing, field) != incoming:
+                raise serializers.ValidationError(
+                    {field: f"{existing.__class__.__name__} with {key_value!r} already exists but differs."}
+                )
+
+
+def _has_unique_constraint(model: type[M], fields: list[str]) -> bool:
+    """Whether a model has an unconditional unique constraint on exactly the given fields."""
+    return any(
+        isinstance(constraint, UniqueConstraint)
+        and constraint.condition is None
+        and set(constraint.fields) == set(fields)
+        for constraint in model._meta.constraints
+    )
+
+
+def _insert_ignoring_conflicts(instance: M, conflict_fields: list[str]) -> bool:
+    """Insert a model instance with `INSERT ... ON CONFLICT (<conflict fields>) DO NOTHING RETURNING`.
+
+    Args:
+        instance: The unsaved instance, with its primary key set.
+        conflict_fields: The fields of the unique constraint whose conflicts skip the insert.
+
+    Returns:
+        Whether the instance was inserted, rather than conflicting with an existing row.
+    """
+    opts = instance._meta
+    quote_name = connection.ops.quote_name
+    fields = opts.local_concrete_fields
+    values = [field.get_db_prep_save(field.pre_save(instance, True), connection) for field in fields]
+    conflict_columns = ", ".join(quote_name(opts.get_field(name).column) for name in conflict_fields)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote_name(opts.db_table)} ({', '.join(quote_name(field.column) for field in fields)}) "
+            f"VALUES ({', '.join(['%s'] * len(fields))}) "
+            f"ON CONFLICT ({conflict_columns}) DO NOTHING RETURNING {quote_name(opts.pk.column)}",
+            values,
+        )
+        inserted = cursor.fetchone() is not None
+    if inserted:
+        instance._state.adding = False
+        instance._state.db = connection.alias
+    return inserted
+
 
 class StrictPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
     """Accept PK only. If a dict/object is provided -> validation error."""
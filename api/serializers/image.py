@@ -399,3 +399,30 @@ class IngestImageSerializer(ImageSerializer):
     """Serializer for ingesting Image data from iFDO payloads."""
 
     id = serializers.UUIDField(required=False)
+
+
+class IngestImageListSerializer(serializers.ListSerializer):
+    """List serializer validating the image items of an iFDO payload in one pass."""
+
+    def run_child_validation(self, data: dict) -> dict:
+        """Give each item to the child serializer as its initial data, which its cross-field validation reads."""
+        self.child.initial_data = data
+        return super().run_child_validation(data)
+
+
+class BulkIngestImageSerializer(IngestImageSerializer):
+    """Serializer validating the image items of a large iFDO payload together.
+
+    Every item goes to the image set created by the payload, and the unique id, filename and hash of the items are
+    checked with one query per field for all items, so none of them are looked up for each item here.
+    """
+
+    image_set_id = None
+
+    class Meta(IngestImageSerializer.Meta):
+        """Meta class for BulkIngestImageSerializer."""
+
+        fields = [field for field in IngestImageSerializer.Meta.fields if field != "image_set_id"]
+        validators = []
+        extra_kwargs = {"sha256_hash": {"validators": []}}
+        list_serializer_class = IngestImageListSerializer
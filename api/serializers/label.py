@@ -1,14 +1,19 @@
 """Serializers for the Labels API endpoints."""
 
+import httpx
 import requests
+from asgiref.sync import async_to_sync
 from requests import RequestException
 from rest_framework import serializers, status
 
 from api.models import Label
 from api.models.annotation_set import AnnotationSet
 from api.serializers.base import ReadOnlyFieldsMixin
+from api.services.async_cached_worms_client import AsyncCachedWoRMSClient
 from api.services.cached_worms_client import CachedWoRMSClient
 
+WORMS_UNAVAILABLE_MESSAGE = "WoRMS API is currently unavailable. Please try again later."
+
 
 class LabelSerializer(ReadOnlyFieldsMixin, serializers.ModelSerializer):
     """Serializer for Label model."""
@@ -58,30 +63,13 @@ class LabelSerializer(ReadOnlyFieldsMixin, serializers.ModelSerializer):
         try:
             response = _ingest_get_aphia_id_cached_worms(aphia_id)
         except RequestException:
-            error_message = "WoRMS API is currently unavailable. Please try again later."
-            aphia_cache[aphia_id] = error_message
-            errors["lowest_aphia_id"] = error_message
-            return errors
-
-        if response.status_code in [
-            status.HTTP_200_OK,
-            status.HTTP_201_CREATED,
-            status.HTTP_202_ACCEPTED,
-        ]:
-            aphia_cache[aphia_id] = None
-            return errors
+            error_message = WORMS_UNAVAILABLE_MESSAGE
+        else:
+            error_message = _aphia_id_error_message(aphia_id, response.status_code)
 
-        if response.status_code == status.HTTP_400_BAD_REQUEST:
-            error_message = f"Invalid lowest_aphia_id: {aphia_id} does not exist in WoRMS API."
-            aphia_cache[aphia_id] = error_message
-            errors["lowest_aphia_id"] = error_message
-            return errors
-
-        error_message = (
-            f"Unable to validate lowest_aphia_id right now " f"(status {response.status_code}). Please try again later."
-        )
         aphia_cache[aphia_id] = error_message
-        errors["lowest_aphia_id"] = error_message
+        if error_message:
+            errors["lowest_aphia_id"] = error_message
         return errors
 
     def validate(self, attrs: dict) -> dict:
@@ -100,6 +88,17 @@ class LabelSerializer(ReadOnlyFieldsMixin, serializers.ModelSerializer):
         return attrs
 
 
+class UploadLabelSerializer(LabelSerializer):
+    """Serializer validating one label of an annotations upload, before its annotation set is created."""
+
+    annotation_set_id = None
+
+    class Meta(LabelSerializer.Meta):
+        """Meta class for UploadLabelSerializer."""
+
+        fields = [field for field in LabelSerializer.Meta.fields if field != "annotation_set_id"]
+
+
 def _ingest_get_aphia_id_cached_worms(aphia_id: str) -> requests.Response:
     """Helper function to call the cached WoRMS API to validate an aphia_id.
 
@@ -115,3 +114,52 @@ def _ingest_get_aphia_id_cached_worms(aphia_id: str) -> requests.Response:
     """
     client = CachedWoRMSClient()
     return client.ingest(aphia_id)
+
+
+def _aphia_id_error_message(aphia_id: int, status_code: int) -> str | None:
+    """Map the status of a cached WoRMS ingest response to a lowest_aphia_id validation error.
+
+    Args:
+        aphia_id (int): The aphia_id that was validated.
+        status_code (int): The status code returned by the ingest endpoint.
+
+    Returns:
+        str | None: The validation error message, or None if the aphia_id is valid.
+    """
+    if status_code in [
+        status.HTTP_200_OK,
+        status.HTTP_201_CREATED,
+        status.HTTP_202_ACCEPTED,
+    ]:
+        return None
+
+    if status_code == status.HTTP_400_BAD_REQUEST:
+        return f"Invalid lowest_aphia_id: {aphia_id} does not exist in WoRMS API."
+
+    return f"Unable to validate lowest_aphia_id right now (status {status_code}). Please try again later."
+
+
+def prevalidate_aphia_ids(aphia_ids: list[int]) -> dict[int, str | None]:
+    """Validate many aphia_ids against the cached WoRMS API concurrently.
+
+    The result has the shape of the `aphia_validation_error_cache` serializer context entry, so it can be passed to
+    LabelSerializer to avoid one blocking WoRMS request per label.
+
+    Args:
+        aphia_ids (list[int]): The aphia_ids to validate.
+
+    Returns:
+        dict[int, str | None]: The validation error message for each distinct aphia_id, or None if it is valid.
+    """
+    if not aphia_ids:
+        return {}
+
+    responses = async_to_sync(AsyncCachedWoRMSClient().ingest_many)(aphia_ids)
+    return {
+        aphia_id: (
+            WORMS_UNAVAILABLE_MESSAGE
+            if isinstance(response, httpx.HTTPError)
+            else _aphia_id_error_message(aphia_id, response.status_code)
+        )
+        for aphia_id, response in responses.items()
+    }
@@ -0,0 +1,60 @@
+"""Serializers for the upload job status endpoints."""
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from api.models import UploadJob
+
+
+class UploadJobSerializer(serializers.ModelSerializer):
+    """Read-only serializer reporting the progress of an upload job."""
+
+    progress = serializers.SerializerMethodField()
+    duration_seconds = serializers.SerializerMethodField()
+
+    class Meta:
+        """Meta class for UploadJobSerializer."""
+
+        model = UploadJob
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "filename",
+            "options",
+            "phase",
+            "phases",
+            "total_rows",
+            "processed_rows",
+            "progress",
+            "checkpoint",
+            "result",
+            "errors",
+            "created_at",
+            "started_at",
+            "heartbeat_at",
+            "finished_at",
+            "duration_seconds",
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj: UploadJob) -> float | None:
+        """Share of the rows ingested so far, between 0 and 1, or None while the upload is not parsed yet."""
+        if not obj.total_rows:
+            return 1.0 if obj.finished_at and obj.total_rows == 0 else None
+        return round(obj.processed_rows / obj.total_rows, 4)
+
+    def get_duration_seconds(self, obj: UploadJob) -> float | None:
+        """Time the worker spent on the job so far, or in total once it has finished."""
+        if obj.started_at is None:
+            return None
+        end = obj.finished_at or timezone.now()
+        return round((end - obj.started_at).total_seconds(), 3)
+
+
+class UploadJobAcceptedSerializer(serializers.Serializer):
+    """Serializer describing the response to an upload queued for the background worker."""
+
+    job_id = serializers.UUIDField()
+    status = serializers.CharField()
+    status_url = serializers.URLField()
@@ -0,0 +1,214 @@
+"""Asyncio WoRMS API client for fanning out many lookups against the cached WoRMS API concurrently."""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Self
+
+import httpx
+from rest_framework import status
+
+from config import settings
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_METHODS = ("GET",)
+
+
+@dataclass
+class AsyncCachedWoRMSClient:
+    """Asyncio counterpart of `CachedWoRMSClient`.
+
+    Used as an async context manager, the client keeps a single pool of connections open and caps the number of
+    in-flight requests at `max_concurrency`, so many lookups can be awaited together without one thread each:
+
+        async with AsyncCachedWoRMSClient() as client:
+            responses = await asyncio.gather(*(client.ingest(aphia_id) for aphia_id in aphia_ids))
+
+    Outside a context manager every call opens its own short-lived connection. Like the synchronous client, only GET
+    requests are retried on transient errors.
+    """
+
+    base_url: str = settings.CACHED_WORMS_API_BASE_URL
+
+    authorization_token: str = f"Bearer {settings.CACHED_WORMS_API_TOKEN}"
+
+    max_concurrency: int = 10
+
+    retries: int = 5
+
+    backoff_factor: float = 0.5
+
+    timeout: float = 20
+
+    _http: httpx.AsyncClient | None = field(default=None, init=False, repr=False)
+
+    _semaphore: asyncio.Semaphore | None = field(default=None, init=False, repr=False)
+
+    def _client(self) -> httpx.AsyncClient:
+        """Create an httpx AsyncClient with a connection pool sized to the concurrency limit.
+
+        Returns:
+            A configured httpx AsyncClient object.
+        """
+        limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+        return httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits)
+
+    async def __aenter__(self) -> Self:
+        """Open the shared connection pool.
+
+        Returns:
+            The client itself, ready to be used concurrently.
+        """
+        self._http = self._client()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the shared connection pool.
+
+        Args:
+            *exc_info: The exception information, if the block raised.
+        """
+        http, self._http, self._semaphore = self._http, None, None
+        await http.aclose()
+
+    @contextlib.asynccontextmanager
+    async def _connection(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared connection pool, or a short-lived one when the client is not used as a context manager.
+
+        Yields:
+            An httpx AsyncClient object.
+        """
+        if self._http is not None:
+            async with self._semaphore:
+                yield self._http
+            return
+        async with self._client() as http:
+            yield http
+
+    def _backoff(self, attempt: int, response: httpx.Response | None) -> float:
+        """Return how long to wait before retrying, honouring a numeric Retry-After header if present.
+
+        Args:
+            attempt: The zero-based number of the attempt that failed.
+            response: The response of the failed attempt, or None if the request did not complete.
+
+        Returns:
+            The number of seconds to wait.
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_factor * (2**attempt)
+
+    async def _request(self, method: str, path: str, **kwargs: object) -> httpx.Response:
+        """Send a request, retrying GET requests on connection errors and transient HTTP statuses.
+
+        Args:
+            method: The HTTP method.
+            path: The API endpoint path to append to the base URL.
+            **kwargs: Extra arguments passed on to httpx.
+
+        Returns:
+            The response from the API. Once retries are exhausted, the last response is returned.
+        """
+        retries = self.retries if method in RETRY_METHODS else 0
+        attempt = 0
+        while True:
+            response = None
+            try:
+                async with self._connection() as http:
+                    response = await http.request(method, path, **kwargs)
+            except httpx.TransportError:
+                if attempt >= retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+            await asyncio.sleep(self._backoff(attempt, response))
+            attempt += 1
+
+    async def _get(self, path: str) -> dict | list[dict] | None:
+        """Helper method to perform a GET request to the WoRMS API.
+
+        Args:
+            path: The API endpoint path to append to the base URL.
+
+        Returns:
+            The JSON response from the API as a dictionary or list of dictionaries, or None if no content.
+        """
+        response = await self._request("GET", path)
+        if response.status_code == status.HTTP_204_NO_CONTENT:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    async def _post(self, path: str, json: dict) -> httpx.Response:
+        """Helper method to perform a POST request to the WoRMS API.
+
+        Args:
+            path: The API endpoint path to append to the base URL.
+            json: The JSON payload to send in the POST request.
+
+        Returns:
+            The response from the API as an httpx.Response object.
+        """
+        return await self._request("POST", path, json=json, headers={"Authorization": self.authorization_token})
+
+    async def ingest(self, aphia_id: int) -> httpx.Response:
+        """Ingest or get an AphiaID into the cache and return the result.
+
+        Args:
+            aphia_id: The AphiaID for which to trigger the ingest/get operation.
+
+        Returns:
+            An httpx.Response object representing the result of the ingest operation.
+        """
+        return await self._post("/taxa/ingest/", json={"aphia_id": aphia_id})
+
+    async def ingest_many(self, aphia_ids: Iterable[int]) -> dict[int, httpx.Response | httpx.HTTPError]:
+        """Ingest several AphiaIDs concurrently over a shared connection pool.
+
+        Args:
+            aphia_ids: The AphiaIDs for which to trigger the ingest/get operation.
+
+        Returns:
+            A dictionary mapping each distinct AphiaID to its response, or to the error raised if the request failed.
+        """
+        aphia_ids = list(dict.fromkeys(aphia_ids))
+        if self._http is None:
+            async with self:
+                return await self.ingest_many(aphia_ids)
+
+        results = await asyncio.gather(*(self.ingest(aphia_id) for aphia_id in aphia_ids), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, httpx.HTTPError):
+                raise result
+        return dict(zip(aphia_ids, results, strict=True))
+
+    async def descendants_aphia_ids(self, aphia_ids: list[int]) -> list[int] | None:
+        """Fetch the descendant AphiaIDs for a given list of AphiaIDs.
+
+        Args:
+            aphia_ids: A list of AphiaIDs for which to fetch the descendant AphiaIDs.
+
+        Returns:
+            A list of descendant AphiaIDs for the given list of AphiaIDs, or None if not found.
+        """
+        aphia_ids = [str(aphia_id) for aphia_id in aphia_ids]
+        return await self._get(f"/taxa/ids_with_descendants/?aphia_ids[]={"&aphia_ids[]=".join(aphia_ids)}")
+
+    async def aphia_ids_by_name_part(self, name_part: str, combine_vernaculars: bool = False) -> list[dict] | None:
+        """Fetch the AphiaIDs for a given name part.
+
+        Args:
+            name_part: The partial name to search for.
+            combine_vernaculars: Whether to combine vernacular names in the search.
+
+        Returns:
+            A list of dictionaries representing the AphiaIDs, or None if not found.
+        """
+        return await self._get(
+            f"/taxa/ajax_by_name_part/only_ids/{name_part}/?combine_vernaculars={str(combine_vernaculars).lower()}"
+        )
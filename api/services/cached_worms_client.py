@@ -89,6 +89,18 @@ class CachedWoRMSClient:
         aphia_ids = [str(aphia_id) for aphia_id in aphia_ids]
         return self._get(f"/taxa/ids_with_descendants/?aphia_ids[]={"&aphia_ids[]=".join(aphia_ids)}")
 
+    def taxon(self, aphia_id: int) -> dict | None:
+        """Fetch the cached WoRMS record for a given AphiaID, including its vernacular names.
+
+        Args:
+            aphia_id: The AphiaID of the taxon to fetch.
+
+        Returns:
+            A dictionary with the WoRMS record fields (e.g. `scientificname`) and a `vernaculars` list, or None if
+        not found.
+        """
+        return self._get(f"/taxa/{aphia_id}/")
+
     def aphia_ids_by_name_part(self, name_part: str, combine_vernaculars: bool = False) -> list[dict] | None:
         """Fetch the AphiaIDs for a given name part.
 
@@ -0,0 +1,107 @@
+"""Local index of taxon names, used to resolve name searches to AphiaIDs without calling WoRMS."""
+
+from collections.abc import Iterable
+
+import requests
+from django.db import transaction
+
+from api.models.label import Label
+from api.models.taxon_name import TaxonName
+from api.services.cached_worms_client import CachedWoRMSClient
+
+NAME_MAX_LENGTH = TaxonName._meta.get_field("name").max_length
+
+
+def aphia_ids_by_name_part(name_part: str) -> list[int]:
+    """Resolve a partial scientific or vernacular name to AphiaIDs using the local taxon name index.
+
+    Args:
+        name_part: The partial name to search for.
+
+    Returns:
+        A list of distinct AphiaIDs whose names contain the given name part (case-insensitive).
+    """
+    return list(
+        TaxonName.objects.filter(name__icontains=name_part.strip())
+        .order_by("aphia_id")
+        .values_list("aphia_id", flat=True)
+        .distinct()
+    )
+
+
+def held_aphia_ids() -> list[int]:
+    """Return the distinct AphiaIDs referenced by labels in the database.
+
+    Returns:
+        A sorted list of AphiaIDs.
+    """
+    return list(
+        Label.objects.filter(lowest_aphia_id__isnull=False)
+        .order_by("lowest_aphia_id")
+        .values_list("lowest_aphia_id", flat=True)
+        .distinct()
+    )
+
+
+def _names_from_taxon(aphia_id: int, taxon: dict) -> list[TaxonName]:
+    """Build the TaxonName rows for a cached WoRMS record.
+
+    Args:
+        aphia_id: The AphiaID the record was fetched for.
+        taxon: The record returned by the cached WoRMS service.
+
+    Returns:
+        A list of unsaved TaxonName instances, one per distinct name.
+    """
+    names: dict[str, TaxonName] = {}
+
+    scientific_name = (taxon.get("scientificname") or "").strip()
+    if scientific_name:
+        names[scientific_name] = TaxonName(aphia_id=aphia_id, name=scientific_name[:NAME_MAX_LENGTH])
+
+    for vernacular in taxon.get("vernaculars") or []:
+        name = (vernacular.get("vernacular") or "").strip()
+        if not name or name in names:
+            continue
+        names[name] = TaxonName(
+            aphia_id=aphia_id,
+            name=name[:NAME_MAX_LENGTH],
+            is_vernacular=True,
+            language_code=vernacular.get("language_code"),
+        )
+
+    return list(names.values())
+
+
+def refresh_taxon_names(aphia_ids: Iterable[int], client: CachedWoRMSClient | None = None) -> dict[str, int]:
+    """Harvest names for the given AphiaIDs from the cached WoRMS service and replace their index rows.
+
+    Each AphiaID is refreshed in its own transaction, so a WoRMS failure for one taxon keeps its previous names and
+    does not affect the others.
+
+    Args:
+        aphia_ids: The AphiaIDs to refresh.
+        client: The cached WoRMS client to use. A default client is created if not provided.
+
+    Returns:
+        A dictionary with the number of refreshed taxa, indexed names, and taxa that could not be fetched.
+    """
+    client = client or CachedWoRMSClient()
+    summary = {"taxa": 0, "names": 0, "failed": 0}
+
+    for aphia_id in aphia_ids:
+        try:
+            taxon = client.taxon(aphia_id)
+        except requests.RequestException:
+            summary["failed"] += 1
+            continue
+
+        names = _names_from_taxon(aphia_id, taxon or {})
+        with transaction.atomic():
+            TaxonName.objects.filter(aphia_id=aphia_id).delete()
+            TaxonName.objects.bulk_create(names)
+
+        summary["taxa"] += 1
+        summary["names"] += len(names)
+
+    return summary
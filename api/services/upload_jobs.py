@@ -0,0 +1,450 @@
+"""Database-backed queue of uploads processed by the `run_upload_worker` management command."""
+
+import io
+import logging
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import IO, Any
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.status import is_success
+
+from api.ingest.images_ingest import IngestCheckpoint
+from api.models import UploadJob
+from api.models.base import UploadJobKindEnum, UploadJobStatusEnum
+from api.utils.annotations_ingest import ingest_annotation_data
+from api.utils.annotations_parser import (
+    annotation_upload_format,
+    iter_annotation_records,
+    iter_sheet_rows,
+    open_annotation_workbook,
+    parse_annotation_data,
+    parse_annotation_records,
+    parse_annotation_set_metadata,
+    parse_label_set,
+)
+from api.utils.constants import (
+    ANNOTATION_DATA_SHEET,
+    ANNOTATION_SET_SHEET,
+    LABEL_SET_SHEET,
+    UPLOAD_JOB_HEARTBEAT_INTERVAL,
+    UPLOAD_JOB_STALE_TIMEOUT,
+)
+from api.utils.large_objects import open_large_object, unlink_large_object, write_large_object
+
+logger = logging.getLogger(__name__)
+
+STALE_JOB_ERROR = "The upload worker stopped while processing the job"
+
+# Fields of a job written once it has finished
+FINISHED_JOB_FIELDS = [
+    "status",
+    "result",
+    "errors",
+    "total_rows",
+    "processed_rows",
+    "finished_at",
+    "updated_at",
+    "file",
+    "payload",
+    "file_oid",
+]
+
+
+class UploadJobError(Exception):
+    """Raised by a job runner when the upload cannot be ingested, with the errors to report on the job."""
+
+    def __init__(self, errors: dict) -> None:
+        super().__init__(errors)
+        self.errors = errors
+
+
+def enqueue_annotation_upload(
+    file: IO[bytes], filename: str, backend: str | None = None, validate_coordinates: bool = False, mode: str = "create"
+) -> UploadJob:
+    """Queue an annotations file for the upload worker.
+
+    Args:
+        file (IO[bytes]): the uploaded file.
+        filename (str): name of the uploaded file, whose extension gives its format.
+        backend (str | None): annotation ingest backend, see `ingest_annotation_data`.
+        validate_coordinates (bool): check the annotation coordinates against their shape, see `ingest_annotation_data`.
+        mode (str): create a new annotation set or append to an existing one, see `ingest_annotation_data`.
+
+    Returns:
+        UploadJob: the queued job.
+    """
+    return UploadJob.objects.create(
+        kind=UploadJobKindEnum.annotations.value,
+        filename=filename,
+        file=file.read(),
+        options={"backend": backend, "validate_coordinates": validate_coordinates, "mode": mode},
+    )
+
+
+def enqueue_ifdo_ingest(body: dict[str, Any]) -> UploadJob:
+    """Queue an iFDO payload for the upload worker.
+
+    Args:
+        body (dict[str, Any]): request body, with the iFDO object under "ifdo", and `"chunked": true` for a chunked
+            ingest.
+
+    Returns:
+        UploadJob: the queued job.
+    """
+    options = {"chunked": body.get("chunked") is True}
+    body = {key: value for key, value in body.items() if key not in {"background", "chunked"}}
+    return UploadJob.objects.create(kind=UploadJobKindEnum.ifdo.value, payload=body, options=options)
+
+
+def enqueue_ifdo_stream(  # noqa: PLR0913
+    stream: IO[bytes],
+    upload_format: str = "json",
+    compression: str | None = None,
+    filename: str | None = None,
+    chunked: bool = False,
+    mode: str = "create",
+) -> UploadJob:
+    """Queue a large or compressed iFDO request body or file for the upload worker, which streams its image items.
+
+    The data is spooled into a PostgreSQL large object a chunk at a time, so it is neither held in memory nor bound by
+    the size limit of a bytea column, and any worker connected to the database can read it. Compressed data is stored
+    as uploaded, and only decompressed by the worker.
+
+    Args:
+        stream (IO[bytes]): request body, a JSON object with the iFDO object under "ifdo", or iFDO file.
+        upload_format (str): format of the data, see `read_ifdo_stream`.
+        compression (str | None): compression of the data, see `read_ifdo_stream`.
+        filename (str | None): name of the uploaded file, if any.
+        chunked (bool): whether to commit the images a chunk at a time, see `resume_job`.
+        mode (str): create a new image set or upsert the existing one, see `ingest_ifdo_stream`.
+
+    Returns:
+        UploadJob: the queued job.
+    """
+    with transaction.atomic():
+        return UploadJob.objects.create(
+            kind=UploadJobKindEnum.ifdo.value,
+            filename=filename,
+            file_oid=write_large_object(stream),
+            options={"upload_format": upload_format, "compression": compression, "chunked": chunked, "mode": mode},
+        )
+
+
+def accepted_job_data(job: UploadJob, request: Request) -> dict[str, Any]:
+    """Build the response data for an upload accepted into the job queue.
+
+    Args:
+        job (UploadJob): the queued job.
+        request (Request): the upload request, used to build the absolute status URL.
+
+    Returns:
+        dict[str, Any]: the job id, status and status URL.
+    """
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": request.build_absolute_uri(reverse("upload_job-detail", args=[job.id])),
+    }
+
+
+def resume_job(job: UploadJob) -> bool:
+    """Queue a failed chunked iFDO ingest again, for the worker to resume it from its last committed chunk.
+
+    Chunked ingests commit the image set, then the images a chunk of items at a time, saving the number of committed
+    items on the job: a resumed job skips them, and adds the images of the remaining items to the same image set. This
+    includes the jobs failed by `fail_stale_jobs` after their worker crashed.
+
+    Args:
+        job (UploadJob): the job.
+
+    Returns:
+        bool: whether the job was queued, which it only is if it is a failed chunked ingest with a checkpoint.
+    """
+    if job.status != UploadJobStatusEnum.failed.value or not job.checkpoint:
+        return False
+    job.status = UploadJobStatusEnum.queued.value
+    job.errors = None
+    job.finished_at = None
+    job.save(update_fields=["status", "errors", "finished_at", "updated_at"])
+    return True
+
+
+def fail_stale_jobs(timeout: float = UPLOAD_JOB_STALE_TIMEOUT) -> int:
+    """Mark the running jobs whose worker stopped sending heartbeats as failed.
+
+    A worker that crashes or is killed leaves its job running, and no worker would claim it again. Jobs without a
+    heartbeat for `timeout` seconds are failed instead, with an error, so clients stop waiting for them and chunked
+    ingests can be resumed with `resume_job`. The upload of the other jobs is discarded, as in `run_job`.
+
+    Args:
+        timeout (float): seconds since the last heartbeat (or the start) of a job after which it is considered stale.
+
+    Returns:
+        int: the number of failed jobs.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=timeout)
+    with transaction.atomic():
+        stale = list(
+            UploadJob.objects.select_for_update(skip_locked=True)
+            .defer("file", "payload")
+            .filter(
+                Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff),
+                status=UploadJobStatusEnum.running.value,
+            )
+        )
+        for job in stale:
+            job.status = UploadJobStatusEnum.failed.value
+            job.errors = {"error": STALE_JOB_ERROR}
+            job.finished_at = now
+            if not job.checkpoint:
+                _discard_upload(job)
+            job.save(update_fields=FINISHED_JOB_FIELDS)
+    return len(stale)
+
+
+def claim_next_job() -> UploadJob | None:
+    """Mark the oldest queued job as running and return it.
+
+    Queued rows are locked with `SKIP LOCKED`, so several workers can poll the queue without claiming the same job.
+    Running jobs abandoned by a crashed worker are failed first, see `fail_stale_jobs`.
+
+    Returns:
+        UploadJob | None: the claimed job, or None if no job is queued.
+    """
+    fail_stale_jobs()
+    with transaction.atomic():
+        job = (
+            UploadJob.objects.select_for_update(skip_locked=True)
+            .filter(status=UploadJobStatusEnum.queued.value)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = UploadJobStatusEnum.running.value
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.save(update_fields=["status", "started_at", "heartbeat_at", "updated_at"])
+    return job
+
+
+@contextmanager
+def job_heartbeat(job: UploadJob, interval: float = UPLOAD_JOB_HEARTBEAT_INTERVAL) -> Iterator[None]:
+    """Record a heartbeat on the running job every `interval` seconds, from a background thread.
+
+    The heartbeat is written on its own connection, so it is not held back by the transactions of the ingest, and
+    tells `fail_stale_jobs` the worker is still processing the job.
+
+    Args:
+        job (UploadJob): the running job.
+        interval (float): seconds between heartbeats.
+    """
+    stop = threading.Event()
+
+    def beat() -> None:
+        try:
+            while not stop.wait(interval):
+                UploadJob.objects.filter(pk=job.pk, status=UploadJobStatusEnum.running.value).update(
+                    heartbeat_at=timezone.now()
+                )
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f"upload-job-heartbeat-{job.pk}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+@contextmanager
+def job_phase(job: UploadJob, name: str) -> Iterator[None]:
+    """Record the start, end and duration of a processing phase on the job.
+
+    The job is saved when the phase starts and ends, so the jobs endpoint reports the current phase while it runs.
+
+    Args:
+        job (UploadJob): the running job.
+        name (str): name of the phase.
+    """
+    started_at = timezone.now()
+    job.phase = name
+    job.phases[name] = {"started_at": started_at.isoformat(), "finished_at": None, "seconds": None}
+    job.save(update_fields=["phase", "phases", "updated_at"])
+    try:
+        yield
+    finally:
+        finished_at = timezone.now()
+        job.phases[name].update(
+            finished_at=finished_at.isoformat(), seconds=round((finished_at - started_at).total_seconds(), 3)
+        )
+        job.save(update_fields=["phases", "total_rows", "processed_rows", "updated_at"])
+
+
+def _run_annotation_upload(job: UploadJob) -> dict[str, Any]:
+    """Parse and ingest a queued annotations file, as `UploadAnnotationsView` does for direct uploads.
+
+    Args:
+        job (UploadJob): the running job.
+
+    Returns:
+        dict[str, Any]: summary of the ingested data.
+
+    Raises:
+        UploadJobError: if the file cannot be read, parsed or ingested.
+    """
+    upload_format = annotation_upload_format(job.filename or "")
+    if upload_format == "xlsx":
+        with job_phase(job, "read"):
+            try:
+                workbook = open_annotation_workbook(io.BytesIO(job.file))
+            except ValueError as e:
+                raise UploadJobError({"error": str(e)}) from e
+            except Exception as e:
+                raise UploadJobError({"error": "Failed to read Excel file."}) from e
+
+    with job_phase(job, "parse"):
+        try:
+            if upload_format == "xlsx":
+                try:
+                    annotation_set = parse_annotation_set_metadata(iter_sheet_rows(workbook, ANNOTATION_SET_SHEET))
+                    label_data = parse_label_set(iter_sheet_rows(workbook, LABEL_SET_SHEET))
+                    annotation_data = parse_annotation_data(iter_sheet_rows(workbook, ANNOTATION_DATA_SHEET))
+                finally:
+                    workbook.close()
+            else:
+                records = iter_annotation_records(io.BytesIO(job.file), upload_format)
+                annotation_set, label_data, annotation_data = parse_annotation_records(records)
+        except ValueError as e:
+            raise UploadJobError({"error": f"Error parsing annotations template: {e}"}) from e
+        job.total_rows = len(annotation_data)
+
+    with job_phase(job, "ingest"):
+        try:
+            data = ingest_annotation_data(
+                annotation_set,
+                label_data,
+                annotation_data,
+                backend=job.options.get("backend"),
+                validate_coordinates=job.options.get("validate_coordinates", False),
+                with_data=False,
+                mode=job.options.get("mode", "create"),
+            )
+        except ValidationError as e:
+            raise UploadJobError(e.detail) from e
+        except ValueError as e:
+            raise UploadJobError({"error": f"Error ingesting annotations data: {e}"}) from e
+        job.processed_rows = data["annotation_data"]["created"]
+
+    return {
+        "annotation_set": data["annotation_set"],
+        "label_count": len(data["label_set"]),
+        "created": data["annotation_data"]["created"],
+        "skipped": data["annotation_data"].get("skipped", 0),
+    }
+
+
+def _save_checkpoint(job: UploadJob) -> None:
+    """Save the checkpoint of a chunked iFDO ingest, with its committed items as the processed rows."""
+    job.processed_rows = job.checkpoint.get("committed_items", 0)
+    job.save(update_fields=["checkpoint", "processed_rows", "updated_at"])
+
+
+def _run_ifdo_ingest(job: UploadJob) -> dict[str, Any]:
+    """Ingest a queued iFDO payload, as `ingest_ifdo_image_set` does for direct requests.
+
+    Args:
+        job (UploadJob): the running job.
+
+    Returns:
+        dict[str, Any]: the response data of a successful ingest.
+
+    Raises:
+        UploadJobError: if the payload cannot be ingested.
+    """
+    # Imported here, as the iFDO ingest view also queues jobs through this module
+    from api.views.ingest_imagery import ingest_ifdo_payload, ingest_ifdo_stream
+
+    checkpoint = None
+    if job.options.get("chunked"):
+        job.checkpoint = job.checkpoint or {}
+        checkpoint = IngestCheckpoint(job.checkpoint, save=lambda: _save_checkpoint(job))
+
+    if job.file_oid is not None:
+        # Large payloads are queued as the request body or file, whose number of items isn't known before ingesting it
+        data, status_code = ingest_ifdo_stream(
+            open_large_object(job.file_oid),
+            phase=lambda name: job_phase(job, name),
+            upload_format=job.options.get("upload_format", "json"),
+            compression=job.options.get("compression"),
+            checkpoint=checkpoint,
+            mode=job.options.get("mode", "create"),
+            # Only iFDO files are queued with their filename, and they hold the iFDO object itself
+            wrapped=job.filename is None,
+        )
+    else:
+        items = (job.payload.get("ifdo") or {}).get("image-set-items")
+        job.total_rows = len(items) if isinstance(items, list) else None
+        data, status_code = ingest_ifdo_payload(
+            job.payload, phase=lambda name: job_phase(job, name), checkpoint=checkpoint
+        )
+    if not is_success(status_code):
+        raise UploadJobError(data)
+
+    job.processed_rows = data["image_count"]
+    return data
+
+
+JOB_RUNNERS: dict[str, Callable[[UploadJob], dict[str, Any]]] = {
+    UploadJobKindEnum.annotations.value: _run_annotation_upload,
+    UploadJobKindEnum.ifdo.value: _run_ifdo_ingest,
+}
+
+
+def run_job(job: UploadJob) -> UploadJob:
+    """Process a claimed job and record its result or errors.
+
+    Args:
+        job (UploadJob): the job, as returned by `claim_next_job`.
+
+    Returns:
+        UploadJob: the finished job.
+    """
+    try:
+        with job_heartbeat(job):
+            job.result = JOB_RUNNERS[job.kind](job)
+    except UploadJobError as e:
+        job.status = UploadJobStatusEnum.failed.value
+        job.errors = e.errors
+    except Exception as e:
+        logger.exception("Upload job %s failed", job.id)
+        job.status = UploadJobStatusEnum.failed.value
+        job.errors = {"error": f"Unexpected error: {e}"}
+    else:
+        job.status = UploadJobStatusEnum.succeeded.value
+
+    # Only failed chunked ingests with a checkpoint can be resumed, from their upload: the others don't need it anymore
+    if job.status == UploadJobStatusEnum.succeeded.value or not job.checkpoint:
+        _discard_upload(job)
+    job.finished_at = timezone.now()
+    job.save(update_fields=FINISHED_JOB_FIELDS)
+    return job
+
+
+def _discard_upload(job: UploadJob) -> None:
+    """Delete the copy of the upload kept on a finished job, with the large object holding a streamed upload."""
+    if job.file_oid is not None:
+        unlink_large_object(job.file_oid)
+    job.file = None
+    job.payload = None
+    job.file_oid = None
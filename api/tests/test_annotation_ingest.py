@@ -2,16 +2,27 @@
 
 import uuid
 from datetime import datetime
+from functools import partial
+from io import StringIO
 from unittest.mock import MagicMock, Mock, patch
 
+from django.core.management import call_command
+from django.db import transaction
 from django.test import TestCase
+from rest_framework.exceptions import ValidationError
 
+from api.models import Annotation, AnnotationLabel, AnnotationSet, Annotator, Image, ImageSet, Label
 from api.utils.annotations_ingest import (
+    append_annotations_data,
+    bulk_insert_annotations_data,
+    copy_insert_annotations_data,
     ingest_annotation_data,
     insert_annotations_data,
     insert_annotations_set,
     insert_label_data,
+    validate_annotation_upload,
 )
+from api.utils.parallel import map_chunks
 
 
 def make_annotation_set_data(**overrides) -> dict:
@@ -237,59 +248,80 @@ class InsertAnnotationsSetTests(TestCase):
 class InsertLabelDataTests(TestCase):
     """Tests for inserting label data from file upload."""
 
-    @patch("api.utils.annotations_ingest.LabelSerializer")
-    @patch("api.utils.annotations_ingest.Label")
-    def test_inserts_new_labels(self, mock_get_label: Mock, mock_label_serializer: Mock) -> None:
+    def setUp(self) -> None:
+        """Set up the annotation set of the labels."""
+        self.annotation_set = AnnotationSet.objects.create(name="Annotation Set")
+
+    @patch("api.utils.annotations_ingest.prevalidate_aphia_ids", return_value={})
+    def test_inserts_new_labels(self, mock_prevalidate: Mock) -> None:
         """Test that new labels for the annotation set are created in DB."""
-        annotation_set_id = uuid.uuid4()
-        mock_get_label.objects.filter.return_value.first.return_value = None  # no existing labels
+        labels = [{**label, "parent_label_name": "animal"} for label in make_label_list()]
 
-        mock_serializer = MagicMock()
-        mock_serializer.is_valid.return_value = True
-        mock_serializer.data = {"id": str(uuid.uuid4()), "name": "fish"}
-        mock_label_serializer.return_value = mock_serializer
+        with self.assertNumQueries(3):
+            result = insert_label_data(labels, self.annotation_set.id)
 
-        labels = make_label_list()
-        result = insert_label_data(labels, annotation_set_id)
+        self.assertEqual([label["name"] for label in result], ["fish", "coral"])
+        self.assertEqual(Label.objects.filter(annotation_set=self.annotation_set).count(), 2)
+        self.assertEqual(str(Label.objects.get(name="coral").id), result[1]["id"])
 
-        self.assertEqual(len(result), len(labels))
-        self.assertEqual(mock_label_serializer.call_count, len(labels))
+    @patch("api.utils.annotations_ingest.prevalidate_aphia_ids", return_value={})
+    def test_skips_existing_and_repeated_labels(self, mock_prevalidate: Mock) -> None:
+        """Test that labels already in the annotation set, or repeated in the upload, are only created once."""
+        Label.objects.create(name="fish", parent_label_name="animal", annotation_set=self.annotation_set)
+        other_annotation_set = AnnotationSet.objects.create(name="Other Set")
+        Label.objects.create(name="coral", parent_label_name="animal", annotation_set=other_annotation_set)
+        labels = [
+            {"name": "fish", "parent_label_name": "animal"},
+            {"name": "coral", "parent_label_name": "animal"},
+            {"name": "fish", "parent_label_name": "vertebrate"},
+            {"name": "coral", "parent_label_name": "animal"},
+        ]
 
-    @patch("api.utils.annotations_ingest.LabelSerializer")
-    @patch("api.utils.annotations_ingest.Label")
-    def test_skips_existing_labels(self, mock_get_label: Mock, mock_label_serializer: Mock) -> None:
-        """Test that existing labels for the annotation set are not recreated."""
-        annotation_set_id = uuid.uuid4()
-        # Simulate all labels already existing
-        mock_get_label.objects.filter.return_value.first.return_value = MagicMock()
+        result = insert_label_data(labels, self.annotation_set.id)
 
-        result = insert_label_data(make_label_list(), annotation_set_id)
+        self.assertEqual(
+            [(label["name"], label["parent_label_name"]) for label in result],
+            [("coral", "animal"), ("fish", "vertebrate")],
+        )
+        self.assertEqual(Label.objects.filter(annotation_set=self.annotation_set).count(), 3)
+        self.assertEqual(insert_label_data(labels, self.annotation_set.id), [])
 
-        mock_label_serializer.assert_not_called()
-        self.assertEqual(result, [])
+    @patch("api.utils.annotations_ingest.prevalidate_aphia_ids")
+    def test_returns_the_ids_of_labels_created_concurrently(self, mock_prevalidate: Mock) -> None:
+        """Test that labels inserted by a concurrent upload meanwhile are returned with their stored ids."""
 
-    @patch("api.utils.annotations_ingest.LabelSerializer")
-    @patch("api.utils.annotations_ingest.Label")
-    def test_partial_existing_labels_only_inserts_new(self, mock_get_label: Mock, mock_label_serializer: Mock) -> None:
-        """Test that only required new labels are created for the annotation set if some exist."""
-        annotation_set_id = uuid.uuid4()
+        def create_concurrently(aphia_ids: list[int]) -> dict:
+            Label.objects.create(name="fish", parent_label_name="animal", annotation_set=self.annotation_set)
+            return {}
 
-        # First label exists, second does not
-        mock_get_label.objects.filter.return_value.first.side_effect = [MagicMock(), None]
+        mock_prevalidate.side_effect = create_concurrently
+        labels = [{**label, "parent_label_name": "animal"} for label in make_label_list()]
 
-        mock_serializer = MagicMock()
-        mock_serializer.is_valid.return_value = True
-        mock_serializer.data = {"name": "coral"}
-        mock_label_serializer.return_value = mock_serializer
+        result = insert_label_data(labels, self.annotation_set.id)
+
+        stored = Label.objects.filter(annotation_set=self.annotation_set)
+        self.assertEqual(stored.count(), 2)
+        self.assertEqual(
+            [label["id"] for label in result], [str(stored.get(name=name).id) for name in ("fish", "coral")]
+        )
 
+    @patch("api.utils.annotations_ingest.prevalidate_aphia_ids")
+    def test_aphia_ids_are_prevalidated_once(self, mock_prevalidate: Mock) -> None:
+        """Test that the aphia_ids of new labels are validated together, and invalid labels reported by number."""
+        mock_prevalidate.return_value = {123: None, 456: "Invalid lowest_aphia_id: 456 does not exist in WoRMS API."}
         labels = [
-            {"name": "fish"},
-            {"name": "coral"},
+            {"name": "fish", "parent_label_name": "animal", "lowest_aphia_id": 123.0},
+            {"name": "cod", "parent_label_name": "animal", "lowest_aphia_id": "456"},
+            {"name": "sand", "parent_label_name": "substrate", "lowest_aphia_id": None},
+            {"name": "fish2", "parent_label_name": "animal", "lowest_aphia_id": 123},
         ]
-        result = insert_label_data(labels, annotation_set_id)
 
-        self.assertEqual(mock_label_serializer.call_count, 1)
-        self.assertEqual(len(result), 1)
+        with self.assertRaises(ValidationError) as ctx:
+            insert_label_data(labels, self.annotation_set.id)
+
+        mock_prevalidate.assert_called_once_with([123, 456])
+        self.assertEqual(list(ctx.exception.detail), ["Label 2"])
+        self.assertFalse(Label.objects.exists())
 
 
 class InsertAnnotationsDataTests(TestCase):
@@ -311,7 +343,10 @@ class InsertAnnotationsDataTests(TestCase):
 
         mock_image = MagicMock()
         mock_image.id = image_id
-        mock_get_image.objects.filter.return_value.first.return_value = mock_image
+        # Images are looked up by id (flat list of ids), not by filename
+        mock_get_image.objects.filter.return_value.values_list.side_effect = lambda *fields, flat=False: (
+            [image_id] if flat else []
+        )
 
         mock_label = MagicMock()
         mock_label.id = label_id
@@ -356,7 +391,7 @@ class InsertAnnotationsDataTests(TestCase):
         mock_annotator_serializer: Mock,
     ) -> None:
         """Test that annotation data can be inserted successfully."""
-        self._setup_mocks(
+        mock_image, _, _ = self._setup_mocks(
             mock_get_image,
             mock_get_name,
             mock_get_annotator,
@@ -365,7 +400,7 @@ class InsertAnnotationsDataTests(TestCase):
             mock_annotator_serializer,
         )
         annotation_set_id = uuid.uuid4()
-        entries = [make_annotation_entry() for _ in range(5)]
+        entries = [make_annotation_entry(image_id=str(mock_image.id)) for _ in range(5)]
         result = insert_annotations_data(entries, annotation_set_id)
 
         self.assertEqual(result["created"], 5)
@@ -373,7 +408,7 @@ class InsertAnnotationsDataTests(TestCase):
     @patch("api.utils.annotations_ingest.Image")
     def test_raises_when_image_not_found(self, mock_get_image: Mock) -> None:
         """Test that a ValueError is raised when an image within the annotation data isn't found."""
-        mock_get_image.objects.filter.return_value.first.return_value = None
+        mock_get_image.objects.filter.return_value.values_list.return_value = []
         annotation_set_id = uuid.uuid4()
 
         with self.assertRaises(ValueError) as ctx:
@@ -384,10 +419,11 @@ class InsertAnnotationsDataTests(TestCase):
     @patch("api.utils.annotations_ingest.Image")
     def test_raises_when_image_uuid_and_filename_conflict(self, mock_get_image: Mock) -> None:
         """Test that a ValueError is raised when the image UUID and filename don't point to the same record."""
-        conflicting_image = MagicMock()
-        conflicting_image.id = uuid.uuid4()
+        conflicting_image_id = uuid.uuid4()
         # UUID miss, name hit (different record)
-        mock_get_image.objects.filter.return_value.first.side_effect = [None, conflicting_image]
+        mock_get_image.objects.filter.return_value.values_list.side_effect = lambda *fields, flat=False: (
+            [] if flat else [("conflict.jpg", conflicting_image_id)]
+        )
 
         entry = make_annotation_entry(image_id=str(uuid.uuid4()), image_filename="conflict.jpg")
         with self.assertRaises(ValueError):
@@ -397,12 +433,15 @@ class InsertAnnotationsDataTests(TestCase):
     @patch("api.utils.annotations_ingest.Image")
     def test_raises_when_label_not_found(self, mock_get_image: Mock, mock_get_label: Mock) -> None:
         """Test that a ValueError is raised when a label is not found for an annotation."""
-        mock_image = MagicMock()
-        mock_get_image.objects.filter.return_value.first.return_value = mock_image
+        image_id = uuid.uuid4()
+        # Images are looked up by id (flat list of ids), not by filename
+        mock_get_image.objects.filter.return_value.values_list.side_effect = lambda *fields, flat=False: (
+            [image_id] if flat else []
+        )
         mock_get_label.objects.filter.return_value.first.return_value = None
 
         with self.assertRaises(ValueError) as ctx:
-            insert_annotations_data([make_annotation_entry()], uuid.uuid4())
+            insert_annotations_data([make_annotation_entry(image_id=str(image_id))], uuid.uuid4())
 
         self.assertIn("Label", str(ctx.exception))
         self.assertIn("not found", str(ctx.exception))
@@ -423,7 +462,7 @@ class InsertAnnotationsDataTests(TestCase):
         mock_annotator_serializer: Mock,
     ) -> None:
         """Test that creation datetime for an annotation is parsed correctly."""
-        self._setup_mocks(
+        mock_image, _, _ = self._setup_mocks(
             mock_get_image,
             mock_get_name,
             mock_get_annotator,
@@ -431,7 +470,7 @@ class InsertAnnotationsDataTests(TestCase):
             mock_annotation_label_serializer,
             mock_annotator_serializer,
         )
-        entry = make_annotation_entry(creation_datetime="15062023 09:30:00")
+        entry = make_annotation_entry(image_id=str(mock_image.id), creation_datetime="15062023 09:30:00")
         insert_annotations_data([entry], uuid.uuid4())
 
         anno_label_call_data = (
@@ -461,7 +500,7 @@ class InsertAnnotationsDataTests(TestCase):
         mock_annotator_serializer: Mock,
     ) -> None:
         """Test that creation datetime for an annotation falls back to now if input data can't be parsed."""
-        self._setup_mocks(
+        mock_image, _, _ = self._setup_mocks(
             mock_get_image,
             mock_get_name,
             mock_get_annotator,
@@ -469,7 +508,7 @@ class InsertAnnotationsDataTests(TestCase):
             mock_annotation_label_serializer,
             mock_annotator_serializer,
         )
-        entry = make_annotation_entry(creation_datetime="not-a-date")
+        entry = make_annotation_entry(image_id=str(mock_image.id), creation_datetime="not-a-date")
         before = datetime.now()
         insert_annotations_data([entry], uuid.uuid4())
         after = datetime.now()
@@ -501,7 +540,7 @@ class InsertAnnotationsDataTests(TestCase):
         mock_annotator_serializer: Mock,
     ) -> None:
         """Test that a record is created for a new annotator."""
-        self._setup_mocks(
+        mock_image, _, _ = self._setup_mocks(
             mock_get_image,
             mock_get_name,
             mock_get_annotator,
@@ -509,13 +548,15 @@ class InsertAnnotationsDataTests(TestCase):
             mock_annotation_label_serializer,
             mock_annotator_serializer,
         )
-        insert_annotations_data([make_annotation_entry(annotator_name="NewGuy")], uuid.uuid4())
+        insert_annotations_data(
+            [make_annotation_entry(image_id=str(mock_image.id), annotator_name="NewGuy")], uuid.uuid4()
+        )
         mock_get_annotator.objects.get_or_create.assert_called_once_with(name="NewGuy")
 
     @patch("api.utils.annotations_ingest.Image")
     def test_error_message_includes_row_number(self, mock_get_image: Mock) -> None:
         """Test that row numbers in error messages are 1-indexed."""
-        mock_get_image.objects.filter.return_value.first.return_value = None
+        mock_get_image.objects.filter.return_value.values_list.return_value = []
 
         with self.assertRaises(ValueError) as ctx:
             insert_annotations_data([make_annotation_entry()], uuid.uuid4())
@@ -566,7 +607,7 @@ class IngestAnnotationDataTests(TestCase):
         )
 
         mock_labels.assert_called_once_with([], str(annotation_set_id))
-        mock_annos.assert_called_once_with([], str(annotation_set_id))
+        mock_annos.assert_called_once_with([], str(annotation_set_id), with_data=True)
 
     @patch("api.utils.annotations_ingest.insert_annotations_set")
     @patch("api.utils.annotations_ingest.insert_label_data")
@@ -595,3 +636,438 @@ class IngestAnnotationDataTests(TestCase):
 
         self.assertEqual(result["label_set"], [])
         self.assertEqual(result["annotation_data"]["created"], 0)
+
+    @patch("api.utils.annotations_ingest.insert_annotations_set")
+    def test_invalid_coordinates_are_rejected_before_writing(self, mock_set: Mock) -> None:
+        """Test that with validate_coordinates, rows whose coordinates don't follow their shape are reported."""
+        annotation_data = [
+            make_annotation_entry(shape="point", coordinates=[[1, 2]]),
+            make_annotation_entry(shape="rectangle", coordinates=[[1, 2, 3, 4]]),
+        ]
+
+        with self.assertRaises(ValidationError) as ctx:
+            ingest_annotation_data({}, [], annotation_data, validate_coordinates=True)
+
+        self.assertEqual(
+            ctx.exception.detail,
+            {"Row 2": {"coordinates": ["rectangle coordinates must have 8 values per list."]}},
+        )
+        mock_set.assert_not_called()
+
+
+class BulkInsertAnnotationsDataTests(TestCase):
+    """Tests for inserting annotation data from large file uploads with bulk queries."""
+
+    def setUp(self) -> None:
+        """Set up an annotation set with its images and labels."""
+        image_set = ImageSet.objects.create(name="Image Set")
+        self.image = Image.objects.create(filename="image_001.jpg", image_set=image_set)
+        self.other_image = Image.objects.create(filename="image_002.jpg", image_set=image_set)
+        self.annotation_set = AnnotationSet.objects.create(name="Annotation Set")
+        self.label = Label.objects.create(name="fish", parent_label_name="animal", annotation_set=self.annotation_set)
+        Annotator.objects.create(name="Alice")
+
+    def _entry(self, **overrides) -> dict:
+        """Helper function to create a valid annotation row for the annotation set."""
+        return make_annotation_entry(
+            **{"image_id": "", "shape": "rectangle", "coordinates": [[1, 2, 3, 4]], "dimension_pixels": None}
+            | overrides
+        )
+
+    def test_inserts_annotations_labels_and_missing_annotators(self) -> None:
+        """Test that every row is inserted and annotators are created once."""
+        entries = [
+            self._entry(image_id=str(self.image.id)),
+            self._entry(image_filename="image_002.jpg", annotator_name="Bob"),
+            self._entry(image_filename="image_002.jpg", annotator_name="Bob", shape="bounding box"),
+        ]
+
+        result = bulk_insert_annotations_data(entries, self.annotation_set.id, batch_size=2)
+
+        self.assertEqual(result["created"], 3)
+        self.assertEqual(Annotator.objects.count(), 2)
+        self.assertEqual(Annotation.objects.filter(image=self.other_image).count(), 2)
+        self.assertEqual(AnnotationLabel.objects.filter(label=self.label, annotator__name="Bob").count(), 2)
+        self.assertEqual(result["data"][0]["annotation"]["image_id"], self.image.id)
+        self.assertEqual(result["data"][1]["annotator"]["name"], "Bob")
+        self.assertEqual(result["data"][2]["annotation"]["shape"], "rectangle")
+        self.assertEqual(result["data"][2]["label"]["creation_datetime"], "2024-01-01T12:00:00Z")
+
+    def test_images_are_found_by_filename_in_the_image_sets_of_the_annotation_set(self) -> None:
+        """Test that filenames shared by several image sets resolve to the image set of the annotation set."""
+        other_image_set = ImageSet.objects.create(name="Other Image Set")
+        other_image = Image.objects.create(filename="image_001.jpg", image_set=other_image_set)
+
+        with self.assertRaises(ValueError) as ctx:
+            bulk_insert_annotations_data([self._entry()], self.annotation_set.id)
+        self.assertIn("several image sets", str(ctx.exception))
+
+        self.annotation_set.image_sets.add(other_image_set)
+        self.annotation_set.image_sets.add(self.image.image_set)
+        with self.assertRaises(ValueError):
+            bulk_insert_annotations_data([self._entry()], self.annotation_set.id)
+
+        self.annotation_set.image_sets.remove(self.image.image_set)
+        bulk_insert_annotations_data([self._entry()], self.annotation_set.id)
+        self.assertEqual(Annotation.objects.get().image, other_image)
+
+    def test_returns_only_the_count_without_data(self) -> None:
+        """Test that the rows are inserted but not serialized when their data isn't needed."""
+        result = bulk_insert_annotations_data([self._entry(), self._entry()], self.annotation_set.id, with_data=False)
+
+        self.assertEqual(result, {"created": 2})
+        self.assertEqual(AnnotationLabel.objects.filter(label=self.label).count(), 2)
+
+    def test_raises_when_image_not_found(self) -> None:
+        """Test that a ValueError naming the row is raised when an image isn't found."""
+        entries = [self._entry(), self._entry(image_filename="missing.jpg")]
+
+        with self.assertRaises(ValueError) as ctx:
+            bulk_insert_annotations_data(entries, self.annotation_set.id)
+
+        self.assertIn("Row 2: Image not found", str(ctx.exception))
+        self.assertFalse(Annotation.objects.exists())
+
+    def test_raises_when_image_uuid_and_filename_conflict(self) -> None:
+        """Test that a ValueError is raised when the image UUID and filename don't point to the same record."""
+        with self.assertRaises(ValueError) as ctx:
+            bulk_insert_annotations_data([self._entry(image_id=str(uuid.uuid4()))], self.annotation_set.id)
+
+        self.assertIn("matched a different record", str(ctx.exception))
+
+    def test_raises_when_label_not_found(self) -> None:
+        """Test that a ValueError is raised when a label is not in the annotation set."""
+        with self.assertRaises(ValueError) as ctx:
+            bulk_insert_annotations_data([self._entry(label_name="coral")], self.annotation_set.id)
+
+        self.assertIn("Row 1: Label 'coral' not found", str(ctx.exception))
+
+    def test_raises_validation_errors_by_row_before_writing(self) -> None:
+        """Test that invalid rows are reported together and nothing is written."""
+        entries = [self._entry(), self._entry(shape="blob"), self._entry(annotator_name="Bob", creation_datetime="")]
+
+        with self.assertRaises(ValidationError) as ctx:
+            bulk_insert_annotations_data(entries, self.annotation_set.id)
+
+        self.assertEqual(set(ctx.exception.detail), {"Row 2", "Row 3"})
+        self.assertFalse(Annotation.objects.exists())
+        self.assertFalse(Annotator.objects.filter(name="Bob").exists())
+
+    @patch("api.utils.annotations_ingest.map_chunks", partial(map_chunks, chunk_size=2))
+    def test_rows_validated_in_chunks_keep_their_row_numbers(self) -> None:
+        """Test that rows validated in chunks are inserted in order, and errors name their row in the upload."""
+        entries = [self._entry(annotator_name=f"Annotator {index}") for index in range(5)]
+
+        result = bulk_insert_annotations_data(entries, self.annotation_set.id)
+
+        self.assertEqual([row["annotator"]["name"] for row in result["data"]], [f"Annotator {i}" for i in range(5)])
+
+        entries[3] = self._entry(shape="blob")
+        with self.assertRaises(ValidationError) as ctx:
+            bulk_insert_annotations_data(entries, self.annotation_set.id)
+
+        self.assertEqual(set(ctx.exception.detail), {"Row 4"})
+
+    @patch("api.utils.annotations_ingest.ANNOTATION_BULK_THRESHOLD", 2)
+    @patch("api.utils.annotations_ingest.insert_annotations_set")
+    @patch("api.utils.annotations_ingest.insert_label_data")
+    @patch("api.utils.annotations_ingest.insert_annotations_data")
+    @patch("api.utils.annotations_ingest.bulk_insert_annotations_data")
+    def test_ingest_uses_bulk_insert_for_large_uploads(
+        self, mock_bulk_insert: Mock, mock_insert: Mock, mock_insert_label: Mock, mock_insert_set: Mock
+    ) -> None:
+        """Test that uploads with at least ANNOTATION_BULK_THRESHOLD rows use the bulk insert."""
+        mock_insert_set.return_value = {"id": 1}
+
+        ingest_annotation_data({}, [], [{}, {}])
+        ingest_annotation_data({}, [], [{}])
+        ingest_annotation_data({}, [], [{}], backend="bulk")
+
+        self.assertEqual(mock_bulk_insert.call_count, 2)
+        mock_insert.assert_called_once_with([{}], 1, with_data=True)
+
+    def test_benchmark_command_leaves_database_unchanged(self) -> None:
+        """Test that the benchmark command reports its timings and rolls back the data it created."""
+        out = StringIO()
+        call_command("benchmark_annotation_ingest", "--rows", "20", "--images", "3", "--mode", "both", stdout=out)
+
+        self.assertIn("bulk: 20 rows", out.getvalue())
+        self.assertIn("per-row: 20 rows", out.getvalue())
+        self.assertEqual(Annotation.objects.count(), 0)
+        self.assertEqual(Image.objects.count(), 2)
+
+
+class CopyInsertAnnotationsDataTests(TestCase):
+    """Tests for inserting annotation data with PostgreSQL COPY through staging tables."""
+
+    def setUp(self) -> None:
+        """Set up an annotation set with its images and labels."""
+        image_set = ImageSet.objects.create(name="Image Set")
+        self.image = Image.objects.create(filename="image_001.jpg", image_set=image_set)
+        self.annotation_set = AnnotationSet.objects.create(name="Annotation Set")
+        self.label = Label.objects.create(name="fish", parent_label_name="animal", annotation_set=self.annotation_set)
+
+    def _entry(self, **overrides) -> dict:
+        """Helper function to create a valid annotation row for the annotation set."""
+        return make_annotation_entry(
+            **{"image_id": "", "shape": "rectangle", "coordinates": [[1, 2, 3, 4]], "dimension_pixels": None}
+            | overrides
+        )
+
+    def test_copies_annotations_and_labels(self) -> None:
+        """Test that every row is merged into the annotations and annotation labels tables."""
+        entries = [self._entry(), self._entry(annotator_name="Bob", shape="bounding box", dimension_pixels=12.5)]
+
+        result = copy_insert_annotations_data(entries, self.annotation_set.id)
+
+        self.assertEqual(result, {"created": 2})
+        annotations = Annotation.objects.filter(annotation_set=self.annotation_set).order_by("dimension_pixels")
+        self.assertEqual([a.coordinates for a in annotations], [[[1, 2, 3, 4]], [[1, 2, 3, 4]]])
+        self.assertEqual([a.shape for a in annotations], ["rectangle", "rectangle"])
+        self.assertIsNotNone(annotations[0].created_at)
+        annotation_label = AnnotationLabel.objects.get(annotator__name="Bob")
+        self.assertEqual(annotation_label.annotation.dimension_pixels, 12.5)
+        self.assertEqual(annotation_label.label, self.label)
+        self.assertEqual(annotation_label.creation_datetime.isoformat(), "2024-01-01T12:00:00+00:00")
+
+    def test_raises_before_copying_invalid_rows(self) -> None:
+        """Test that rows are validated before anything is copied."""
+        with self.assertRaises(ValidationError):
+            copy_insert_annotations_data([self._entry(), self._entry(shape="blob")], self.annotation_set.id)
+
+        self.assertFalse(Annotation.objects.exists())
+
+    @patch("api.utils.annotations_ingest.ANNOTATION_PARALLEL_CHUNK_SIZE", 2)
+    def test_rows_copied_before_an_invalid_chunk_are_rolled_back(self) -> None:
+        """Test that rows streamed a chunk at a time are rolled back with their annotators when a later row fails."""
+        entries = [self._entry(annotator_name=f"Annotator {index}") for index in range(5)]
+        entries[3] = self._entry(shape="blob")
+
+        with self.assertRaises(ValidationError) as ctx:
+            copy_insert_annotations_data(entries, self.annotation_set.id)
+
+        self.assertEqual(set(ctx.exception.detail), {"Row 4"})
+        self.assertFalse(Annotation.objects.exists())
+        self.assertFalse(Annotator.objects.filter(name__startswith="Annotator").exists())
+
+    def test_copies_twice_in_one_transaction(self) -> None:
+        """Test that each copy has a staging table of its own, so it can run again in the same transaction."""
+        with transaction.atomic():
+            for _ in range(2):
+                copy_insert_annotations_data([self._entry(), self._entry()], self.annotation_set.id)
+
+        self.assertEqual(Annotation.objects.filter(annotation_set=self.annotation_set).count(), 4)
+        self.assertEqual(AnnotationLabel.objects.count(), 4)
+
+    @patch("api.utils.annotations_ingest.insert_annotations_set")
+    @patch("api.utils.annotations_ingest.insert_label_data")
+    @patch("api.utils.annotations_ingest.copy_insert_annotations_data")
+    def test_ingest_uses_requested_backend(self, mock_copy: Mock, mock_insert_label: Mock, mock_set: Mock) -> None:
+        """Test that the copy backend can be requested, and unknown backends are rejected."""
+        mock_set.return_value = {"id": 1}
+
+        ingest_annotation_data({}, [], [{}], backend="copy")
+        mock_copy.assert_called_once_with([{}], 1, with_data=True)
+
+        with self.assertRaises(ValueError):
+            ingest_annotation_data({}, [], [{}], backend="fast")
+
+    @patch("api.management.commands.load_annotations.ingest_annotation_data")
+    @patch("api.management.commands.load_annotations.parse_annotation_data")
+    @patch("api.management.commands.load_annotations.parse_label_set")
+    @patch("api.management.commands.load_annotations.parse_annotation_set_metadata")
+    @patch("api.management.commands.load_annotations.open_annotation_workbook")
+    def test_load_annotations_command_uses_copy_backend(  # noqa: PLR0913
+        self, mock_open: Mock, mock_parse_set: Mock, mock_parse_label: Mock, mock_parse_data: Mock, mock_ingest: Mock
+    ) -> None:
+        """Test that the load command ingests the parsed template with the COPY backend by default."""
+        mock_open.return_value = MagicMock()
+        mock_ingest.return_value = {"annotation_set": {"id": 1}, "label_set": [{}], "annotation_data": {"created": 5}}
+        out = StringIO()
+
+        call_command("load_annotations", "annotations.xlsx", stdout=out)
+
+        mock_open.assert_called_once_with("annotations.xlsx")
+        mock_ingest.assert_called_once_with(
+            mock_parse_set.return_value,
+            mock_parse_label.return_value,
+            mock_parse_data.return_value,
+            backend="copy",
+            validate_coordinates=False,
+            with_data=False,
+            mode="create",
+        )
+        mock_open.return_value.close.assert_called_once()
+        self.assertIn("Annotations created: 5", out.getvalue())
+
+
+class AppendAnnotationsDataTests(TestCase):
+    """Tests for appending the new rows of an upload to an existing annotation set."""
+
+    def setUp(self) -> None:
+        """Set up an annotation set with its images and labels."""
+        image_set = ImageSet.objects.create(name="Image Set")
+        self.image = Image.objects.create(filename="image_001.jpg", image_set=image_set)
+        Image.objects.create(filename="image_002.jpg", image_set=image_set)
+        self.annotation_set = AnnotationSet.objects.create(name="Annotation Set")
+        self.label = Label.objects.create(name="fish", parent_label_name="animal", annotation_set=self.annotation_set)
+
+    def _entry(self, **overrides) -> dict:
+        """Helper function to create a valid annotation row for the annotation set."""
+        return make_annotation_entry(
+            **{"image_id": "", "shape": "point", "coordinates": [[1, 2]], "dimension_pixels": None} | overrides
+        )
+
+    def test_only_new_rows_are_inserted(self) -> None:
+        """Test that rows already stored in the set are skipped, and uploading them again inserts nothing."""
+        bulk_insert_annotations_data([self._entry(), self._entry(coordinates=[[3, 4]])], self.annotation_set.id)
+
+        entries = [
+            self._entry(coordinates=[[1.0, 2.0]]),
+            self._entry(coordinates=[[3, 4]], annotator_name="Bob"),
+            self._entry(coordinates=[[3, 4]], image_filename="image_002.jpg"),
+            self._entry(coordinates=[[5, 6]]),
+            self._entry(coordinates=[[5, 6]]),
+        ]
+        result = append_annotations_data(entries, self.annotation_set.id)
+
+        self.assertEqual((result["created"], result["skipped"]), (4, 1))
+        self.assertEqual([row["annotation"]["coordinates"] for row in result["data"]][-1], [[5, 6]])
+        self.assertEqual(Annotation.objects.filter(annotation_set=self.annotation_set).count(), 6)
+
+        result = append_annotations_data(entries, self.annotation_set.id, with_data=False)
+        self.assertEqual(result, {"created": 0, "skipped": 5})
+        self.assertEqual(Annotation.objects.filter(annotation_set=self.annotation_set).count(), 6)
+
+    @patch("api.utils.annotations_ingest.prevalidate_aphia_ids", return_value={})
+    def test_ingest_appends_to_the_annotation_set_of_its_uuid(self, mock_prevalidate: Mock) -> None:
+        """Test that an append adds new labels and rows to the existing set instead of creating one."""
+        label_list = [{"name": "fish", "parent_label_name": "animal"}, {"name": "crab", "parent_label_name": "animal"}]
+        annotation_set_data = make_annotation_set_data(**{"annotation-set-uuid": str(self.annotation_set.id)})
+        bulk_insert_annotations_data([self._entry()], self.annotation_set.id)
+
+        data = ingest_annotation_data(
+            annotation_set_data, label_list, [self._entry(), self._entry(label_name="crab")], mode="append"
+        )
+
+        self.assertEqual(data["annotation_set"]["id"], str(self.annotation_set.id))
+        self.assertEqual([label["name"] for label in data["label_set"]], ["crab"])
+        self.assertEqual((data["annotation_data"]["created"], data["annotation_data"]["skipped"]), (1, 1))
+        self.assertEqual(AnnotationSet.objects.count(), 1)
+
+    @patch("api.utils.annotations_ingest.prevalidate_aphia_ids")
+    def test_dry_run_checks_an_append_against_the_existing_set(self, mock_prevalidate: Mock) -> None:
+        """Test that a dry-run append only checks the new labels, and rows can refer to the stored labels."""
+        mock_prevalidate.return_value = {123: "Invalid lowest_aphia_id: 123 does not exist in WoRMS API."}
+        label_list = [
+            {"name": "fish", "parent_label_name": "animal", "lowest_aphia_id": "123"},
+            {"name": "crab", "parent_label_name": "animal"},
+            {"name": "coral", "parent_label_name": "animal", "lowest_aphia_id": "123"},
+        ]
+        annotation_set_data = make_annotation_set_data(**{"annotation-set-uuid": str(self.annotation_set.id)})
+        annotation_data = [self._entry(), self._entry(label_name="crab"), self._entry(label_name="sponge")]
+
+        report = validate_annotation_upload(annotation_set_data, label_list, annotation_data, mode="append")
+
+        self.assertEqual(report["annotation_set"], {})
+        self.assertEqual(list(report["labels"]), ["Label 3"])
+        self.assertEqual(list(report["annotations"]), ["Row 3"])
+        mock_prevalidate.assert_called_once_with([123])
+        self.assertEqual(list(Label.objects.values_list("name", flat=True)), ["fish"])
+
+        report = validate_annotation_upload(
+            make_annotation_set_data(**{"annotation-set-uuid": str(uuid.uuid4())}), [], [], mode="append"
+        )
+        self.assertFalse(report["valid"])
+        self.assertIn("AnnotationSet not found", report["annotation_set"]["annotation_set"][0])
+
+    def test_ingest_rejects_append_without_an_existing_annotation_set(self) -> None:
+        """Test that an append needs the annotation-set-uuid of an existing set."""
+        with self.assertRaises(ValueError) as ctx:
+            ingest_annotation_data(make_annotation_set_data(), [], [], mode="append")
+        self.assertIn("annotation-set-uuid", str(ctx.exception))
+
+        with self.assertRaises(ValueError) as ctx:
+            ingest_annotation_data(
+                make_annotation_set_data(**{"annotation-set-uuid": str(uuid.uuid4())}), [], [], mode="append"
+            )
+        self.assertIn("AnnotationSet not found", str(ctx.exception))
+
+        with self.assertRaises(ValueError):
+            ingest_annotation_data(make_annotation_set_data(), [], [], mode="merge")
+
+
+class ValidateAnnotationUploadTests(TestCase):
+    """Tests for checking an annotations upload without writing it."""
+
+    def setUp(self) -> None:
+        """Set up the images referenced by the upload, and its labels."""
+        image_set = ImageSet.objects.create(name="Image Set")
+        self.image = Image.objects.create(filename="image_001.jpg", image_set=image_set)
+
+        self.label_list = [
+            {"name": "fish", "parent_label_name": "animal"},
+            {"name": "coral", "parent_label_name": "animal"},
+        ]
+
+    def _entry(self, **overrides) -> dict:
+        """Helper function to create a valid annotation row for the upload."""
+        return make_annotation_entry(
+            **{"image_id": "", "coordinates": [[1, 2]], "dimension_pixels": None} | overrides,
+        )
+
+    @patch("api.utils.annotations_ingest.prevalidate_aphia_ids", return_value={})
+    def test_valid_upload(self, mock_prevalidate: Mock) -> None:
+        """Test that a valid upload is reported as valid, and nothing is written."""
+        report = validate_annotation_upload(
+            make_annotation_set_data(), self.label_list, [self._entry(), self._entry(label_name="coral")]
+        )
+
+        self.assertEqual(
+            report,
+            {
+                "valid": True,
+                "rows": 2,
+                "invalid_rows": 0,
+                "invalid_rows_by_field": {},
+                "annotation_set": {},
+                "labels": {},
+                "annotations": {},
+            },
+        )
+        self.assertFalse(AnnotationSet.objects.exists())
+        self.assertFalse(Label.objects.exists())
+        self.assertFalse(Annotator.objects.exists())
+
+    @patch("api.utils.annotations_ingest.ANNOTATION_DRY_RUN_MAX_ROW_ERRORS", 2)
+    @patch("api.utils.annotations_ingest.prevalidate_aphia_ids")
+    def test_collects_every_error(self, mock_prevalidate: Mock) -> None:
+        """Test that the errors of every section and row are collected, and only the first rows are listed."""
+        mock_prevalidate.return_value = {123: "Invalid lowest_aphia_id: 123 does not exist in WoRMS API."}
+        label_list = [self.label_list[0], {**self.label_list[1], "lowest_aphia_id": "123"}]
+        annotation_data = [
+            self._entry(),
+            self._entry(image_filename="missing.jpg"),
+            self._entry(label_name="crab", shape="hexagon"),
+            self._entry(image_filename="missing.jpg", coordinates=[[1, 2, 3]]),
+        ]
+
+        report = validate_annotation_upload(
+            make_annotation_set_data(**{"annotation-image-set-name": "Missing Set"}),
+            label_list,
+            annotation_data,
+            validate_coordinates=True,
+        )
+
+        self.assertFalse(report["valid"])
+        self.assertEqual(
+            report["annotation_set"]["image_set"], ["ImageSet not found with id=None or name='Missing Set'"]
+        )
+        self.assertEqual(list(report["labels"]), ["Label 2"])
+        self.assertEqual((report["rows"], report["invalid_rows"]), (4, 3))
+        self.assertEqual(report["invalid_rows_by_field"], {"image": 2, "label_name": 1, "shape": 1, "coordinates": 1})
+        self.assertEqual(list(report["annotations"]), ["Row 2", "Row 3"])
+        self.assertEqual(report["annotations"]["Row 2"]["image"], ["Image not found (UUID: , Name: missing.jpg)"])
+        self.assertEqual(report["annotations"]["Row 3"]["label_name"], ["Label 'crab' not found in the label set."])
+        mock_prevalidate.assert_called_once_with([123])
+        self.assertFalse(AnnotationSet.objects.exists())
@@ -1,21 +1,34 @@
 """Unit tests for annotation parsing functions in api/util/annotation.py."""
 
+import csv
+import io
+import json
 import os
+from datetime import datetime
+from functools import partial
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from django.conf import settings
 from django.test import TransactionTestCase
 
 from api.utils.annotations_ingest import ingest_annotation_data
 from api.utils.annotations_parser import (
     _parse_coordinates,
+    annotation_upload_format,
+    iter_annotation_records,
+    iter_sheet_rows,
+    open_annotation_workbook,
     parse_annotation_data,
+    parse_annotation_records,
     parse_annotation_set_metadata,
     parse_label_set,
 )
+from api.utils.parallel import map_chunks
 
 
 class TestAnnotationParsers(TestCase):
@@ -106,11 +119,8 @@ class TestAnnotationParsers(TestCase):
     @patch("api.utils.annotations_parser.ANNOTATION_DATA_START_ROW", 3)
     @patch("api.utils.annotations_parser.ANNOTATION_DATA_START_COL", 0)
     @patch("api.utils.annotations_parser.ANNOTATION_DATA_END_COL", 9)
-    @patch("api.utils.annotations_parser._parse_coordinates")
-    def test_parse_annotation_data(self, mock_parse_coords: Mock) -> None:
+    def test_parse_annotation_data(self) -> None:
         """Test parsing the main annotation data sheet based on image structure."""
-        mock_parse_coords.return_value = [1427, 8163]
-
         data = [
             [
                 "image-uuid",
@@ -159,12 +169,69 @@ class TestAnnotationParsers(TestCase):
         self.assertEqual(result[0]["image_id"], "0c3bc9cd")
         self.assertEqual(result[0]["image_filename"], "M58_1044.jpg")
         self.assertEqual(result[0]["dimension_pixels"], 5850.0)
+        self.assertEqual(result[0]["coordinates"], [[1427.0, 8163.0]])
+        self.assertEqual(result[0]["creation_datetime"], "31122012")
 
         self.assertEqual(result[1]["image_id"], "")
         self.assertEqual(result[1]["label_name"], "bryozoa_01")
         self.assertEqual(result[1]["dimension_pixels"], 384.06)
+        self.assertEqual(result[1]["coordinates"], [[1731.0, 8308.0]])
+
+    @patch("api.utils.annotations_parser.ANNOTATION_DATA_START_COL", 0)
+    @patch("api.utils.annotations_parser.ANNOTATION_DATA_END_COL", 9)
+    @patch("api.utils.annotations_parser.ANNOTATION_DATA_START_ROW", 0)
+    def test_parse_annotation_data_columns(self) -> None:
+        """Test that the column-wise parsing gives the same values as parsing each cell on its own."""
+        coordinates = ["[[1, 2], [3, 4]]", "10.5, 20", "[1], [2]", "1,,2", "[1, 2", "1, true", "", "[10, 20, 30, 40]"]
+        rows = [
+            ("", "Platform", f"image_{index}.jpg", "Annotator", "31122012 23:59:59", "label", "point", value, None)
+            for index, value in enumerate(coordinates)
+        ]
+        rows[1] = (*rows[1][:4], datetime(2020, 1, 2, 3, 4, 5), *rows[1][5:])
+        rows[2] = (*rows[2][:4], "not a date", *rows[2][5:])
+        rows[3] = (*rows[3][:4], None, *rows[3][5:8], " 12 ")
+
+        result = parse_annotation_data(iter(rows))
+
+        self.assertEqual(
+            [entry["coordinates"] for entry in result], [_parse_coordinates(value) for value in coordinates]
+        )
+        self.assertEqual(
+            [entry["creation_datetime"] for entry in result[:4]],
+            [datetime(2012, 12, 31, 23, 59, 59), datetime(2020, 1, 2, 3, 4, 5), "not a date", ""],
+        )
+        self.assertEqual([entry["dimension_pixels"] for entry in result[2:4]], [None, 12.0])
+
+    @patch("api.utils.annotations_parser.ANNOTATION_DATA_START_COL", 0)
+    @patch("api.utils.annotations_parser.ANNOTATION_DATA_END_COL", 9)
+    @patch("api.utils.annotations_parser.ANNOTATION_DATA_START_ROW", 0)
+    def test_parse_annotation_data_invalid_dimension(self) -> None:
+        """Test that a dimension which is not a number raises a ValueError naming its row."""
+        rows = [
+            ("", "Platform", "a.jpg", "Annotator", "", "label", "point", "", 12),
+            ("", "Platform", "b.jpg", "Annotator", "", "label", "point", "", "twelve"),
+        ]
 
-        self.assertTrue(mock_parse_coords.called)
+        with self.assertRaisesRegex(ValueError, "Row 2: 'annotation-dimension-pixels' must be a number"):
+            parse_annotation_data(iter(rows))
+
+    @patch("api.utils.annotations_parser.ANNOTATION_DATA_START_COL", 0)
+    @patch("api.utils.annotations_parser.ANNOTATION_DATA_END_COL", 9)
+    @patch("api.utils.annotations_parser.ANNOTATION_DATA_START_ROW", 0)
+    def test_parse_annotation_data_in_chunks(self) -> None:
+        """Test that rows parsed in chunks are merged back in order, with errors naming their row in the file."""
+        rows = [
+            ("", "Platform", f"image_{index}.jpg", "Annotator", "", "label", "point", f"{index}, {index}", index)
+            for index in range(5)
+        ]
+        expected = parse_annotation_data(iter(rows))
+
+        with patch("api.utils.annotations_parser.map_chunks", partial(map_chunks, chunk_size=2)):
+            self.assertEqual(parse_annotation_data(iter(rows)), expected)
+
+            rows[4] = (*rows[4][:8], "twelve")
+            with self.assertRaisesRegex(ValueError, "Row 5: 'annotation-dimension-pixels' must be a number"):
+                parse_annotation_data(iter(rows))
 
     def test_full_template_parsing(self) -> None:
         """Verify that the parsers work with the actual Excel file structure without mocking constants."""
@@ -203,6 +270,58 @@ class TestAnnotationParsers(TestCase):
         self.assertEqual(first_anno["label_name"], "reteporella")
         self.assertEqual(first_anno["shape"], "rectangle")
 
+    def test_streamed_workbook_matches_dataframe_parsing(self) -> None:
+        """Verify that parsing rows streamed from a single read-only workbook gives the same result as pandas."""
+        test_file_path = os.path.join(
+            settings.BASE_DIR, "api", "tests", "test_data", "annotation_metadata_template_v1.xlsx"
+        )
+        if not os.path.exists(test_file_path):
+            self.skipTest(f"Test file not found at {test_file_path}")
+
+        with open(test_file_path, "rb") as file:
+            workbook = open_annotation_workbook(file)
+            metadata_result = parse_annotation_set_metadata(iter_sheet_rows(workbook, "Annotation set metadata"))
+            label_result = parse_label_set(iter_sheet_rows(workbook, "Label set"))
+            annotation_result = parse_annotation_data(iter_sheet_rows(workbook, "Annotation data"))
+            workbook.close()
+
+        self.assertEqual(
+            metadata_result,
+            parse_annotation_set_metadata(pd.read_excel(test_file_path, sheet_name="Annotation set metadata")),
+        )
+        self.assertEqual(label_result, parse_label_set(pd.read_excel(test_file_path, sheet_name="Label set")))
+        self.assertEqual(
+            annotation_result, parse_annotation_data(pd.read_excel(test_file_path, sheet_name="Annotation data"))
+        )
+
+    def test_parsers_accept_row_iterators(self) -> None:
+        """Test that the parsers accept plain row iterators, treating None and NA strings as blank cells."""
+        metadata_rows = iter(
+            [
+                ("annotation-set-name", None, "Trial Data"),
+                ("annotation-license", "name", "MIT"),
+                (None, "uri", "NA"),
+                ("annotation-image-set", "name", "Set A"),
+                (None, "uuid", "0000-0000"),
+            ]
+        )
+        label_rows = iter(
+            [
+                ("Expected value", "Text"),
+                ("Value", "antedon", "Echinodermata", "Antedon", 123349, "Yes", None),
+                (None, None, None, None, None, None, None),
+            ]
+        )
+
+        metadata_result = parse_annotation_set_metadata(metadata_rows)
+        label_result = parse_label_set(label_rows)
+
+        self.assertEqual(metadata_result["annotation-license-name"], "MIT")
+        self.assertNotIn("annotation-license-uri", metadata_result)
+        self.assertEqual(len(label_result), 1)
+        self.assertEqual(label_result[0]["lowest_aphia_id"], "123349")
+        self.assertIsNone(label_result[0]["identification_qualifier"])
+
 
 class TestParseCoordinates(TestCase):
     """Test for parsing coordinates."""
@@ -225,6 +344,93 @@ class TestParseCoordinates(TestCase):
         self.assertEqual(_parse_coordinates(None), [])
 
 
+class TestAnnotationRecordFormats(TestCase):
+    """Tests for parsing CSV, JSON Lines and Parquet annotation files."""
+
+    def setUp(self) -> None:
+        """Parse the template file, and lay out its sections as records."""
+        test_file_path = os.path.join(
+            settings.BASE_DIR, "api", "tests", "test_data", "annotation_metadata_template_v1.xlsx"
+        )
+        with open(test_file_path, "rb") as file:
+            workbook = open_annotation_workbook(file)
+            self.expected = (
+                parse_annotation_set_metadata(iter_sheet_rows(workbook, "Annotation set metadata")),
+                parse_label_set(iter_sheet_rows(workbook, "Label set")),
+                parse_annotation_data(iter_sheet_rows(workbook, "Annotation data")),
+            )
+            workbook.close()
+
+        metadata, labels, annotations = self.expected
+        self.records = [
+            *({"section": "annotation_set", "key": key, "value": value} for key, value in metadata.items()),
+            *({"section": "label", **label} for label in labels),
+            *({"section": "annotation", **annotation} for annotation in annotations),
+        ]
+        self.fieldnames = list(dict.fromkeys(field for record in self.records for field in record))
+
+    def test_upload_format_from_extension(self) -> None:
+        """Test that the upload format is taken from the file extension."""
+        self.assertEqual(annotation_upload_format("upload.XLSX"), "xlsx")
+        self.assertEqual(annotation_upload_format("detections.jsonl"), "ndjson")
+        self.assertEqual(annotation_upload_format("detections.parquet"), "parquet")
+        self.assertIsNone(annotation_upload_format("detections.txt"))
+
+    def test_csv_matches_template_parsing(self) -> None:
+        """Test that a CSV file with the template's sections parses as the template does."""
+        text = io.StringIO()
+        writer = csv.DictWriter(text, fieldnames=self.fieldnames)
+        writer.writeheader()
+        for record in self.records:
+            writer.writerow(
+                {**record, "coordinates": json.dumps(record["coordinates"])} if "coordinates" in record else record
+            )
+
+        file = io.BytesIO(text.getvalue().encode())
+
+        self.assertEqual(parse_annotation_records(iter_annotation_records(file, "csv")), self.expected)
+        self.assertFalse(file.closed)
+
+    def test_ndjson_matches_template_parsing(self) -> None:
+        """Test that a JSON Lines file with the template's sections parses as the template does."""
+        file = io.BytesIO("\n\n".join(json.dumps(record, default=str) for record in self.records).encode())
+
+        self.assertEqual(parse_annotation_records(iter_annotation_records(file, "ndjson")), self.expected)
+
+    def test_parquet_matches_template_parsing(self) -> None:
+        """Test that a Parquet file with the template's sections parses as the template does."""
+        file = io.BytesIO()
+        # Every record gets every column, as the columns are otherwise taken from the first record
+        pq.write_table(
+            pa.Table.from_pylist([{field: record.get(field) for field in self.fieldnames} for record in self.records]),
+            file,
+        )
+        file.seek(0)
+
+        self.assertEqual(parse_annotation_records(iter_annotation_records(file, "parquet")), self.expected)
+
+    def test_iso_creation_datetime_is_parsed(self) -> None:
+        """Test that ISO 8601 and template creation date-times are both parsed."""
+        records = [
+            *self.records[:-1],
+            {**self.records[-1], "creation_datetime": "2024-01-31T12:30:00"},
+        ]
+
+        _, _, annotations = parse_annotation_records(records)
+
+        self.assertEqual(annotations[0]["creation_datetime"], datetime(2012, 12, 31, 23, 59, 59))
+        self.assertEqual(annotations[-1]["creation_datetime"], datetime(2024, 1, 31, 12, 30))
+
+    def test_invalid_records_raise_value_error(self) -> None:
+        """Test that unknown sections and malformed JSON lines raise a ValueError naming the record or line."""
+        with self.assertRaisesRegex(ValueError, "Record 2 has an unknown section 'labels'"):
+            parse_annotation_records([self.records[0], {"section": "labels"}])
+
+        file = io.BytesIO(b'{"section": "label"}\n{"section": ')
+        with self.assertRaisesRegex(ValueError, "Invalid JSON on line 2"):
+            parse_annotation_records(iter_annotation_records(file, "ndjson"))
+
+
 class TestIngestAnnotationData(TransactionTestCase):
     """Test class for testing data ingestion."""
 
@@ -3,9 +3,10 @@
 import uuid
 
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 
-from api.models import AnnotationSet, Creator, Project
+from api.models import Annotation, AnnotationLabel, AnnotationSet, Annotator, Creator, Label, Project
 from api.models.image_set import ImageSet
 from api.tests.utils.auth_utils import AuthenticatedAPITestCase
 
@@ -183,6 +184,37 @@ class AnnotationSetViewSetTests(AuthenticatedAPITestCase):
         self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(AnnotationSet.objects.filter(pk=annotation_set.pk).exists())
 
+    def test_list_annotation_set_annotations(self) -> None:
+        """Test that the annotations of a set are listed page by page, with their label and annotator."""
+        annotation_set = AnnotationSet.objects.create(name="Set A")
+        other_annotation_set = AnnotationSet.objects.create(name="Set B")
+        image = self.image_set.images.create(filename="test_image.jpg", image_set=self.image_set)
+        label = Label.objects.create(name="fish", parent_label_name="animal", annotation_set=annotation_set)
+        annotator = Annotator.objects.create(name="Alice")
+        for index, (row_annotation_set, row_annotator) in enumerate(
+            [(annotation_set, annotator), (annotation_set, None), (other_annotation_set, annotator)]
+        ):
+            annotation = Annotation.objects.create(
+                annotation_set=row_annotation_set, image=image, shape="single-pixel", coordinates=[[index, index]]
+            )
+            AnnotationLabel.objects.create(
+                annotation=annotation, label=label, annotator=row_annotator, creation_datetime=timezone.now()
+            )
+        self.client.force_authenticate(user=None)  # ensure endpoint works for anonymous users
+
+        resp = self.client.get(reverse("annotation_set-annotations", args=[annotation_set.pk]), {"page_size": 1})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["count"], 2)
+        self.assertEqual(set(resp.data["results"][0]), {"annotation", "label", "annotator"})
+        self.assertEqual(resp.data["results"][0]["annotation"]["coordinates"], [[0, 0]])
+        self.assertEqual(resp.data["results"][0]["label"]["label_id"], label.id)
+        self.assertEqual(resp.data["results"][0]["annotator"]["name"], "Alice")
+
+        resp = self.client.get(resp.data["next"])
+        self.assertEqual(resp.data["results"][0]["annotation"]["coordinates"], [[1, 1]])
+        self.assertIsNone(resp.data["results"][0]["annotator"])
+        self.assertIsNone(resp.data["next"])
+
     def test_anonymous_user_cannot_create_annotation_set(self) -> None:
         """Test that an AnnotationSet can't be created by an anonymous user."""
         payload = {
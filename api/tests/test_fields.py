@@ -1,11 +1,16 @@
 """Tests for fields views."""
 
+from unittest.mock import patch
 from uuid import UUID
 
+from django.db import IntegrityError, transaction
+from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 
 from api.models.fields import PI, Context, Creator, Event, License, Platform, Project, RelatedMaterial, Sensor
+from api.serializers.base import IDENTITY_MAP_CONTEXT_KEY
+from api.serializers.fields import ImageCameraPoseSerializer, PlatformSerializer
 from api.tests.utils.auth_utils import AuthenticatedAPITestCase
 
 
@@ -777,3 +782,63 @@ class RelatedMaterialTests(AuthenticatedAPITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         self.assertEqual(RelatedMaterial.objects.count(), 1)
+
+
+class NestedGetOrCreateTests(TestCase):
+    """Tests for the get-or-create of nested related objects."""
+
+    def save(self, serializer_class: type, data: dict, context: dict | None = None) -> object:
+        """Helper to validate and save a nested serializer."""
+        serializer = serializer_class(data=data, context=context or {})
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_existing_object_is_returned(self) -> None:
+        """Saving an object with the name and URI of an existing one should return the existing one."""
+        platform = Platform.objects.create(name="ROV", uri="http://example.com/rov")
+
+        self.assertEqual(self.save(PlatformSerializer, {"name": "ROV", "uri": "http://example.com/rov"}), platform)
+        self.assertNotEqual(self.save(PlatformSerializer, {"name": "ROV"}), platform)
+        self.assertEqual(Platform.objects.count(), 2)
+
+    def test_identity_map_resolves_each_object_once(self) -> None:
+        """Objects already resolved with the same identity map should be reused without queries."""
+        context = {IDENTITY_MAP_CONTEXT_KEY: {}}
+        platform = self.save(PlatformSerializer, {"name": "AUV"}, context)
+
+        with self.assertNumQueries(0):
+            self.assertIs(self.save(PlatformSerializer, {"name": "AUV"}, context), platform)
+        self.assertEqual(Platform.objects.get(), platform)
+
+    def test_objects_without_key_fields_are_always_created(self) -> None:
+        """Objects without key fields should be created each time, even with an identity map."""
+        context = {IDENTITY_MAP_CONTEXT_KEY: {}}
+        first = self.save(ImageCameraPoseSerializer, {"utm_zone": "30U"}, context)
+        second = self.save(ImageCameraPoseSerializer, {"utm_zone": "30U"}, context)
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(context[IDENTITY_MAP_CONTEXT_KEY], {})
+
+    def test_identity_map_returns_existing_object_with_same_key(self) -> None:
+        """Objects already stored with the same key fields should be returned on the identity map path too."""
+        platform = Platform.objects.create(name="ROV", uri="http://example.com/rov")
+        context = {IDENTITY_MAP_CONTEXT_KEY: {}}
+
+        self.assertEqual(
+            self.save(PlatformSerializer, {"name": "ROV", "uri": "http://example.com/rov"}, context), platform
+        )
+        self.assertEqual(Platform.objects.count(), 1)
+
+    def test_identity_map_raises_conflicts_on_other_constraints(self) -> None:
+        """A conflict on a constraint other than the key fields should raise, rather than be skipped."""
+        platform = Platform.objects.create(name="ROV")
+        context = {IDENTITY_MAP_CONTEXT_KEY: {}}
+
+        with (
+            patch.object(Platform._meta.pk, "_get_default", lambda: platform.pk),
+            self.assertRaisesMessage(IntegrityError, "platforms_pkey"),
+            transaction.atomic(),
+        ):
+            self.save(PlatformSerializer, {"name": "AUV"}, context)
+        self.assertEqual(context[IDENTITY_MAP_CONTEXT_KEY], {})
+        self.assertEqual(Platform.objects.get(), platform)
@@ -210,6 +210,25 @@ class ImageViewSetTests(AuthenticatedAPITestCase):
         self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Image.objects.filter(pk=image.pk).exists())
 
+    def test_geom_is_computed_by_bulk_writes(self) -> None:
+        """Test that the geom is set by the database for bulk-created and bulk-updated images, not only on save()."""
+        Image.objects.bulk_create(
+            [
+                Image(filename="located.jpg", image_set=self.image_set, latitude=50.5, longitude=-4.25),
+                Image(filename="unlocated.jpg", image_set=self.image_set),
+            ]
+        )
+        located = Image.objects.get(filename="located.jpg")
+        self.assertEqual((located.geom.x, located.geom.y, located.geom.srid), (-4.25, 50.5, 4326))
+        self.assertIsNone(Image.objects.get(filename="unlocated.jpg").geom)
+
+        Image.objects.filter(image_set=self.image_set).update(latitude=10.0, longitude=20.0)
+        for image in Image.objects.filter(image_set=self.image_set):
+            self.assertEqual((image.geom.x, image.geom.y), (20.0, 10.0))
+
+        Image.objects.filter(filename="located.jpg").update(latitude=None)
+        self.assertIsNone(Image.objects.get(filename="located.jpg").geom)
+
     def test_anonymous_user_cannot_create_image(self) -> None:
         """Test that an Image can't be PATCHed by an anonymous user."""
         payload = {
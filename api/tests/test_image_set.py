@@ -1,11 +1,17 @@
 """Tests for ImageSetViewSet."""
 
+import gzip
+import json
 import uuid
+from unittest.mock import patch
 
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
-from api.models import Creator, ImageSet, Project, RelatedMaterial
+from api.models import Creator, Image, ImageSet, Platform, Project, RelatedMaterial
 from api.tests.utils.auth_utils import AuthenticatedAPITestCase
 
 
@@ -87,7 +93,7 @@ class ImageSetViewSetTests(AuthenticatedAPITestCase):
         self.assertTrue(Creator.objects.filter(name="Ada Lovelace").exists())
         self.assertTrue(RelatedMaterial.objects.filter(uri="https://example.com/paper.pdf").exists())
 
-        # limits is computed in ImageSet.save() when bbox is present
+        # limits is computed by the database when bbox is present
         self.assertIsNotNone(image_set.limits)
 
     def test_create_image_set_with_an_existing_creator_and_project(self) -> None:
@@ -247,6 +253,26 @@ class ImageSetViewSetTests(AuthenticatedAPITestCase):
         self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(ImageSet.objects.filter(pk=image_set.pk).exists())
 
+    def test_limits_are_computed_by_bulk_writes(self) -> None:
+        """Test that the geom and limits are set by the database for bulk-updated image sets, not only on save()."""
+        image_set = ImageSet.objects.create(name="Bulk Updated")
+        ImageSet.objects.filter(pk=image_set.pk).update(
+            latitude=1.5,
+            longitude=2.5,
+            min_latitude_degrees=1.0,
+            max_latitude_degrees=2.0,
+            min_longitude_degrees=2.0,
+            max_longitude_degrees=3.0,
+        )
+        image_set.refresh_from_db()
+        self.assertEqual((image_set.geom.x, image_set.geom.y), (2.5, 1.5))
+        self.assertEqual(image_set.limits.extent, (2.0, 1.0, 3.0, 2.0))
+        self.assertEqual(image_set.limits.srid, 4326)
+
+        ImageSet.objects.filter(pk=image_set.pk).update(max_longitude_degrees=None)
+        image_set.refresh_from_db()
+        self.assertIsNone(image_set.limits)
+
     def test_anonymous_user_cannot_create_image_set(self) -> None:
         """Test that an ImageSet  can't be created by an anonymous user."""
         payload = {
@@ -255,3 +281,107 @@ class ImageSetViewSetTests(AuthenticatedAPITestCase):
         self.client.force_authenticate(user=None)
         resp = self.client.post(self.list_url(), payload, format="json")
         self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ImageSetIFDOExportTests(AuthenticatedAPITestCase):
+    """Integration tests for the iFDO export of ImageSetViewSet."""
+
+    def setUp(self) -> None:
+        """Set up an image set with images, ingested from an iFDO payload."""
+        super().setUp()
+        self.ifdo = {
+            "image-set-header": {
+                "image-set-name": "Exported Set",
+                "image-set-start-datetime": "2021-05-04 12:30:15.250000",
+                "image-project": {"name": "Project", "uri": "https://example.com/project"},
+                "image-creators": [{"name": "Ada Lovelace"}],
+                "image-set-related-material": [{"name": "Paper", "uri": "https://example.com/paper", "title": "Paper"}],
+            },
+            "image-set-items": [
+                {
+                    "image-filename": f"image_{index}.jpg",
+                    "image-latitude": 50.5,
+                    "image-longitude": -4.25,
+                    "image-platform": {"name": "ROV"},
+                    "image-creators": [{"name": "Grace Hopper"}, {"name": "Ada Lovelace"}],
+                }
+                for index in range(5)
+            ],
+        }
+        resp = self.client.post("/api/ingest/image-set", {"ifdo": self.ifdo}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.image_set = ImageSet.objects.get(pk=resp.data["image_set_id"])
+
+    def ifdo_url(self) -> str:
+        """Helper to get the iFDO export URL of the image set."""
+        return reverse("image_set-ifdo", kwargs={"pk": self.image_set.pk})
+
+    def test_export_is_inverse_of_ingest(self) -> None:
+        """The exported iFDO should have the ingested fields, and ingest back to the same image set and images."""
+        with patch("api.ingest.ifdo_export.IFDO_EXPORT_CHUNK_SIZE", 2):
+            resp = self.client.get(self.ifdo_url())
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.streaming)
+        ifdo = json.loads(b"".join(resp.streaming_content))
+        header = ifdo["image-set-header"]
+        self.assertEqual(header["image-set-uuid"], str(self.image_set.pk))
+        self.assertEqual(header["image-set-start-datetime"], "2021-05-04 12:30:15.250000")
+        self.assertEqual(header["image-project"], self.ifdo["image-set-header"]["image-project"])
+        self.assertEqual(header["image-creators"], [{"name": "Ada Lovelace"}])
+        self.assertEqual(header["image-set-related-material"][0]["uri"], "https://example.com/paper")
+        items = ifdo["image-set-items"]
+        self.assertEqual([item["image-filename"] for item in items], [f"image_{index}.jpg" for index in range(5)])
+        for item in items:
+            self.assertEqual(item["image-platform"], {"name": "ROV"})
+            self.assertEqual(item["image-creators"], [{"name": "Grace Hopper"}, {"name": "Ada Lovelace"}])
+            self.assertEqual((item["image-latitude"], item["image-longitude"]), (50.5, -4.25))
+
+        self.image_set.delete()
+        resp = self.client.post("/api/ingest/image-set", {"ifdo": ifdo}, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["image_set_id"], uuid.UUID(header["image-set-uuid"]))
+        self.assertEqual(Image.objects.filter(image_set_id=resp.data["image_set_id"]).count(), 5)
+        self.assertEqual(Platform.objects.count(), 1)
+
+    def test_export_related_objects_are_fetched_once(self) -> None:
+        """The objects shared by the images should be fetched once, and the creator links once per chunk."""
+        with patch("api.ingest.ifdo_export.IFDO_EXPORT_CHUNK_SIZE", 2), CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(self.ifdo_url())
+            b"".join(resp.streaming_content)
+
+        def count(table: str) -> int:
+            return sum(f'FROM "{table}"' in query["sql"] for query in queries.captured_queries)
+
+        self.assertEqual(count("platforms"), 1)
+        self.assertEqual(count("creators"), 1)
+        self.assertEqual(count("image_creators"), 3)
+
+    def test_export_gzip(self) -> None:
+        """With Accept-Encoding: gzip, the document should be gzip compressed."""
+        resp = self.client.get(self.ifdo_url(), HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", resp["Vary"])
+        ifdo = json.loads(gzip.decompress(b"".join(resp.streaming_content)))
+        self.assertEqual(len(ifdo["image-set-items"]), 5)
+
+    def test_exported_file_can_be_uploaded(self) -> None:
+        """The exported document should ingest back to the same image set when uploaded as an iFDO file."""
+        resp = self.client.get(self.ifdo_url(), HTTP_ACCEPT_ENCODING="gzip")
+        file = SimpleUploadedFile("ifdo.json.gz", b"".join(resp.streaming_content))
+        image_set_id = self.image_set.pk
+        self.image_set.delete()
+
+        resp = self.client.post("/api/ingest/image-set", {"file": file}, format="multipart")
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["image_set_id"], image_set_id)
+        self.assertEqual(Image.objects.filter(image_set_id=resp.data["image_set_id"]).count(), 5)
+
+    def test_export_unknown_image_set(self) -> None:
+        """Exporting an unknown image set should return 404."""
+        resp = self.client.get(reverse("image_set-ifdo", kwargs={"pk": uuid.uuid4()}))
+
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
@@ -1,12 +1,19 @@
 """Tests for ingest_ifdo_image_set view."""
 
+import gzip
+import json
 import uuid
 from unittest.mock import Mock, patch
 
+import zstandard
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 from api.ingest.data_subs_mapping import IFDOAdaptError
-from api.models import Image, ImageSet
+from api.models import Creator, Image, ImageCameraPose, ImagePhotometricCalibration, ImageSet, Platform, Project
 from api.tests.utils.auth_utils import AuthenticatedAPITestCase
 
 
@@ -268,6 +275,30 @@ class IngestIFDOViewTests(AuthenticatedAPITestCase):
         self.assertEqual(ImageSet.objects.count(), 0)
         self.assertEqual(Image.objects.count(), 0)
 
+    def test_ingest_ifdo_resolves_repeated_related_objects_once(self) -> None:
+        """Related objects repeated by the header and items should be created once, or reuse existing ones."""
+        platform = Platform.objects.create(name="ROV", uri="http://example.com/rov")
+        payload = {
+            "ifdo": {
+                "image-set-header": {
+                    "image-set-name": "Repeated Set",
+                    "image-platform": {"name": "ROV", "uri": "http://example.com/rov"},
+                    "image-creators": [{"name": "Alice"}],
+                },
+                "image-set-items": [
+                    {"image-filename": "a.jpg", "image-platform": {"name": "ROV", "uri": "http://example.com/rov"}},
+                    {"image-filename": "b.jpg", "image-creators": [{"name": "Alice"}, {"name": "Bob"}]},
+                ],
+            },
+        }
+
+        resp = self.client.post(self.ingest_url(), payload, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Platform.objects.get(), platform)
+        self.assertEqual(Image.objects.get(filename="a.jpg").platform, platform)
+        self.assertEqual(sorted(Creator.objects.values_list("name", flat=True)), ["Alice", "Bob"])
+
     def test_anonymous_user_cannot_ingest_ifdo(self) -> None:
         """Test that an anonymous user can't create ImageSet and Images ."""
         payload = {
@@ -281,3 +312,359 @@ class IngestIFDOViewTests(AuthenticatedAPITestCase):
 
         resp = self.client.post(self.ingest_url(), payload, format="json")
         self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@patch("api.views.ingest_imagery.IFDO_BULK_THRESHOLD", 2)
+class BulkIngestIFDOViewTests(AuthenticatedAPITestCase):
+    """Integration tests for the bulk ingest of the image items of large iFDO payloads."""
+
+    def ingest_url(self) -> str:
+        """Helper to get the ingest URL."""
+        return "/api/ingest/image-set"
+
+    def post_items(self, items: list) -> object:
+        """Helper to post an iFDO payload with the given image items."""
+        payload = {"ifdo": {"image-set-header": {"image-set-name": "Bulk Set"}, "image-set-items": items}}
+        return self.client.post(self.ingest_url(), payload, format="json")
+
+    def test_bulk_ingest_creates_images_and_shared_related_objects_once(self) -> None:
+        """Images should be created with their location, and related objects shared by items created once."""
+        items = [
+            {
+                "image-filename": f"image_{index}.jpg",
+                "image-latitude": 50.5,
+                "image-longitude": -4.25,
+                "image-project": {"name": "Dive project", "uri": "https://example.org/project"},
+                "image-creators": [{"name": "Alice"}, {"name": "Bob"}],
+                "image-camera-pose": {"name": "pose"},
+            }
+            for index in range(3)
+        ]
+
+        resp = self.post_items(items)
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["image_count"], 3)
+        images = Image.objects.filter(image_set_id=resp.data["image_set_id"])
+        self.assertEqual(images.count(), 3)
+        self.assertEqual(Project.objects.count(), 1)
+        self.assertEqual(Creator.objects.count(), 2)
+        self.assertEqual(ImageCameraPose.objects.count(), 3)
+        image = images.get(filename="image_0.jpg")
+        self.assertEqual(image.project.name, "Dive project")
+        self.assertEqual(sorted(image.creators.values_list("name", flat=True)), ["Alice", "Bob"])
+        self.assertEqual((image.geom.x, image.geom.y), (-4.25, 50.5))
+
+    def test_bulk_ingest_reports_invalid_items_and_rolls_back(self) -> None:
+        """Adapter, serializer and unique field errors should be reported by item, and nothing created."""
+        image_set = ImageSet.objects.create(name="Existing Set")
+        image = Image.objects.create(image_set=image_set, filename="existing.jpg", sha256_hash="a" * 64)
+        items = [
+            {"image-filename": "a.jpg", "image-uuid": str(image.id)},
+            "not-an-object",
+            {"image-filename": "c.jpg", "image-latitude": "north"},
+            {"image-filename": "d.jpg", "image-hash-sha256": "a" * 64},
+            {"image-filename": "e.jpg", "image-entropy": "high"},
+            {"image-filename": "f.jpg"},
+            {"image-filename": "f.jpg"},
+        ]
+
+        resp = self.post_items(items)
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(resp.data["items"]), ["2", "3", "5"])
+        self.assertEqual(resp.data["items"]["2"]["detail"], "Item must be an object")
+
+        resp = self.post_items([items[0], items[3], items[5], items[6]])
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(image.id), resp.data["items"]["1"]["detail"])
+        self.assertIn("sha256_hash", resp.data["items"]["2"]["detail"])
+        self.assertIn("filename f.jpg", resp.data["items"]["4"]["detail"])
+        self.assertNotIn("3", resp.data["items"])
+        self.assertEqual(ImageSet.objects.count(), 1)
+        self.assertEqual(Image.objects.count(), 1)
+
+
+class UpsertIngestIFDOViewTests(AuthenticatedAPITestCase):
+    """Integration tests for re-ingesting the iFDO payload of an existing image set."""
+
+    url = "/api/ingest/image-set"
+    image_set_uuid = "6f1c1e9e-3b5a-4d2e-9a41-0c9b8f6a2d10"
+
+    def payload(self, name: str, items: list) -> dict:
+        """Helper to build an upsert iFDO payload of the image set with the given name and image items."""
+        header = {"image-set-name": name, "image-set-uuid": self.image_set_uuid}
+        return {"mode": "upsert", "ifdo": {"image-set-header": header, "image-set-items": items}}
+
+    def test_upsert_only_writes_changed_items(self) -> None:
+        """Unchanged items should be skipped, changed ones update their image, and the new and missing ones synced."""
+        location = {"image-latitude": 50.0, "image-longitude": -4.0}
+        items = [{"image-filename": f"image_{index}.jpg", **location} for index in range(4)]
+
+        resp = self.client.post(self.url, self.payload("Nightly Set", items), format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["counts"], {"created": 4, "updated": 0, "unchanged": 0, "deleted": 0})
+        ids = dict(Image.objects.values_list("filename", "id"))
+        updated_at = dict(Image.objects.values_list("filename", "updated_at"))
+        self.assertFalse(Image.objects.filter(content_hash__isnull=True).exists())
+
+        items[1] = {**items[1], "image-latitude": 51.5, "image-creators": [{"name": "Alice"}]}
+        items[3] = {"image-filename": "image_4.jpg", **location}
+        with patch("api.ingest.images_ingest.IFDO_BULK_BATCH_SIZE", 2):
+            resp = self.client.post(self.url, self.payload("Nightly Set (v2)", items), format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["image_count"], 4)
+        self.assertEqual(resp.data["counts"], {"created": 1, "updated": 1, "unchanged": 2, "deleted": 1})
+        self.assertEqual(ImageSet.objects.get().name, "Nightly Set (v2)")
+        images = {image.filename: image for image in Image.objects.all()}
+        self.assertEqual(sorted(images), ["image_0.jpg", "image_1.jpg", "image_2.jpg", "image_4.jpg"])
+        self.assertEqual(images["image_1.jpg"].id, ids["image_1.jpg"])
+        self.assertEqual(images["image_1.jpg"].geom.y, 51.5)
+        self.assertEqual(list(images["image_1.jpg"].creators.values_list("name", flat=True)), ["Alice"])
+        self.assertEqual(images["image_0.jpg"].updated_at, updated_at["image_0.jpg"])
+        self.assertGreater(images["image_1.jpg"].updated_at, updated_at["image_1.jpg"])
+
+    def test_upsert_item_errors_roll_back_everything(self) -> None:
+        """Invalid or duplicated items should be reported, and the image set and its images left as they were."""
+        items = [{"image-filename": "a.jpg"}, {"image-filename": "b.jpg"}]
+        self.client.post(self.url, self.payload("Nightly Set", items), format="json")
+
+        items = [{"image-filename": "a.jpg", "image-latitude": "north"}, {"image-filename": "c.jpg"}]
+        items.append({"image-filename": "c.jpg"})
+        resp = self.client.post(self.url, self.payload("Nightly Set (v2)", items), format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(resp.data["items"]), ["1", "3"])
+        self.assertEqual(ImageSet.objects.get().name, "Nightly Set")
+        self.assertEqual(sorted(Image.objects.values_list("filename", flat=True)), ["a.jpg", "b.jpg"])
+
+    def test_upsert_item_with_another_image_uuid_conflicts(self) -> None:
+        """Items whose image-uuid isn't the id of the image with their filename should be reported as conflicts."""
+        image_uuid = str(uuid.uuid4())
+        items = [{"image-filename": "a.jpg", "image-uuid": image_uuid}, {"image-filename": "b.jpg"}]
+        self.client.post(self.url, self.payload("Nightly Set", items), format="json")
+
+        items[0]["image-uuid"] = str(uuid.uuid4())
+        resp = self.client.post(self.url, self.payload("Nightly Set (v2)", items), format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(resp.data["items"]), ["1"])
+        self.assertIn(f"already exists with image-uuid {image_uuid}", resp.data["items"]["1"]["detail"])
+        self.assertEqual(str(Image.objects.get(filename="a.jpg").id), image_uuid)
+
+        items[0] = {"image-filename": "a.jpg", "image-uuid": image_uuid, "image-latitude": 51.5}
+        resp = self.client.post(self.url, self.payload("Nightly Set (v2)", items), format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["counts"], {"created": 0, "updated": 1, "unchanged": 1, "deleted": 0})
+
+    def test_upsert_replaces_the_camera_parameters_of_changed_images(self) -> None:
+        """Camera parameters of updated and deleted images should be deleted, not left behind with no image."""
+        parameters = {"image-camera-pose": {"name": "pose"}, "image-photometric-calibration": {"name": "calibration"}}
+        items = [{"image-filename": f"image_{index}.jpg", **parameters} for index in range(3)]
+        self.client.post(self.url, self.payload("Nightly Set", items), format="json")
+        self.assertEqual((ImageCameraPose.objects.count(), ImagePhotometricCalibration.objects.count()), (3, 3))
+
+        items[0] = {**items[0], "image-latitude": 51.5}
+        items[1] = {**items[1], "image-longitude": -4.0}
+        resp = self.client.post(self.url, self.payload("Nightly Set", items[:2]), format="json")
+
+        self.assertEqual(resp.data["counts"], {"created": 0, "updated": 2, "unchanged": 0, "deleted": 1})
+        self.assertEqual((ImageCameraPose.objects.count(), ImagePhotometricCalibration.objects.count()), (2, 2))
+        self.assertEqual(
+            set(ImageCameraPose.objects.values_list("pk", flat=True)),
+            set(Image.objects.values_list("camera_pose", flat=True)),
+        )
+
+    def test_upsert_locks_the_image_set(self) -> None:
+        """The existing image set should be read with a row lock, in the transaction of the upsert."""
+        items = [{"image-filename": "a.jpg"}]
+        self.client.post(self.url, self.payload("Nightly Set", items), format="json")
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.post(self.url, self.payload("Nightly Set (v2)", items), format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        locks = [query["sql"] for query in queries.captured_queries if query["sql"].endswith("FOR UPDATE")]
+        self.assertEqual(len(locks), 1)
+        self.assertIn('FROM "image_sets"', locks[0])
+
+    def test_upsert_options_are_checked(self) -> None:
+        """Unknown modes and chunked upserts should be rejected before anything is ingested."""
+        payload = self.payload("Nightly Set", [{"image-filename": "a.jpg"}])
+
+        resp = self.client.post(self.url, {**payload, "mode": "replace"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.data["detail"], "mode must be one of create, upsert")
+
+        resp = self.client.post(self.url, {**payload, "background": True, "chunked": True}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("can't be chunked", resp.data["detail"])
+        self.assertEqual(ImageSet.objects.count(), 0)
+
+    @patch("api.views.ingest_imagery.IFDO_STREAMING_THRESHOLD", 0)
+    def test_streamed_upsert(self) -> None:
+        """Streamed payloads should be upserted with the mode query parameter, and not take it from the body."""
+        payload = self.payload("Nightly Set", [{"image-filename": "a.jpg"}])
+
+        resp = self.client.post(self.url, payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+        del payload["mode"]
+        for expected_status in (status.HTTP_201_CREATED, status.HTTP_200_OK):
+            resp = self.client.post(f"{self.url}?mode=upsert", payload, format="json")
+            self.assertEqual(resp.status_code, expected_status)
+        self.assertEqual(resp.data["counts"], {"created": 0, "updated": 0, "unchanged": 1, "deleted": 0})
+
+
+@patch("api.views.ingest_imagery.IFDO_STREAMING_THRESHOLD", 0)
+class StreamingIngestIFDOViewTests(AuthenticatedAPITestCase):
+    """Integration tests for the streamed ingest of large iFDO payloads."""
+
+    def ingest_url(self) -> str:
+        """Helper to get the ingest URL."""
+        return "/api/ingest/image-set"
+
+    def test_streamed_payload_creates_imageset_and_images(self) -> None:
+        """A streamed payload should create the ImageSet and its Images in batches."""
+        payload = {
+            "submission_id": "sub-123",
+            "ifdo": {
+                "image-set-header": {"image-set-name": "Streamed Set", "image-platform": {"name": "ROV"}},
+                "image-set-items": [
+                    {"image-filename": f"image_{index}.jpg", "image-platform": {"name": "ROV"}} for index in range(5)
+                ],
+            },
+        }
+
+        with patch("api.ingest.images_ingest.IFDO_BULK_BATCH_SIZE", 2):
+            resp = self.client.post(self.ingest_url(), payload, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["image_count"], 5)
+        self.assertEqual(Image.objects.filter(image_set__name="Streamed Set", platform__name="ROV").count(), 5)
+        self.assertEqual(Platform.objects.count(), 1)
+
+    def test_streamed_item_errors_are_numbered_across_batches(self) -> None:
+        """Errors of items in later batches should name their index in the payload, and nothing be created."""
+        items = [{"image-filename": f"image_{index}.jpg"} for index in range(5)]
+        items[3] = {"image-filename": "image_0.jpg"}
+        payload = {"ifdo": {"image-set-header": {"image-set-name": "Streamed Set"}, "image-set-items": items}}
+
+        with patch("api.ingest.images_ingest.IFDO_BULK_BATCH_SIZE", 2):
+            resp = self.client.post(self.ingest_url(), payload, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(resp.data["items"]), ["4"])
+        self.assertEqual(ImageSet.objects.count(), 0)
+        self.assertEqual(Image.objects.count(), 0)
+
+    @override_settings(IFDO_UPLOAD_WORKERS=2)
+    def test_streamed_items_are_validated_by_worker_processes(self) -> None:
+        """Batches validated by worker processes should give the same images and errors as in the request process."""
+        items = [{"image-filename": f"image_{index}.jpg", "image-platform": {"name": "ROV"}} for index in range(5)]
+        payload = {"ifdo": {"image-set-header": {"image-set-name": "Parallel Set"}, "image-set-items": items}}
+
+        with patch("api.ingest.images_ingest.IFDO_BULK_BATCH_SIZE", 2):
+            resp = self.client.post(self.ingest_url(), payload, format="json")
+
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(Image.objects.filter(image_set__name="Parallel Set", platform__name="ROV").count(), 5)
+            self.assertEqual(Platform.objects.count(), 1)
+
+            items[4] = {"image-filename": "image_5.jpg", "image-latitude": "north"}
+            payload["ifdo"]["image-set-header"]["image-set-name"] = "Invalid Set"
+            resp = self.client.post(self.ingest_url(), payload, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(resp.data["items"]), ["5"])
+        self.assertFalse(ImageSet.objects.filter(name="Invalid Set").exists())
+
+    def test_streamed_payload_needs_header_before_items(self) -> None:
+        """Items before the header can't be streamed, and should be rejected."""
+        payload = {"ifdo": {"image-set-items": [{"image-filename": "a.jpg"}], "image-set-header": {}}}
+
+        resp = self.client.post(self.ingest_url(), payload, format="json")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("must come before", resp.data["detail"])
+        self.assertEqual(ImageSet.objects.count(), 0)
+
+
+class CompressedIngestIFDOViewTests(AuthenticatedAPITestCase):
+    """Integration tests for the ingest of compressed iFDO request bodies and iFDO files."""
+
+    url = "/api/ingest/image-set"
+    payload = {
+        "ifdo": {
+            "image-set-header": {"image-set-name": "Compressed Set"},
+            "image-set-items": [{"image-filename": "a.jpg"}, {"image-filename": "b.jpg"}],
+        },
+    }
+    yaml_file = b"""
+image-set-header:
+  image-set-name: Compressed Set
+image-set-items:
+  - image-filename: a.jpg
+  - image-filename: b.jpg
+"""
+
+    def assert_ingested(self, resp: object) -> None:
+        """Helper to check that the payload was ingested."""
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.data["image_count"], 2)
+        filenames = Image.objects.filter(image_set__name="Compressed Set").values_list("filename", flat=True)
+        self.assertEqual(sorted(filenames), ["a.jpg", "b.jpg"])
+
+    def test_gzip_body(self) -> None:
+        """A gzip compressed body should be decompressed as it is ingested."""
+        body = gzip.compress(json.dumps(self.payload).encode())
+
+        resp = self.client.post(self.url, body, content_type="application/json", HTTP_CONTENT_ENCODING="gzip")
+
+        self.assert_ingested(resp)
+
+    def test_zstd_body(self) -> None:
+        """A zstd compressed body should be decompressed as it is ingested."""
+        body = zstandard.ZstdCompressor().compress(json.dumps(self.payload).encode())
+
+        resp = self.client.post(self.url, body, content_type="application/json", HTTP_CONTENT_ENCODING="zstd")
+
+        self.assert_ingested(resp)
+
+    def test_unsupported_or_invalid_content_encoding(self) -> None:
+        """Bodies with an unsupported Content-Encoding, or not compressed as it says, should be rejected."""
+        body = json.dumps(self.payload).encode()
+
+        for encoding, detail in (("br", "Unsupported Content-Encoding"), ("gzip", "Invalid compressed data")):
+            with self.subTest(encoding=encoding):
+                resp = self.client.post(self.url, body, content_type="application/json", HTTP_CONTENT_ENCODING=encoding)
+                self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(detail, resp.data["detail"])
+        self.assertEqual(ImageSet.objects.count(), 0)
+
+    def test_ifdo_files(self) -> None:
+        """JSON and YAML iFDO files (the bare iFDO object), optionally compressed, should be ingested."""
+        json_file = json.dumps(self.payload["ifdo"]).encode()
+        files = {
+            "ifdo.json": json_file,
+            "ifdo.json.gz": gzip.compress(json_file),
+            "ifdo.yaml": self.yaml_file,
+            "ifdo.yml.zst": zstandard.ZstdCompressor().compress(self.yaml_file),
+        }
+
+        for filename, content in files.items():
+            with self.subTest(filename=filename):
+                resp = self.client.post(self.url, {"file": SimpleUploadedFile(filename, content)}, format="multipart")
+                self.assert_ingested(resp)
+                ImageSet.objects.all().delete()
+
+    def test_unsupported_ifdo_file(self) -> None:
+        """Files that aren't JSON or YAML should be rejected."""
+        resp = self.client.post(self.url, {"file": SimpleUploadedFile("ifdo.csv", b"a,b")}, format="multipart")
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("not a .json, .yaml, .yml file", resp.data["detail"])
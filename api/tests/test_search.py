@@ -14,6 +14,7 @@ from api.models.annotation import Annotator
 from api.models.annotation_set import AnnotationSet
 from api.models.fields import Platform, Project
 from api.models.image_set import ImageSet
+from api.models.taxon_name import TaxonName
 from api.views.search import AnnotationSearchViewSet, _get_aphia_ids_by_name_part, _get_descendant_aphia_ids
 
 
@@ -433,6 +434,23 @@ class AnnotationSearchViewSetTests(APITestCase):
         self.assertEqual(result, [])
         mocked_client.aphia_ids_by_name_part.assert_called_once_with("cod", combine_vernaculars=True)
 
+    @patch("api.views.search.CachedWoRMSClient")
+    def test_get_aphia_ids_by_name_part_uses_local_index_first(self, mocked_client_cls: Mock) -> None:
+        """Test name-part helper lists the matches of the local taxon name index first, then the ones of WoRMS.
+
+        Args:
+            mocked_client_cls (Mock): Mock of the CachedWoRMSClient class.
+        """
+        TaxonName.objects.create(aphia_id=1001, name="Gadus morhua")
+        TaxonName.objects.create(aphia_id=1001, name="Atlantic cod", is_vernacular=True, language_code="eng")
+        mocked_client = mocked_client_cls.return_value
+        mocked_client.aphia_ids_by_name_part.return_value = [2002, 1001]
+
+        self.assertEqual(_get_aphia_ids_by_name_part("cod"), [1001, 2002])
+
+        mocked_client.aphia_ids_by_name_part.side_effect = requests.RequestException()
+        self.assertEqual(_get_aphia_ids_by_name_part("cod"), [1001])
+
     @patch("api.views.search.AnnotationSearchViewSet.paginator", new_callable=PropertyMock)
     @patch("api.views.search._get_aphia_ids_by_name_part")
     def test_list_filters_by_name_part_with_no_pagination(
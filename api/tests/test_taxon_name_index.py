@@ -0,0 +1,96 @@
+"""Tests for the local taxon name index and its refresh management command."""
+
+from io import StringIO
+from unittest.mock import MagicMock, Mock, patch
+
+import requests
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models import AnnotationSet, Label, TaxonName
+from api.services.taxon_name_index import aphia_ids_by_name_part, held_aphia_ids, refresh_taxon_names
+
+GADUS_MORHUA = {
+    "AphiaID": 126436,
+    "scientificname": "Gadus morhua",
+    "vernaculars": [
+        {"vernacular": "Atlantic cod", "language_code": "eng"},
+        {"vernacular": "cabillaud", "language_code": "fra"},
+        {"vernacular": "Atlantic cod", "language_code": "eng"},
+    ],
+}
+
+
+class TaxonNameIndexTests(TestCase):
+    """Tests for resolving and refreshing taxon names."""
+
+    def test_aphia_ids_by_name_part_is_case_insensitive_and_distinct(self) -> None:
+        """Test that scientific and vernacular names of the same taxon resolve to a single AphiaID."""
+        TaxonName.objects.create(aphia_id=126436, name="Gadus morhua")
+        TaxonName.objects.create(aphia_id=126436, name="Atlantic cod", is_vernacular=True)
+        TaxonName.objects.create(aphia_id=2002, name="Cancer pagurus")
+
+        self.assertEqual(aphia_ids_by_name_part("  GADUS "), [126436])
+        self.assertEqual(aphia_ids_by_name_part("a"), [2002, 126436])
+        self.assertEqual(aphia_ids_by_name_part("nothing"), [])
+
+    def test_held_aphia_ids_returns_distinct_label_aphia_ids(self) -> None:
+        """Test that only distinct, non-null AphiaIDs referenced by labels are returned."""
+        annotation_set = AnnotationSet.objects.create(name="Set")
+        Label.objects.create(annotation_set=annotation_set, name="cod", parent_label_name="fish", lowest_aphia_id=2)
+        Label.objects.create(annotation_set=annotation_set, name="cod2", parent_label_name="fish", lowest_aphia_id=2)
+        Label.objects.create(annotation_set=annotation_set, name="crab", parent_label_name="crust", lowest_aphia_id=1)
+        Label.objects.create(annotation_set=annotation_set, name="sand", parent_label_name="habitat")
+
+        self.assertEqual(held_aphia_ids(), [1, 2])
+
+    def test_refresh_replaces_names_for_each_taxon(self) -> None:
+        """Test that refreshing replaces stale names with the scientific and distinct vernacular names."""
+        TaxonName.objects.create(aphia_id=126436, name="Stale name")
+        client = MagicMock()
+        client.taxon.return_value = GADUS_MORHUA
+
+        summary = refresh_taxon_names([126436], client=client)
+
+        self.assertEqual(summary, {"taxa": 1, "names": 3, "failed": 0})
+        names = TaxonName.objects.filter(aphia_id=126436)
+        self.assertEqual(
+            sorted(names.values_list("name", "is_vernacular")),
+            [("Atlantic cod", True), ("Gadus morhua", False), ("cabillaud", True)],
+        )
+
+    def test_refresh_keeps_existing_names_when_worms_is_unreachable(self) -> None:
+        """Test that a WoRMS failure is counted and keeps the previously indexed names."""
+        TaxonName.objects.create(aphia_id=126436, name="Gadus morhua")
+        client = MagicMock()
+        client.taxon.side_effect = requests.RequestException()
+
+        summary = refresh_taxon_names([126436], client=client)
+
+        self.assertEqual(summary, {"taxa": 0, "names": 0, "failed": 1})
+        self.assertTrue(TaxonName.objects.filter(aphia_id=126436, name="Gadus morhua").exists())
+
+    @patch("api.management.commands.refresh_taxon_names.refresh_taxon_names")
+    def test_command_refreshes_held_aphia_ids(self, mock_refresh: Mock) -> None:
+        """Test that the command refreshes every AphiaID referenced by a label by default."""
+        annotation_set = AnnotationSet.objects.create(name="Set")
+        Label.objects.create(annotation_set=annotation_set, name="cod", parent_label_name="fish", lowest_aphia_id=7)
+        mock_refresh.return_value = {"taxa": 1, "names": 2, "failed": 0}
+
+        out = StringIO()
+        call_command("refresh_taxon_names", stdout=out)
+
+        mock_refresh.assert_called_once_with([7])
+        self.assertIn("Names indexed: 2", out.getvalue())
+
+    @patch("api.management.commands.refresh_taxon_names.refresh_taxon_names")
+    def test_command_missing_only_skips_indexed_aphia_ids(self, mock_refresh: Mock) -> None:
+        """Test that --missing-only only harvests AphiaIDs that are not in the index yet."""
+        TaxonName.objects.create(aphia_id=1, name="Already indexed")
+        mock_refresh.return_value = {"taxa": 1, "names": 1, "failed": 1}
+
+        out = StringIO()
+        call_command("refresh_taxon_names", "--aphia-ids", "1", "2", "--missing-only", stdout=out)
+
+        mock_refresh.assert_called_once_with([2])
+        self.assertIn("1 taxa could not be fetched", out.getvalue())
@@ -1,6 +1,8 @@
 """Tests for UploadAnnotationsView."""
 
 import io
+import json
+import uuid
 from unittest.mock import Mock, patch
 
 import pandas as pd
@@ -69,14 +71,14 @@ class UploadAnnotationsViewTests(AuthenticatedAPITestCase):
         self.assertEqual(response.data["data"]["status"], "success")
         self.assertEqual(response.data["data"]["count"], 10)
 
-    def test_upload_annotations_rejects_non_xlsx_file(self) -> None:
-        """Test that uploading a non-.xlsx file is rejected."""
+    def test_upload_annotations_rejects_unsupported_file(self) -> None:
+        """Test that uploading a file in an unsupported format is rejected."""
         text_file = SimpleUploadedFile("test_file.txt", b"This is not an Excel file", content_type="text/plain")
 
         response = self.client.post(self.upload_url, {"file": text_file}, format="multipart")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertEqual(response.data["error"], "Provided file is not a .xlsx file.")
+        self.assertEqual(response.data["error"], "Provided file is not a .xlsx, .csv, .ndjson, .jsonl, .parquet file.")
 
     def test_upload_annotations_rejects_invalid_excel_file(self) -> None:
         """Test that uploading an invalid Excel file is rejected."""
@@ -113,6 +115,21 @@ class UploadAnnotationsViewTests(AuthenticatedAPITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("error", response.data)
+        self.assertEqual(response.data["error"], "Missing sheets: Annotation set metadata, Label set, Annotation data")
+
+    def test_upload_annotations_names_the_missing_sheet(self) -> None:
+        """Test that a workbook missing one of the template sheets is rejected with the name of that sheet."""
+        file_stream = io.BytesIO()
+        with pd.ExcelWriter(file_stream, engine="openpyxl") as writer:
+            pd.DataFrame([{"name": "Test Set"}]).to_excel(writer, index=False, sheet_name="Annotation set metadata")
+            pd.DataFrame([{"annotation_id": 1}]).to_excel(writer, index=False, sheet_name="Annotation data")
+        file_stream.seek(0)
+        file_stream.name = "no_labels.xlsx"
+
+        response = self.client.post(self.upload_url, {"file": file_stream}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"], "Missing sheets: Label set")
 
     @patch("api.views.annotation.parse_annotation_set_metadata")
     @patch("api.views.annotation.parse_label_set")
@@ -143,7 +160,160 @@ class UploadAnnotationsViewTests(AuthenticatedAPITestCase):
             self.mock_annotation_set,
             self.mock_label_data,
             self.mock_annotation_data,
+            backend=None,
+            validate_coordinates=False,
+            with_data=True,
+            mode="create",
+        )
+
+    @patch("api.views.annotation.parse_annotation_set_metadata")
+    @patch("api.views.annotation.parse_label_set")
+    @patch("api.views.annotation.parse_annotation_data")
+    @patch("api.views.annotation.ingest_annotation_data")
+    def test_upload_annotations_passes_backend_to_ingest(
+        self, mock_ingest: Mock, mock_parse_annotation: Mock, mock_parse_label: Mock, mock_parse_set: Mock
+    ) -> None:
+        """Test that the requested ingest backend is passed on, and unknown backends are rejected."""
+        mock_parse_set.return_value = self.mock_annotation_set
+        mock_parse_label.return_value = self.mock_label_data
+        mock_parse_annotation.return_value = self.mock_annotation_data
+        mock_ingest.return_value = {}
+
+        response = self.client.post(
+            self.upload_url, {"file": self.create_mock_xlsx_file(), "backend": "copy"}, format="multipart"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            mock_ingest.call_args.kwargs,
+            {"backend": "copy", "validate_coordinates": False, "with_data": True, "mode": "create"},
+        )
+
+        response = self.client.post(
+            self.upload_url, {"file": self.create_mock_xlsx_file(), "backend": "fast"}, format="multipart"
         )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("backend", response.data)
+
+    @patch("api.views.annotation.ANNOTATION_SUMMARY_RESPONSE_THRESHOLD", 2)
+    @patch("api.views.annotation.parse_annotation_set_metadata")
+    @patch("api.views.annotation.parse_label_set")
+    @patch("api.views.annotation.parse_annotation_data")
+    @patch("api.views.annotation.ingest_annotation_data")
+    def test_upload_annotations_returns_summary_for_large_uploads(
+        self, mock_ingest: Mock, mock_parse_annotation: Mock, mock_parse_label: Mock, mock_parse_set: Mock
+    ) -> None:
+        """Test that large uploads, or uploads asking for it, only get counts, ids and timings back."""
+        mock_parse_set.return_value = self.mock_annotation_set
+        mock_parse_label.return_value = self.mock_label_data
+        mock_parse_annotation.return_value = self.mock_annotation_data * 2
+        annotation_set_id = uuid.uuid4()
+        mock_ingest.return_value = {
+            "annotation_set": {"id": annotation_set_id, "name": "Test Annotation Set"},
+            "label_set": [{}],
+            "annotation_data": {"created": 2},
+        }
+
+        response = self.client.post(self.upload_url, {"file": self.create_mock_xlsx_file()}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(mock_ingest.call_args.kwargs["with_data"], False)
+        summary = response.data["summary"]
+        self.assertEqual((summary["annotation_set_id"], summary["label_count"]), (annotation_set_id, 1))
+        self.assertEqual(summary["created"], 2)
+        self.assertEqual(set(summary["timings"]), {"parse_seconds", "ingest_seconds"})
+        self.assertTrue(
+            summary["annotations_url"].endswith(reverse("annotation_set-annotations", args=[annotation_set_id]))
+        )
+
+        # A full response can still be requested, and a summary requested for small uploads
+        response = self.client.post(
+            self.upload_url, {"file": self.create_mock_xlsx_file(), "response": "full"}, format="multipart"
+        )
+        self.assertEqual(response.data["data"], mock_ingest.return_value)
+        self.assertEqual(mock_ingest.call_args.kwargs["with_data"], True)
+
+        mock_parse_annotation.return_value = self.mock_annotation_data
+        response = self.client.post(
+            self.upload_url, {"file": self.create_mock_xlsx_file(), "response": "summary"}, format="multipart"
+        )
+        self.assertIn("summary", response.data)
+        self.assertEqual(mock_ingest.call_args.kwargs["with_data"], False)
+
+    @patch("api.views.annotation.ingest_annotation_data")
+    def test_upload_annotations_accepts_json_lines_file(self, mock_ingest: Mock) -> None:
+        """Test that a JSON Lines file is parsed by section and ingested like a template file."""
+        mock_ingest.return_value = {}
+        records = [
+            {"section": "annotation_set", "key": "annotation-set-name", "value": "Detections"},
+            {"section": "annotation_set", "key": "annotation-license-name", "value": "CC-BY-4.0"},
+            {"section": "annotation_set", "key": "annotation-image-set-name", "value": "Dive 1"},
+            {"section": "annotation_set", "key": "annotation-image-set-uuid", "value": "1234"},
+            {"section": "label", "name": "fish", "parent_label_name": "animal", "name_is_lowest": False},
+            {
+                "section": "annotation",
+                "image_filename": "image_001.jpg",
+                "label_name": "fish",
+                "shape": "rectangle",
+                "coordinates": [[1, 2, 3, 4]],
+                "creation_datetime": "2024-01-31T12:30:00",
+            },
+        ]
+        ndjson_file = SimpleUploadedFile(
+            "detections.ndjson", "\n".join(json.dumps(record) for record in records).encode()
+        )
+
+        response = self.client.post(self.upload_url, {"file": ndjson_file}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        annotation_set, label_data, annotation_data = mock_ingest.call_args.args
+        self.assertEqual(annotation_set["annotation-set-name"], "Detections")
+        self.assertEqual(label_data[0]["name"], "fish")
+        self.assertEqual(annotation_data[0]["coordinates"], [[1, 2, 3, 4]])
+
+    @patch("api.views.annotation.parse_annotation_set_metadata")
+    @patch("api.views.annotation.parse_label_set")
+    @patch("api.views.annotation.parse_annotation_data")
+    @patch("api.views.annotation.validate_annotation_upload")
+    @patch("api.views.annotation.ingest_annotation_data")
+    def test_upload_annotations_dry_run_reports_without_ingesting(  # noqa: PLR0913
+        self,
+        mock_ingest: Mock,
+        mock_validate: Mock,
+        mock_parse_annotation: Mock,
+        mock_parse_label: Mock,
+        mock_parse_set: Mock,
+    ) -> None:
+        """Test that a dry run returns the validation report of the parsed file, without ingesting it."""
+        mock_parse_set.return_value = self.mock_annotation_set
+        mock_parse_label.return_value = self.mock_label_data
+        mock_parse_annotation.return_value = self.mock_annotation_data
+        mock_validate.return_value = {"valid": False, "annotations": {"Row 1": {"image": ["Image not found"]}}}
+
+        response = self.client.post(
+            self.upload_url, {"file": self.create_mock_xlsx_file(), "dry_run": True}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"status": "validated", "report": mock_validate.return_value})
+        mock_validate.assert_called_once_with(
+            self.mock_annotation_set,
+            self.mock_label_data,
+            self.mock_annotation_data,
+            validate_coordinates=False,
+            mode="create",
+        )
+        mock_ingest.assert_not_called()
+
+    def test_upload_annotations_dry_run_cannot_run_in_background(self) -> None:
+        """Test that a dry run is rejected when queued for the background worker."""
+        response = self.client.post(
+            self.upload_url,
+            {"file": self.create_mock_xlsx_file(), "dry_run": True, "background": True},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("dry_run", response.data)
 
     def test_upload_annotations_requires_file(self) -> None:
         """Test that uploading without a file is rejected by the serializer."""
@@ -0,0 +1,325 @@
+"""Tests for the upload job queue, worker command and status endpoint."""
+
+import gzip
+import math
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest.mock import Mock, patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api.ingest import images_ingest
+from api.models import Image, ImageSet, UploadJob
+from api.models.base import UploadJobKindEnum, UploadJobStatusEnum
+from api.services.upload_jobs import claim_next_job, resume_job
+from api.tests.utils.auth_utils import AuthenticatedAPITestCase
+from api.utils.constants import UPLOAD_JOB_STALE_TIMEOUT
+from api.utils.large_objects import open_large_object, write_large_object
+
+
+class UploadJobTests(AuthenticatedAPITestCase):
+    """Tests for queueing uploads, processing them with the worker and polling their status."""
+
+    def setUp(self) -> None:
+        """Set up the upload URLs and a template file."""
+        super().setUp()
+        self.upload_url = reverse("upload_annotation-list")
+        self.ingest_url = "/api/ingest/image-set"
+        self.xlsx_file = SimpleUploadedFile(
+            "annotations.xlsx",
+            b"xlsx content",
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+
+    def _run_worker(self) -> str:
+        """Helper to process every queued job and return the worker output."""
+        out = StringIO()
+        call_command("run_upload_worker", "--once", stdout=out)
+        return out.getvalue()
+
+    def test_background_annotation_upload_is_queued(self) -> None:
+        """Test that a background upload returns 202 with a job to poll, without ingesting anything."""
+        response = self.client.post(
+            self.upload_url, {"file": self.xlsx_file, "background": True, "backend": "copy"}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = UploadJob.objects.get(pk=response.data["job_id"])
+        self.assertEqual(job.kind, UploadJobKindEnum.annotations.value)
+        self.assertEqual(job.status, UploadJobStatusEnum.queued.value)
+        self.assertEqual(bytes(job.file), b"xlsx content")
+        self.assertEqual(job.options, {"backend": "copy", "validate_coordinates": False, "mode": "create"})
+        self.assertTrue(response.data["status_url"].endswith(reverse("upload_job-detail", args=[job.id])))
+
+    @patch("api.services.upload_jobs.ingest_annotation_data")
+    @patch("api.services.upload_jobs.parse_annotation_data")
+    @patch("api.services.upload_jobs.parse_label_set")
+    @patch("api.services.upload_jobs.parse_annotation_set_metadata")
+    @patch("api.services.upload_jobs.open_annotation_workbook")
+    def test_worker_ingests_annotation_upload(  # noqa: PLR0913
+        self, mock_open: Mock, mock_parse_set: Mock, mock_parse_label: Mock, mock_parse_data: Mock, mock_ingest: Mock
+    ) -> None:
+        """Test that the worker ingests a queued annotations upload and records its phases and row counts."""
+        mock_parse_data.return_value = [{}, {}, {}]
+        mock_ingest.return_value = {
+            "annotation_set": {"id": "set-id", "name": "Set"},
+            "label_set": [{}, {}],
+            "annotation_data": {"created": 3, "data": []},
+        }
+        response = self.client.post(self.upload_url, {"file": self.xlsx_file, "background": True}, format="multipart")
+
+        output = self._run_worker()
+
+        job = UploadJob.objects.get(pk=response.data["job_id"])
+        self.assertIn(f"Job {job.id} succeeded", output)
+        self.assertEqual(job.status, UploadJobStatusEnum.succeeded.value)
+        self.assertEqual(list(job.phases), ["read", "parse", "ingest"])
+        self.assertIsNotNone(job.phases["ingest"]["seconds"])
+        self.assertEqual((job.total_rows, job.processed_rows), (3, 3))
+        self.assertEqual(
+            job.result,
+            {"annotation_set": {"id": "set-id", "name": "Set"}, "label_count": 2, "created": 3, "skipped": 0},
+        )
+        self.assertIsNone(job.file)
+        mock_ingest.assert_called_once_with(
+            mock_parse_set.return_value,
+            mock_parse_label.return_value,
+            mock_parse_data.return_value,
+            backend=None,
+            validate_coordinates=False,
+            with_data=False,
+            mode="create",
+        )
+
+        response = self.client.get(response.data["status_url"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "succeeded")
+        self.assertEqual(response.data["progress"], 1.0)
+        self.assertIsNotNone(response.data["duration_seconds"])
+        self.assertNotIn("file", response.data)
+
+    def test_worker_records_errors_of_failed_upload(self) -> None:
+        """Test that an unreadable upload fails the job with the same error as a direct upload."""
+        response = self.client.post(self.upload_url, {"file": self.xlsx_file, "background": True}, format="multipart")
+
+        output = self._run_worker()
+
+        job = UploadJob.objects.get(pk=response.data["job_id"])
+        self.assertIn(f"Job {job.id} failed", output)
+        self.assertEqual(job.status, UploadJobStatusEnum.failed.value)
+        self.assertEqual(job.errors, {"error": "Failed to read Excel file."})
+        self.assertEqual(job.phase, "read")
+        self.assertIsNone(job.file)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_worker_ingests_ifdo_payload(self) -> None:
+        """Test that a background iFDO ingest is queued, then ingested by the worker."""
+        payload = {
+            "background": True,
+            "ifdo": {
+                "image-set-header": {"image-set-name": "Queued ImageSet"},
+                "image-set-items": [{"image-filename": "a.jpg"}, {"image-filename": "b.jpg"}],
+            },
+        }
+        response = self.client.post(self.ingest_url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(ImageSet.objects.exists())
+        self.assertNotIn("background", UploadJob.objects.get().payload)
+
+        self._run_worker()
+
+        job = UploadJob.objects.get(pk=response.data["job_id"])
+        self.assertEqual(job.status, UploadJobStatusEnum.succeeded.value)
+        self.assertEqual(list(job.phases), ["validate", "ingest"])
+        self.assertEqual((job.total_rows, job.processed_rows), (2, 2))
+        self.assertEqual(job.result["image_count"], 2)
+        self.assertEqual(Image.objects.filter(image_set__name="Queued ImageSet").count(), 2)
+
+    @patch("api.views.ingest_imagery.IFDO_STREAMING_THRESHOLD", 0)
+    def test_worker_streams_large_ifdo_payload(self) -> None:
+        """Test that a large iFDO payload is queued as its request body, then streamed by the worker."""
+        payload = {
+            "ifdo": {
+                "image-set-header": {"image-set-name": "Streamed ImageSet"},
+                "image-set-items": [{"image-filename": "a.jpg"}, {"image-filename": "b.jpg"}],
+            },
+        }
+        response = self.client.post(f"{self.ingest_url}?background=true", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIsNotNone(UploadJob.objects.get().file_oid)
+
+        self._run_worker()
+
+        job = UploadJob.objects.get(pk=response.data["job_id"])
+        self.assertEqual(job.status, UploadJobStatusEnum.succeeded.value)
+        self.assertEqual(job.processed_rows, 2)
+        self.assertEqual(Image.objects.filter(image_set__name="Streamed ImageSet").count(), 2)
+
+    def test_worker_ingests_compressed_ifdo_file(self) -> None:
+        """Test that a compressed iFDO file is queued as uploaded, then decompressed by the worker."""
+        content = gzip.compress(
+            b"image-set-header: {image-set-name: YAML ImageSet}\nimage-set-items:\n  - image-filename: a.jpg\n"
+        )
+        file = SimpleUploadedFile("ifdo.yaml.gz", content)
+
+        response = self.client.post(self.ingest_url, {"file": file, "background": "true"}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = UploadJob.objects.get(pk=response.data["job_id"])
+        self.assertEqual(open_large_object(job.file_oid).read(), content)
+        self.assertEqual(
+            job.options, {"upload_format": "yaml", "compression": "gzip", "chunked": False, "mode": "create"}
+        )
+
+        self._run_worker()
+
+        oid = job.file_oid
+        job.refresh_from_db()
+        self.assertEqual(job.status, UploadJobStatusEnum.succeeded.value)
+        self.assertEqual(Image.objects.filter(image_set__name="YAML ImageSet").count(), 1)
+        self.assertIsNone(job.file_oid)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM pg_largeobject_metadata WHERE oid = %s::oid", [oid])
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_ifdo_stream_is_spooled_in_chunks(self) -> None:
+        """Test that a queued iFDO stream is copied into a large object a chunk at a time, and read back whole."""
+        content = b'{"ifdo": {"image-set-header": {}, "image-set-items": []}}'
+
+        with self.assertNumQueries(1 + math.ceil(len(content) / 8)):
+            oid = write_large_object(BytesIO(content), chunk_size=8)
+
+        self.assertEqual(open_large_object(oid, chunk_size=5).read(), content)
+
+    def test_background_ifdo_ingest_requires_ifdo_object(self) -> None:
+        """Test that a background iFDO ingest without an iFDO object is rejected before being queued."""
+        response = self.client.post(self.ingest_url, {"background": True}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(UploadJob.objects.exists())
+
+    def _chunked_ifdo_payload(self, filenames: list[str]) -> dict:
+        """Helper to build a chunked background iFDO payload with an image item per filename."""
+        return {
+            "background": True,
+            "chunked": True,
+            "ifdo": {
+                "image-set-header": {"image-set-name": "Chunked ImageSet"},
+                "image-set-items": [{"image-filename": filename} for filename in filenames],
+            },
+        }
+
+    @patch("api.views.ingest_imagery.IFDO_COMMIT_CHUNK_SIZE", 2)
+    def test_chunked_ifdo_ingest_keeps_committed_chunks(self) -> None:
+        """Test that a failed chunked iFDO ingest keeps the images of its committed chunks, and its checkpoint."""
+        payload = self._chunked_ifdo_payload(["a.jpg", "b.jpg", "c.jpg", "a.jpg", "e.jpg"])
+        response = self.client.post(self.ingest_url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = UploadJob.objects.get(pk=response.data["job_id"])
+        self.assertEqual(job.options, {"chunked": True})
+        self.assertNotIn("chunked", job.payload)
+
+        self._run_worker()
+
+        job.refresh_from_db()
+        image_set = ImageSet.objects.get(name="Chunked ImageSet")
+        self.assertEqual(job.status, UploadJobStatusEnum.failed.value)
+        self.assertEqual(job.checkpoint, {"image_set_id": str(image_set.id), "committed_items": 2})
+        self.assertEqual(job.processed_rows, 2)
+        self.assertEqual(list(job.errors["items"]), ["4"])
+        self.assertEqual(job.errors["committed_items"], 2)
+        self.assertEqual(
+            sorted(Image.objects.filter(image_set=image_set).values_list("filename", flat=True)), ["a.jpg", "b.jpg"]
+        )
+
+    @patch("api.views.ingest_imagery.IFDO_COMMIT_CHUNK_SIZE", 2)
+    def test_resumed_chunked_ifdo_ingest_skips_committed_items(self) -> None:
+        """Test that a resumed chunked iFDO ingest adds the remaining images to the image set of the failed run."""
+        response = self.client.post(
+            self.ingest_url, self._chunked_ifdo_payload(["a.jpg", "b.jpg", "c.jpg", "d.jpg", "e.jpg"]), format="json"
+        )
+        job = UploadJob.objects.get(pk=response.data["job_id"])
+        create_chunk = images_ingest.bulk_create_images
+        interrupted_start = 3
+
+        def interrupted(*args, start: int = 1, **kwargs) -> tuple:
+            if start == interrupted_start:
+                raise IntegrityError("connection lost")
+            return create_chunk(*args, start=start, **kwargs)
+
+        with patch("api.ingest.images_ingest.bulk_create_images", side_effect=interrupted):
+            self._run_worker()
+        job.refresh_from_db()
+        self.assertEqual(job.status, UploadJobStatusEnum.failed.value)
+        self.assertEqual(job.checkpoint["committed_items"], 2)
+
+        resume_url = reverse("upload_job-resume", args=[job.id])
+        response = self.client.post(resume_url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], UploadJobStatusEnum.queued.value)
+
+        with patch("api.ingest.images_ingest.bulk_create_images", wraps=create_chunk) as create:
+            self._run_worker()
+        self.assertEqual([call.kwargs["start"] for call in create.call_args_list], [3, 5])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, UploadJobStatusEnum.succeeded.value)
+        self.assertEqual((job.processed_rows, job.result["image_count"]), (5, 5))
+        self.assertEqual(ImageSet.objects.filter(name="Chunked ImageSet").count(), 1)
+        self.assertEqual(Image.objects.filter(image_set__name="Chunked ImageSet").count(), 5)
+        self.assertEqual(self.client.post(resume_url).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_chunked_ifdo_ingest_requires_background(self) -> None:
+        """Test that a chunked iFDO ingest must be queued, as it is resumed through its upload job."""
+        payload = self._chunked_ifdo_payload(["a.jpg"])
+        del payload["background"]
+        response = self.client.post(self.ingest_url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ImageSet.objects.exists())
+
+    def test_claim_next_job_takes_oldest_queued_job(self) -> None:
+        """Test that jobs are claimed oldest first, and only while queued."""
+        first = UploadJob.objects.create(kind=UploadJobKindEnum.ifdo.value, payload={})
+        second = UploadJob.objects.create(kind=UploadJobKindEnum.ifdo.value, payload={})
+
+        self.assertEqual(claim_next_job(), first)
+        self.assertEqual(claim_next_job(), second)
+        self.assertIsNone(claim_next_job())
+
+        first.refresh_from_db()
+        self.assertEqual(first.status, UploadJobStatusEnum.running.value)
+        self.assertIsNotNone(first.started_at)
+
+    def test_claim_next_job_fails_jobs_left_running_by_a_crashed_worker(self) -> None:
+        """Test that running jobs without a recent heartbeat are failed, and chunked ones can be resumed."""
+        stale_at = timezone.now() - timedelta(seconds=UPLOAD_JOB_STALE_TIMEOUT + 60)
+        running = {"kind": UploadJobKindEnum.ifdo.value, "payload": {}, "status": UploadJobStatusEnum.running.value}
+        crashed = UploadJob.objects.create(
+            **running,
+            options={"chunked": True},
+            checkpoint={"committed_items": 2},
+            started_at=stale_at,
+            heartbeat_at=stale_at,
+        )
+        never_beat = UploadJob.objects.create(**running, started_at=stale_at)
+        alive = UploadJob.objects.create(**running, started_at=stale_at, heartbeat_at=timezone.now())
+
+        self.assertIsNone(claim_next_job())
+
+        for job in (crashed, never_beat):
+            job.refresh_from_db()
+            self.assertEqual(job.status, UploadJobStatusEnum.failed.value)
+            self.assertEqual(job.errors, {"error": "The upload worker stopped while processing the job"})
+            self.assertIsNotNone(job.finished_at)
+        # Only the chunked job can be resumed, from its upload
+        self.assertEqual((crashed.payload, never_beat.payload), ({}, None))
+        alive.refresh_from_db()
+        self.assertEqual(alive.status, UploadJobStatusEnum.running.value)
+
+        self.assertTrue(resume_job(crashed))
+        self.assertEqual(claim_next_job(), crashed)
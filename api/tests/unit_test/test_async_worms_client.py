@@ -0,0 +1,200 @@
+"""Unit tests for AsyncCachedWoRMSClient (async_cached_worms_client)."""
+
+import asyncio
+from collections.abc import Callable
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from django.test import SimpleTestCase
+from rest_framework import status
+
+from api.serializers.label import WORMS_UNAVAILABLE_MESSAGE, prevalidate_aphia_ids
+from api.services.async_cached_worms_client import AsyncCachedWoRMSClient
+
+APHIA_IDS_TO_RETURN = [10, 20, 30, 40]
+
+
+class AsyncCachedWoRMSClientTests(SimpleTestCase):
+    """Tests for AsyncCachedWoRMSClient using a mocked httpx transport."""
+
+    def setUp(self) -> None:
+        """Set up an AsyncCachedWoRMSClient instance for testing and record the requests it sends."""
+        self.client = AsyncCachedWoRMSClient(base_url="https://worms.example/api", max_concurrency=2)
+        self.requests: list[httpx.Request] = []
+
+    def _mock_transport(self, handler: Callable[[httpx.Request], httpx.Response]) -> None:
+        """Route every request sent by the client through the given handler.
+
+        Args:
+            handler: A function that receives the request and returns the response to send back.
+        """
+
+        def record(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return handler(request)
+
+        def client() -> httpx.AsyncClient:
+            return httpx.AsyncClient(base_url=self.client.base_url, transport=httpx.MockTransport(record))
+
+        patcher = patch.object(self.client, "_client", side_effect=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_get_returns_json_for_200(self) -> None:
+        """Test that _get() returns the JSON-decoded response for a successful 200 response."""
+        self._mock_transport(lambda request: httpx.Response(200, json={"ok": True}))
+
+        out = await self.client._get("/example")
+
+        self.assertEqual(out, {"ok": True})
+        self.assertEqual(str(self.requests[0].url), "https://worms.example/api/example")
+
+    async def test_get_returns_none_for_204(self) -> None:
+        """Test that _get() returns None for a 204 No Content response."""
+        self._mock_transport(lambda request: httpx.Response(status.HTTP_204_NO_CONTENT))
+
+        self.assertIsNone(await self.client._get("/example"))
+
+    @patch("api.services.async_cached_worms_client.asyncio.sleep", new_callable=AsyncMock)
+    async def test_get_retries_transient_errors(self, mock_sleep: AsyncMock) -> None:
+        """Test that GET requests are retried with backoff on transient statuses and connection errors.
+
+        Args:
+            mock_sleep: Mocked asyncio.sleep, to skip the backoff delays.
+        """
+        responses = iter([httpx.Response(503), httpx.ConnectError("down"), httpx.Response(200, json=[1])])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        self._mock_transport(handler)
+
+        out = await self.client._get("/example")
+
+        self.assertEqual(out, [1])
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual([call.args[0] for call in mock_sleep.await_args_list], [0.5, 1.0])
+
+    @patch("api.services.async_cached_worms_client.asyncio.sleep", new_callable=AsyncMock)
+    async def test_get_raises_once_retries_are_exhausted(self, mock_sleep: AsyncMock) -> None:
+        """Test that _get() raises an HTTPStatusError when the last retry still fails.
+
+        Args:
+            mock_sleep: Mocked asyncio.sleep, to skip the backoff delays.
+        """
+        self.client.retries = 2
+        self._mock_transport(lambda request: httpx.Response(500))
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self.client._get("/example")
+
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(mock_sleep.await_count, 2)
+
+    async def test_post_is_not_retried(self) -> None:
+        """Test that _post() sends the authorization header and returns the response without retrying."""
+        self._mock_transport(lambda request: httpx.Response(503))
+
+        out = await self.client._post("/example", json={"key": "value"})
+
+        self.assertEqual(out.status_code, 503)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.requests[0].headers["Authorization"], self.client.authorization_token)
+        self.assertEqual(self.requests[0].content, b'{"key":"value"}')
+
+    async def test_ingest_many_limits_concurrency_and_collects_errors(self) -> None:
+        """Test that ingest_many() shares one pool, caps in-flight requests and maps failures to their AphiaID."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if b'"aphia_id":3' in request.content:
+                raise httpx.ConnectError("down")
+            return httpx.Response(200)
+
+        client_factory = patch.object(
+            self.client,
+            "_client",
+            return_value=httpx.AsyncClient(base_url=self.client.base_url, transport=httpx.MockTransport(handler)),
+        )
+        with client_factory as mock_client:
+            out = await self.client.ingest_many([1, 2, 3, 4, 1])
+
+        mock_client.assert_called_once()
+        self.assertEqual(list(out), [1, 2, 3, 4])
+        self.assertEqual(out[1].status_code, 200)
+        self.assertIsInstance(out[3], httpx.ConnectError)
+        self.assertLessEqual(max_in_flight, 2)
+
+    async def test_descendants_aphia_ids_builds_correct_path(self) -> None:
+        """Test that descendants_aphia_ids() builds the correct API path and returns the expected result."""
+        with patch.object(self.client, "_get", new=AsyncMock(return_value=APHIA_IDS_TO_RETURN)) as mock_get:
+            out = await self.client.descendants_aphia_ids([1, 2])
+
+        self.assertEqual(out, APHIA_IDS_TO_RETURN)
+        mock_get.assert_awaited_once_with("/taxa/ids_with_descendants/?aphia_ids[]=1&aphia_ids[]=2")
+
+    async def test_aphia_ids_by_name_part_builds_correct_path(self) -> None:
+        """Test that aphia_ids_by_name_part() builds the correct API path and returns the expected result."""
+        with patch.object(self.client, "_get", new=AsyncMock(return_value=APHIA_IDS_TO_RETURN)) as mock_get:
+            out = await self.client.aphia_ids_by_name_part("example")
+
+        self.assertEqual(out, APHIA_IDS_TO_RETURN)
+        mock_get.assert_awaited_once_with("/taxa/ajax_by_name_part/only_ids/example/?combine_vernaculars=false")
+
+    async def test_ingest_builds_correct_path(self) -> None:
+        """Test that ingest() posts the AphiaID to the ingest endpoint."""
+        with patch.object(self.client, "_post", new=AsyncMock(return_value="response")) as mock_post:
+            out = await self.client.ingest(1)
+
+        self.assertEqual(out, "response")
+        mock_post.assert_awaited_once_with("/taxa/ingest/", json={"aphia_id": 1})
+
+
+class PrevalidateAphiaIdsTests(SimpleTestCase):
+    """Tests for validating many aphia_ids concurrently from synchronous code."""
+
+    @patch.object(AsyncCachedWoRMSClient, "ingest_many", new_callable=AsyncMock)
+    def test_maps_responses_to_validation_errors(self, mock_ingest_many: AsyncMock) -> None:
+        """Test that each aphia_id is mapped to the same error message the LabelSerializer would produce.
+
+        Args:
+            mock_ingest_many: Mocked AsyncCachedWoRMSClient.ingest_many method.
+        """
+        mock_ingest_many.return_value = {
+            1: httpx.Response(200),
+            2: httpx.Response(400),
+            3: httpx.Response(502),
+            4: httpx.ConnectError("down"),
+        }
+
+        out = prevalidate_aphia_ids([1, 2, 3, 4])
+
+        mock_ingest_many.assert_awaited_once_with([1, 2, 3, 4])
+        self.assertEqual(
+            out,
+            {
+                1: None,
+                2: "Invalid lowest_aphia_id: 2 does not exist in WoRMS API.",
+                3: "Unable to validate lowest_aphia_id right now (status 502). Please try again later.",
+                4: WORMS_UNAVAILABLE_MESSAGE,
+            },
+        )
+
+    @patch.object(AsyncCachedWoRMSClient, "ingest_many", new_callable=AsyncMock)
+    def test_skips_worms_without_aphia_ids(self, mock_ingest_many: AsyncMock) -> None:
+        """Test that no request is made when there is nothing to validate.
+
+        Args:
+            mock_ingest_many: Mocked AsyncCachedWoRMSClient.ingest_many method.
+        """
+        self.assertEqual(prevalidate_aphia_ids([]), {})
+        mock_ingest_many.assert_not_awaited()
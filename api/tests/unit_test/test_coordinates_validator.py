@@ -0,0 +1,94 @@
+"""Unit tests for the annotation coordinates validator."""
+
+from django.test import SimpleTestCase
+
+from api.utils.coordinates_validator import validate_annotation_coordinates
+
+
+class TestValidateAnnotationCoordinates(SimpleTestCase):
+    """Unit tests for api.utils.coordinates_validator."""
+
+    def test_valid_coordinates_have_no_errors(self) -> None:
+        """Coordinates following the rules of each shape (and shape alias) should not be reported."""
+        shapes = ["single-pixel", "point", "circle", "rectangle", "ellipse", "polyline", "polygon", "whole_image"]
+        coordinates = [
+            [[1, 2]],
+            [[1.5, 2.5], [3, 4]],
+            [[10, 10, 5]],
+            [[0, 0, 10, 0, 10, 10, 0, 10]],
+            [[0, 5, 5, 0, 10, 5, 5, 10]],
+            [[0, 0, 10, 10, 20, 0]],
+            [[0, 0, 10, 0, 10, 10, 0, 0]],
+            [],
+        ]
+
+        self.assertEqual(validate_annotation_coordinates(shapes, coordinates), {})
+
+    def test_value_counts_follow_shape(self) -> None:
+        """Frames with the wrong number of values for their shape should be reported by row."""
+        errors = validate_annotation_coordinates(
+            ["single-pixel", "rectangle", "polyline", "polygon", "point", "whole-image"],
+            [[[1, 2, 3]], [[1, 2], [0, 0, 1, 0, 1, 1, 0, 1]], [[0, 0, 1]], [[0, 0, 1, 1, 0, 0]], [], [[1, 2]]],
+        )
+
+        self.assertEqual(
+            errors,
+            {
+                0: ["single-pixel coordinates must have 2 values per list."],
+                1: ["rectangle coordinates must have 8 values per list."],
+                2: ["polyline coordinates must have at least 4 (an even number) values per list."],
+                3: ["polygon coordinates must have at least 8 (an even number) values per list."],
+                4: ["point coordinates must have at least one list of 2 values."],
+                5: ["whole-image coordinates must have 0 values per list."],
+            },
+        )
+
+    def test_polygons_must_be_closed(self) -> None:
+        """Polygons whose last point isn't their first point should be reported."""
+        errors = validate_annotation_coordinates(
+            ["polygon", "polygon"], [[[0, 0, 10, 0, 10, 10, 0, 0]], [[0, 0, 10, 0, 10, 10, 0, 10]]]
+        )
+
+        self.assertEqual(errors, {1: ["polygon coordinates must end with their first point."]})
+
+    def test_values_must_be_finite_non_negative_numbers(self) -> None:
+        """Non-numeric, non-finite and negative values should be reported, once per row and rule."""
+        errors = validate_annotation_coordinates(
+            ["point", "point", "point", "circle", "point"],
+            [[[1, "2"]], [[1, float("nan")]], [[-1, 2], [-3, 4]], [[1, 2, float("inf")]], [[True, None]]],
+        )
+
+        self.assertEqual(
+            errors,
+            {
+                0: ["point coordinates must be numbers."],
+                1: ["point coordinates must be finite numbers."],
+                2: ["point coordinates must not be negative."],
+                3: ["circle coordinates must be finite numbers."],
+                4: ["point coordinates must be numbers."],
+            },
+        )
+
+    def test_booleans_among_numbers_are_not_numbers(self) -> None:
+        """Booleans should be reported even when every other value of the upload is a number."""
+        errors = validate_annotation_coordinates(["point", "point", "point"], [[[1, 2]], [[True, 1]], [[1.5, False]]])
+
+        self.assertEqual(errors, {1: ["point coordinates must be numbers."], 2: ["point coordinates must be numbers."]})
+
+    def test_malformed_coordinates_and_unknown_shapes(self) -> None:
+        """Coordinates that aren't a list of lists should be reported, and rows with unknown shapes skipped."""
+        errors = validate_annotation_coordinates(
+            ["point", "rectangle", "hexagon", None], ["1427,8163", [1, 2, 3, 4], [[1]], [[1]]]
+        )
+
+        self.assertEqual(
+            errors,
+            {
+                0: ["Coordinates must be a list of lists of pixel coordinates."],
+                1: ["Coordinates must be a list of lists of pixel coordinates."],
+            },
+        )
+
+    def test_empty_upload(self) -> None:
+        """An upload without annotations should have no errors."""
+        self.assertEqual(validate_annotation_coordinates([], []), {})
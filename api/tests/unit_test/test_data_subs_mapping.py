@@ -1,6 +1,6 @@
 """Unit tests for iFDO data_subs_mapping adapter functions."""
 
-from datetime import datetime
+from datetime import UTC, datetime
 
 from django.test import TestCase
 
@@ -8,6 +8,8 @@ from api.ingest.data_subs_mapping import (
     IFDOAdaptError,
     adapt_ifdo_image_set_to_serializer_payload,
     adapt_ifdo_item_to_image_serializer_payload,
+    parse_datetimes,
+    parse_item_datetimes,
 )
 
 
@@ -161,6 +163,10 @@ class TestDataSubsMapping(TestCase):
         payload = adapt_ifdo_image_set_to_serializer_payload(ifdo_iso)
         self.assertIsInstance(payload["date_time"], datetime)
 
+        ifdo_exif = self._base_ifdo(**{"image-set-start-datetime": "2024:01:02 03:04:05+0100"})
+        payload = adapt_ifdo_image_set_to_serializer_payload(ifdo_exif)
+        self.assertEqual(payload["date_time"], datetime(2024, 1, 2, 2, 4, 5, tzinfo=UTC))
+
         ifdo_bad = self._base_ifdo(**{"image-set-start-datetime": "not-a-date"})
         with self.assertRaises(IFDOAdaptError) as ctx:
             adapt_ifdo_image_set_to_serializer_payload(ifdo_bad)
@@ -171,6 +177,47 @@ class TestDataSubsMapping(TestCase):
             adapt_ifdo_image_set_to_serializer_payload(ifdo_bad)
         self.assertIn("Expected datetime-like value", str(ctx.exception))
 
+    def test_parse_datetimes_mixed_formats(self) -> None:
+        """Datetimes in the inferred format, EXIF datetimes and other formats should all be parsed, in UTC."""
+        parsed = parse_datetimes(
+            [
+                "2024-01-02 03:04:05.250000",
+                "2024:01:02 03:04:05+0100",
+                "2024-01-02T03:04:05+02:00",
+                "not-a-date",
+                "2024-01-03 03:04:05.000000",
+            ]
+        )
+
+        self.assertEqual(
+            parsed,
+            [
+                datetime(2024, 1, 2, 3, 4, 5, 250000, tzinfo=UTC),
+                datetime(2024, 1, 2, 2, 4, 5, tzinfo=UTC),
+                datetime(2024, 1, 2, 1, 4, 5, tzinfo=UTC),
+                None,
+                datetime(2024, 1, 3, 3, 4, 5, tzinfo=UTC),
+            ],
+        )
+        self.assertEqual(parse_datetimes([]), [])
+
+    def test_parse_item_datetimes_leaves_invalid_items_to_adapter(self) -> None:
+        """Valid item datetimes should be parsed, and invalid ones reported by the adapter as before."""
+        items = [
+            {"image-filename": "a.jpg", "image-datetime": "2024-01-02T03:04:05Z"},
+            {"image-filename": "b.jpg", "image-datetime": "not-a-date"},
+            {"image-filename": "c.jpg", "image-datetime": ""},
+            "not-an-object",
+        ]
+
+        parsed = parse_item_datetimes(items)
+
+        self.assertEqual(parsed[0]["image-datetime"], datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC))
+        self.assertEqual(items[0]["image-datetime"], "2024-01-02T03:04:05Z")
+        self.assertEqual(parsed[1:], items[1:])
+        with self.assertRaisesRegex(IFDOAdaptError, "Invalid datetime"):
+            adapt_ifdo_item_to_image_serializer_payload(parsed[1], image_set_id=1)
+
     def test_item_requires_filename(self) -> None:
         """image-filename is required and must be string."""
         with self.assertRaises(IFDOAdaptError) as ctx:
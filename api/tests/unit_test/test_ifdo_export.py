@@ -0,0 +1,94 @@
+"""Unit tests for the iFDO export, checked against the iFDO adapters it is the inverse of."""
+
+import uuid
+from datetime import UTC, datetime
+
+from django.test import SimpleTestCase
+
+from api.ingest.data_subs_mapping import (
+    adapt_ifdo_image_set_to_serializer_payload,
+    adapt_ifdo_item_to_image_serializer_payload,
+)
+from api.ingest.ifdo_export import COMMON_FIELDS, IMAGE_FIELDS, IMAGE_SET_FIELDS, _ifdo_fields
+
+COMMON_VALUES = {
+    "handle": "https://hdl.handle.net/1",
+    "copyright": "Copyright",
+    "date_time": datetime(2021, 5, 4, 12, 30, 15, 250000, tzinfo=UTC),
+    "latitude": 50.5,
+    "longitude": -4.25,
+    "altitude_meters": -1200.0,
+    "coordinate_uncertainty_meters": 2.5,
+    "entropy": 0.75,
+    "particle_count": 12,
+    "acquisition": "photo",
+    "quality": "raw",
+    "deployment": "survey",
+    "navigation": "beacon",
+    "scale_reference": "none",
+    "illumination": "artificial light",
+    "pixel_magnitude": "mm",
+    "marine_zone": "seafloor",
+    "spectral_resolution": "rgb",
+    "capture_mode": "timer",
+    "fauna_attraction": "none",
+    "area_square_meters": 4.5,
+    "meters_above_ground": 2.0,
+    "acquisition_settings": {"iso": 200},
+    "camera_yaw_degrees": 10.0,
+    "camera_pitch_degrees": -80.0,
+    "camera_roll_degrees": 1.5,
+    "overlap_fraction": 0.25,
+}
+
+
+class TestIFDOExportFields(SimpleTestCase):
+    """Unit tests for the field mappings of api.ingest.ifdo_export."""
+
+    def test_image_fields_are_adapted_back(self) -> None:
+        """Image fields exported as an image-set-item should be adapted back to the same values."""
+        values = {
+            **COMMON_VALUES,
+            "id": uuid.uuid4(),
+            "filename": "image.jpg",
+            "sha256_hash": "a" * 64,
+            **{field: [1.0, 2.5] for field in IMAGE_FIELDS if field == "average_color" or field.startswith("mpeg7")},
+        }
+        self.assertEqual(values.keys(), IMAGE_FIELDS.keys())
+
+        payload = adapt_ifdo_item_to_image_serializer_payload(_ifdo_fields(values, IMAGE_FIELDS), image_set_id=1)
+
+        self.assertEqual(payload, {**values, "id": str(values["id"]), "image_set_id": 1})
+
+    def test_image_set_fields_are_adapted_back(self) -> None:
+        """Image set fields exported as an image-set-header should be adapted back to the same values."""
+        values = {
+            **COMMON_VALUES,
+            "id": uuid.uuid4(),
+            "name": "Image set",
+            "abstract": "Abstract",
+            "target_environment": "Deep sea",
+            "time_synchronisation": "NTP",
+            "item_identification_scheme": "<filename>",
+            "visual_constraints": "Turbid water",
+            "spatial_constraints": "Transect",
+            "temporal_constraints": "One day",
+            "local_path": "../raw",
+            "min_latitude_degrees": 50.0,
+            "max_latitude_degrees": 51.0,
+            "min_longitude_degrees": -5.0,
+            "max_longitude_degrees": -4.0,
+        }
+        self.assertEqual(values.keys(), IMAGE_SET_FIELDS.keys())
+
+        payload = adapt_ifdo_image_set_to_serializer_payload(
+            {"image-set-header": _ifdo_fields(values, IMAGE_SET_FIELDS)}
+        )
+
+        self.assertEqual(payload, {**values, "id": str(values["id"])})
+
+    def test_empty_fields_are_left_out(self) -> None:
+        """Null and blank fields should be left out of the iFDO fields."""
+        values = dict.fromkeys(COMMON_FIELDS) | {"handle": "", "copyright": "Copyright"}
+
+        self.assertEqual(_ifdo_fields(values, COMMON_FIELDS), {"image-copyright": "Copyright"})
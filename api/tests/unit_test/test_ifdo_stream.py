@@ -0,0 +1,158 @@
+"""Unit tests for the streaming reader of large and compressed iFDO request bodies and files."""
+
+import gzip
+import io
+import json
+
+import zstandard
+from django.test import SimpleTestCase
+
+from api.ingest.data_subs_mapping import IFDOAdaptError
+from api.ingest.ifdo_stream import ifdo_upload_format, read_ifdo_stream
+
+PAYLOAD = {
+    "submission_id": "sub-1",
+    "ifdo": {
+        "image-set-header": {"image-set-name": "Set", "image-set-datetime": "2021-01-01 12:00:00"},
+        "image-set-items": [{"image-filename": "a.jpg", "image-altitude-meters": 1.5}, {"image-filename": "b.jpg"}],
+    },
+}
+
+
+class TestReadIFDOStream(SimpleTestCase):
+    """Unit tests for api.ingest.ifdo_stream."""
+
+    def read(self, body: object, upload_format: str = "json", compression: str | None = None) -> tuple:
+        """Helper to read a JSON body, consuming its items."""
+        raw = body if isinstance(body, bytes) else json.dumps(body).encode()
+        fields, ifdo, items = read_ifdo_stream(io.BytesIO(raw), upload_format, compression)
+        return fields, ifdo, list(items)
+
+    def test_header_and_items_are_read(self) -> None:
+        """The fields before the iFDO object, its header and its items should be read as json.loads does."""
+        header = {"image-set-name": "Set", "image-set-related-material": [{"name": "doc", "size": 1.5}]}
+        items = [{"image-filename": "a.jpg", "image-average-color": [1, 2.5, 3]}, {"image-filename": "b.jpg"}]
+
+        fields, ifdo, read_items = self.read(
+            {"submission_id": "sub-1", "ifdo": {"image-set-header": header, "image-set-items": items}}
+        )
+
+        self.assertEqual(fields, {"submission_id": "sub-1"})
+        self.assertEqual(ifdo, {"image-set-header": header})
+        self.assertEqual(read_items, items)
+
+    def test_ifdo_files_are_read_as_the_ifdo_object(self) -> None:
+        """Files should be read as the iFDO object itself, without other fields."""
+        raw = json.dumps(PAYLOAD["ifdo"]).encode()
+
+        fields, ifdo, items = read_ifdo_stream(io.BytesIO(raw), wrapped=False)
+
+        self.assertEqual(fields, {})
+        self.assertEqual(ifdo, {"image-set-header": PAYLOAD["ifdo"]["image-set-header"]})
+        self.assertEqual(list(items), PAYLOAD["ifdo"]["image-set-items"])
+        with self.assertRaisesRegex(IFDOAdaptError, "iFDO file must be a JSON object"):
+            read_ifdo_stream(io.BytesIO(b"[]"), wrapped=False)
+
+    def test_missing_ifdo_object(self) -> None:
+        """Bodies without an iFDO object should be read without one."""
+        self.assertEqual(self.read({"submission_id": "sub-1"}), ({"submission_id": "sub-1"}, None, []))
+        self.assertEqual(self.read({"ifdo": "not an object"}), ({}, None, []))
+        self.assertEqual(self.read({"ifdo": {"image-set-header": {}}}), ({}, {"image-set-header": {}}, []))
+
+    def test_body_fields_after_the_ifdo_object_are_rejected(self) -> None:
+        """Body fields after the iFDO object should be reported once the items are read, rather than dropped."""
+        for ifdo in (PAYLOAD["ifdo"], {"image-set-header": {}}):
+            body = {"ifdo": ifdo, "mode": "upsert", "submission_id": "sub-1"}
+            with self.subTest(ifdo=ifdo), self.assertRaisesRegex(IFDOAdaptError, "after it: mode, submission_id$"):
+                self.read(body)
+
+        items = [{"image-filename": "a.jpg", "image-set-items": [{"mode": "x"}]}]
+        ifdo = {"image-set-header": {}, "image-set-items": items, "image-set-extra": {"mode": "x"}}
+        self.assertEqual(self.read({"ifdo": ifdo}), ({}, {"image-set-header": {}}, items))
+
+    def test_invalid_bodies_are_rejected(self) -> None:
+        """Bodies that aren't JSON objects, or whose iFDO items can't be streamed, should be rejected."""
+        invalid = {
+            "must be a JSON object": [1, 2],
+            "must come before": {"ifdo": {"image-set-items": [], "image-set-header": {}}},
+            "must be a list": {"ifdo": {"image-set-header": {}, "image-set-items": {}}},
+            "Invalid JSON": b'{"ifdo": {"image-set-header": {}, "image-set-items": [{"a": 1}, {"b": ',
+        }
+
+        for message, body in invalid.items():
+            with self.subTest(message=message), self.assertRaisesRegex(IFDOAdaptError, message):
+                self.read(body)
+
+    def test_compressed_bodies_are_read(self) -> None:
+        """Gzip and zstd compressed bodies should be read as the uncompressed body."""
+        raw = json.dumps(PAYLOAD).encode()
+        expected = self.read(PAYLOAD)
+
+        self.assertEqual(self.read(gzip.compress(raw), compression="gzip"), expected)
+        self.assertEqual(self.read(zstandard.ZstdCompressor().compress(raw), compression="zstd"), expected)
+
+        for compression in ("gzip", "zstd"):
+            with self.subTest(compression=compression), self.assertRaisesRegex(IFDOAdaptError, "compressed data"):
+                self.read(raw, compression=compression)
+        with self.assertRaisesRegex(IFDOAdaptError, "compressed data"):
+            self.read(gzip.compress(raw)[:-20], compression="gzip")
+
+    def test_yaml_documents_are_read_as_json(self) -> None:
+        """YAML documents should be read as the equivalent JSON document, with datetimes kept as strings."""
+        document = b"""
+submission_id: sub-1
+ifdo:
+  image-set-header:
+    image-set-name: Set
+    image-set-datetime: 2021-01-01 12:00:00
+  image-set-items:
+    - image-filename: a.jpg
+      image-altitude-meters: 1.5
+    - {image-filename: b.jpg}
+"""
+        self.assertEqual(self.read(document, "yaml"), self.read(PAYLOAD))
+        self.assertEqual(self.read(gzip.compress(document), "yaml", "gzip"), self.read(PAYLOAD))
+
+    def test_yaml_aliases_are_expanded(self) -> None:
+        """YAML aliases should be replaced by the node they refer to, but not refer to a node containing them."""
+        document = b"""
+ifdo:
+  image-set-header: {image-set-creators: [&creator {name: Creator, uri: https://example.com}]}
+  image-set-items:
+    - {image-filename: a.jpg, image-creators: [*creator]}
+    - {image-filename: b.jpg, image-creators: [*creator]}
+"""
+        creator = {"name": "Creator", "uri": "https://example.com"}
+
+        _, ifdo, items = self.read(document, "yaml")
+
+        self.assertEqual(ifdo, {"image-set-header": {"image-set-creators": [creator]}})
+        self.assertEqual([item["image-creators"] for item in items], [[creator], [creator]])
+        for invalid in (b"a: *missing", b"a: &a [*a]"):
+            with self.subTest(document=invalid), self.assertRaisesRegex(IFDOAdaptError, "alias"):
+                self.read(invalid, "yaml")
+
+    def test_yaml_alias_expansion_is_bounded(self) -> None:
+        """Aliases nesting aliases should not expand the document exponentially."""
+        document = "a: &a [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]\n"
+        for level in "bcdefg":
+            previous = chr(ord(level) - 1)
+            document += f"{level}: &{level} [{', '.join([f'*{previous}'] * 10)}]\n"
+
+        with self.assertRaisesRegex(IFDOAdaptError, "expand the document too much"):
+            self.read(document.encode(), "yaml")
+
+    def test_invalid_yaml_is_rejected(self) -> None:
+        """YAML syntax errors and non-scalar mapping keys should be rejected."""
+        for document in (b"submission_id: [1, 2", b"? [1]\n: 2"):
+            with self.subTest(document=document), self.assertRaisesRegex(IFDOAdaptError, "Invalid YAML"):
+                self.read(document, "yaml")
+
+    def test_ifdo_upload_format(self) -> None:
+        """The format and compression of iFDO files should be read from their file extensions."""
+        self.assertEqual(ifdo_upload_format("ifdo.json"), ("json", None))
+        self.assertEqual(ifdo_upload_format("IFDO.JSON.GZ"), ("json", "gzip"))
+        self.assertEqual(ifdo_upload_format("dive.v2.yml.zst"), ("yaml", "zstd"))
+        self.assertIsNone(ifdo_upload_format("ifdo.gz"))
+        self.assertIsNone(ifdo_upload_format("ifdo.csv"))
+        self.assertIsNone(ifdo_upload_format("ifdo"))
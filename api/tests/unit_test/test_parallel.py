@@ -0,0 +1,84 @@
+"""Unit tests for the chunked process pool of large uploads."""
+
+from collections.abc import Sequence
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from api.utils.parallel import imap_chunks, map_chunks, upload_workers
+
+
+def _number_chunk(start: int, items: Sequence[str]) -> list[tuple[int, str]]:
+    """Number the items of a chunk by their index among all items."""
+    return [(start + index, item) for index, item in enumerate(items)]
+
+
+def _fail_on_chunk(start: int, items: Sequence[int]) -> int:
+    """Raise a ValueError for chunks starting after the first one."""
+    if start:
+        raise ValueError(f"Row {start + 1}: invalid")
+    return len(items)
+
+
+def _query_chunk(start: int, items: Sequence[int]) -> int:
+    """Query the database."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return len(items)
+
+
+class TestMapChunks(SimpleTestCase):
+    """Unit tests for api.utils.parallel."""
+
+    @override_settings(ANNOTATION_UPLOAD_WORKERS=3)
+    def test_upload_workers(self) -> None:
+        """The number of workers should default to the setting, and never be less than one."""
+        self.assertEqual(upload_workers(), 3)
+        self.assertEqual(upload_workers(2), 2)
+        self.assertEqual(upload_workers(0), 1)
+
+    def test_chunks_are_merged_in_order(self) -> None:
+        """Results of each chunk should come back in order, with the offset of the chunk."""
+        items = [f"item {index}" for index in range(7)]
+
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                chunks = map_chunks(_number_chunk, items, workers=workers, chunk_size=3)
+
+                self.assertEqual(len(chunks), 3)
+                self.assertEqual([pair for chunk in chunks for pair in chunk], list(enumerate(items)))
+
+    def test_errors_are_raised_from_workers(self) -> None:
+        """Exceptions raised on a chunk should be re-raised to the caller."""
+        with self.assertRaisesRegex(ValueError, "Row 3: invalid"):
+            map_chunks(_fail_on_chunk, [1, 2, 3, 4], workers=2, chunk_size=2)
+
+    def test_empty_items(self) -> None:
+        """No chunks should be processed without items."""
+        self.assertEqual(map_chunks(_number_chunk, [], workers=2), [])
+
+    def test_streamed_chunks_are_yielded_in_order(self) -> None:
+        """Chunks read from an iterator should be processed lazily, with their results yielded in order."""
+        items = [f"item {index}" for index in range(7)]
+
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                chunks = ((start, items[start : start + 2]) for start in range(0, len(items), 2))
+                results = imap_chunks(_number_chunk, chunks, workers=workers)
+
+                self.assertEqual(next(results), [(0, "item 0"), (1, "item 1")])
+                self.assertEqual([pair for chunk in results for pair in chunk], list(enumerate(items))[2:])
+
+    def test_streamed_errors_are_raised_from_workers(self) -> None:
+        """Exceptions raised on a streamed chunk should be re-raised once its result is reached."""
+        results = imap_chunks(_fail_on_chunk, iter([(0, [1, 2]), (2, [3, 4])]), workers=2)
+
+        self.assertEqual(next(results), 2)
+        with self.assertRaisesRegex(ValueError, "Row 3: invalid"):
+            next(results)
+
+    def test_workers_have_no_database_access(self) -> None:
+        """Worker processes should not query the database, whose settings they don't share with the caller."""
+        with self.assertRaisesRegex(ImproperlyConfigured, "settings.DATABASES is improperly configured"):
+            map_chunks(_query_chunk, [1, 2, 3, 4], workers=2, chunk_size=2)
@@ -136,3 +136,12 @@ class CachedWoRMSClientTests(SimpleTestCase):
 
         self.assertEqual(out, return_value)
         mock_post.assert_called_once_with("/taxa/ingest/", json={"aphia_id": 1})
+
+    def test_taxon_builds_correct_path(self) -> None:
+        """Test that taxon() builds the correct API path and returns the expected result."""
+        return_value = {"AphiaID": 1, "scientificname": "Gadus morhua", "vernaculars": []}
+        with patch.object(CachedWoRMSClient, "_get", return_value=return_value) as mock_get:
+            out = self.client.taxon(1)
+
+        self.assertEqual(out, return_value)
+        mock_get.assert_called_once_with("/taxa/1/")
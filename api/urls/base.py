@@ -9,6 +9,7 @@ from .annotation import router_annotation
 from .fields import router_fields
 from .image import router_image
 from .label import router_label
+from .upload_job import router_upload_job
 
 urlpatterns = [
     path("health/", HealthView.as_view(), name="Health"),
@@ -17,5 +18,6 @@ urlpatterns = [
     path("labels/", include(router_label.urls)),
     path("fields/", include(router_fields.urls)),
     path("ingest/", include("api.urls.ingest"), name="ingest-ifdo-image-set"),
+    path("jobs/", include(router_upload_job.urls)),
     path("debug/db-dump/", DebugDatabaseDumpView.as_view(), name="debug-db-dump"),
 ]
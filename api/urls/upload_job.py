@@ -0,0 +1,12 @@
+"""URL configuration for the Upload Jobs API endpoints."""
+
+from rest_framework.routers import DefaultRouter
+
+from api.views import UploadJobViewSet
+
+router_upload_job = DefaultRouter()
+router_upload_job.register(
+    r"upload_jobs",
+    UploadJobViewSet,
+    basename="upload_job",
+)
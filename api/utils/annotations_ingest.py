@@ -1,32 +1,55 @@
 """Functions for ingesting annotation data."""
 
+import hashlib
+import json
 import uuid
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator, Sequence
 from datetime import datetime
 from itertools import zip_longest
 
 import pandas as pd
-from django.db import transaction
+from django.db import connection, models, transaction
+from django.db.backends.utils import CursorWrapper
+from rest_framework import serializers
 
-from api.models.annotation import Annotator
+from api.models.annotation import Annotation, AnnotationLabel, Annotator
+from api.models.annotation_set import AnnotationSet, AnnotationSetImageSet
 from api.models.fields import Creator
 from api.models.image import Image
 from api.models.image_set import ImageSet
 from api.models.label import Label
 from api.serializers import AnnotationSetSerializer, LabelSerializer
-from api.serializers.annotation import AnnotationLabelSerializer, AnnotationSerializer, AnnotatorSerializer
+from api.serializers.annotation import (
+    AnnotationLabelSerializer,
+    AnnotationSerializer,
+    AnnotatorSerializer,
+    BulkAnnotationSerializer,
+)
+from api.serializers.label import UploadLabelSerializer, prevalidate_aphia_ids
+from api.utils.constants import (
+    ANNOTATION_BULK_BATCH_SIZE,
+    ANNOTATION_BULK_THRESHOLD,
+    ANNOTATION_CREATION_DATETIME_FORMAT,
+    ANNOTATION_DRY_RUN_MAX_ROW_ERRORS,
+    ANNOTATION_INGEST_BACKENDS,
+    ANNOTATION_PARALLEL_CHUNK_SIZE,
+    ANNOTATION_UPLOAD_MODES,
+)
+from api.utils.coordinates_validator import validate_annotation_coordinates
+from api.utils.parallel import imap_chunks, map_chunks
 
 
-def insert_annotations_set(data: pd.DataFrame) -> dict:
-    """Insert annotations related into respective tables.
+def _annotation_set_data(data: pd.DataFrame) -> dict:
+    """Map the parsed annotation set metadata to the AnnotationSetSerializer fields.
 
     Args:
         data(pd.DataFrame): annotation dataframe.
 
     Returns:
-        newly created annotation_set object
+        dict: the AnnotationSetSerializer data.
     """
-    # Prepare data for AnnotationSet
-    annotation_set_data = {
+    return {
         "name": data.get("annotation-set-name", ""),
         "abstract": data.get("annotation-abstract", ""),
         "objective": data.get("annotation-objective", ""),
@@ -42,7 +65,50 @@ def insert_annotations_set(data: pd.DataFrame) -> dict:
         "license": {"name": data.get("annotation-license-name", ""), "uri": data.get("annotation-license-uri", "")},
     }
 
-    serializer = AnnotationSetSerializer(data=annotation_set_data)
+
+def _find_image_set(data: pd.DataFrame) -> ImageSet | None:
+    """Find the image set an annotation set refers to, by id then by name.
+
+    Args:
+        data(pd.DataFrame): annotation dataframe.
+
+    Returns:
+        ImageSet | None: the image set, or None if the annotation set doesn't refer to one.
+
+    Raises:
+        ValueError: if the image set is not found, or its name matches an image set with another id.
+    """
+    image_set_uuid = data.get("annotation-image-set-uuid")
+    image_set_name = data.get("annotation-image-set-name")
+    if not image_set_name and not image_set_uuid:
+        return None
+
+    image_set_inst = None
+    if image_set_uuid and str(image_set_uuid).strip() != "":
+        image_set_inst = ImageSet.objects.filter(id=image_set_uuid).first()
+    if not image_set_inst and image_set_name:
+        name_match = ImageSet.objects.filter(name=image_set_name).first()
+        if name_match and image_set_uuid:
+            raise ValueError(
+                f"ImageSet not found with id={image_set_uuid} but name={image_set_name!r} "
+                f"matched a different record (id={name_match.id})"
+            )
+        image_set_inst = name_match
+    if not image_set_inst:
+        raise ValueError(f"ImageSet not found with id={image_set_uuid} or name={image_set_name!r}")
+    return image_set_inst
+
+
+def insert_annotations_set(data: pd.DataFrame) -> dict:
+    """Insert annotations related into respective tables.
+
+    Args:
+        data(pd.DataFrame): annotation dataframe.
+
+    Returns:
+        newly created annotation_set object
+    """
+    serializer = AnnotationSetSerializer(data=_annotation_set_data(data))
     if serializer.is_valid(raise_exception=True):
         annotation_set = serializer.save()
 
@@ -56,65 +122,133 @@ def insert_annotations_set(data: pd.DataFrame) -> dict:
                 annotation_set.creators.add(creator)
 
         # Handle Many-to-Many image-sets
-        image_set_uuid = data.get("annotation-image-set-uuid")
-        image_set_name = data.get("annotation-image-set-name")
-        if image_set_name or image_set_uuid:
-            image_set_inst = None
-            if image_set_uuid and str(image_set_uuid).strip() != "":
-                image_set_inst = ImageSet.objects.filter(id=image_set_uuid).first()
-            if not image_set_inst and image_set_name:
-                name_match = ImageSet.objects.filter(name=image_set_name).first()
-                if name_match and image_set_uuid:
-                    raise ValueError(
-                        f"ImageSet not found with id={image_set_uuid} but name={image_set_name!r} "
-                        f"matched a different record (id={name_match.id})"
-                    )
-                image_set_inst = name_match
-            if not image_set_inst:
-                raise ValueError(f"ImageSet not found with id={image_set_uuid} or name={image_set_name!r}")
+        image_set_inst = _find_image_set(data)
+        if image_set_inst:
             annotation_set.image_sets.add(image_set_inst)
 
     return serializer.data
 
 
+def find_annotation_set(data: pd.DataFrame) -> dict:
+    """Find the existing annotation set an upload is appended to, by its annotation-set-uuid.
+
+    The annotation set row is locked until the end of the transaction, so concurrent appends to the same set are
+    compared with its stored rows one after the other.
+
+    Args:
+        data(pd.DataFrame): annotation dataframe.
+
+    Returns:
+        dict: the serialized annotation set.
+
+    Raises:
+        ValueError: if the upload has no annotation-set-uuid, or no annotation set has it.
+    """
+    annotation_set_uuid = data.get("annotation-set-uuid")
+    if not annotation_set_uuid or str(annotation_set_uuid).strip() == "":
+        raise ValueError("Appending to an annotation set requires its annotation-set-uuid.")
+
+    annotation_set = AnnotationSet.objects.select_for_update().filter(id=_as_uuid(annotation_set_uuid)).first()
+    if annotation_set is None:
+        raise ValueError(f"AnnotationSet not found with id={annotation_set_uuid}")
+    return AnnotationSetSerializer(annotation_set).data
+
+
+def _new_labels(label_list: list[dict], annotation_set_id: uuid.UUID) -> tuple[list[dict], list[int]]:
+    """The labels of an upload not already in the annotation set nor repeated in the upload, with their numbers."""
+    known_keys = set(Label.objects.filter(annotation_set_id=annotation_set_id).values_list("name", "parent_label_name"))
+
+    new_labels = []
+    label_numbers = []
+    for index, label_dict in enumerate(label_list):
+        # Ensure this matches the key from parse_label_set
+        key = (label_dict.get("name"), label_dict.get("parent_label_name"))
+        if key not in known_keys:
+            known_keys.add(key)
+            new_labels.append(label_dict)
+            label_numbers.append(index + 1)
+    return new_labels, label_numbers
+
+
 def insert_label_data(label_list: list, annotation_set_id: uuid.UUID) -> list[dict]:
     """Inserts a list of label dictionaries into the Label table.
 
+    The labels already in the annotation set are fetched with one query and skipped, as are repeated labels of the
+    upload. The new labels are then validated together, their aphia_ids against WoRMS concurrently, and inserted with
+    `bulk_create`.
+
     Args:
         label_list(list[dict]): list of label dictionaries.
         annotation_set_id(uuid.UUID): associated annotation set ID.
 
     Returns:
         list[dict]: list of inserted label data.
+
+    Raises:
+        serializers.ValidationError: if some new labels are invalid, with the errors of each by label number.
     """
-    processed_data = []
+    new_labels, label_numbers = _new_labels(label_list, annotation_set_id)
+    if not new_labels:
+        return []
 
-    for label_dict in label_list:
-        label_name = label_dict.get("name")
-        # Ensure this matches the key from parse_label_set
-        parent_name = label_dict.get("parent_label_name")
+    # Validate every aphia_id against WoRMS concurrently up front, instead of one blocking request per label
+    context = {"aphia_validation_error_cache": prevalidate_aphia_ids(_label_aphia_ids(new_labels))}
+    serializer = UploadLabelSerializer(data=new_labels, many=True, context=context)
+    if not serializer.is_valid():
+        raise serializers.ValidationError(
+            {
+                f"Label {number}": errors
+                for number, errors in zip(label_numbers, serializer.errors, strict=True)
+                if errors
+            }
+        )
 
-        existing_label = Label.objects.filter(
-            name=label_name, parent_label_name=parent_name, annotation_set_id=annotation_set_id
-        ).first()
+    labels = [
+        Label(annotation_set_id=annotation_set_id, **validated_data) for validated_data in serializer.validated_data
+    ]
+    # Rows conflicting on unique_label_name_per_parent can only come from a concurrent upload to the same set
+    Label.objects.bulk_create(labels, batch_size=ANNOTATION_BULK_BATCH_SIZE, ignore_conflicts=True)
 
-        if not existing_label:
-            label_dict["annotation_set_id"] = annotation_set_id
-            serializer = LabelSerializer(data=label_dict)
+    # Skipped rows keep the ids generated for them, so the stored labels are fetched back to report their actual ids
+    stored = {
+        (label.name, label.parent_label_name): label
+        for label in Label.objects.filter(
+            annotation_set_id=annotation_set_id, name__in={label.name for label in labels}
+        )
+    }
+    return LabelSerializer([stored[(label.name, label.parent_label_name)] for label in labels], many=True).data
 
-            if serializer.is_valid(raise_exception=True):
-                serializer.save()
-                processed_data.append(serializer.data)
 
-    return processed_data
+def _label_aphia_ids(label_list: list[dict]) -> list[int]:
+    """Collect the distinct lowest_aphia_id values of a list of label dictionaries.
 
+    Values that are not valid integers are skipped, and left to the LabelSerializer to report.
 
-def insert_annotations_data(parsed_data_list: list[dict], annotation_set_inst: uuid.UUID) -> dict:
+    Args:
+        label_list(list[dict]): list of label dictionaries.
+
+    Returns:
+        list[int]: the distinct aphia_ids, in order of first appearance.
+    """
+    aphia_ids = []
+    for label_dict in label_list:
+        try:
+            aphia_id = int(float(label_dict["lowest_aphia_id"]))
+        except (KeyError, TypeError, ValueError, OverflowError):
+            continue
+        aphia_ids.append(aphia_id)
+    return list(dict.fromkeys(aphia_ids))
+
+
+def insert_annotations_data(
+    parsed_data_list: list[dict], annotation_set_inst: uuid.UUID, with_data: bool = True
+) -> dict:
     """Ingests parsed records into Annotation, Annotator, and AnnotationLabel.
 
     Args:
         parsed_data_list (list[dict]): List of parsed annotation data.
         annotation_set_inst (uuid.UUID): UUID of the annotation set.
+        with_data (bool): return the serialized rows, and not only their number.
 
     Returns:
         dict: Dictionary containing the inserted annotation data.
@@ -122,25 +256,13 @@ def insert_annotations_data(parsed_data_list: list[dict], annotation_set_inst: u
     created_count = 0
     data = []
 
-    for index, entry in enumerate(parsed_data_list):
-        image_inst = None
-        image_uuid = entry.get("image_id")
-        image_filename = entry.get("image_filename")
-
-        if image_uuid and str(image_uuid).strip() != "":
-            image_inst = Image.objects.filter(id=image_uuid).first()
-
-        if not image_inst and image_filename:
-            name_match = Image.objects.filter(filename=image_filename).first()
-            if name_match and image_uuid:
-                raise ValueError(
-                    f"ImageSet not found with id={image_uuid} but name={image_filename!r} "
-                    f"matched a different record (id={name_match.id})"
-                )
-            image_inst = name_match
+    # Images are resolved up front with set-based queries, by filename within the image sets of the annotation set
+    existing_image_ids, image_ids_by_filename = _resolve_images(
+        parsed_data_list, _annotation_set_image_set_ids(annotation_set_inst)
+    )
 
-        if not image_inst:
-            raise ValueError(f"Row {index+1}: Image not found (UUID: {image_uuid}, Name: {image_filename})")
+    for index, entry in enumerate(parsed_data_list):
+        image_id = _match_image(index, entry, existing_image_ids, image_ids_by_filename)
 
         # Labels must exist in the context of this Annotation Set (from Tab 3)
         label_inst = Label.objects.filter(name=entry["label_name"], annotation_set=annotation_set_inst).first()
@@ -154,7 +276,7 @@ def insert_annotations_data(parsed_data_list: list[dict], annotation_set_inst: u
 
         # Create Annotation via Serializer
         annotation_data = {
-            "image_id": image_inst.id,
+            "image_id": image_id,
             "annotation_set_id": annotation_set_inst,
             "annotation_platform": entry["annotation_platform"],
             "shape": entry["shape"],
@@ -167,46 +289,908 @@ def insert_annotations_data(parsed_data_list: list[dict], annotation_set_inst: u
         annotation_obj = anno_serializer.save()
 
         # Create AnnotationLabel via Serializer
-        dt_val = entry["creation_datetime"]
-        if isinstance(dt_val, str) and dt_val.strip():
-            try:
-                dt_val = datetime.strptime(dt_val, "%d%m%Y %H:%M:%S")
-            except ValueError:
-                dt_val = datetime.now()
-
         anno_label_data = {
             "annotation_id": annotation_obj.id,
             "label_id": label_inst.id,
             "annotator_id": annotator_inst.id,
-            "creation_datetime": dt_val,
+            "creation_datetime": _parse_creation_datetime(entry["creation_datetime"]),
         }
 
         anno_label_serializer = AnnotationLabelSerializer(data=anno_label_data)
         anno_label_serializer.is_valid(raise_exception=True)
         anno_label_serializer.save()
+        created_count += 1
 
-        annotator_serializer = AnnotatorSerializer(annotator_inst)
+        if with_data:
+            annotator_serializer = AnnotatorSerializer(annotator_inst)
 
-        data.append(
-            {
-                "annotation": anno_serializer.data,
-                "label": anno_label_serializer.data,
-                "annotator": annotator_serializer.data,
-            }
-        )
-        created_count += 1
+            data.append(
+                {
+                    "annotation": anno_serializer.data,
+                    "label": anno_label_serializer.data,
+                    "annotator": annotator_serializer.data,
+                }
+            )
+
+    if not with_data:
+        return {"created": created_count}
 
     data = {"created": created_count, "data": data}
     return data
 
 
-def ingest_annotation_data(annotation_set_df: pd.DataFrame, label_list: list, annotation_data: list[dict]) -> dict:
-    """Ingest data."""
+def _parse_creation_datetime(dt_val: object) -> object:
+    """Parse a "DDMMYYYY HH:MM:SS" creation date-time string, falling back to now if it can't be parsed.
+
+    Args:
+        dt_val (object): creation date-time as read from the template.
+
+    Returns:
+        object: the parsed datetime, or the value unchanged if it isn't a non-blank string.
+    """
+    if isinstance(dt_val, str) and dt_val.strip():
+        try:
+            return datetime.strptime(dt_val, ANNOTATION_CREATION_DATETIME_FORMAT)
+        except ValueError:
+            return datetime.now()
+    return dt_val
+
+
+def _chunks(values: list, size: int = ANNOTATION_BULK_BATCH_SIZE) -> Iterator[list]:
+    """Split a list into chunks, to keep `__in` lookups under the query parameter limit.
+
+    Args:
+        values (list): values to split.
+        size (int): maximum size of each chunk.
+
+    Returns:
+        Iterator[list]: iterator over the chunks.
+    """
+    return (values[start : start + size] for start in range(0, len(values), size))
+
+
+def _annotation_set_image_set_ids(annotation_set_inst: uuid.UUID) -> list[uuid.UUID]:
+    """Ids of the image sets linked to an annotation set, to which the lookup of its images by filename is scoped."""
+    return list(
+        AnnotationSetImageSet.objects.filter(annotation_set_id=annotation_set_inst).values_list(
+            "image_set_id", flat=True
+        )
+    )
+
+
+def _resolve_images(
+    parsed_data_list: list[dict], image_set_ids: list[uuid.UUID] | None = None
+) -> tuple[set[uuid.UUID], dict[str, uuid.UUID | None]]:
+    """Look up all images referenced by the upload, by id and by filename.
+
+    Filenames are only unique within an image set, so they are looked up in the given image sets (those linked to the
+    annotation set), with the `(filename, image_set)` unique index, or in all image sets if none is given.
+
+    Args:
+        parsed_data_list (list[dict]): List of parsed annotation data.
+        image_set_ids (list[uuid.UUID] | None): image sets in which images are looked up by filename.
+
+    Returns:
+        tuple[set[uuid.UUID], dict[str, uuid.UUID | None]]: ids of the existing images, and image id by filename
+        (None when several of the image sets have an image with that filename).
+    """
+    image_ids = set()
+    filenames = set()
+    for entry in parsed_data_list:
+        image_uuid = _as_uuid(entry.get("image_id"))
+        if image_uuid:
+            image_ids.add(image_uuid)
+        if entry.get("image_filename"):
+            filenames.add(entry["image_filename"])
+
+    existing_ids = set()
+    for chunk in _chunks(list(image_ids)):
+        existing_ids.update(Image.objects.filter(id__in=chunk).values_list("id", flat=True))
+
+    ids_by_filename = {}
+    for chunk in _chunks(list(filenames)):
+        images = Image.objects.filter(filename__in=chunk)
+        if image_set_ids:
+            images = images.filter(image_set_id__in=image_set_ids)
+        for filename, image_id in images.values_list("filename", "id"):
+            ids_by_filename[filename] = None if filename in ids_by_filename else image_id
+
+    return existing_ids, ids_by_filename
+
+
+def _as_uuid(value: object) -> uuid.UUID | None:
+    """Convert an image id from the template to a UUID, or None if it is blank or not a valid UUID."""
+    if not value or str(value).strip() == "":
+        return None
+    try:
+        return uuid.UUID(str(value).strip())
+    except ValueError:
+        return None
+
+
+def _match_image(
+    index: int, entry: dict, existing_ids: set[uuid.UUID], ids_by_filename: dict[str, uuid.UUID | None]
+) -> uuid.UUID:
+    """Find the image of an annotation row, by id then by filename.
+
+    Args:
+        index (int): index of the row in the upload.
+        entry (dict): parsed annotation data of the row.
+        existing_ids (set[uuid.UUID]): ids of the existing images.
+        ids_by_filename (dict[str, uuid.UUID | None]): image id by filename, as returned by `_resolve_images`.
+
+    Returns:
+        uuid.UUID: id of the matched image.
+    """
+    image_uuid = entry.get("image_id")
+    image_filename = entry.get("image_filename")
+
+    image_id = _as_uuid(image_uuid)
+    if image_id not in existing_ids:
+        image_id = None
+
+    if not image_id and image_filename:
+        if image_filename in ids_by_filename and ids_by_filename[image_filename] is None:
+            raise ValueError(
+                f"Row {index+1}: Image name={image_filename!r} matches images in several image sets, "
+                "give the image UUID instead"
+            )
+        name_match = ids_by_filename.get(image_filename)
+        if name_match and image_uuid:
+            raise ValueError(
+                f"ImageSet not found with id={image_uuid} but name={image_filename!r} "
+                f"matched a different record (id={name_match})"
+            )
+        image_id = name_match
+
+    if not image_id:
+        raise ValueError(f"Row {index+1}: Image not found (UUID: {image_uuid}, Name: {image_filename})")
+
+    return image_id
+
+
+def _resolve_labels(parsed_data_list: list[dict], annotation_set_inst: uuid.UUID) -> dict[str, uuid.UUID]:
+    """Look up all labels referenced by the upload in the annotation set.
+
+    Args:
+        parsed_data_list (list[dict]): List of parsed annotation data.
+        annotation_set_inst (uuid.UUID): UUID of the annotation set.
+
+    Returns:
+        dict[str, uuid.UUID]: label id by name (the first label by id when several share a name).
+    """
+    names = list({entry["label_name"] for entry in parsed_data_list})
+    ids_by_name = {}
+    for chunk in _chunks(names):
+        labels = (
+            Label.objects.filter(annotation_set=annotation_set_inst, name__in=chunk)
+            .order_by("name", "id")
+            .values_list("name", "id")
+        )
+        for name, label_id in labels:
+            ids_by_name.setdefault(name, label_id)
+    return ids_by_name
+
+
+def _get_or_create_annotators(parsed_data_list: list[dict]) -> dict[str, Annotator]:
+    """Get or create all annotators referenced by the upload.
+
+    Args:
+        parsed_data_list (list[dict]): List of parsed annotation data.
+
+    Returns:
+        dict[str, Annotator]: annotator by name.
+    """
+    names = list({entry.get("annotator_name") for entry in parsed_data_list})
+
+    annotators = {}
+    for chunk in _chunks(names):
+        annotators.update((annotator.name, annotator) for annotator in Annotator.objects.filter(name__in=chunk))
+
+    missing = [name for name in names if name not in annotators]
+    if missing:
+        Annotator.objects.bulk_create(
+            [Annotator(name=name) for name in missing], batch_size=ANNOTATION_BULK_BATCH_SIZE, ignore_conflicts=True
+        )
+        for chunk in _chunks(missing):
+            annotators.update((annotator.name, annotator) for annotator in Annotator.objects.filter(name__in=chunk))
+
+    return annotators
+
+
+def _bulk_annotation_data(entry: dict) -> dict:
+    """Map a row of parsed annotation data to the BulkAnnotationSerializer fields."""
+    return {
+        "annotation_platform": entry["annotation_platform"],
+        "shape": entry["shape"],
+        "coordinates": entry["coordinates"],
+        "dimension_pixels": entry["dimension_pixels"],
+        "creation_datetime": _parse_creation_datetime(entry["creation_datetime"]),
+    }
+
+
+def _validate_bulk_chunk(start: int, entries: Sequence[dict]) -> tuple[list[dict], list[dict]]:
+    """Validate the annotation fields of a chunk of rows with BulkAnnotationSerializer.
+
+    Args:
+        start (int): index of the first row of the chunk (not used, rows are numbered once merged).
+        entries (Sequence[dict]): parsed annotation data of the rows.
+
+    Returns:
+        tuple[list[dict], list[dict]]: the validated data of the rows (empty if any is invalid), and their errors.
+    """
+    serializer = BulkAnnotationSerializer(data=[_bulk_annotation_data(entry) for entry in entries], many=True)
+    if serializer.is_valid():
+        return list(serializer.validated_data), [{} for _ in entries]
+    return [], list(serializer.errors)
+
+
+def _validate_bulk_annotations(parsed_data_list: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Validate the annotation fields of every row of an upload.
+
+    Large uploads are validated in chunks by `ANNOTATION_UPLOAD_WORKERS` worker processes (see `map_chunks`), as
+    running the serializer on every row is the most CPU-bound stage of the ingest.
+
+    Args:
+        parsed_data_list (list[dict]): List of parsed annotation data.
+
+    Returns:
+        tuple[list[dict], list[dict]]: the validated data of every row (empty if any row is invalid), and the errors
+        of every row.
+    """
+    validated_rows = []
+    row_errors = []
+    for chunk_validated_rows, chunk_errors in map_chunks(_validate_bulk_chunk, parsed_data_list):
+        validated_rows.extend(chunk_validated_rows)
+        row_errors.extend(chunk_errors)
+    if any(row_errors):
+        return [], row_errors
+    return validated_rows, row_errors
+
+
+def _match_label(index: int, entry: dict, ids_by_name: dict[str, uuid.UUID]) -> uuid.UUID:
+    """Find the label of an annotation row by name, as returned by `_resolve_labels`."""
+    label_id = ids_by_name.get(entry["label_name"])
+    if not label_id:
+        raise ValueError(f"Row {index+1}: Label '{entry['label_name']}' not found in this Annotation Set.")
+    return label_id
+
+
+def _annotation_row(
+    entry: dict, validated_data: dict, related_ids: tuple[uuid.UUID, uuid.UUID, uuid.UUID], annotator: Annotator
+) -> tuple[Annotation, AnnotationLabel]:
+    """Build the unsaved annotation and annotation label of a validated row.
+
+    Args:
+        entry (dict): parsed annotation data of the row.
+        validated_data (dict): the row validated by BulkAnnotationSerializer.
+        related_ids (tuple[uuid.UUID, uuid.UUID, uuid.UUID]): ids of the annotation set, image and label of the row.
+        annotator (Annotator): the annotator of the row.
+
+    Returns:
+        tuple[Annotation, AnnotationLabel]: the annotation and its label.
+    """
+    annotation_set_inst, image_id, label_id = related_ids
+    creation_datetime = validated_data.pop("creation_datetime")
+    annotation = Annotation(image_id=image_id, annotation_set_id=annotation_set_inst, **validated_data)
+    annotation_label = AnnotationLabel(
+        annotation_id=annotation.id,
+        label_id=label_id,
+        annotator_id=annotator.id,
+        creation_datetime=creation_datetime,
+    )
+    return annotation, annotation_label
+
+
+def _prepare_bulk_annotations(
+    parsed_data_list: list[dict], annotation_set_inst: uuid.UUID
+) -> tuple[list[Annotation], list[AnnotationLabel], list[Annotator]]:
+    """Resolve and validate every row of an upload into unsaved Annotation and AnnotationLabel instances.
+
+    The images (by filename within the image sets of the annotation set), labels and annotators of the whole upload
+    are resolved with a handful of set-based queries, and every row is validated before anything is written. Missing
+    annotators are the only rows created here.
+
+    Args:
+        parsed_data_list (list[dict]): List of parsed annotation data.
+        annotation_set_inst (uuid.UUID): UUID of the annotation set.
+
+    Returns:
+        tuple[list[Annotation], list[AnnotationLabel], list[Annotator]]: the annotation, annotation label and
+        annotator of each row.
+    """
+    existing_image_ids, image_ids_by_filename = _resolve_images(
+        parsed_data_list, _annotation_set_image_set_ids(annotation_set_inst)
+    )
+    label_ids_by_name = _resolve_labels(parsed_data_list, annotation_set_inst)
+
+    related_ids = []
+    for index, entry in enumerate(parsed_data_list):
+        image_id = _match_image(index, entry, existing_image_ids, image_ids_by_filename)
+        label_id = _match_label(index, entry, label_ids_by_name)
+        related_ids.append((annotation_set_inst, image_id, label_id))
+
+    validated_rows, row_errors = _validate_bulk_annotations(parsed_data_list)
+    if any(row_errors):
+        raise serializers.ValidationError(
+            {f"Row {index+1}": errors for index, errors in enumerate(row_errors) if errors}
+        )
+
+    # Annotators are only created once every row is known to be valid
+    annotators_by_name = _get_or_create_annotators(parsed_data_list)
+
+    annotations = []
+    annotation_labels = []
+    annotators = []
+    for entry, row_related_ids, validated_data in zip(parsed_data_list, related_ids, validated_rows, strict=True):
+        annotator = annotators_by_name[entry.get("annotator_name")]
+        annotation, annotation_label = _annotation_row(entry, validated_data, row_related_ids, annotator)
+        annotations.append(annotation)
+        annotation_labels.append(annotation_label)
+        annotators.append(annotator)
+
+    return annotations, annotation_labels, annotators
+
+
+def _iter_bulk_annotations(
+    parsed_data_list: list[dict], annotation_set_inst: uuid.UUID
+) -> Iterator[tuple[Annotation, AnnotationLabel, Annotator]]:
+    """Resolve and validate the rows of an upload into unsaved Annotation and AnnotationLabel instances, as consumed.
+
+    Like `_prepare_bulk_annotations`, but for inserts streamed into the database (see `_copy_insert`): the images,
+    labels and annotators are resolved, and every row matched to its image and label, when this is called, and the
+    rows are then validated a chunk at a time (by worker processes, see `imap_chunks`) and built as they are consumed,
+    without running any query, so only a few chunks of instances are held in memory. Missing annotators are created
+    up front, so the caller must run this in the transaction of the inserts. Once a row is invalid, no more rows are
+    yielded, the remaining chunks are only validated, and the errors of every row are raised once all are consumed:
+    the caller's transaction then rolls back the rows it already wrote.
+
+    Args:
+        parsed_data_list (list[dict]): List of parsed annotation data.
+        annotation_set_inst (uuid.UUID): UUID of the annotation set.
+
+    Returns:
+        Iterator[tuple[Annotation, AnnotationLabel, Annotator]]: the annotation, annotation label and annotator of
+        each row.
+    """
+    existing_image_ids, image_ids_by_filename = _resolve_images(
+        parsed_data_list, _annotation_set_image_set_ids(annotation_set_inst)
+    )
+    label_ids_by_name = _resolve_labels(parsed_data_list, annotation_set_inst)
+
+    def related_ids(index: int, entry: dict) -> tuple[uuid.UUID, uuid.UUID, uuid.UUID]:
+        image_id = _match_image(index, entry, existing_image_ids, image_ids_by_filename)
+        return annotation_set_inst, image_id, _match_label(index, entry, label_ids_by_name)
+
+    # Every row is matched before anything is written, and matched again as it is built rather than kept
+    for index, entry in enumerate(parsed_data_list):
+        related_ids(index, entry)
+    annotators_by_name = _get_or_create_annotators(parsed_data_list)
+
+    def rows() -> Iterator[tuple[Annotation, AnnotationLabel, Annotator]]:
+        chunk_size = ANNOTATION_PARALLEL_CHUNK_SIZE
+        chunks = (
+            (start, parsed_data_list[start : start + chunk_size])
+            for start in range(0, len(parsed_data_list), chunk_size)
+        )
+        row_errors = {}
+        for number, (validated_rows, errors) in enumerate(imap_chunks(_validate_bulk_chunk, chunks)):
+            start = number * chunk_size
+            row_errors.update({f"Row {start + offset + 1}": error for offset, error in enumerate(errors) if error})
+            if row_errors:
+                continue
+            for index, validated_data in enumerate(validated_rows, start=start):
+                entry = parsed_data_list[index]
+                annotator = annotators_by_name[entry.get("annotator_name")]
+                yield (*_annotation_row(entry, validated_data, related_ids(index, entry), annotator), annotator)
+        if row_errors:
+            raise serializers.ValidationError(row_errors)
+
+    return rows()
+
+
+def annotation_rows_data(
+    annotations: list[Annotation], annotation_labels: list[AnnotationLabel], annotators: list[Annotator | None]
+) -> list[dict]:
+    """Serialize annotation rows as returned for an upload, each with its annotation, label and annotator.
+
+    Args:
+        annotations (list[Annotation]): the annotation of each row.
+        annotation_labels (list[AnnotationLabel]): the annotation label of each row.
+        annotators (list[Annotator | None]): the annotator of each row.
+
+    Returns:
+        list[dict]: the serialized rows.
+    """
+    # Annotators are shared by many rows (or missing, for stored rows), so each one is only serialized once
+    annotator_data = {
+        annotator: AnnotatorSerializer(annotator).data if annotator is not None else None
+        for annotator in set(annotators)
+    }
+    return [
+        {"annotation": annotation, "label": annotation_label, "annotator": annotator_data[annotator]}
+        for annotation, annotation_label, annotator in zip(
+            AnnotationSerializer(annotations, many=True).data,
+            AnnotationLabelSerializer(annotation_labels, many=True).data,
+            annotators,
+            strict=True,
+        )
+    ]
+
+
+def bulk_insert_annotations_data(
+    parsed_data_list: list[dict],
+    annotation_set_inst: uuid.UUID,
+    batch_size: int = ANNOTATION_BULK_BATCH_SIZE,
+    with_data: bool = True,
+) -> dict:
+    """Ingests parsed records into Annotation, Annotator, and AnnotationLabel using bulk queries.
+
+    Same as `insert_annotations_data`, but the images, labels and annotators of the whole upload are resolved with a
+    handful of set-based queries, every row is validated before anything is written, and the annotations and their
+    labels are then inserted with `bulk_create` in batches.
+
+    Args:
+        parsed_data_list (list[dict]): List of parsed annotation data.
+        annotation_set_inst (uuid.UUID): UUID of the annotation set.
+        batch_size (int): number of rows inserted per query.
+        with_data (bool): return the serialized rows, and not only their number.
+
+    Returns:
+        dict: Dictionary containing the inserted annotation data.
+    """
+    annotations, annotation_labels, annotators = _prepare_bulk_annotations(parsed_data_list, annotation_set_inst)
+
+    Annotation.objects.bulk_create(annotations, batch_size=batch_size)
+    AnnotationLabel.objects.bulk_create(annotation_labels, batch_size=batch_size)
+
+    if not with_data:
+        return {"created": len(annotations)}
+    return {"created": len(annotations), "data": annotation_rows_data(annotations, annotation_labels, annotators)}
+
+
+def _copy_to_staging(
+    cursor: CursorWrapper, copy_models: Sequence[type[models.Model]], rows: Iterable[Sequence]
+) -> tuple[str, int]:
+    """Stream rows of model instances into a temporary staging table with COPY, one row at a time.
+
+    Each row has an instance of each model, and the staging table has the columns of each model's table, prefixed by
+    the table name, so related instances (e.g. an annotation and its label) are streamed together. The staging table
+    has a name of its own, and is dropped at the end of the transaction.
+
+    Args:
+        cursor (CursorWrapper): cursor of the default database connection.
+        copy_models (Sequence[type[models.Model]]): model of the instances of each row.
+        rows (Iterable[Sequence]): unsaved instances to copy, consumed as they are copied.
+
+    Returns:
+        tuple[str, int]: the quoted name of the staging table, and the number of copied rows.
+    """
+    quote_name = connection.ops.quote_name
+    staging_table = quote_name(f"copy_staging_{uuid.uuid4().hex}")
+    columns = [
+        f"{quote_name(model._meta.db_table)}.{quote_name(field.column)} AS {_staging_column(model, field)}"
+        for model in copy_models
+        for field in model._meta.concrete_fields
+    ]
+    tables = ", ".join(quote_name(model._meta.db_table) for model in copy_models)
+    cursor.execute(
+        f"CREATE TEMPORARY TABLE {staging_table} ON COMMIT DROP AS SELECT {', '.join(columns)} FROM {tables} "
+        "WITH NO DATA"
+    )
+
+    copied = 0
+    with cursor.copy(f"COPY {staging_table} FROM STDIN") as copy:
+        for instances in rows:
+            # pre_save fills created_at/updated_at, get_db_prep_save adapts e.g. JSON values, as an INSERT would
+            copy.write_row(
+                [
+                    field.get_db_prep_save(field.pre_save(instance, add=True), connection)
+                    for instance in instances
+                    for field in instance._meta.concrete_fields
+                ]
+            )
+            copied += 1
+
+    return staging_table, copied
+
+
+def _staging_column(model: type[models.Model], field: models.Field) -> str:
+    """Quoted name of the column of a model field in a staging table of `_copy_to_staging`."""
+    return connection.ops.quote_name(f"{model._meta.db_table}__{field.column}")
+
+
+def _merge_from_staging(model: type[models.Model], staging_table: str) -> str:
+    """SQL inserting the instances of a model copied into a staging table by `_copy_to_staging` into its table."""
+    quote_name = connection.ops.quote_name
+    fields = model._meta.concrete_fields
+    columns = ", ".join(quote_name(field.column) for field in fields)
+    staged_columns = ", ".join(_staging_column(model, field) for field in fields)
+    return f"INSERT INTO {quote_name(model._meta.db_table)} ({columns}) SELECT {staged_columns} FROM {staging_table}"
+
+
+def copy_insert_annotations_data(
+    parsed_data_list: list[dict], annotation_set_inst: uuid.UUID, with_data: bool = False
+) -> dict:
+    """Ingests parsed records into Annotation, Annotator, and AnnotationLabel using PostgreSQL COPY.
+
+    Rows are resolved as in `bulk_insert_annotations_data`, then validated and built a chunk at a time (see
+    `_iter_bulk_annotations`) and streamed with `COPY ... FROM STDIN` into a temporary staging table as they are
+    built, and merged into the annotations and annotation labels tables in a single statement. Meant for very large
+    (e.g. machine-generated) annotation sets, so only the number of created rows is returned.
+
+    Args:
+        parsed_data_list (list[dict]): List of parsed annotation data.
+        annotation_set_inst (uuid.UUID): UUID of the annotation set.
+        with_data (bool): not used, accepted for the same signature as the other backends.
+
+    Returns:
+        dict: Dictionary containing the number of inserted annotations.
+    """
     with transaction.atomic():
-        annotation_set = insert_annotations_set(annotation_set_df)
-        label_set = insert_label_data(label_list, annotation_set["id"])
+        rows = _iter_bulk_annotations(parsed_data_list, annotation_set_inst)
+        created = _copy_insert((annotation, annotation_label) for annotation, annotation_label, _ in rows)
+    return {"created": created}
+
+
+def _copy_insert(rows: Iterable[tuple[Annotation, AnnotationLabel]]) -> int:
+    """Insert unsaved annotations and their labels with COPY into a staging table, merged in a single statement.
+
+    Args:
+        rows (Iterable[tuple[Annotation, AnnotationLabel]]): the annotation and annotation label of each row, consumed
+            as they are copied.
+
+    Returns:
+        int: the number of inserted rows.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        staging_table, copied = _copy_to_staging(cursor, (Annotation, AnnotationLabel), rows)
+        cursor.execute(
+            f"WITH merged_annotations AS ({_merge_from_staging(Annotation, staging_table)}) "
+            f"{_merge_from_staging(AnnotationLabel, staging_table)}"
+        )
+        cursor.execute(f"DROP TABLE {staging_table}")
+    return copied
+
+
+def _coordinates_hash(coordinates: object) -> str:
+    """Hash annotation coordinates, with integers and floats of the same value hashing alike.
+
+    Args:
+        coordinates (object): the coordinates, as uploaded or stored.
+
+    Returns:
+        str: hex digest of the coordinates.
+    """
 
-        annotation_data = insert_annotations_data(annotation_data, annotation_set["id"])
+    def normalise(value: object) -> object:
+        if isinstance(value, list):
+            return [normalise(item) for item in value]
+        if isinstance(value, int | float) and not isinstance(value, bool):
+            return float(value)
+        return value
+
+    return hashlib.sha1(json.dumps(normalise(coordinates), separators=(",", ":")).encode()).hexdigest()
+
+
+def _existing_annotation_keys(annotation_set_inst: uuid.UUID) -> Counter:
+    """Count the annotation rows of an annotation set by image, label, annotator, shape and coordinates hash.
+
+    Args:
+        annotation_set_inst (uuid.UUID): UUID of the annotation set.
+
+    Returns:
+        Counter: number of stored rows by key.
+    """
+    rows = (
+        AnnotationLabel.objects.filter(annotation__annotation_set=annotation_set_inst)
+        .values_list("annotation__image_id", "label_id", "annotator_id", "annotation__shape", "annotation__coordinates")
+        .iterator(chunk_size=ANNOTATION_BULK_BATCH_SIZE)
+    )
+    return Counter(
+        (image_id, label_id, annotator_id, shape, _coordinates_hash(coordinates))
+        for image_id, label_id, annotator_id, shape, coordinates in rows
+    )
+
+
+def _new_annotation_rows(
+    rows: Iterable[tuple[Annotation, AnnotationLabel, Annotator]], stored_keys: Counter
+) -> Iterator[tuple[Annotation, AnnotationLabel, Annotator]]:
+    """Leave out the rows of an upload already stored, once per stored occurrence.
+
+    Args:
+        rows (Iterable[tuple[Annotation, AnnotationLabel, Annotator]]): the annotation, annotation label and annotator
+            of each row.
+        stored_keys (Counter): keys of the stored rows, as counted by `_existing_annotation_keys`, used up as rows
+            match them.
+
+    Yields:
+        tuple[Annotation, AnnotationLabel, Annotator]: the rows that aren't stored yet.
+    """
+    for annotation, annotation_label, annotator in rows:
+        key = (
+            annotation.image_id,
+            annotation_label.label_id,
+            annotator.id,
+            annotation.shape,
+            _coordinates_hash(annotation.coordinates),
+        )
+        if stored_keys[key] > 0:
+            stored_keys[key] -= 1
+            continue
+        yield annotation, annotation_label, annotator
+
+
+def append_annotations_data(
+    parsed_data_list: list[dict],
+    annotation_set_inst: uuid.UUID,
+    backend: str = "bulk",
+    with_data: bool = True,
+) -> dict:
+    """Ingests only the parsed records not already in an existing annotation set.
+
+    Rows are resolved and validated as in `bulk_insert_annotations_data`, then keyed by image, label, annotator,
+    shape and coordinates hash, and compared with the stored rows of the annotation set. A row is inserted once per
+    occurrence in the upload beyond the stored ones, so uploading the same file again inserts nothing, and a re-sync
+    only writes what has changed since. Stored rows missing from the upload are left as they are.
+
+    Args:
+        parsed_data_list (list[dict]): List of parsed annotation data.
+        annotation_set_inst (uuid.UUID): UUID of the existing annotation set.
+        backend (str): "copy" to insert the new rows with PostgreSQL COPY, anything else for `bulk_create`.
+        with_data (bool): return the serialized new rows, and not only their number (never done with "copy").
+
+    Returns:
+        dict: Dictionary containing the number of inserted and skipped rows, and the inserted annotation data.
+    """
+    stored_keys = _existing_annotation_keys(annotation_set_inst)
+    if backend == "copy":
+        with transaction.atomic():
+            rows = _new_annotation_rows(_iter_bulk_annotations(parsed_data_list, annotation_set_inst), stored_keys)
+            created = _copy_insert((annotation, annotation_label) for annotation, annotation_label, _ in rows)
+        return {"created": created, "skipped": len(parsed_data_list) - created}
+
+    annotations, annotation_labels, annotators = _prepare_bulk_annotations(parsed_data_list, annotation_set_inst)
+    new_rows = list(_new_annotation_rows(zip(annotations, annotation_labels, annotators, strict=True), stored_keys))
+    new_annotations = [annotation for annotation, _, _ in new_rows]
+    new_annotation_labels = [annotation_label for _, annotation_label, _ in new_rows]
+    new_annotators = [annotator for _, _, annotator in new_rows]
+
+    data = {"created": len(new_annotations), "skipped": len(annotations) - len(new_annotations)}
+    Annotation.objects.bulk_create(new_annotations, batch_size=ANNOTATION_BULK_BATCH_SIZE)
+    AnnotationLabel.objects.bulk_create(new_annotation_labels, batch_size=ANNOTATION_BULK_BATCH_SIZE)
+    if with_data:
+        data["data"] = annotation_rows_data(new_annotations, new_annotation_labels, new_annotators)
+    return data
+
+
+def ingest_annotation_data(  # noqa: PLR0913
+    annotation_set_df: pd.DataFrame,
+    label_list: list,
+    annotation_data: list[dict],
+    backend: str | None = None,
+    validate_coordinates: bool = False,
+    with_data: bool = True,
+    mode: str = "create",
+) -> dict:
+    """Ingest data.
+
+    Args:
+        annotation_set_df (pd.DataFrame): parsed annotation set metadata.
+        label_list (list): parsed label set.
+        annotation_data (list[dict]): parsed annotation data.
+        backend (str | None): how to insert the annotation data, one of ANNOTATION_INGEST_BACKENDS: "rows" (one
+            serializer per row), "bulk" (`bulk_create`) or "copy" (PostgreSQL COPY). Defaults to "bulk" for uploads
+            of at least `ANNOTATION_BULK_THRESHOLD` rows, and "rows" otherwise.
+        validate_coordinates (bool): check the coordinates of every row against the rules of its shape, before
+            anything is written.
+        with_data (bool): return every inserted annotation row, with its label and annotator. Without it only the
+            number of inserted rows is returned, which the "copy" backend always does.
+        mode (str): one of ANNOTATION_UPLOAD_MODES, "create" to ingest the upload as a new annotation set, or
+            "append" to add its new labels and rows to the annotation set of its annotation-set-uuid, see
+            `append_annotations_data` (with "bulk" rather than "rows" inserts).
+
+    Returns:
+        dict: the inserted (or appended to) annotation set, labels and annotation data.
+
+    Raises:
+        ValueError: if the backend or mode is unknown, or the annotation set to append to is not found.
+        serializers.ValidationError: if `validate_coordinates` is set and some rows have invalid coordinates.
+    """
+    if backend is None:
+        backend = "bulk" if len(annotation_data) >= ANNOTATION_BULK_THRESHOLD else "rows"
+    if backend not in ANNOTATION_INGEST_BACKENDS:
+        raise ValueError(f"Unknown ingest backend: {backend}")
+    if mode not in ANNOTATION_UPLOAD_MODES:
+        raise ValueError(f"Unknown upload mode: {mode}")
+    insert_annotations = {
+        "rows": insert_annotations_data,
+        "bulk": bulk_insert_annotations_data,
+        "copy": copy_insert_annotations_data,
+    }[backend]
+
+    if validate_coordinates:
+        coordinate_errors = validate_annotation_coordinates(
+            [entry.get("shape") for entry in annotation_data], [entry.get("coordinates") for entry in annotation_data]
+        )
+        if coordinate_errors:
+            raise serializers.ValidationError(
+                {f"Row {index+1}": {"coordinates": errors} for index, errors in coordinate_errors.items()}
+            )
+
+    with transaction.atomic():
+        if mode == "append":
+            annotation_set = find_annotation_set(annotation_set_df)
+            label_set = insert_label_data(label_list, annotation_set["id"])
+            annotation_data = append_annotations_data(
+                annotation_data, annotation_set["id"], backend=backend, with_data=with_data
+            )
+        else:
+            annotation_set = insert_annotations_set(annotation_set_df)
+            label_set = insert_label_data(label_list, annotation_set["id"])
+            annotation_data = insert_annotations(annotation_data, annotation_set["id"], with_data=with_data)
 
         data = {"annotation_set": annotation_set, "label_set": label_set, "annotation_data": annotation_data}
         return data
+
+
+def _annotation_set_errors(annotation_set_df: pd.DataFrame) -> tuple[dict, ImageSet | None]:
+    """Validate the annotation set metadata of an upload, and find its image set, without writing anything."""
+    errors = {}
+    serializer = AnnotationSetSerializer(data=_annotation_set_data(annotation_set_df))
+    if not serializer.is_valid():
+        errors.update(serializer.errors)
+    image_set = None
+    try:
+        image_set = _find_image_set(annotation_set_df)
+    except ValueError as e:
+        errors["image_set"] = [str(e)]
+    return errors, image_set
+
+
+def _append_errors(annotation_set_df: pd.DataFrame, label_list: list[dict]) -> tuple[dict, dict, set, list]:
+    """Check an upload against the existing annotation set it is appended to, without writing anything.
+
+    Only the labels not already in the set are validated, as `insert_label_data` only inserts those, and the
+    annotation rows can refer to the stored labels too. Images are looked up in the image sets linked to the set.
+
+    Args:
+        annotation_set_df (pd.DataFrame): parsed annotation set metadata.
+        label_list (list[dict]): parsed label set.
+
+    Returns:
+        tuple[dict, dict, set, list]: the annotation set errors, the label errors, the label names the annotation
+        rows can refer to, and the ids of the image sets in which images are looked up by filename.
+    """
+    try:
+        # The lookup locks the annotation set row, which needs a transaction
+        with transaction.atomic():
+            annotation_set_id = find_annotation_set(annotation_set_df)["id"]
+    except ValueError as e:
+        return {"annotation_set": [str(e)]}, _label_errors(label_list), _label_names(label_list), []
+
+    new_labels, label_numbers = _new_labels(label_list, annotation_set_id)
+    label_names = _label_names(label_list) | set(
+        Label.objects.filter(annotation_set_id=annotation_set_id).values_list("name", flat=True)
+    )
+    return {}, _label_errors(new_labels, label_numbers), label_names, _annotation_set_image_set_ids(annotation_set_id)
+
+
+def _label_names(label_list: list[dict]) -> set[str]:
+    """The names of the labels of an upload."""
+    return {label_dict.get("name") for label_dict in label_list}
+
+
+def _label_errors(label_list: list[dict], label_numbers: list[int] | None = None) -> dict:
+    """Validate the labels of an upload, checking all their aphia_ids against WoRMS concurrently up front.
+
+    Args:
+        label_list (list[dict]): the labels to validate.
+        label_numbers (list[int] | None): the number of each label in the upload, when only some are validated.
+
+    Returns:
+        dict: errors by label number, of the labels with errors.
+    """
+    if label_numbers is None:
+        label_numbers = list(range(1, len(label_list) + 1))
+    context = {"aphia_validation_error_cache": prevalidate_aphia_ids(_label_aphia_ids(label_list))}
+    serializer = UploadLabelSerializer(data=label_list, many=True, context=context)
+    if serializer.is_valid():
+        return {}
+    return {
+        f"Label {number}": errors for number, errors in zip(label_numbers, serializer.errors, strict=True) if errors
+    }
+
+
+def _annotation_row_errors(
+    annotation_data: list[dict],
+    label_names: set[str],
+    validate_coordinates: bool,
+    image_set_ids: list[uuid.UUID] | None,
+) -> dict[int, dict]:
+    """Validate every annotation row of an upload, resolving their images with set-based queries.
+
+    Args:
+        annotation_data (list[dict]): parsed annotation data.
+        label_names (set[str]): names of the labels the rows can refer to.
+        validate_coordinates (bool): also check the coordinates of every row against the rules of its shape.
+        image_set_ids (list[uuid.UUID] | None): image sets in which images are looked up by filename.
+
+    Returns:
+        dict[int, dict]: errors by field, by index of the rows with errors.
+    """
+    existing_image_ids, image_ids_by_filename = _resolve_images(annotation_data, image_set_ids)
+    row_errors = defaultdict(dict)
+    for index, entry in enumerate(annotation_data):
+        try:
+            _match_image(index, entry, existing_image_ids, image_ids_by_filename)
+        except ValueError as e:
+            row_errors[index]["image"] = [str(e).removeprefix(f"Row {index+1}: ")]
+        if entry.get("label_name") not in label_names:
+            row_errors[index]["label_name"] = [f"Label '{entry.get('label_name')}' not found in the label set."]
+
+    _, serializer_errors = _validate_bulk_annotations(annotation_data)
+    for index, errors in enumerate(serializer_errors):
+        if errors:
+            row_errors[index].update(errors)
+
+    if validate_coordinates:
+        coordinate_errors = validate_annotation_coordinates(
+            [entry.get("shape") for entry in annotation_data], [entry.get("coordinates") for entry in annotation_data]
+        )
+        for index, errors in coordinate_errors.items():
+            row_errors[index].setdefault("coordinates", []).extend(errors)
+
+    return {index: errors for index, errors in sorted(row_errors.items()) if errors}
+
+
+def validate_annotation_upload(
+    annotation_set_df: pd.DataFrame,
+    label_list: list,
+    annotation_data: list[dict],
+    validate_coordinates: bool = False,
+    mode: str = "create",
+) -> dict:
+    """Check an annotations upload as `ingest_annotation_data` would ingest it, without writing anything.
+
+    The ingest stops at the first error; here every error of the annotation set, labels and annotation rows is
+    collected, with the WoRMS checks and image lookups made in bulk.
+
+    Args:
+        annotation_set_df (pd.DataFrame): parsed annotation set metadata.
+        label_list (list): parsed label set.
+        annotation_data (list[dict]): parsed annotation data.
+        validate_coordinates (bool): also check the coordinates of every row against the rules of its shape.
+        mode (str): one of ANNOTATION_UPLOAD_MODES, "create" to check the upload as a new annotation set, or
+            "append" to check it against the annotation set of its annotation-set-uuid.
+
+    Returns:
+        dict: the report of the upload, with its errors by section. Only the first
+        `ANNOTATION_DRY_RUN_MAX_ROW_ERRORS` annotation rows with errors are listed, all of them are counted by field.
+
+    Raises:
+        ValueError: if the mode is unknown.
+    """
+    if mode not in ANNOTATION_UPLOAD_MODES:
+        raise ValueError(f"Unknown upload mode: {mode}")
+    if mode == "append":
+        set_errors, label_errors, label_names, image_set_ids = _append_errors(annotation_set_df, label_list)
+    else:
+        set_errors, image_set = _annotation_set_errors(annotation_set_df)
+        label_errors = _label_errors(label_list)
+        # Annotation rows can only refer to the labels of the upload, as it creates a new annotation set
+        label_names = _label_names(label_list)
+        image_set_ids = [image_set.id] if image_set else None
+    row_errors = _annotation_row_errors(annotation_data, label_names, validate_coordinates, image_set_ids)
+
+    return {
+        "valid": not (set_errors or label_errors or row_errors),
+        "rows": len(annotation_data),
+        "invalid_rows": len(row_errors),
+        "invalid_rows_by_field": dict(Counter(field for errors in row_errors.values() for field in errors)),
+        "annotation_set": set_errors,
+        "labels": label_errors,
+        "annotations": {
+            f"Row {index+1}": errors for index, errors in list(row_errors.items())[:ANNOTATION_DRY_RUN_MAX_ROW_ERRORS]
+        },
+    }
@@ -1,50 +1,138 @@
 """Parser functions related to annotation data."""
 
+import csv
+import io
 import json
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import suppress
+from datetime import datetime
+from functools import partial
+from itertools import chain, islice
+from pathlib import Path
+from typing import IO
 
 import pandas as pd
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+from openpyxl.workbook import Workbook
 
 from api.utils.constants import (
+    ANNOTATION_CREATION_DATETIME_FORMAT,
     ANNOTATION_DATA_END_COL,
     ANNOTATION_DATA_START_COL,
     ANNOTATION_DATA_START_ROW,
     ANNOTATION_METADATA_KEYS,
+    ANNOTATION_PARQUET_BATCH_SIZE,
+    ANNOTATION_RECORD_FIELDS,
+    ANNOTATION_RECORD_SECTION_FIELD,
     ANNOTATION_SET_COL_SIZE,
+    ANNOTATION_TEMPLATE_SHEETS,
+    ANNOTATION_UPLOAD_FORMATS,
+    BLANK_CELL_VALUES,
     LABEL_SET_COL_SIZE,
 )
+from api.utils.parallel import map_chunks
 
+SheetRows = pd.DataFrame | Iterable[Sequence]
 
-def parse_annotation_set_metadata(annotation_df: pd.DataFrame) -> dict:
+
+def open_annotation_workbook(file: IO[bytes]) -> Workbook:
+    """Open an annotations template workbook once, in openpyxl read-only (streaming) mode.
+
+    The sheets are not loaded into memory: use `iter_sheet_rows` to stream their rows into the parsers, and close the
+    workbook once parsing is done.
+
+    Args:
+        file(IO[bytes]): the uploaded XLSX file.
+
+    Returns:
+        Workbook: the read-only workbook.
+
+    Raises:
+        ValueError: if any of the template sheets is missing.
+    """
+    workbook = load_workbook(file, read_only=True, data_only=True)
+
+    missing = [sheet_name for sheet_name in ANNOTATION_TEMPLATE_SHEETS if sheet_name not in workbook.sheetnames]
+    if missing:
+        workbook.close()
+        raise ValueError(f"Missing sheets: {', '.join(missing)}")
+
+    return workbook
+
+
+def iter_sheet_rows(workbook: Workbook, sheet_name: str) -> Iterator[tuple]:
+    """Stream the rows of a template sheet as tuples of cell values.
+
+    Like `pd.read_excel`, the first row is treated as the header and skipped, so the parsers see the same rows whether
+    they are given a DataFrame or this iterator. Rows are padded to the number of columns the parsers read.
+
+    Args:
+        workbook(Workbook): workbook opened with `open_annotation_workbook`.
+        sheet_name(str): name of the sheet to read.
+
+    Returns:
+        Iterator[tuple]: iterator over the row values.
+    """
+    worksheet = workbook[sheet_name]
+    # Template files are often written without (or with stale) dimensions, which read-only mode would trust
+    worksheet.reset_dimensions()
+    return worksheet.iter_rows(min_row=2, max_col=ANNOTATION_TEMPLATE_SHEETS[sheet_name], values_only=True)
+
+
+def _iter_rows(data: SheetRows, start_col: int, end_col: int) -> Iterator[tuple]:
+    """Iterate over a DataFrame or row iterator, yielding the given column range of each row padded with None.
+
+    Args:
+        data(SheetRows): DataFrame or iterable of row values.
+        start_col(int): index of the first column to keep.
+        end_col(int): index after the last column to keep.
+
+    Returns:
+        Iterator[tuple]: iterator over the sliced row values.
+    """
+    rows = data.itertuples(index=False, name=None) if isinstance(data, pd.DataFrame) else data
+    width = end_col - start_col
+    for row in rows:
+        values = tuple(row[start_col:end_col])
+        yield values + (None,) * (width - len(values))
+
+
+def _clean(value: object) -> str:
+    """Helper to convert a cell value to a stripped string, with blank cells as an empty string."""
+    if value is None or value in BLANK_CELL_VALUES or pd.isna(value):
+        return ""
+    return str(value).strip()
+
+
+def parse_annotation_set_metadata(annotation_rows: SheetRows) -> dict:
     """Parse annotation set metadata.
 
     Args:
-        annotation_df(pd.DataFrame): annotation_set metadata
+        annotation_rows(SheetRows): annotation_set metadata, as a DataFrame or an iterator of rows.
 
     Returns:
         dict: parsed data.
     """
-    df = annotation_df.iloc[:, :ANNOTATION_SET_COL_SIZE]
-    df.iloc[:, 2] = df.iloc[:, 2].fillna("")
-
     annotation_data = {}
     current_main_key = None
 
-    for main_key, sub_key, value in df.itertuples(index=False, name=None):
+    for main_key, sub_key, value in _iter_rows(annotation_rows, 0, ANNOTATION_SET_COL_SIZE):
         # Update main key if valid
-        if pd.notna(main_key) and str(main_key).strip():
-            current_main_key = str(main_key).strip()
+        if _clean(main_key):
+            current_main_key = _clean(main_key)
 
         # Skip if no main key yet
         if not current_main_key:
             continue
 
-        sub_key_clean = str(sub_key).strip() if pd.notna(sub_key) else ""
+        sub_key_clean = _clean(sub_key)
 
         final_key = f"{current_main_key}-{sub_key_clean}" if sub_key_clean else current_main_key
 
         # Store only if value exists
-        if pd.notna(value) and str(value).strip() != "" and final_key in ANNOTATION_METADATA_KEYS:
-            annotation_data[final_key] = str(value).strip()
+        if _clean(value) and final_key in ANNOTATION_METADATA_KEYS:
+            annotation_data[final_key] = _clean(value)
 
     required_keys = {
         "annotation-image-set-name": "Image Set Name",
@@ -61,61 +149,64 @@ def parse_annotation_set_metadata(annotation_df: pd.DataFrame) -> dict:
     return annotation_data
 
 
-def _empty_to_none(value: str) -> str | None:
-    """Helper to convert blank strings to None."""
-    if value is None:
-        return None
-    value = str(value).strip()
+def _empty_to_none(value: object) -> str | None:
+    """Helper to convert blank cells to None."""
+    value = _clean(value)
     return value if value else None
 
 
-def parse_label_set(label_df: pd.DataFrame) -> list[dict]:
+def parse_label_set(label_rows: SheetRows) -> list[dict]:
     """Parse Label set data from Dataframe.
 
     Args:
-        label_df(pd.DataFrame): label data.
+        label_rows(SheetRows): label data, as a DataFrame or an iterator of rows.
 
     Returns:
         list[dict]: list of label dictionaries.
     """
-    start_idx = None
-    for i, val in enumerate(label_df.iloc[:, 0]):
-        if str(val).strip().lower() == "value":
-            start_idx = i  # data starts AFTER this row
-            break
+    rows = _iter_rows(label_rows, 0, LABEL_SET_COL_SIZE)
 
-    if start_idx is None:
+    # Data starts at the row whose first column reads "Value"
+    for row in rows:
+        if str(row[0]).strip().lower() == "value":
+            break
+    else:
         raise ValueError("Could not find values in Label Set.")
 
-    label_df = label_df.iloc[start_idx:, :LABEL_SET_COL_SIZE]
+    return _parse_label_rows(chain([row], rows))
 
-    label_df.columns = [
-        "field",
-        "label_name",
-        "parent_label_name",
-        "lowest_taxonomic_name",
-        "lowest_aphia_id",
-        "label_name_is_lowest",
-        "identification_qualifier",
-    ]
 
-    # Clean data
-    label_df = label_df.fillna("")
+def _parse_label_rows(rows: Iterable[tuple]) -> list[dict]:
+    """Parse the value rows of a label set, laid out as in the Label set sheet.
+
+    Args:
+        rows(Iterable[tuple]): label rows of `LABEL_SET_COL_SIZE` values.
 
+    Returns:
+        list[dict]: list of label dictionaries.
+    """
     label_data = []
 
-    for row in label_df.to_dict(orient="records"):
-        if not str(row["label_name"]).strip():
+    for (
+        _field,
+        label_name,
+        parent_label_name,
+        lowest_taxonomic_name,
+        lowest_aphia_id,
+        label_name_is_lowest,
+        identification_qualifier,
+    ) in rows:
+        if not _clean(label_name):
             continue
 
         label_data.append(
             {
-                "name": row["label_name"].strip(),
-                "parent_label_name": row["parent_label_name"].strip(),
-                "lowest_taxonomic_name": _empty_to_none(row["lowest_taxonomic_name"]),
-                "lowest_aphia_id": _empty_to_none(row["lowest_aphia_id"]),
-                "name_is_lowest": str(row["label_name_is_lowest"]).strip().lower() == "yes",
-                "identification_qualifier": _empty_to_none(row["identification_qualifier"]),
+                "name": _clean(label_name),
+                "parent_label_name": _clean(parent_label_name),
+                "lowest_taxonomic_name": _empty_to_none(lowest_taxonomic_name),
+                "lowest_aphia_id": _empty_to_none(lowest_aphia_id),
+                "name_is_lowest": _clean(label_name_is_lowest).lower() == "yes",
+                "identification_qualifier": _empty_to_none(identification_qualifier),
             }
         )
 
@@ -140,59 +231,294 @@ def _parse_coordinates(coord_val: str) -> list:
         return []
 
 
-def parse_annotation_data(annotation_df: pd.DataFrame) -> list[dict]:
+def parse_annotation_data(annotation_rows: SheetRows) -> list[dict]:
     """Parse Annotation data from dataframe.
 
     Args:
-        annotation_df(pd.DataFrame): annotation data.
+        annotation_rows(SheetRows): annotation data, as a DataFrame or an iterator of rows.
+
+    Returns:
+        list[dict]: list of annotation dictionaries.
+    """
+    rows = islice(
+        _iter_rows(annotation_rows, ANNOTATION_DATA_START_COL, ANNOTATION_DATA_END_COL), ANNOTATION_DATA_START_ROW, None
+    )
+
+    return _parse_annotation_rows(rows, ANNOTATION_DATA_START_ROW + 1)
+
+
+def _parse_annotation_rows(rows: Iterable[tuple], first_row_number: int) -> list[dict]:
+    """Parse annotation rows, laid out as in the Annotation data sheet.
+
+    Large uploads are split into chunks of rows parsed by `ANNOTATION_UPLOAD_WORKERS` worker processes, and merged
+    back in order (see `map_chunks`).
+
+    Args:
+        rows(Iterable[tuple]): annotation rows, from the image UUID to the dimension in pixels.
+        first_row_number(int): number of the first row in the uploaded file, for error messages.
 
     Returns:
         list[dict]: list of annotation dictionaries.
     """
-    annotation_df = annotation_df.iloc[ANNOTATION_DATA_START_ROW:, ANNOTATION_DATA_START_COL:ANNOTATION_DATA_END_COL]
-
-    annotation_df.columns = [
-        "image_uuid",
-        "annotation_platform",
-        "image_filename",
-        "annotation_human_creator",
-        "annotation_creation_datetime",
-        "annotation_label_name",
-        "annotation_shape_name",
-        "annotation_coordinates",
-        "annotation_dimension_pixels",
+    chunks = map_chunks(partial(_parse_annotation_chunk, first_row_number=first_row_number), list(rows))
+    return list(chain.from_iterable(chunks))
+
+
+def _parse_annotation_chunk(start: int, rows: Sequence[tuple], first_row_number: int) -> list[dict]:
+    """Parse a chunk of annotation rows.
+
+    The rows are parsed column by column: cells are cleaned, dimensions converted and creation date-times parsed with
+    vectorized pandas operations, and coordinates decoded in batches, before being zipped back into records.
+
+    The chunk is returned as records rather than columns: the other upload formats are parsed into records too (see
+    `parse_annotation_records`), and the ingest validates every row with a serializer, which takes a dict per row.
+    Zipping the columns back is a small part of the parse.
+
+    Args:
+        start(int): index of the first row of the chunk among the uploaded rows.
+        rows(Sequence[tuple]): annotation rows, from the image UUID to the dimension in pixels.
+        first_row_number(int): number of the first uploaded row in the uploaded file, for error messages.
+
+    Returns:
+        list[dict]: list of annotation dictionaries.
+    """
+    first_row_number += start
+    # Cells are kept as read, e.g. image ids are not turned into floats by a blank cell in their column
+    frame = pd.DataFrame(list(rows), columns=ANNOTATION_RECORD_FIELDS["annotation"], dtype=object)
+    text = frame.apply(_clean_column)
+
+    # Skip empty rows
+    has_filename = text["image_filename"] != ""
+    frame, text = frame[has_filename], text[has_filename]
+    if frame.empty:
+        return []
+
+    columns = zip(
+        text["image_id"].tolist(),
+        text["image_filename"].tolist(),
+        text["annotation_platform"].tolist(),
+        text["shape"].tolist(),
+        _parse_coordinates_column(text["coordinates"]),
+        _parse_dimension_column(text["dimension_pixels"], first_row_number),
+        text["label_name"].tolist(),
+        text["annotator_name"].tolist(),
+        _parse_datetime_column(frame["creation_datetime"], text["creation_datetime"]),
+        strict=True,
+    )
+
+    return [
+        {
+            "image_id": image_id,
+            "image_filename": image_filename,
+            "annotation_platform": annotation_platform,
+            "shape": shape,
+            "coordinates": coordinates,
+            "dimension_pixels": dimension_pixels,
+            "label_name": label_name,
+            "annotator_name": annotator_name,
+            "creation_datetime": creation_datetime,
+        }
+        for (
+            image_id,
+            image_filename,
+            annotation_platform,
+            shape,
+            coordinates,
+            dimension_pixels,
+            label_name,
+            annotator_name,
+            creation_datetime,
+        ) in columns
     ]
 
-    annotation_df = annotation_df.fillna("")
 
-    annotation_data = []
+def _clean_column(values: pd.Series) -> pd.Series:
+    """Column-wise `_clean`: convert cells to stripped strings, with blank cells as an empty string."""
+    text = values.astype(str)
+    return text.str.strip().mask(values.isna() | text.isin(BLANK_CELL_VALUES), "")
+
+
+def _parse_dimension_column(text: pd.Series, first_row_number: int) -> list[float | None]:
+    """Convert a column of dimensions in pixels to floats, with blank cells as None.
+
+    Raises:
+        ValueError: if a non-blank cell is not a number.
+    """
+    blank = text == ""
+    dimensions = pd.to_numeric(text.mask(blank), errors="coerce").astype(float)
+
+    invalid = dimensions.isna() & ~blank
+    if invalid.any():
+        index = invalid.idxmax()
+        raise ValueError(
+            f"Validation Error at Row {index + first_row_number}: "
+            f"'annotation-dimension-pixels' must be a number, got '{text[index]}'."
+        )
+
+    return dimensions.astype(object).mask(blank, None).tolist()
+
+
+def _parse_datetime_column(values: pd.Series, text: pd.Series) -> list:
+    """Parse a column of "DDMMYYYY HH:MM:SS" creation date-times.
+
+    Cells in another format (e.g. date-times read by openpyxl) are kept as they are, for the ingest to handle, and
+    blank cells become an empty string.
+    """
+    parsed = pd.to_datetime(text, format=ANNOTATION_CREATION_DATETIME_FORMAT, errors="coerce")
+    unparsed = values.astype(object).mask(text == "", "")
+    return pd.Series(parsed.dt.to_pydatetime(), index=text.index, dtype=object).where(parsed.notna(), unparsed).tolist()
+
+
+def _parse_coordinates_column(text: pd.Series) -> list[list]:
+    """Batched `_parse_coordinates`: decode a column of coordinate strings.
+
+    JSON lists and plain "x, y" pairs are each decoded with a single `json.loads` call over the whole column. Cells a
+    batch cannot safely hold, or batches that fail to decode, are parsed one by one with `_parse_coordinates`.
+
+    Args:
+        text(pd.Series): cleaned coordinate strings.
 
-    for index, row in enumerate(annotation_df.to_dict(orient="records")):
-        uuid_val = str(row["image_uuid"]).strip()
-        filename_val = str(row["image_filename"]).strip()
-        # Skip empty rows
-        if not str(row["image_filename"]).strip():
+    Returns:
+        list[list]: coordinates of each cell, as `_parse_coordinates` returns them.
+    """
+    coordinates = [[] for _ in range(len(text))]
+
+    is_json = text.str.startswith("[") & (text.str.count(r"\[") == text.str.count(r"\]"))
+    is_pair = text.str.fullmatch(r"[0-9eE.,+\-\s]+")
+    # JSON lists as they are, "x, y" pairs as a list of floats, as `_parse_coordinates` parses them
+    batches = ((is_json, "[", ",", "]", None), (is_pair, "[[[", "]],[[", "]]]", float))
+    for batch, opening, separator, closing, parse_int in batches:
+        values = text[batch].tolist()
+        if not values:
             continue
-        if not uuid_val and not filename_val:
-            excel_row = index + 1 + ANNOTATION_DATA_START_ROW
-            raise ValueError(
-                f"Validation Error at Row {excel_row}: " f"Record must provide either 'image-uuid' or 'image-filename'."
-            )
+        try:
+            decoded = json.loads(opening + separator.join(values) + closing, parse_int=parse_int)
+        except ValueError:
+            decoded = None
+        # A cell holding several lists (e.g. "[1], [2]") decodes as several items
+        if decoded is None or len(decoded) != len(values):
+            decoded = [_parse_coordinates(value) for value in values]
+        for position, value in zip(batch.to_numpy().nonzero()[0], decoded, strict=True):
+            coordinates[position] = value
 
-        parsed_row = {
-            "image_id": uuid_val,
-            "image_filename": filename_val,
-            "annotation_platform": row["annotation_platform"].strip(),
-            "shape": row["annotation_shape_name"].strip(),
-            "coordinates": _parse_coordinates(row["annotation_coordinates"]),
-            "dimension_pixels": (
-                float(row["annotation_dimension_pixels"]) if str(row["annotation_dimension_pixels"]).strip() else None
-            ),
-            "label_name": row["annotation_label_name"].strip(),
-            "annotator_name": row["annotation_human_creator"].strip(),
-            "creation_datetime": row["annotation_creation_datetime"],
-        }
+    for position in (~is_json & ~is_pair & (text != "")).to_numpy().nonzero()[0]:
+        coordinates[position] = _parse_coordinates(text.iat[position])
 
-        annotation_data.append(parsed_row)
+    return coordinates
 
-    return annotation_data
+
+def annotation_upload_format(filename: str) -> str | None:
+    """Get the format of an annotations upload from its file extension.
+
+    Args:
+        filename(str): name of the uploaded file.
+
+    Returns:
+        str | None: one of the `ANNOTATION_UPLOAD_FORMATS` values, or None if the format is not supported.
+    """
+    return ANNOTATION_UPLOAD_FORMATS.get(Path(filename).suffix.lower())
+
+
+def _iter_csv_records(file: IO[bytes]) -> Iterator[dict]:
+    """Stream the rows of a CSV file with a header row as dictionaries."""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.DictReader(text)
+    except csv.Error as e:
+        raise ValueError(f"Invalid CSV file: {e}") from e
+    finally:
+        # Leave the uploaded file open for its owner
+        text.detach()
+
+
+def _iter_ndjson_records(file: IO[bytes]) -> Iterator[dict]:
+    """Stream the objects of a JSON Lines file, skipping blank lines."""
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e.msg}") from e
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {line_number} is not a JSON object.")
+        yield record
+
+
+def _iter_parquet_records(file: IO[bytes]) -> Iterator[dict]:
+    """Stream the rows of a Parquet file as dictionaries, one record batch at a time."""
+    for batch in pq.ParquetFile(file).iter_batches(batch_size=ANNOTATION_PARQUET_BATCH_SIZE):
+        yield from batch.to_pylist()
+
+
+ANNOTATION_RECORD_READERS: dict[str, Callable[[IO[bytes]], Iterator[dict]]] = {
+    "csv": _iter_csv_records,
+    "ndjson": _iter_ndjson_records,
+    "parquet": _iter_parquet_records,
+}
+
+
+def iter_annotation_records(file: IO[bytes], upload_format: str) -> Iterator[dict]:
+    """Stream the records of a CSV, JSON Lines or Parquet annotations file.
+
+    Args:
+        file(IO[bytes]): the uploaded file.
+        upload_format(str): "csv", "ndjson" or "parquet".
+
+    Returns:
+        Iterator[dict]: iterator over the records, read lazily from the file.
+    """
+    return ANNOTATION_RECORD_READERS[upload_format](file)
+
+
+def _record_row(section: str, record: dict) -> tuple:
+    """Lay out the fields of a record as the row of the corresponding template sheet."""
+    row = {field: record.get(field) for field in ANNOTATION_RECORD_FIELDS[section]}
+
+    if section == "annotation_set":
+        return (row["key"], None, row["value"])
+
+    if section == "label":
+        row["name_is_lowest"] = "yes" if _clean(row["name_is_lowest"]).lower() in {"yes", "true"} else "no"
+        return (None, *row.values())
+
+    # JSON Lines and Parquet carry coordinates as lists, which the template holds as JSON text
+    if isinstance(row["coordinates"], list):
+        row["coordinates"] = json.dumps(row["coordinates"])
+    # ISO 8601 date-times are converted here, the template's "%d%m%Y %H:%M:%S" format is parsed with the annotations
+    if isinstance(row["creation_datetime"], str):
+        with suppress(ValueError):
+            row["creation_datetime"] = datetime.fromisoformat(row["creation_datetime"].strip())
+    return tuple(row.values())
+
+
+def parse_annotation_records(records: Iterable[dict]) -> tuple[dict, list[dict], list[dict]]:
+    """Parse the records of a CSV, JSON Lines or Parquet annotations file.
+
+    Each record belongs to the section named by its "section" field: "annotation_set" records hold one metadata
+    `key` (e.g. "annotation-set-name") and its `value`, "label" records one label, and "annotation" records one
+    annotation, with the fields listed in `ANNOTATION_RECORD_FIELDS`. The sections are parsed as the sheets of the
+    annotations template are.
+
+    Args:
+        records(Iterable[dict]): the records, e.g. from `iter_annotation_records`.
+
+    Returns:
+        tuple[dict, list[dict], list[dict]]: the annotation set metadata, label set and annotation data.
+    """
+    rows = {section: [] for section in ANNOTATION_RECORD_FIELDS}
+
+    for number, record in enumerate(records, start=1):
+        section = _clean(record.get(ANNOTATION_RECORD_SECTION_FIELD))
+        if section not in rows:
+            raise ValueError(
+                f"Record {number} has an unknown {ANNOTATION_RECORD_SECTION_FIELD} '{section}', "
+                f"expected one of: {', '.join(rows)}."
+            )
+        rows[section].append(_record_row(section, record))
+
+    return (
+        parse_annotation_set_metadata(rows["annotation_set"]),
+        _parse_label_rows(rows["label"]),
+        _parse_annotation_rows(rows["annotation"], 1),
+    )
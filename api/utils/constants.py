@@ -29,6 +29,154 @@ ANNOTATION_METADATA_KEYS = {
 ANNOTATION_DATA_START_ROW = 3
 ANNOTATION_DATA_START_COL = 1
 ANNOTATION_DATA_END_COL = 10
+ANNOTATION_CREATION_DATETIME_FORMAT = "%d%m%Y %H:%M:%S"
 
 ANNOTATION_SET_COL_SIZE = 3
 LABEL_SET_COL_SIZE = 7
+
+ANNOTATION_SET_SHEET = "Annotation set metadata"
+LABEL_SET_SHEET = "Label set"
+ANNOTATION_DATA_SHEET = "Annotation data"
+
+# Number of columns read from each sheet of the annotations template
+ANNOTATION_TEMPLATE_SHEETS = {
+    ANNOTATION_SET_SHEET: ANNOTATION_SET_COL_SIZE,
+    LABEL_SET_SHEET: LABEL_SET_COL_SIZE,
+    ANNOTATION_DATA_SHEET: ANNOTATION_DATA_END_COL,
+}
+
+# Cell strings read as blank, matching the default `na_values` of `pd.read_excel`
+BLANK_CELL_VALUES = {
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+}
+
+# Uploads with at least this many annotation rows are ingested with set-based lookups and bulk inserts
+ANNOTATION_BULK_THRESHOLD = 500
+ANNOTATION_BULK_BATCH_SIZE = 1000
+
+# iFDO payloads with at least this many image items are ingested with set-based lookups and bulk inserts
+IFDO_BULK_THRESHOLD = 500
+IFDO_BULK_BATCH_SIZE = 1000
+
+# Number of image items committed per transaction by chunked (resumable) iFDO ingests
+IFDO_COMMIT_CHUNK_SIZE = 10000
+
+# iFDO request bodies of at least this many bytes are streamed, rather than parsed into memory as a whole
+IFDO_STREAMING_THRESHOLD = 16 * 1024 * 1024
+
+# Number of images read from the database, and serialized, at a time by the iFDO export
+IFDO_EXPORT_CHUNK_SIZE = 2000
+
+# Supported iFDO file formats, by file extension, optionally followed by one of the IFDO_COMPRESSIONS extensions
+IFDO_UPLOAD_FORMATS = {
+    ".json": "json",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+}
+
+# Compressions of iFDO files (by file extension) and request bodies (by Content-Encoding), decompressed as a stream
+IFDO_COMPRESSIONS = {
+    ".gz": "gzip",
+    ".zst": "zstd",
+}
+
+# iFDO ingest modes: create a new image set, or create or re-ingest the image set of the image-set-uuid
+IFDO_INGEST_MODES = ("create", "upsert")
+
+# Ways of inserting uploaded annotation data: one serializer per row, bulk_create, or PostgreSQL COPY
+ANNOTATION_INGEST_BACKENDS = ("rows", "bulk", "copy")
+
+# Upload modes: ingest as a new annotation set, or append the new rows to the set of the annotation-set-uuid
+ANNOTATION_UPLOAD_MODES = ("create", "append")
+
+# Number of annotation rows with errors listed in the report of a dry-run upload, the others are only counted
+ANNOTATION_DRY_RUN_MAX_ROW_ERRORS = 100
+
+# Number of annotation rows parsed or validated per task when large uploads are split over worker processes
+ANNOTATION_PARALLEL_CHUNK_SIZE = 50_000
+
+# Upload responses: every created row ("full"), or only counts and timings ("summary")
+ANNOTATION_UPLOAD_RESPONSES = ("full", "summary")
+
+# Uploads with at least this many annotation rows get a summary response unless a full one is requested
+ANNOTATION_SUMMARY_RESPONSE_THRESHOLD = 1000
+
+# Seconds the upload worker waits before polling the job queue again when it is empty
+UPLOAD_WORKER_POLL_INTERVAL = 2.0
+
+# Seconds between the heartbeats a worker records on the job it is running
+UPLOAD_JOB_HEARTBEAT_INTERVAL = 30.0
+
+# Seconds without a heartbeat after which a running job is considered abandoned by a crashed worker, and failed
+UPLOAD_JOB_STALE_TIMEOUT = 300.0
+
+# Bytes of an upload written to, or read from, its PostgreSQL large object per query
+LARGE_OBJECT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Supported annotations upload formats, by file extension
+ANNOTATION_UPLOAD_FORMATS = {
+    ".xlsx": "xlsx",
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".parquet": "parquet",
+}
+
+# CSV, JSON Lines and Parquet uploads hold the three template sections as records tagged with the section field, and
+# the fields of each section, in the column order of the corresponding template sheet
+ANNOTATION_RECORD_SECTION_FIELD = "section"
+ANNOTATION_RECORD_FIELDS = {
+    "annotation_set": ("key", "value"),
+    "label": (
+        "name",
+        "parent_label_name",
+        "lowest_taxonomic_name",
+        "lowest_aphia_id",
+        "name_is_lowest",
+        "identification_qualifier",
+    ),
+    "annotation": (
+        "image_id",
+        "annotation_platform",
+        "image_filename",
+        "annotator_name",
+        "creation_datetime",
+        "label_name",
+        "shape",
+        "coordinates",
+        "dimension_pixels",
+    ),
+}
+ANNOTATION_PARQUET_BATCH_SIZE = 10_000
+
+# Number of pixel coordinate values per frame of each annotation shape, as (minimum, maximum), with None for no
+# maximum. Polylines and polygons hold whole (x, y) points, and polygons are closed, ending on their first point.
+SHAPE_COORDINATE_COUNTS = {
+    "whole-image": (0, 0),
+    "single-pixel": (2, 2),
+    "circle": (3, 3),
+    "rectangle": (8, 8),
+    "ellipse": (8, 8),
+    "polyline": (4, None),
+    "polygon": (8, None),
+}
+POINT_LIST_SHAPES = ("polyline", "polygon")
+CLOSED_SHAPES = ("polygon",)
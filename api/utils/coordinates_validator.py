@@ -0,0 +1,130 @@
+"""Validation of annotation pixel coordinates against the rules of their shape."""
+
+from collections.abc import Sequence
+from contextlib import suppress
+
+import numpy as np
+import pandas as pd
+
+from api.models.base import AliasedShapesEnumField
+from api.utils.constants import CLOSED_SHAPES, POINT_LIST_SHAPES, SHAPE_COORDINATE_COUNTS
+
+SHAPES = tuple(SHAPE_COORDINATE_COUNTS)
+MIN_COUNTS = np.array([minimum for minimum, _ in SHAPE_COORDINATE_COUNTS.values()])
+MAX_COUNTS = np.array([np.inf if maximum is None else maximum for _, maximum in SHAPE_COORDINATE_COUNTS.values()])
+IS_POINT_LIST = np.array([shape in POINT_LIST_SHAPES for shape in SHAPES])
+IS_CLOSED = np.array([shape in CLOSED_SHAPES for shape in SHAPES])
+
+
+def _shape_code(shape: object) -> int:
+    """Index of a shape (or shape alias) in `SHAPES`, or -1 if it isn't a known shape."""
+    if not isinstance(shape, str):
+        return -1
+    shape = shape.strip().lower()
+    shape = AliasedShapesEnumField.SHAPE_ALIASES.get(shape, shape)
+    return SHAPES.index(shape) if shape in SHAPES else -1
+
+
+def _expected_count(shape: str) -> str:
+    """Describe the number of coordinate values a frame of the shape needs, for error messages."""
+    minimum, maximum = SHAPE_COORDINATE_COUNTS[shape]
+    expected = f"{minimum}" if minimum == maximum else f"at least {minimum}"
+    return f"{expected} (an even number)" if shape in POINT_LIST_SHAPES else expected
+
+
+def _is_number(value: object) -> bool:
+    """Whether a coordinate value is a number, booleans excluded."""
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def validate_annotation_coordinates(shapes: Sequence[object], coordinates: Sequence[object]) -> dict[int, list[str]]:
+    """Check the pixel coordinates of many annotations against the rules of their shape.
+
+    Coordinates are a list of frames (one for photos, optionally more for videos), each a flat list of pixel
+    coordinates. The frames of all annotations are laid out in a single NumPy array, and checked with batched
+    operations per rule:
+
+    - the number of values per frame, as given by `SHAPE_COORDINATE_COUNTS`, with whole (x, y) points for polylines
+      and polygons, and at least one frame unless the shape is "whole-image";
+    - polygons are closed, their last point being their first one;
+    - values are finite numbers and non-negative, as the top-left corner of an image is (0, 0).
+
+    Annotations with an unknown shape are not checked, that is left to the shape field.
+
+    Args:
+        shapes (Sequence[object]): shape of each annotation, as uploaded (aliases such as "point" are accepted).
+        coordinates (Sequence[object]): coordinates of each annotation.
+
+    Returns:
+        dict[int, list[str]]: error messages by index of the annotation, for the annotations with invalid coordinates.
+    """
+    # Shape codes are looked up once per distinct shape, missing shapes (code -1) get the last, unknown, code
+    shape_keys, distinct_shapes = pd.factorize(pd.Series(shapes, dtype=object))
+    codes = np.array([*(_shape_code(shape) for shape in distinct_shapes), -1], dtype=np.int64)[shape_keys]
+    errors: dict[int, list[str]] = {}
+
+    def add_error(rows: np.ndarray, message: str) -> None:
+        for row in np.unique(rows).tolist():
+            expected = _expected_count(SHAPES[codes[row]])
+            errors.setdefault(row, []).append(message.format(shape=shapes[row], expected=expected))
+
+    # Lay out all frames end to end, with the annotation and length of each frame
+    values = []
+    frame_rows = []
+    frame_lengths = []
+    checked = codes >= 0
+    for row, (code, frames) in enumerate(zip(codes.tolist(), coordinates, strict=True)):
+        if code < 0:
+            continue
+        if not isinstance(frames, list) or not all(isinstance(frame, list) for frame in frames):
+            checked[row] = False
+            continue
+        for frame in frames:
+            values.extend(frame)
+            frame_rows.append(row)
+            frame_lengths.append(len(frame))
+    add_error(np.flatnonzero((codes >= 0) & ~checked), "Coordinates must be a list of lists of pixel coordinates.")
+
+    frame_rows = np.array(frame_rows, dtype=np.int64)
+    frame_lengths = np.array(frame_lengths, dtype=np.int64)
+    frame_ends = np.cumsum(frame_lengths)
+    frame_starts = frame_ends - frame_lengths
+    frame_codes = codes[frame_rows]
+    value_rows = np.repeat(frame_rows, frame_lengths)
+
+    # NumPy would cast booleans to numbers alongside other numbers, so they always take the per-value check
+    array = None
+    if not any(isinstance(value, bool | np.bool_) for value in values):
+        with suppress(ValueError):
+            array = np.array(values)
+    if array is None or array.ndim != 1 or array.dtype.kind not in "iuf":
+        # Strings, booleans, nulls or nested lists among the values, the rest are checked as numbers
+        is_number = np.fromiter((_is_number(value) for value in values), dtype=bool, count=len(values))
+        add_error(value_rows[~is_number], "{shape} coordinates must be numbers.")
+        array = np.fromiter(
+            (value if number else 0 for value, number in zip(values, is_number, strict=True)),
+            dtype=float,
+            count=len(values),
+        )
+    values = array.astype(float, copy=False)
+
+    frame_counts = np.bincount(frame_rows, minlength=len(codes))
+    add_error(
+        np.flatnonzero(checked & (MIN_COUNTS[codes] > 0) & (frame_counts == 0)),
+        "{shape} coordinates must have at least one list of {expected} values.",
+    )
+
+    bad_count = (frame_lengths < MIN_COUNTS[frame_codes]) | (frame_lengths > MAX_COUNTS[frame_codes])
+    bad_count |= IS_POINT_LIST[frame_codes] & (frame_lengths % 2 == 1)
+    add_error(frame_rows[bad_count], "{shape} coordinates must have {expected} values per list.")
+
+    # Only polygons with whole points are checked for closure, the others already have an error
+    closable = IS_CLOSED[frame_codes] & ~bad_count
+    starts, ends = frame_starts[closable], frame_ends[closable]
+    is_open = (values[starts] != values[ends - 2]) | (values[starts + 1] != values[ends - 1])
+    add_error(frame_rows[closable][is_open], "{shape} coordinates must end with their first point.")
+
+    add_error(value_rows[~np.isfinite(values)], "{shape} coordinates must be finite numbers.")
+    add_error(value_rows[values < 0], "{shape} coordinates must not be negative.")
+
+    return dict(sorted(errors.items()))
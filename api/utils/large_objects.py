@@ -0,0 +1,71 @@
+"""PostgreSQL large objects, holding uploads too large to be read into memory or stored in a bytea column."""
+
+import io
+from typing import IO
+
+from django.db import connection
+
+from api.utils.constants import LARGE_OBJECT_CHUNK_SIZE
+
+
+def write_large_object(stream: IO[bytes], chunk_size: int = LARGE_OBJECT_CHUNK_SIZE) -> int:
+    """Copy a stream into a new large object, a chunk at a time.
+
+    The large object is created in the current transaction, so it is removed again if the transaction rolls back.
+
+    Args:
+        stream (IO[bytes]): the data to store.
+        chunk_size (int): number of bytes read from the stream and written per query.
+
+    Returns:
+        int: the OID of the large object.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT lo_create(0)")
+        oid = cursor.fetchone()[0]
+        offset = 0
+        while chunk := stream.read(chunk_size):
+            cursor.execute("SELECT lo_put(%s::oid, %s::bigint, %s::bytea)", [oid, offset, chunk])
+            offset += len(chunk)
+    return oid
+
+
+class LargeObjectReader(io.RawIOBase):
+    """Read-only file object over a large object, fetching the requested bytes with `lo_get`."""
+
+    def __init__(self, oid: int) -> None:
+        self.oid = oid
+        self.offset = 0
+
+    def readable(self) -> bool:
+        """Large objects are opened for reading."""
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        """Read the next bytes of the large object into the buffer, returning their number (0 at the end)."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT lo_get(%s::oid, %s::bigint, %s)", [self.oid, self.offset, len(buffer)])
+            data = cursor.fetchone()[0]
+        size = len(data)
+        buffer[:size] = data
+        self.offset += size
+        return size
+
+
+def open_large_object(oid: int, chunk_size: int = LARGE_OBJECT_CHUNK_SIZE) -> io.BufferedReader:
+    """Open a large object for reading, fetching it a chunk at a time.
+
+    Args:
+        oid (int): the OID of the large object.
+        chunk_size (int): number of bytes fetched per query.
+
+    Returns:
+        io.BufferedReader: the content of the large object.
+    """
+    return io.BufferedReader(LargeObjectReader(oid), buffer_size=chunk_size)
+
+
+def unlink_large_object(oid: int) -> None:
+    """Delete a large object."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT lo_unlink(%s::oid)", [oid])
@@ -0,0 +1,110 @@
+"""Process pool for the CPU-bound parse and validation stages of large uploads."""
+
+import multiprocessing
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain, islice
+from typing import TypeVar
+
+import django
+from django.conf import settings
+
+from api.utils.constants import ANNOTATION_PARALLEL_CHUNK_SIZE
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def upload_workers(workers: int | None = None) -> int:
+    """Number of worker processes used for an upload, `ANNOTATION_UPLOAD_WORKERS` unless given."""
+    return max(1, settings.ANNOTATION_UPLOAD_WORKERS if workers is None else workers)
+
+
+def map_chunks(
+    func: Callable[[int, Sequence[T]], R],
+    items: Sequence[T],
+    workers: int | None = None,
+    chunk_size: int = ANNOTATION_PARALLEL_CHUNK_SIZE,
+) -> list[R]:
+    """Apply a function to consecutive chunks of items, in a pool of worker processes.
+
+    The function is given the offset of each chunk in `items` and the chunk, and must be picklable (a module-level
+    function, or a `functools.partial` of one). Results come back in the order of the chunks, and the first exception
+    raised, in that order, is re-raised, so merging the results gives the same output and errors as a single call on
+    all items. Uploads of a single chunk, or with one worker, are processed in this process.
+
+    Worker processes are started from a fork server (a fork of a multi-threaded web server process is unsafe), and
+    set Django up before taking chunks, without database access (see `_init_worker`): the function must not query the
+    database, and is given whatever it needs to look up.
+
+    Args:
+        func (Callable[[int, Sequence[T]], R]): function applied to each chunk.
+        items (Sequence[T]): items to process.
+        workers (int | None): number of worker processes, `ANNOTATION_UPLOAD_WORKERS` by default.
+        chunk_size (int): number of items per chunk.
+
+    Returns:
+        list[R]: the result of each chunk, in order.
+    """
+    chunks = [(start, items[start : start + chunk_size]) for start in range(0, len(items), chunk_size)]
+    workers = min(upload_workers(workers), len(chunks))
+    if workers <= 1:
+        return [func(start, chunk) for start, chunk in chunks]
+
+    with _process_pool(workers) as pool:
+        return list(pool.map(func, *zip(*chunks, strict=True)))
+
+
+def imap_chunks(
+    func: Callable[[int, Sequence[T]], R], chunks: Iterable[tuple[int, Sequence[T]]], workers: int | None = None
+) -> Iterator[R]:
+    """Apply a function to chunks of items as they are read, in a pool of worker processes.
+
+    Like `map_chunks`, but for chunks read from a stream: the chunks are given with their offset, and at most two
+    chunks per worker are handed to the pool ahead of the results consumed, so memory use doesn't grow with the number
+    of chunks. Results are yielded in the order of the chunks, and exceptions re-raised when their result is reached.
+    Streams of a single chunk, or with one worker, are processed in this process.
+
+    Args:
+        func (Callable[[int, Sequence[T]], R]): function applied to each chunk, picklable as for `map_chunks`.
+        chunks (Iterable[tuple[int, Sequence[T]]]): the offset of each chunk and the chunk.
+        workers (int | None): number of worker processes, `ANNOTATION_UPLOAD_WORKERS` by default.
+
+    Yields:
+        R: the result of each chunk, in order.
+    """
+    chunks = iter(chunks)
+    first_chunks = list(islice(chunks, 2))
+    workers = upload_workers(workers)
+    if workers <= 1 or len(first_chunks) <= 1:
+        for start, chunk in chain(first_chunks, chunks):
+            yield func(start, chunk)
+        return
+
+    with _process_pool(workers) as pool:
+        pending: deque[Future[R]] = deque()
+        for start, chunk in chain(first_chunks, chunks):
+            pending.append(pool.submit(func, start, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _init_worker() -> None:
+    """Set Django up in a worker process, without any database.
+
+    Workers start from the settings of the environment, not those of the calling process (e.g. its test database or
+    overridden settings), and outside of its transaction, so a query would read another state of the data, if any.
+    With no database configured, any query raises ImproperlyConfigured instead.
+    """
+    settings.DATABASES = {}
+    django.setup()
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """Pool of worker processes started from a fork server, which set Django up before taking chunks."""
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("forkserver"), initializer=_init_worker
+    )
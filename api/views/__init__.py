@@ -23,6 +23,7 @@ from .fields import (
 from .image import ImageViewSet
 from .image_set import ImageSetViewSet
 from .label import LabelViewSet
+from .upload_job import UploadJobViewSet
 
 __all__ = [
     "HealthView",
@@ -49,4 +50,5 @@ __all__ = [
     "RelatedMaterialViewSet",
     "SensorViewSet",
     "UploadAnnotationsView",
+    "UploadJobViewSet",
 ]
@@ -1,21 +1,39 @@
 """ViewSet for the Annotation model."""
 
-import pandas as pd
+import time
+
+from django.core.files.uploadedfile import UploadedFile
+from django.urls import reverse
 from drf_spectacular.utils import OpenApiTypes, extend_schema
+from openpyxl.workbook import Workbook
 from rest_framework import viewsets
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_202_ACCEPTED, HTTP_400_BAD_REQUEST
 
 from api.models import Annotation, AnnotationLabel, Annotator
 from api.serializers import AnnotationLabelSerializer, AnnotationSerializer, AnnotatorSerializer, FileUploadSerializer
-from api.utils.annotations_ingest import ingest_annotation_data
+from api.serializers.upload_job import UploadJobAcceptedSerializer
+from api.services.upload_jobs import accepted_job_data, enqueue_annotation_upload
+from api.utils.annotations_ingest import ingest_annotation_data, validate_annotation_upload
 from api.utils.annotations_parser import (
+    annotation_upload_format,
+    iter_annotation_records,
+    iter_sheet_rows,
+    open_annotation_workbook,
     parse_annotation_data,
+    parse_annotation_records,
     parse_annotation_set_metadata,
     parse_label_set,
 )
+from api.utils.constants import (
+    ANNOTATION_DATA_SHEET,
+    ANNOTATION_SET_SHEET,
+    ANNOTATION_SUMMARY_RESPONSE_THRESHOLD,
+    ANNOTATION_UPLOAD_FORMATS,
+    LABEL_SET_SHEET,
+)
 
 
 @extend_schema(tags=["Annotations API"])
@@ -42,6 +60,82 @@ class AnnotationLabelViewSet(viewsets.ModelViewSet):
     serializer_class = AnnotationLabelSerializer
 
 
+def _open_workbook(file: UploadedFile) -> tuple[Workbook | None, str | None]:
+    """Open an uploaded annotations template workbook.
+
+    Args:
+        file (UploadedFile): the uploaded XLSX file.
+
+    Returns:
+        tuple[Workbook | None, str | None]: the workbook, or None and the error to report, naming the missing sheets of
+        a workbook that isn't a complete template.
+    """
+    try:
+        return open_annotation_workbook(file), None
+    except ValueError as e:
+        return None, str(e)
+    except Exception:
+        return None, "Failed to read Excel file."
+
+
+def _parse_workbook(workbook: Workbook) -> tuple[dict, list[dict], list[dict]]:
+    """Parse the three sheets of an annotations template workbook, and close it.
+
+    Args:
+        workbook (Workbook): the workbook, as opened by `open_annotation_workbook`.
+
+    Returns:
+        tuple[dict, list[dict], list[dict]]: the annotation set metadata, label set and annotation data.
+    """
+    # The workbook is opened once and each sheet is streamed straight into its parser
+    try:
+        return (
+            parse_annotation_set_metadata(iter_sheet_rows(workbook, ANNOTATION_SET_SHEET)),
+            parse_label_set(iter_sheet_rows(workbook, LABEL_SET_SHEET)),
+            parse_annotation_data(iter_sheet_rows(workbook, ANNOTATION_DATA_SHEET)),
+        )
+    finally:
+        workbook.close()
+
+
+def _response_mode(requested: str | None, row_count: int) -> str:
+    """Pick the response of an upload, a summary by default for uploads of many rows.
+
+    Args:
+        requested (str | None): the requested response, one of ANNOTATION_UPLOAD_RESPONSES.
+        row_count (int): number of annotation rows in the upload.
+
+    Returns:
+        str: "full" or "summary".
+    """
+    if requested is not None:
+        return requested
+    return "summary" if row_count >= ANNOTATION_SUMMARY_RESPONSE_THRESHOLD else "full"
+
+
+def _upload_summary(data: dict, timings: dict[str, float], request: Request) -> dict:
+    """Summarise an ingested upload, without its annotation rows.
+
+    Args:
+        data (dict): the ingested data, as returned by `ingest_annotation_data`.
+        timings (dict[str, float]): seconds spent in each phase of the upload.
+        request (Request): the upload request, used to build the absolute URL of the created annotations.
+
+    Returns:
+        dict: the annotation set id, counts of created labels and of created and skipped (already stored)
+        annotations, timings and annotations URL.
+    """
+    annotation_set_id = data["annotation_set"]["id"]
+    return {
+        "annotation_set_id": annotation_set_id,
+        "label_count": len(data["label_set"]),
+        "created": data["annotation_data"]["created"],
+        "skipped": data["annotation_data"].get("skipped", 0),
+        "timings": {f"{phase}_seconds": round(seconds, 3) for phase, seconds in timings.items()},
+        "annotations_url": request.build_absolute_uri(reverse("annotation_set-annotations", args=[annotation_set_id])),
+    }
+
+
 class UploadAnnotationsView(viewsets.ViewSet):
     """Annotations view to import image annotation data into the database."""
 
@@ -52,13 +146,22 @@ class UploadAnnotationsView(viewsets.ViewSet):
         tags=["Annotations API"],
         operation_id="upload_annotations",
         request=FileUploadSerializer,
-        responses={201: OpenApiTypes.OBJECT},
+        responses={200: OpenApiTypes.OBJECT, 201: OpenApiTypes.OBJECT, 202: UploadJobAcceptedSerializer},
     )
-    def create(self, request: Request) -> Response:
-        """Endpoint to receive an XLSX file and import it into the database.
+    def create(self, request: Request) -> Response:  # noqa: PLR0911
+        """Endpoint to receive an annotations file (XLSX template, CSV, JSON Lines or Parquet) and import it.
+
+        With `background` set, the file is queued for the upload worker instead, and a 202 response points to the
+        job status endpoint. With `dry_run` set, the file is only checked, and a 200 response reports all its errors.
+        With `mode` set to "append", only the labels and rows not already in the annotation set of the file's
+        annotation-set-uuid are added to it.
+
+        Large uploads (or any upload with `response` set to "summary") only get counts, the annotation set id and
+        timings back, as serializing every created row would dwarf the upload itself. The created rows can then be
+        fetched page by page from the annotation set annotations endpoint.
 
         Args:
-            request (Request): XLSX file to be imported.
+            request (Request): annotations file to be imported.
 
         Returns:
             Response: JSON success/fail response.
@@ -68,41 +171,78 @@ class UploadAnnotationsView(viewsets.ViewSet):
         serializer.is_valid(raise_exception=True)
         file = serializer.validated_data["file"]
 
-        # Exit if file not a XLSX (Excel) file.
-        if not file.name.endswith(".xlsx"):
+        # Exit if file is not in a supported format.
+        upload_format = annotation_upload_format(file.name)
+        if upload_format is None:
             return Response(
-                {"error": "Provided file is not a .xlsx file."},
+                {"error": f"Provided file is not a {', '.join(ANNOTATION_UPLOAD_FORMATS)} file."},
                 status=HTTP_400_BAD_REQUEST,
             )
 
-        try:
-            df = pd.read_excel(file, sheet_name="Annotation set metadata")
-            label_df = pd.read_excel(file, sheet_name="Label set")
-            annotation_df = pd.read_excel(file, sheet_name="Annotation data")
-        except Exception:
-            return Response(
-                {"error": "Failed to read Excel file."},
-                status=HTTP_400_BAD_REQUEST,
+        if serializer.validated_data["background"]:
+            job = enqueue_annotation_upload(
+                file,
+                file.name,
+                backend=serializer.validated_data.get("backend"),
+                validate_coordinates=serializer.validated_data["validate_coordinates"],
+                mode=serializer.validated_data["mode"],
             )
+            return Response(accepted_job_data(job, request), status=HTTP_202_ACCEPTED)
+
+        started_at = time.perf_counter()
+        if upload_format == "xlsx":
+            workbook, error = _open_workbook(file)
+            if error is not None:
+                return Response({"error": error}, status=HTTP_400_BAD_REQUEST)
 
         try:
-            annotation_set = parse_annotation_set_metadata(df)
-            label_data = parse_label_set(label_df)
-            annotation_data = parse_annotation_data(annotation_df)
+            if upload_format == "xlsx":
+                annotation_set, label_data, annotation_data = _parse_workbook(workbook)
+            else:
+                records = iter_annotation_records(file, upload_format)
+                annotation_set, label_data, annotation_data = parse_annotation_records(records)
         except ValueError as e:
             return Response(
                 {"error": f"Error parsing annotations template: {e}"},
                 status=HTTP_400_BAD_REQUEST,
             )
 
+        if serializer.validated_data["dry_run"]:
+            report = validate_annotation_upload(
+                annotation_set,
+                label_data,
+                annotation_data,
+                validate_coordinates=serializer.validated_data["validate_coordinates"],
+                mode=serializer.validated_data["mode"],
+            )
+            return Response({"status": "validated", "report": report}, status=HTTP_200_OK)
+
+        response = _response_mode(serializer.validated_data.get("response"), len(annotation_data))
+        parsed_at = time.perf_counter()
+
         try:
-            data = ingest_annotation_data(annotation_set, label_data, annotation_data)
+            data = ingest_annotation_data(
+                annotation_set,
+                label_data,
+                annotation_data,
+                backend=serializer.validated_data.get("backend"),
+                validate_coordinates=serializer.validated_data["validate_coordinates"],
+                with_data=response == "full",
+                mode=serializer.validated_data["mode"],
+            )
         except ValueError as e:
             return Response(
                 {"error": f"Error ingesting annotations data: {e}"},
                 status=HTTP_400_BAD_REQUEST,
             )
 
+        if response == "summary":
+            timings = {"parse": parsed_at - started_at, "ingest": time.perf_counter() - parsed_at}
+            return Response(
+                {"status": "uploaded", "summary": _upload_summary(data, timings, request)},
+                status=HTTP_201_CREATED,
+            )
+
         return Response(
             {"status": "uploaded", "data": data},
             status=HTTP_201_CREATED,
@@ -1,10 +1,15 @@
 """ViewSet for the AnnotationSet model."""
 
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
 
-from api.models import AnnotationSet
+from api.models import AnnotationLabel, AnnotationSet
 from api.serializers import AnnotationSetSerializer
+from api.utils.annotations_ingest import annotation_rows_data
 
 
 @extend_schema(tags=["Annotations API"])
@@ -13,3 +18,33 @@ class AnnotationSetViewSet(viewsets.ModelViewSet):
 
     queryset = AnnotationSet.objects.all().order_by("id")
     serializer_class = AnnotationSetSerializer
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    @action(detail=True, methods=["get"], url_path="annotations")
+    def annotations(self, request: Request, pk: str | None = None) -> Response:
+        """List the annotations of the annotation set page by page, as a full upload response lists them.
+
+        Each row has its annotation, label and annotator, in the order they were created, so the rows created by an
+        upload with a summary response can be fetched afterwards.
+
+        Args:
+            request (Request): The incoming HTTP request.
+            pk (str | None): id of the annotation set.
+
+        Returns:
+            Response: A paginated list of annotation rows.
+        """
+        annotation_set = self.get_object()
+        queryset = (
+            AnnotationLabel.objects.filter(annotation__annotation_set=annotation_set)
+            .select_related("annotation", "annotator")
+            .order_by("annotation__created_at", "annotation_id", "created_at", "id")
+        )
+
+        page = self.paginator.paginate_queryset(queryset, request, view=self)
+        data = annotation_rows_data(
+            [annotation_label.annotation for annotation_label in page],
+            page,
+            [annotation_label.annotator for annotation_label in page],
+        )
+        return self.paginator.get_paginated_response(data)
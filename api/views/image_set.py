@@ -1,12 +1,23 @@
 """ViewSet for the ImageSet model."""
 
+import re
+
 from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.request import Request
 
+from api.ingest.ifdo_export import iter_ifdo_json
 from api.models import ImageSet
 from api.serializers import ImageSetSerializer
 
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
 
 @extend_schema(tags=["Images API"])
 class ImageSetViewSet(viewsets.ModelViewSet):
@@ -40,3 +51,29 @@ class ImageSetViewSet(viewsets.ModelViewSet):
             serializer: The serializer instance with validated data.
         """
         serializer.save()
+
+    @extend_schema(responses={200: OpenApiTypes.OBJECT})
+    @action(detail=True, methods=["get"], url_path="ifdo")
+    def ifdo(self, request: Request, pk: str | None = None) -> StreamingHttpResponse:
+        """Export the image set and its images as an iFDO document, which the iFDO ingest reads back.
+
+        The image-set-items are streamed from the database a chunk at a time, so image sets of any size can be exported
+        in one response. With `Accept-Encoding: gzip`, the document is gzip compressed as it is streamed.
+
+        Args:
+            request (Request): The incoming HTTP request.
+            pk (str | None): id of the image set.
+
+        Returns:
+            StreamingHttpResponse: The iFDO JSON document.
+        """
+        image_set = self.get_object()
+        content = (part.encode() for part in iter_ifdo_json(image_set))
+        gzipped = ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", "")) is not None
+        response = StreamingHttpResponse(
+            compress_sequence(content) if gzipped else content, content_type="application/json"
+        )
+        if gzipped:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Any
+import io
+from collections.abc import Callable, Iterable
+from contextlib import AbstractContextManager, nullcontext
+from typing import IO, Any
 
+from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction
 from drf_spectacular.utils import extend_schema, inline_serializer
 from rest_framework import serializers, status
@@ -15,9 +19,36 @@ from api.ingest.data_subs_mapping import (
     IFDOAdaptError,
     adapt_ifdo_image_set_to_serializer_payload,
     adapt_ifdo_item_to_image_serializer_payload,
+    parse_item_datetimes,
 )
+from api.ingest.ifdo_stream import ifdo_upload_format, read_ifdo_stream
+from api.ingest.images_ingest import (
+    IngestCheckpoint,
+    bulk_create_images,
+    bulk_create_images_in_chunks,
+    item_content_hash,
+    upsert_images,
+)
+from api.models import ImageSet
+from api.serializers.base import IDENTITY_MAP_CONTEXT_KEY
 from api.serializers.image import IngestImageSerializer
 from api.serializers.image_set import IngestImageSetSerializer
+from api.serializers.upload_job import UploadJobAcceptedSerializer
+from api.services.upload_jobs import accepted_job_data, enqueue_ifdo_ingest, enqueue_ifdo_stream
+from api.utils.constants import (
+    IFDO_BULK_THRESHOLD,
+    IFDO_COMMIT_CHUNK_SIZE,
+    IFDO_COMPRESSIONS,
+    IFDO_INGEST_MODES,
+    IFDO_STREAMING_THRESHOLD,
+    IFDO_UPLOAD_FORMATS,
+)
+
+# Chunked ingests are resumed from the checkpoint of their upload job
+CHUNKED_INGEST_ERROR = "Chunked iFDO ingests run as resumable background jobs: set background too"
+
+# Upserts delete the images missing from the payload once all its items are read, so can't commit earlier chunks
+CHUNKED_UPSERT_ERROR = "Upserts can't be chunked: the whole payload is needed to know which images to delete"
 
 IngestIFDOSerializer = inline_serializer(
     name="IngestIFDORequest",
@@ -25,6 +56,19 @@ IngestIFDOSerializer = inline_serializer(
         "submission_id": serializers.CharField(required=False),
         "image_set_uuid": serializers.CharField(required=False),
         "ifdo": serializers.DictField(),  # contains image-set-header + image-set-items
+        "background": serializers.BooleanField(required=False),
+        "chunked": serializers.BooleanField(required=False),
+        "mode": serializers.ChoiceField(choices=IFDO_INGEST_MODES, required=False),
+    },
+)
+
+IngestIFDOFileSerializer = inline_serializer(
+    name="IngestIFDOFileRequest",
+    fields={
+        "file": serializers.FileField(),  # .json or .yaml iFDO file, optionally compressed as .gz or .zst
+        "background": serializers.BooleanField(required=False),
+        "chunked": serializers.BooleanField(required=False),
+        "mode": serializers.ChoiceField(choices=IFDO_INGEST_MODES, required=False),
     },
 )
 
@@ -34,87 +78,448 @@ IngestIFDOResponseSerializer = inline_serializer(
         "message": serializers.CharField(),
         "image_set_id": serializers.IntegerField(),
         "image_count": serializers.IntegerField(),
+        "counts": serializers.DictField(child=serializers.IntegerField(), required=False),
     },
 )
 
 
-@extend_schema(
-    tags=["Ingest"],
-    request=IngestIFDOSerializer,
-    responses={201: IngestIFDOResponseSerializer, 400: serializers.DictField(), 502: serializers.DictField()},
-)
-@api_view(["POST"])
-def ingest_ifdo_image_set(request: Request) -> Response:  # noqa: C901, PLR0911
-    """Ingest an iFDO image set payload, creating ImageSet and related Images."""
-    body: dict[str, Any] = request.data if isinstance(request.data, dict) else {}
+def _no_phase(name: str) -> AbstractContextManager:
+    """Default phase hook of `ingest_ifdo_payload`, which does not record anything."""
+    return nullcontext()
 
-    ifdo = body.get("ifdo")
-    if not isinstance(ifdo, dict):
-        return Response({"detail": "Missing or invalid 'ifdo' object"}, status=status.HTTP_400_BAD_REQUEST)
 
-    try:
-        image_set_payload = adapt_ifdo_image_set_to_serializer_payload(ifdo)
-    except IFDOAdaptError as exc:
-        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+def _create_images(image_set: ImageSet, items: Iterable[Any], context: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+    """Create the images of the items of an iFDO payload one at a time, each with its own serializer.
 
-    items = ifdo.get("image-set-items") or []
-    if not isinstance(items, list):
-        return Response({"detail": "ifdo.image-set-items must be a list"}, status=status.HTTP_400_BAD_REQUEST)
+    Args:
+        image_set (ImageSet): the image set created by the payload.
+        items (Iterable[Any]): image-set-items of the iFDO payload.
+        context (dict[str, Any]): serializer context shared by the request, with its identity map.
 
-    with transaction.atomic():
-        # create ImageSet first
-        image_set_ser = IngestImageSetSerializer(data=image_set_payload)
-        if not image_set_ser.is_valid():
-            return Response({"image_set": image_set_ser.errors}, status=status.HTTP_400_BAD_REQUEST)
+    Returns:
+        tuple[int, dict[str, Any]]: number of created images, and errors of the invalid items by index.
+    """
+    image_count = 0
+    item_errors: dict[str, Any] = {}
+
+    for idx, item in enumerate(parse_item_datetimes(list(items)), start=1):
+        if not isinstance(item, dict):
+            item_errors[str(idx)] = {"detail": "Item must be an object"}
+            continue
+
+        try:
+            img_payload = adapt_ifdo_item_to_image_serializer_payload(item, image_set_id=image_set.id)
+        except IFDOAdaptError as exc:
+            item_errors[str(idx)] = {"detail": str(exc)}
+            continue
+
+        img_ser = IngestImageSerializer(data=img_payload, context=context)
+        if not img_ser.is_valid():
+            item_errors[str(idx)] = img_ser.errors
+            continue
 
         try:
-            image_set = image_set_ser.save()
+            img_ser.save(image_set=image_set, content_hash=item_content_hash(img_payload))
         except IntegrityError as exc:
-            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            item_errors[str(idx)] = {"detail": str(exc)}
+            continue
+        image_count += 1
+
+    return image_count, item_errors
+
+
+def _create_image_set(
+    image_set_payload: dict[str, Any], context: dict[str, Any], instance: ImageSet | None = None
+) -> tuple[ImageSet | None, dict[str, Any] | None]:
+    """Validate and create (or update) the image set of an adapted iFDO header.
+
+    Args:
+        image_set_payload (dict[str, Any]): the image set serializer payload, adapted from the iFDO header.
+        context (dict[str, Any]): serializer context shared by the request, with its identity map.
+        instance (ImageSet | None): the existing image set to update, or None to create one.
+
+    Returns:
+        tuple[ImageSet | None, dict[str, Any] | None]: the image set, or None and the response data of the errors.
+    """
+    image_set_ser = IngestImageSetSerializer(instance, data=image_set_payload, context=context)
+    if not image_set_ser.is_valid():
+        return None, {"image_set": image_set_ser.errors}
+
+    try:
+        return image_set_ser.save(), None
+    except IntegrityError as exc:
+        return None, {"detail": str(exc)}
+
+
+def _item_errors_data(image_set_payload: dict[str, Any], item_errors: dict[str, Any]) -> dict[str, Any]:
+    """Response data of the image items that failed validation."""
+    return {
+        "detail": "One or more image items failed validation",
+        "image_set": {"name": image_set_payload.get("name")},
+        "items": item_errors,
+    }
+
+
+def _ingest_ifdo(
+    image_set_payload: dict[str, Any],
+    items: Iterable[Any],
+    bulk: bool,
+    phase: Callable[[str], AbstractContextManager],
+) -> tuple[dict[str, Any], int]:
+    """Create the image set of an adapted iFDO header and the images of its items, in a single transaction.
+
+    Args:
+        image_set_payload (dict[str, Any]): the image set serializer payload, adapted from the iFDO header.
+        items (Iterable[Any]): image-set-items of the iFDO payload.
+        bulk (bool): whether to create the images with bulk queries, see `bulk_create_images`.
+        phase (Callable[[str], AbstractContextManager]): wrapped around the "ingest" phase.
+
+    Returns:
+        tuple[dict[str, Any], int]: response data and HTTP status code.
+    """
+    with phase("ingest"), transaction.atomic():
+        # create ImageSet first
+        # related objects repeated by the header and items (platform, creators, ...) are resolved once
+        context = {IDENTITY_MAP_CONTEXT_KEY: {}}
+        image_set, errors = _create_image_set(image_set_payload, context)
+        if image_set is None:
+            return errors, status.HTTP_400_BAD_REQUEST
 
         # create Images
-        created_image_ids: list[int] = []
-        item_errors: dict[str, Any] = {}
-
-        for idx, item in enumerate(items, start=1):
-            if not isinstance(item, dict):
-                item_errors[str(idx)] = {"detail": "Item must be an object"}
-                continue
-
-            try:
-                img_payload = adapt_ifdo_item_to_image_serializer_payload(item, image_set_id=image_set.id)
-            except IFDOAdaptError as exc:
-                item_errors[str(idx)] = {"detail": str(exc)}
-                continue
-
-            img_ser = IngestImageSerializer(data=img_payload)
-            if not img_ser.is_valid():
-                item_errors[str(idx)] = img_ser.errors
-                continue
-
-            try:
-                img = img_ser.save(image_set=image_set)
-            except IntegrityError as exc:
-                item_errors[str(idx)] = {"detail": str(exc)}
-                continue
-            created_image_ids.append(img.id)
+        try:
+            if bulk:
+                image_count, item_errors = bulk_create_images(image_set, items, context)
+            else:
+                image_count, item_errors = _create_images(image_set, items, context)
+        except (IFDOAdaptError, IntegrityError) as exc:
+            # streamed items that aren't valid JSON, or images inserted concurrently by another request
+            transaction.set_rollback(True)
+            return {"detail": str(exc)}, status.HTTP_400_BAD_REQUEST
+
+        if item_errors:
+            transaction.set_rollback(True)
+            return _item_errors_data(image_set_payload, item_errors), status.HTTP_400_BAD_REQUEST
+
+    return (
+        {
+            "message": "Ingested iFDO payload successfully",
+            "image_set_id": image_set.id,
+            "image_count": image_count,
+        },
+        status.HTTP_201_CREATED,
+    )
+
+
+def _upsert_ifdo(
+    image_set_payload: dict[str, Any], items: Iterable[Any], phase: Callable[[str], AbstractContextManager]
+) -> tuple[dict[str, Any], int]:
+    """Create or update the image set of an adapted iFDO header, and re-ingest its items, in a single transaction.
+
+    The image set of the header's image-set-uuid is updated if it exists, and only its images whose item changed are
+    written (see `upsert_images`); otherwise the image set is created with all its images.
+
+    Args:
+        image_set_payload (dict[str, Any]): the image set serializer payload, adapted from the iFDO header.
+        items (Iterable[Any]): image-set-items of the iFDO payload.
+        phase (Callable[[str], AbstractContextManager]): wrapped around the "ingest" phase.
+
+    Returns:
+        tuple[dict[str, Any], int]: response data and HTTP status code, 200 if the image set existed.
+    """
+    with phase("ingest"), transaction.atomic():
+        try:
+            # Locked until the upsert commits, so concurrent upserts of the image set run one after the other
+            instance = ImageSet.objects.select_for_update().filter(pk=image_set_payload.get("id")).first()
+        except ValidationError:
+            # an invalid image-set-uuid, reported by the serializer
+            instance = None
+        context = {IDENTITY_MAP_CONTEXT_KEY: {}}
+        image_set, errors = _create_image_set(image_set_payload, context, instance)
+        if image_set is None:
+            return errors, status.HTTP_400_BAD_REQUEST
+
+        try:
+            counts, item_errors = upsert_images(image_set, items, context)
+        except (IFDOAdaptError, IntegrityError) as exc:
+            transaction.set_rollback(True)
+            return {"detail": str(exc)}, status.HTTP_400_BAD_REQUEST
 
         if item_errors:
             transaction.set_rollback(True)
+            return _item_errors_data(image_set_payload, item_errors), status.HTTP_400_BAD_REQUEST
+
+    return (
+        {
+            "message": "Upserted iFDO payload successfully",
+            "image_set_id": image_set.id,
+            "image_count": counts["created"] + counts["updated"] + counts["unchanged"],
+            "counts": counts,
+        },
+        status.HTTP_201_CREATED if instance is None else status.HTTP_200_OK,
+    )
+
+
+def _ingest_ifdo_in_chunks(
+    image_set_payload: dict[str, Any],
+    items: Iterable[Any],
+    phase: Callable[[str], AbstractContextManager],
+    checkpoint: IngestCheckpoint,
+) -> tuple[dict[str, Any], int]:
+    """Create the image set of an adapted iFDO header and the images of its items, committing them a chunk at a time.
+
+    The image set is committed first, then the images a chunk of items at a time (see `bulk_create_images_in_chunks`),
+    with the progress saved to the checkpoint. A failed ingest keeps its committed images, and is resumed by running
+    it again with the same checkpoint: the image set is reused and the committed items are skipped.
+
+    Args:
+        image_set_payload (dict[str, Any]): the image set serializer payload, adapted from the iFDO header.
+        items (Iterable[Any]): image-set-items of the iFDO payload.
+        phase (Callable[[str], AbstractContextManager]): wrapped around the "ingest" phase.
+        checkpoint (IngestCheckpoint): progress of the ingest, empty for a new ingest.
+
+    Returns:
+        tuple[dict[str, Any], int]: response data and HTTP status code.
+    """
+    with phase("ingest"):
+        context = {IDENTITY_MAP_CONTEXT_KEY: {}}
+        if checkpoint.image_set_id is None:
+            with transaction.atomic():
+                image_set, errors = _create_image_set(image_set_payload, context)
+                if image_set is None:
+                    return errors, status.HTTP_400_BAD_REQUEST
+                checkpoint.commit(image_set_id=str(image_set.id), committed_items=0)
+        else:
+            image_set = ImageSet.objects.filter(pk=checkpoint.image_set_id).first()
+            if image_set is None:
+                return {
+                    "detail": "The image set of the interrupted ingest no longer exists"
+                }, status.HTTP_400_BAD_REQUEST
+
+        try:
+            _, item_errors = bulk_create_images_in_chunks(image_set, items, context, checkpoint, IFDO_COMMIT_CHUNK_SIZE)
+        except (IFDOAdaptError, IntegrityError) as exc:
+            errors = {"detail": str(exc)}
+        else:
+            errors = _item_errors_data(image_set_payload, item_errors) if item_errors else None
+        if errors is not None:
+            progress = {"image_set_id": image_set.id, "committed_items": checkpoint.committed_items}
+            return {**errors, **progress}, status.HTTP_400_BAD_REQUEST
+
+    return (
+        {
+            "message": "Ingested iFDO payload successfully",
+            "image_set_id": image_set.id,
+            "image_count": checkpoint.committed_items,
+        },
+        status.HTTP_201_CREATED,
+    )
+
+
+def ingest_ifdo_payload(
+    body: dict[str, Any],
+    phase: Callable[[str], AbstractContextManager] = _no_phase,
+    checkpoint: IngestCheckpoint | None = None,
+) -> tuple[dict[str, Any], int]:
+    """Ingest an iFDO image set payload, creating ImageSet and related Images.
+
+    Args:
+        body (dict[str, Any]): request body, with the iFDO object under "ifdo".
+        phase (Callable[[str], AbstractContextManager]): called with the name of each processing phase ("validate",
+            "ingest"), and wrapped around it, e.g. to record the timing of background jobs.
+        checkpoint (IngestCheckpoint | None): progress of a chunked ingest, whose images are committed a chunk at a
+            time (see `_ingest_ifdo_in_chunks`), or None to ingest the payload in a single transaction.
+
+    Returns:
+        tuple[dict[str, Any], int]: response data and HTTP status code.
+    """
+    mode = body.get("mode", "create")
+    with phase("validate"):
+        ifdo = body.get("ifdo")
+        if not isinstance(ifdo, dict):
+            return {"detail": "Missing or invalid 'ifdo' object"}, status.HTTP_400_BAD_REQUEST
+
+        try:
+            image_set_payload = adapt_ifdo_image_set_to_serializer_payload(ifdo)
+        except IFDOAdaptError as exc:
+            return {"detail": str(exc)}, status.HTTP_400_BAD_REQUEST
+
+        items = ifdo.get("image-set-items") or []
+        if not isinstance(items, list):
+            return {"detail": "ifdo.image-set-items must be a list"}, status.HTTP_400_BAD_REQUEST
+
+    if mode == "upsert":
+        return _upsert_ifdo(image_set_payload, items, phase)
+    if checkpoint is not None:
+        return _ingest_ifdo_in_chunks(image_set_payload, items, phase, checkpoint)
+    return _ingest_ifdo(image_set_payload, items, len(items) >= IFDO_BULK_THRESHOLD, phase)
+
+
+def ingest_ifdo_stream(  # noqa: PLR0913
+    stream: IO[bytes],
+    phase: Callable[[str], AbstractContextManager] = _no_phase,
+    upload_format: str = "json",
+    compression: str | None = None,
+    checkpoint: IngestCheckpoint | None = None,
+    mode: str = "create",
+    wrapped: bool = True,
+) -> tuple[dict[str, Any], int]:
+    """Ingest a large or compressed iFDO image set payload, streaming its image items from the request body or file.
+
+    The image-set-header is read first, and the image-set-items are then read, validated and inserted in batches (see
+    `read_ifdo_stream` and `bulk_create_images`), so the whole document is never held in memory.
+
+    Args:
+        stream (IO[bytes]): request body, a JSON object with the iFDO object under "ifdo", or iFDO file.
+        phase (Callable[[str], AbstractContextManager]): called with the name of each processing phase ("validate",
+            "ingest"), and wrapped around it, e.g. to record the timing of background jobs.
+        upload_format (str): one of the `IFDO_UPLOAD_FORMATS` values.
+        compression (str | None): one of the `IFDO_COMPRESSIONS` values, or None for uncompressed data.
+        checkpoint (IngestCheckpoint | None): progress of a chunked ingest, see `ingest_ifdo_payload`.
+        mode (str): one of the `IFDO_INGEST_MODES` values, given with the request rather than in the body.
+        wrapped (bool): whether the stream is a request body rather than an iFDO file, see `read_ifdo_stream`.
+
+    Returns:
+        tuple[dict[str, Any], int]: response data and HTTP status code.
+    """
+    with phase("validate"):
+        try:
+            body, ifdo, items = read_ifdo_stream(stream, upload_format, compression, wrapped)
+            if ifdo is None:
+                return {"detail": "Missing or invalid 'ifdo' object"}, status.HTTP_400_BAD_REQUEST
+            for option in ("background", "chunked", "mode"):
+                if body.get(option) not in (None, False):
+                    return (
+                        {"detail": f"Set {option} on large iFDO payloads with the {option} query parameter"},
+                        status.HTTP_400_BAD_REQUEST,
+                    )
+            image_set_payload = adapt_ifdo_image_set_to_serializer_payload(ifdo)
+        except IFDOAdaptError as exc:
+            return {"detail": str(exc)}, status.HTTP_400_BAD_REQUEST
+
+    if mode == "upsert":
+        return _upsert_ifdo(image_set_payload, items, phase)
+    if checkpoint is not None:
+        return _ingest_ifdo_in_chunks(image_set_payload, items, phase, checkpoint)
+    return _ingest_ifdo(image_set_payload, items, True, phase)
+
+
+def _ingest_options_error(background: bool, chunked: bool, mode: Any) -> str | None:
+    """Check the ingest options of a request, returning the error of an invalid combination or None."""
+    if mode not in IFDO_INGEST_MODES:
+        return f"mode must be one of {', '.join(IFDO_INGEST_MODES)}"
+    if chunked and not background:
+        return CHUNKED_INGEST_ERROR
+    if chunked and mode == "upsert":
+        return CHUNKED_UPSERT_ERROR
+    return None
+
+
+def _is_large_json(request: Request) -> bool:
+    """Whether the request body is a JSON document large enough to be streamed, rather than parsed by DRF."""
+    try:
+        content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return False
+    return request.content_type.startswith("application/json") and content_length >= IFDO_STREAMING_THRESHOLD
+
+
+def _stream_ifdo_request(request: Request) -> Response | None:
+    """Ingest or queue the iFDO payload of a request whose body or file is streamed rather than parsed by DRF.
+
+    Compressed bodies (by their Content-Encoding), large JSON bodies and uploaded iFDO files are streamed, and queued
+    with `background=true` as a query parameter (or form field, for files), `chunked=true` for a chunked ingest, and
+    `mode=upsert` to re-ingest an existing image set. Bodies hold the iFDO object under "ifdo", and files are the iFDO
+    object itself.
+
+    Returns:
+        Response | None: the response, or None if the request is to be parsed by DRF.
+    """
+    background = request.query_params.get("background") == "true"
+    chunked = request.query_params.get("chunked") == "true"
+    mode = request.query_params.get("mode")
+    filename = None
+    content_encoding = request.META.get("HTTP_CONTENT_ENCODING", "identity").strip().lower()
+    if content_encoding != "identity":
+        if content_encoding not in IFDO_COMPRESSIONS.values():
+            return Response(
+                {"detail": f"Unsupported Content-Encoding: {content_encoding}"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        stream, upload_format, compression = request.stream or io.BytesIO(), "json", content_encoding
+    elif _is_large_json(request):
+        stream, upload_format, compression = request.stream, "json", None
+    elif request.content_type.startswith("multipart/form-data") and "file" in request.FILES:
+        stream = request.FILES["file"]
+        filename = stream.name
+        file_format = ifdo_upload_format(filename)
+        if file_format is None:
             return Response(
                 {
-                    "detail": "One or more image items failed validation",
-                    "image_set": {"name": image_set_payload.get("name")},
-                    "items": item_errors,
+                    "detail": f"Provided file is not a {', '.join(IFDO_UPLOAD_FORMATS)} file, optionally compressed as "
+                    f"{' or '.join(IFDO_COMPRESSIONS)}."
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        upload_format, compression = file_format
+        background = background or request.data.get("background") == "true"
+        chunked = chunked or request.data.get("chunked") == "true"
+        mode = mode or request.data.get("mode")
+    else:
+        return None
 
-    return Response(
-        {
-            "message": "Ingested iFDO payload successfully",
-            "image_set_id": image_set.id,
-            "image_count": len(created_image_ids),
-        },
-        status=status.HTTP_201_CREATED,
+    mode = mode or "create"
+    error = _ingest_options_error(background, chunked, mode)
+    if error is not None:
+        return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+    if background:
+        job = enqueue_ifdo_stream(stream, upload_format, compression, filename, chunked=chunked, mode=mode)
+        return Response(accepted_job_data(job, request), status=status.HTTP_202_ACCEPTED)
+    data, status_code = ingest_ifdo_stream(
+        stream, upload_format=upload_format, compression=compression, mode=mode, wrapped=filename is None
+    )
+    return Response(data, status=status_code)
+
+
+@extend_schema(
+    tags=["Ingest"],
+    request={"application/json": IngestIFDOSerializer, "multipart/form-data": IngestIFDOFileSerializer},
+    responses={
+        200: IngestIFDOResponseSerializer,
+        201: IngestIFDOResponseSerializer,
+        202: UploadJobAcceptedSerializer,
+        400: serializers.DictField(),
+        502: serializers.DictField(),
+    },
+)
+@api_view(["POST"])
+def ingest_ifdo_image_set(request: Request) -> Response:
+    """Ingest an iFDO image set payload, creating ImageSet and related Images.
+
+    With `"background": true` in the body, the payload is queued for the upload worker instead, and a 202 response
+    points to the job status endpoint. With `"chunked": true` too, the worker commits the images a chunk at a time, and
+    a failed job can be resumed from its last committed chunk (see `_ingest_ifdo_in_chunks`). With `"mode": "upsert"`,
+    the image set of the header's image-set-uuid is re-ingested if it exists, writing only the images whose item
+    changed (see `_upsert_ifdo`), and a 200 response counts the created, updated, unchanged and deleted images. JSON
+    bodies of `IFDO_STREAMING_THRESHOLD` bytes or more, gzip or zstd compressed bodies (by their Content-Encoding) and
+    iFDO files uploaded as the `file` form field (.json or .yaml, optionally compressed as .gz or .zst) are streamed
+    rather than parsed in memory: they take these options as query parameters instead, e.g. `background=true`,
+    `chunked=true` or `mode=upsert`.
+    """
+    response = _stream_ifdo_request(request)
+    if response is not None:
+        return response
+
+    body: dict[str, Any] = request.data if isinstance(request.data, dict) else {}
+
+    error = _ingest_options_error(
+        body.get("background") is True, body.get("chunked") is True, body.get("mode", "create")
     )
+    if error is not None:
+        return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+    if body.get("background") is True:
+        if not isinstance(body.get("ifdo"), dict):
+            return Response({"detail": "Missing or invalid 'ifdo' object"}, status=status.HTTP_400_BAD_REQUEST)
+        job = enqueue_ifdo_ingest(body)
+        return Response(accepted_job_data(job, request), status=status.HTTP_202_ACCEPTED)
+
+    data, status_code = ingest_ifdo_payload(body)
+    return Response(data, status=status_code)
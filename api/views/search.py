@@ -15,6 +15,7 @@ from rest_framework.viewsets import GenericViewSet
 from api.models.annotation import AnnotationLabel
 from api.models.base import DeploymentEnum, FaunaAttractionEnum, MarineZoneEnum
 from api.serializers.search import GroupedSearchResultRow, SearchResultItem
+from api.services import taxon_name_index
 from api.services.cached_worms_client import CachedWoRMSClient
 
 MIN_CHARS_FOR_PARTIAL_MATCH = 3
@@ -509,14 +510,21 @@ def _get_descendant_aphia_ids(aphia_ids: list[int]) -> list[int]:
 def _get_aphia_ids_by_name_part(name_part: str) -> list[int]:
     """Get AphiaIDs for a given name part.
 
+    The local taxon name index is searched first, as it holds the names of the taxa labelled in the database. It
+    does not hold the names of their ancestors (e.g. a genus whose descendants are searched), so the matches of the
+    cached WoRMS service are merged after the local ones. If WoRMS cannot be reached, only the local matches are used.
+
     Args:
         name_part (str): The name part to search for.
 
     Returns:
         list[str]: List of AphiaIDs matching the name part.
     """
+    local_aphia_ids = taxon_name_index.aphia_ids_by_name_part(name_part)
+
     client = CachedWoRMSClient()
     try:
-        return client.aphia_ids_by_name_part(name_part, combine_vernaculars=True) or []
+        worms_aphia_ids = client.aphia_ids_by_name_part(name_part, combine_vernaculars=True) or []
     except requests.RequestException:
-        return []
+        worms_aphia_ids = []
+    return list(dict.fromkeys([*local_aphia_ids, *worms_aphia_ids]))
@@ -0,0 +1,41 @@
+"""ViewSet for the UploadJob model."""
+
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.models import UploadJob
+from api.serializers import UploadJobSerializer
+from api.serializers.upload_job import UploadJobAcceptedSerializer
+from api.services.upload_jobs import accepted_job_data, resume_job
+
+
+@extend_schema(tags=["Upload Jobs API"])
+class UploadJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Read-only ViewSet reporting the status of uploads queued for the background worker."""
+
+    # The upload kept on a job isn't reported, and is only loaded by the worker
+    queryset = UploadJob.objects.defer("file", "payload").order_by("-created_at")
+    serializer_class = UploadJobSerializer
+
+    @extend_schema(request=None, responses={202: UploadJobAcceptedSerializer, 400: serializers.DictField()})
+    @action(detail=True, methods=["post"])
+    def resume(self, request: Request, pk: str | None = None) -> Response:
+        """Queue a failed chunked iFDO ingest again, for the worker to resume it from its last committed chunk.
+
+        Args:
+            request (Request): The incoming HTTP request.
+            pk (str | None): id of the upload job.
+
+        Returns:
+            Response: 202 with the job to poll, or 400 if the job is not a failed chunked ingest.
+        """
+        job = self.get_object()
+        if not resume_job(job):
+            return Response(
+                {"detail": "Only failed chunked iFDO ingests with committed progress can be resumed"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(accepted_job_data(job, request), status=status.HTTP_202_ACCEPTED)
@@ -127,6 +127,12 @@ CACHED_WORMS_API_BASE_URL = os.environ.get("CACHED_WORMS_API_BASE_URL", "https:/
 WORMS_API_BASE_URL = os.environ.get("WORMS_API_BASE_URL", "https://marinespecies.org/rest")
 CACHED_WORMS_API_TOKEN = os.environ.get("CACHED_WORMS_API_TOKEN", "mysecrettoken")
 
+# Worker processes parsing and validating the rows of large annotation uploads (1 to do it in the request process)
+ANNOTATION_UPLOAD_WORKERS = int(os.environ.get("ANNOTATION_UPLOAD_WORKERS", "1"))
+
+# Worker processes adapting and validating the image items of large iFDO payloads (1 to do it in the request process)
+IFDO_UPLOAD_WORKERS = int(os.environ.get("IFDO_UPLOAD_WORKERS", "1"))
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 